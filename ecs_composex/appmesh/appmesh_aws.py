@@ -20,63 +20,46 @@ Module to interact with AWS AppMesh API
 """
 
 from ecs_composex.appmesh.appmesh_params import MESH_NAME, MESH_OWNER_ID
-from ecs_composex.common import LOG, keyisset
+from ecs_composex.common import LOG
+from ecs_composex.common.aws import get_account_id
+from ecs_composex.common.discovery import get_discovery_index
 
 
-def find_mesh_in_list(mesh_name, client, next_token=None):
+def find_mesh_in_list(mesh_name, session, mesh_owner=None):
     """
-    Function to recursively go through meshes in case the mesh exists but we don't know the account Id
+    Function to find the mesh in the meshes listed for the account, in case the mesh is shared with the account
+    and we don't know the account Id
 
-    :param mesh_name: Name of the mesh
-    :param next_token: token for next api call
-    :return:
+    :param str mesh_name: Name of the mesh
+    :param boto3.session.Session session:
+    :param str mesh_owner: The account ID owning the mesh, if known
+    :return: the mesh info
+    :rtype: dict
     """
-    if next_token is not None:
-        mesh_r = client.list_meshes(nexToken=next_token)
-    else:
-        mesh_r = client.list_meshes()
-    if not keyisset("meshes", mesh_r):
+    meshes = get_discovery_index(session).find_meshes(mesh_name, mesh_owner)
+    if len(meshes) > 1:
+        account_id = get_account_id(session)
+        meshes = [mesh for mesh in meshes if mesh["meshOwner"] == account_id]
+    if len(meshes) != 1:
         return {}
-    for mesh in mesh_r["meshes"]:
-        if mesh["meshName"] == mesh_name:
-            mesh_info = {
-                MESH_NAME.title: mesh["meshName"],
-                MESH_OWNER_ID.title: mesh["meshOwner"],
-            }
-            LOG.info(
-                f"Found shared mesh {mesh_name} owned by {mesh_info[MESH_OWNER_ID.title]}"
-            )
-            return mesh_info
-    if keyisset("nextToken", mesh_r):
-        return find_mesh_in_list(mesh_name, client, mesh_r["nextToken"])
+    mesh_info = {
+        MESH_NAME.title: meshes[0]["meshName"],
+        MESH_OWNER_ID.title: meshes[0]["meshOwner"],
+    }
+    LOG.info(f"Found mesh {mesh_name} owned by {mesh_info[MESH_OWNER_ID.title]}")
+    return mesh_info
 
 
 def lookup_mesh_by_name(session, mesh_name, mesh_owner=None):
     """
-    Function to figure out whether the mesh exists or not.
+    Function to figure out whether the mesh exists or not, from the meshes listed for the session.
 
     :param str mesh_name:
     :param boto3.session.Session session:
     :param str mesh_owner:
     :return:
     """
-    r_params = {
-        "meshName": mesh_name,
-    }
-    if mesh_owner is not None:
-        r_params["meshOwner"] = mesh_owner
-    client = session.client("appmesh")
-    try:
-        mesh_r = client.describe_mesh(**r_params)["mesh"]
-        mesh_info = {
-            MESH_NAME.title: mesh_r["meshName"],
-            MESH_OWNER_ID.title: mesh_r["metadata"]["meshOwner"],
-        }
-        LOG.info(f"Found mesh {mesh_name} owned by {mesh_info[MESH_OWNER_ID.title]}")
-        return mesh_info
-    except client.exceptions.NotFoundException:
-        LOG.info(
-            f"No mesh {mesh_name} found owned with current details. Looking for shared meshes."
-        )
-        mesh_info = find_mesh_in_list(mesh_name, client)
-        return mesh_info
+    mesh_info = find_mesh_in_list(mesh_name, session, mesh_owner)
+    if not mesh_info:
+        LOG.info(f"No mesh {mesh_name} found owned with current details.")
+    return mesh_info
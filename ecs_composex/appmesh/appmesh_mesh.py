@@ -135,11 +135,15 @@ class Mesh(object):
             appmesh_params.NAME_KEY,
             appmesh_params.PROTOCOL_KEY,
             appmesh_params.BACKENDS_KEY,
+            appmesh_params.ENVOY_KEY,
+            appmesh_params.CONNECTION_POOL_KEY,
+            appmesh_params.OUTLIER_DETECTION_KEY,
+            appmesh_params.TIMEOUT_KEY,
         ]
         for node in self.mesh_settings[self.nodes_key]:
             if not set(node.keys()).issubset(nodes_keys):
                 raise AttributeError(
-                    f"Nodes must have set {nodes_keys}. Got", node.keys()
+                    f"Nodes settings must be in {nodes_keys}. Got", node.keys()
                 )
             service_families = [
                 settings.families[name]
@@ -167,6 +171,7 @@ class Mesh(object):
                 node[appmesh_params.BACKENDS_KEY]
                 if keyisset(appmesh_params.BACKENDS_KEY, node)
                 else None,
+                definition=node,
             )
             self.nodes[family.logical_name].get_node_param = GetAtt(
                 self.nodes[family.logical_name].param_name, "Outputs.VirtualNode"
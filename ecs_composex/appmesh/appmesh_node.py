@@ -16,7 +16,7 @@
 #   along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 from troposphere import Parameter
-from troposphere import Ref, Sub, GetAtt
+from troposphere import AWS_NO_VALUE, Ref, Sub, GetAtt
 from troposphere import appmesh
 from troposphere.ec2 import SecurityGroupIngress
 from troposphere.ecs import (
@@ -34,14 +34,71 @@ from ecs_composex.appmesh import appmesh_params, appmesh_conditions, metadata
 from ecs_composex.appmesh.appmesh_params import (
     NAME_KEY,
     BACKENDS_KEY,
+    ENVOY_KEY,
+    CONNECTION_POOL_KEY,
+    OUTLIER_DETECTION_KEY,
+    TIMEOUT_KEY,
 )
-from ecs_composex.common import LOG, add_parameters
+from ecs_composex.appmesh.appmesh_policies import (
+    define_connection_pool,
+    define_listener_timeout,
+    define_outlier_detection,
+)
+from ecs_composex.common import LOG, add_parameters, keyisset, keypresent
 from ecs_composex.common.services_helpers import extend_container_envvars
 from ecs_composex.common.outputs import ComposeXOutput
 from ecs_composex.dns.dns_params import PRIVATE_DNS_ZONE_NAME
 from ecs_composex.ecs import ecs_params
 
 
+ENVOY_DEFAULT_SETTINGS = {
+    "Cpu": 128,
+    "Memory": 256,
+    "Ulimits": {"nofile": {"soft": 15000, "hard": 15000}},
+}
+
+
+def define_envoy_settings(envoy_settings):
+    """
+    Function to define the Envoy sidecar resources, from the node Envoy settings and the defaults.
+
+    :param dict envoy_settings:
+    :return: the Envoy container Cpu, Memory, MemoryReservation and Ulimits
+    :rtype: dict
+    """
+    settings = dict(ENVOY_DEFAULT_SETTINGS)
+    if envoy_settings:
+        settings.update(envoy_settings)
+    valid_keys = list(ENVOY_DEFAULT_SETTINGS.keys()) + ["MemoryReservation"]
+    unknown = [key for key in settings if key not in valid_keys]
+    if unknown:
+        raise KeyError(f"{ENVOY_KEY} settings are", valid_keys, "Got", unknown)
+    if int(settings["Memory"]) < 128:
+        raise ValueError(
+            f"{ENVOY_KEY}.Memory must be at least 128 MB. Got", settings["Memory"]
+        )
+    if keypresent("MemoryReservation", settings) and int(
+        settings["MemoryReservation"]
+    ) > int(settings["Memory"]):
+        raise ValueError(f"{ENVOY_KEY}.MemoryReservation cannot be higher than Memory")
+    ulimits = []
+    for name, limits in settings["Ulimits"].items():
+        soft, hard = (
+            (limits["soft"], limits["hard"])
+            if isinstance(limits, dict)
+            else (limits, limits)
+        )
+        ulimits.append(Ulimit(Name=name, SoftLimit=int(soft), HardLimit=int(hard)))
+    return {
+        "Cpu": int(settings["Cpu"]),
+        "Memory": int(settings["Memory"]),
+        "MemoryReservation": int(settings["MemoryReservation"])
+        if keypresent("MemoryReservation", settings)
+        else Ref(AWS_NO_VALUE),
+        "Ulimits": ulimits,
+    }
+
+
 class MeshNode(object):
     """
     Class representing an AppMesh Node.
@@ -49,10 +106,13 @@ class MeshNode(object):
 
     weight = 1
 
-    def __init__(self, family, protocol, mesh, backends=None):
+    def __init__(self, family, protocol, mesh, backends=None, definition=None):
         """
         Creates the AppMesh VirtualNode pointing to the family service
+
+        :param dict definition: the node definition, for the Envoy and listener settings
         """
+        self.definition = {} if definition is None else definition
         self.node = None
         self.param_name = family.logical_name
         self.get_node_param = None
@@ -95,6 +155,30 @@ class MeshNode(object):
             )
             break
 
+    def define_listener(self, port_mapping):
+        """
+        Method to define the node listener, with its connection pool, outlier detection and timeouts.
+
+        :param troposphere.appmesh.PortMapping port_mapping:
+        :rtype: troposphere.appmesh.Listener
+        """
+        return appmesh.Listener(
+            PortMapping=port_mapping,
+            ConnectionPool=define_connection_pool(
+                self.definition[CONNECTION_POOL_KEY], self.protocol
+            )
+            if keyisset(CONNECTION_POOL_KEY, self.definition)
+            else Ref(AWS_NO_VALUE),
+            OutlierDetection=define_outlier_detection(
+                self.definition[OUTLIER_DETECTION_KEY]
+            )
+            if keyisset(OUTLIER_DETECTION_KEY, self.definition)
+            else Ref(AWS_NO_VALUE),
+            Timeout=define_listener_timeout(self.definition[TIMEOUT_KEY], self.protocol)
+            if keyisset(TIMEOUT_KEY, self.definition)
+            else Ref(AWS_NO_VALUE),
+        )
+
     def extend_service_stack(self, mesh):
         """
         Method to expand the service template with the AppMesh virtual node
@@ -114,8 +198,7 @@ class MeshNode(object):
                     )
                 ),
                 Listeners=[
-                    appmesh.Listener(PortMapping=mapping)
-                    for mapping in self.port_mappings
+                    self.define_listener(mapping) for mapping in self.port_mappings
                 ],
             ),
             Metadata=metadata,
@@ -154,7 +237,7 @@ class MeshNode(object):
 
     def add_envoy_container_definition(self, family):
         """
-        Method to expand the containers configuration and add the Envoy SideCar.
+        Method to expand the containers configuration and add the Envoy SideCar, sized from the node Envoy settings.
         """
         envoy_container_name = "envoy"
         task = family.task_definition
@@ -187,14 +270,11 @@ class MeshNode(object):
         envoy_container = ContainerDefinition(
             Image=Ref(appmesh_params.ENVOY_IMAGE_URL),
             Name=envoy_container_name,
-            Cpu=128,
-            Memory=256,
             User="1337",
             Essential=True,
             LogConfiguration=envoy_log_config,
             Environment=envoy_environment,
             PortMappings=envoy_port_mapping,
-            Ulimits=[Ulimit(HardLimit=15000, SoftLimit=15000, Name="nofile")],
             HealthCheck=HealthCheck(
                 Command=[
                     "CMD-SHELL",
@@ -205,6 +285,7 @@ class MeshNode(object):
                 Retries=3,
                 StartPeriod=10,
             ),
+            **define_envoy_settings(self.definition.get(ENVOY_KEY)),
         )
         proxy_config = ProxyConfiguration(
             ContainerName="envoy",
@@ -230,6 +311,7 @@ class MeshNode(object):
         task.ContainerDefinitions.append(envoy_container)
         setattr(family.task_definition, "ProxyConfiguration", proxy_config)
         family.refresh()
+        family.set_task_compute_parameter()
 
     def extend_task_policy(self):
         """
@@ -38,6 +38,11 @@ SERVICES_KEY = "Services"
 NODES_KEY = "Nodes"
 ROUTER_KEY = "Router"
 ROUTERS_KEY = "Routers"
+ENVOY_KEY = "Envoy"
+CONNECTION_POOL_KEY = "ConnectionPool"
+OUTLIER_DETECTION_KEY = "OutlierDetection"
+TIMEOUT_KEY = "Timeout"
+RETRY_POLICY_KEY = "RetryPolicy"
 
 MESH_NAME_T = "AppMeshName"
 MESH_NAME = Parameter(MESH_NAME_T, Type="String", Default="AutoCreate")
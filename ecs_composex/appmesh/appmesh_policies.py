@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+#  ECS ComposeX <https://github.com/lambda-my-aws/ecs_composex>
+#  Copyright (C) 2020-2021  John Mille <john@lambda-my-aws.io>
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module to define the traffic policies of the nodes listeners (connection pool, outlier detection, timeouts)
+and of the routes (retry policy, timeouts).
+"""
+
+import re
+
+from troposphere import AWS_NO_VALUE, Ref
+from troposphere import appmesh
+
+from ecs_composex.common import keyisset, keypresent
+
+DURATION_RE = re.compile(r"^(?P<value>[0-9]+)(?P<unit>ms|s|m)$")
+HTTP_PROTOCOLS = ["http", "http2", "grpc"]
+HTTP_RETRY_EVENTS = ["server-error", "gateway-error", "client-error", "stream-error"]
+TCP_RETRY_EVENTS = ["connection-error"]
+CONNECTION_POOL_SETTINGS = {
+    "http": ("HTTP", appmesh.VirtualNodeHttpConnectionPool),
+    "http2": ("HTTP2", appmesh.VirtualNodeHttp2ConnectionPool),
+    "grpc": ("GRPC", appmesh.VirtualNodeGrpcConnectionPool),
+    "tcp": ("TCP", appmesh.VirtualNodeTcpConnectionPool),
+}
+
+
+def define_duration(duration):
+    """
+    Function to define an AppMesh duration. Integers are milliseconds, strings can be in ms, s or m.
+
+    :param duration: the duration, i.e. 500ms, 15s, 1m
+    :rtype: troposphere.appmesh.Duration
+    :raises: ValueError
+    """
+    if isinstance(duration, int):
+        return appmesh.Duration(Unit="ms", Value=duration)
+    parts = DURATION_RE.match(str(duration))
+    if not parts:
+        raise ValueError(
+            "Durations must be an integer (ms) or a string such as 500ms, 15s, 1m. Got",
+            duration,
+        )
+    if parts.group("unit") == "m":
+        return appmesh.Duration(Unit="s", Value=int(parts.group("value")) * 60)
+    return appmesh.Duration(Unit=parts.group("unit"), Value=int(parts.group("value")))
+
+
+def define_timeout(timeout, protocol):
+    """
+    Function to define the timeout for the given protocol. PerRequest only applies to HTTP/HTTP2/gRPC.
+
+    :param dict timeout: the timeout definition
+    :param str protocol: the listener or route protocol
+    :return: the timeout
+    :rtype: troposphere.appmesh.HttpTimeout or troposphere.appmesh.TcpTimeout
+    """
+    idle = define_duration(timeout["Idle"]) if keyisset("Idle", timeout) else None
+    if protocol.lower() not in HTTP_PROTOCOLS:
+        if keyisset("PerRequest", timeout):
+            raise KeyError("PerRequest timeout is not supported for TCP")
+        return appmesh.TcpTimeout(Idle=idle if idle else Ref(AWS_NO_VALUE))
+    timeout_class = (
+        appmesh.GrpcTimeout if protocol.lower() == "grpc" else appmesh.HttpTimeout
+    )
+    return timeout_class(
+        Idle=idle if idle else Ref(AWS_NO_VALUE),
+        PerRequest=define_duration(timeout["PerRequest"])
+        if keyisset("PerRequest", timeout)
+        else Ref(AWS_NO_VALUE),
+    )
+
+
+def define_listener_timeout(timeout, protocol):
+    """
+    Function to define the timeout of a virtual node listener
+
+    :param dict timeout:
+    :param str protocol:
+    :rtype: troposphere.appmesh.ListenerTimeout
+    """
+    key = CONNECTION_POOL_SETTINGS[protocol.lower()][0]
+    return appmesh.ListenerTimeout(**{key: define_timeout(timeout, protocol)})
+
+
+def define_connection_pool(pool, protocol):
+    """
+    Function to define the connection pool of a virtual node listener.
+    HTTP uses MaxConnections and MaxPendingRequests, HTTP2 and gRPC MaxRequests, TCP MaxConnections.
+
+    :param dict pool: the connection pool definition
+    :param str protocol: the listener protocol
+    :rtype: troposphere.appmesh.VirtualNodeConnectionPool
+    """
+    key, pool_class = CONNECTION_POOL_SETTINGS[protocol.lower()]
+    props = {}
+    for prop in pool_class.props:
+        if keypresent(prop, pool):
+            if int(pool[prop]) < 1:
+                raise ValueError(f"ConnectionPool.{prop} must be at least 1")
+            props[prop] = int(pool[prop])
+    unknown = [setting for setting in pool if setting not in pool_class.props]
+    if unknown:
+        raise KeyError(
+            f"ConnectionPool settings for {protocol} are",
+            list(pool_class.props.keys()),
+            "Got",
+            unknown,
+        )
+    return appmesh.VirtualNodeConnectionPool(**{key: pool_class(**props)})
+
+
+def define_outlier_detection(outlier_detection):
+    """
+    Function to define the outlier detection of a virtual node listener.
+    Hosts which return MaxServerErrors errors within the Interval are ejected for the BaseEjectionDuration.
+
+    :param dict outlier_detection:
+    :rtype: troposphere.appmesh.OutlierDetection
+    """
+    max_ejection = int(outlier_detection.get("MaxEjectionPercent", 50))
+    if not 0 <= max_ejection <= 100:
+        raise ValueError(
+            "OutlierDetection.MaxEjectionPercent must be between 0 and 100. Got",
+            max_ejection,
+        )
+    return appmesh.OutlierDetection(
+        MaxServerErrors=int(outlier_detection.get("MaxServerErrors", 5)),
+        Interval=define_duration(outlier_detection.get("Interval", "10s")),
+        BaseEjectionDuration=define_duration(
+            outlier_detection.get("BaseEjectionDuration", "30s")
+        ),
+        MaxEjectionPercent=max_ejection,
+    )
+
+
+def define_retry_policy(retry_policy):
+    """
+    Function to define the retry policy of a HTTP route. Without retry events, the server and gateway errors
+    and the connection errors are retried.
+
+    :param dict retry_policy:
+    :rtype: troposphere.appmesh.HttpRetryPolicy
+    """
+    if not keypresent("MaxRetries", retry_policy) or not keyisset(
+        "PerRetryTimeout", retry_policy
+    ):
+        raise KeyError("RetryPolicy requires MaxRetries and PerRetryTimeout")
+    http_events = retry_policy.get("HttpRetryEvents", [])
+    tcp_events = retry_policy.get("TcpRetryEvents", [])
+    if not http_events and not tcp_events:
+        http_events = ["server-error", "gateway-error"]
+        tcp_events = TCP_RETRY_EVENTS
+    for events, allowed in [
+        (http_events, HTTP_RETRY_EVENTS),
+        (tcp_events, TCP_RETRY_EVENTS),
+    ]:
+        invalid = [event for event in events if event not in allowed]
+        if invalid:
+            raise ValueError("RetryPolicy events must be in", allowed, "Got", invalid)
+    return appmesh.HttpRetryPolicy(
+        MaxRetries=int(retry_policy["MaxRetries"]),
+        PerRetryTimeout=define_duration(retry_policy["PerRetryTimeout"]),
+        HttpRetryEvents=http_events if http_events else Ref(AWS_NO_VALUE),
+        TcpRetryEvents=tcp_events if tcp_events else Ref(AWS_NO_VALUE),
+    )
@@ -35,12 +35,31 @@ from ecs_composex.appmesh.appmesh_params import (
     NAME_KEY,
     NODES_KEY,
     PORT_KEY,
+    RETRY_POLICY_KEY,
+    TIMEOUT_KEY,
 )
+from ecs_composex.appmesh.appmesh_policies import define_retry_policy, define_timeout
 from ecs_composex.common import NONALPHANUM, keyisset, LOG
 
 
-def define_http_route(route_match, route_nodes):
+def define_http_route(route_match, route_nodes, route_definition=None):
+    """
+    Function to define the HTTP route, with its retry policy and timeouts if defined.
+
+    :param dict route_match: the route Match
+    :param list route_nodes: the nodes to send the traffic to
+    :param dict route_definition: the route definition
+    :rtype: troposphere.appmesh.HttpRoute
+    """
+    if route_definition is None:
+        route_definition = {}
     route = appmesh.HttpRoute(
+        RetryPolicy=define_retry_policy(route_definition[RETRY_POLICY_KEY])
+        if keyisset(RETRY_POLICY_KEY, route_definition)
+        else Ref(AWS_NO_VALUE),
+        Timeout=define_timeout(route_definition[TIMEOUT_KEY], "http")
+        if keyisset(TIMEOUT_KEY, route_definition)
+        else Ref(AWS_NO_VALUE),
         Match=appmesh.HttpRouteMatch(
             Prefix=route_match[PREFIX_KEY]
             if keyisset(PREFIX_KEY, route_match)
@@ -114,8 +133,8 @@ class MeshRouter(object):
     Defines a router.
     """
 
-    tcp_routes_keys = [NODES_KEY]
-    http_routes_keys = [MATCH_KEY, NODES_KEY]
+    tcp_routes_keys = [NODES_KEY, TIMEOUT_KEY]
+    http_routes_keys = [MATCH_KEY, NODES_KEY, RETRY_POLICY_KEY, TIMEOUT_KEY]
 
     def __init__(self, name, definition, mesh, nodes):
         """
@@ -181,9 +200,12 @@ class MeshRouter(object):
         :return:
         """
         for route in routes:
-            if not all(key in [MATCH_KEY, NODES_KEY] for key in route.keys()):
+            if not all(key in self.http_routes_keys for key in route.keys()) or not all(
+                key in route.keys() for key in [MATCH_KEY, NODES_KEY]
+            ):
                 raise AttributeError(
-                    "Each route must have match and nodes. Got", route.keys()
+                    f"Each route must have match and nodes, and only {self.http_routes_keys}. Got",
+                    route.keys(),
                 )
             route_nodes = []
             for node in route[NODES_KEY]:
@@ -194,7 +216,7 @@ class MeshRouter(object):
                         f"node {node[NAME_KEY]} is not defined as a virtual node."
                     )
             route_match = route[MATCH_KEY]
-            route = define_http_route(route_match, route_nodes)
+            route = define_http_route(route_match, route_nodes, route)
             self.nodes += [node for node in route_nodes]
             route_name = define_route_name(route_match)
             protocol = "HttpRoute"
@@ -220,8 +242,13 @@ class MeshRouter(object):
         :param dict nodes: Nodes in the mesh
         """
         for route in routes:
-            if not all(key in [NODES_KEY] for key in route.keys()):
-                raise AttributeError("Each route must have nodes. Got", route.keys())
+            if not all(
+                key in self.tcp_routes_keys for key in route.keys()
+            ) or not keyisset(NODES_KEY, route):
+                raise AttributeError(
+                    f"Each route must have nodes, and only {self.tcp_routes_keys}. Got",
+                    route.keys(),
+                )
             route_nodes = []
             for node in route[NODES_KEY]:
                 if node[NAME_KEY] in nodes.keys():
@@ -231,8 +258,8 @@ class MeshRouter(object):
                         f"node {node[NAME_KEY]} is not defined as a virtual node."
                     )
             route = appmesh.TcpRoute(
-                Timeout=appmesh.TcpTimeout(Idle=appmesh.Duration(Unit="ms", Value=1))
-                if keyisset("Timeout", route)
+                Timeout=define_timeout(route[TIMEOUT_KEY], "tcp")
+                if keyisset(TIMEOUT_KEY, route)
                 else Ref(AWS_NO_VALUE),
                 Action=appmesh.TcpRouteAction(
                     WeightedTargets=[
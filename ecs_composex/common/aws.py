@@ -24,9 +24,12 @@ import boto3
 from botocore.exceptions import ClientError
 
 from ecs_composex.common import LOG, keyisset
+from ecs_composex.common.cache import WARM_STATE, session_cache_key
 from ecs_composex.iam import ROLE_ARN_ARG
 from ecs_composex.iam import validate_iam_role_arn
 
+CROSS_ROLE_SESSION_TTL = 600
+
 
 def get_cross_role_session(session, arn, session_name=None):
     """
@@ -44,7 +47,11 @@ def get_cross_role_session(session, arn, session_name=None):
     try:
         if not session:
             session = boto3.session.Session()
-        creds = session.client("sts").assume_role(
+        cache_key = ("role_session", session_cache_key(session), arn, session_name)
+        cached_session = WARM_STATE.get(cache_key)
+        if cached_session:
+            return cached_session
+        creds = WARM_STATE.get_client(session, "sts").assume_role(
             RoleArn=arn,
             RoleSessionName=session_name,
             DurationSeconds=900,
@@ -52,10 +59,14 @@ def get_cross_role_session(session, arn, session_name=None):
         LOG.info(
             f"Successfully assumed role. Session ID: {creds['AssumedRoleUser']['AssumedRoleId']}"
         )
-        return boto3.session.Session(
-            aws_access_key_id=creds["Credentials"]["AccessKeyId"],
-            aws_session_token=creds["Credentials"]["SessionToken"],
-            aws_secret_access_key=creds["Credentials"]["SecretAccessKey"],
+        return WARM_STATE.set(
+            cache_key,
+            boto3.session.Session(
+                aws_access_key_id=creds["Credentials"]["AccessKeyId"],
+                aws_session_token=creds["Credentials"]["SessionToken"],
+                aws_secret_access_key=creds["Credentials"]["SecretAccessKey"],
+            ),
+            ttl=min(WARM_STATE.ttl, CROSS_ROLE_SESSION_TTL),
         )
     except ClientError:
         LOG.error(f"Failed to use the Role ARN {arn}")
@@ -102,12 +113,23 @@ def get_resources_from_tags(session, aws_resource_search, search_tags):
     :param list search_tags: The tags to search the resource with.
     :return:
     """
+    cache_key = (
+        "tags",
+        session_cache_key(session),
+        aws_resource_search,
+        repr(search_tags),
+    )
+    if WARM_STATE.cache_lookups:
+        cached = WARM_STATE.get(cache_key)
+        if cached is not None:
+            return cached
     try:
-
-        client = session.client("resourcegroupstaggingapi")
+        client = WARM_STATE.get_client(session, "resourcegroupstaggingapi")
         resources_r = client.get_resources(
             ResourceTypeFilters=[aws_resource_search], TagFilters=search_tags
         )
+        if WARM_STATE.cache_lookups:
+            WARM_STATE.set(cache_key, resources_r)
         return resources_r
     except ClientError as error:
         LOG.error(error)
@@ -255,7 +277,12 @@ def get_region_azs(session):
     :return: list of AZs in the given region
     :rtype: list
     """
-    return session.client("ec2").describe_availability_zones()["AvailabilityZones"]
+    return WARM_STATE.get_or_set(
+        ("azs", session_cache_key(session)),
+        lambda: WARM_STATE.get_client(session, "ec2").describe_availability_zones()[
+            "AvailabilityZones"
+        ],
+    )
 
 
 def get_account_id(session):
@@ -267,7 +294,10 @@ def get_account_id(session):
     :return: account ID
     :rtype: str
     """
-    return session.client("sts").get_caller_identity()["Account"]
+    return WARM_STATE.get_or_set(
+        ("account_id", session_cache_key(session)),
+        lambda: WARM_STATE.get_client(session, "sts").get_caller_identity()["Account"],
+    )
 
 
 def assert_can_create_stack(client, name):
@@ -0,0 +1,164 @@
+#  -*- coding: utf-8 -*-
+#   ECS ComposeX <https://github.com/lambda-my-aws/ecs_composex>
+#   Copyright (C) 2020-2021  John Mille <john@lambda-my-aws.io>
+#  #
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#  #
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#  #
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module to keep state (sessions, clients, API results) across executions within the same python process.
+When running as the CFN Macro, the Lambda function container is re-used for consecutive invocations, so any value
+stored here survives until the TTL expires or the container is recycled.
+"""
+
+from itertools import count
+from os import environ
+from time import monotonic
+from weakref import WeakKeyDictionary
+
+import boto3
+
+from ecs_composex.common import LOG
+
+CACHE_TTL_ENV = "COMPOSEX_CACHE_TTL"
+DEFAULT_CACHE_TTL = 900
+
+
+def get_cache_ttl():
+    """
+    Function to define the TTL, in seconds, of the cached values. Allows override from environment variable.
+
+    :return: the TTL in seconds
+    :rtype: int
+    """
+    try:
+        return int(environ.get(CACHE_TTL_ENV, DEFAULT_CACHE_TTL))
+    except ValueError:
+        LOG.warning(
+            f"{CACHE_TTL_ENV} must be an integer. Using default {DEFAULT_CACHE_TTL}"
+        )
+        return DEFAULT_CACHE_TTL
+
+
+class WarmState(object):
+    """
+    Class to store values with an expiry time.
+
+    :cvar int ttl: Number of seconds a value is kept for.
+    :cvar bool cache_lookups: Whether the results of resources lookups are kept too. Only enabled for the macro.
+    """
+
+    def __init__(self, ttl=None, cache_lookups=False):
+        self.ttl = ttl if isinstance(ttl, int) else get_cache_ttl()
+        self.cache_lookups = cache_lookups
+        self.values = {}
+        self.clients = WeakKeyDictionary()
+
+    def get(self, key, default=None):
+        """
+        Method to retrieve a value from the state if it has not expired.
+
+        :param key: The key of the value
+        :param default: What to return if the key is not set or the value expired.
+        :return: the value
+        """
+        if key not in self.values:
+            return default
+        expiry, value = self.values[key]
+        if expiry < monotonic():
+            del self.values[key]
+            return default
+        return value
+
+    def set(self, key, value, ttl=None):
+        """
+        Method to store a value in the state
+
+        :param key: The key for the value
+        :param value: The value to store
+        :param int ttl: Override the default TTL for this value
+        :return: the value
+        """
+        ttl = ttl if isinstance(ttl, int) else self.ttl
+        self.values[key] = (monotonic() + ttl, value)
+        return value
+
+    def get_or_set(self, key, function, *args, **kwargs):
+        """
+        Method to return the value for a key, or execute the function and store its result if not present.
+
+        :param key: The key of the value
+        :param function: function to call when the value is missing or expired
+        :return: the value
+        """
+        value = self.get(key)
+        if value is None:
+            LOG.debug(f"Cache miss for {key}")
+            value = self.set(key, function(*args, **kwargs))
+        return value
+
+    def get_client(self, session, service_name):
+        """
+        Method to re-use the boto3 client of a service for a given session.
+        Clients are tied to the session lifecycle, so they get garbage collected with it.
+
+        :param boto3.session.Session session:
+        :param str service_name:
+        :return: the boto3 client
+        """
+        if session not in self.clients:
+            self.clients[session] = {}
+        session_clients = self.clients[session]
+        if service_name not in session_clients:
+            session_clients[service_name] = session.client(service_name)
+        return session_clients[service_name]
+
+    def get_session(self, region=None):
+        """
+        Method to get a boto3 session for a region, re-using the one previously created if still valid.
+
+        :param str region:
+        :return: boto3 session
+        :rtype: boto3.session.Session
+        """
+        return self.get_or_set(
+            ("session", region), boto3.session.Session, region_name=region
+        )
+
+    def clear(self):
+        """
+        Method to drop all the cached values and clients.
+        """
+        self.values.clear()
+        self.clients.clear()
+
+
+_SESSIONS_IDS = WeakKeyDictionary()
+_SESSIONS_COUNTER = count()
+
+
+def session_cache_key(session):
+    """
+    Function to identify uniquely a session and its region, so that values from different
+    accounts or roles never get mixed up.
+
+    :param boto3.session.Session session:
+    :return: the key
+    :rtype: tuple
+    """
+    if session not in _SESSIONS_IDS:
+        _SESSIONS_IDS[session] = next(_SESSIONS_COUNTER)
+    return _SESSIONS_IDS[session], session.region_name
+
+
+WARM_STATE = WarmState()
@@ -28,6 +28,7 @@ from troposphere.ecs import (
     Environment,
     PortMapping,
     LogConfiguration,
+    FirelensConfiguration,
     ContainerDefinition,
     TaskDefinition,
     EnvironmentFile,
@@ -40,6 +41,8 @@ from troposphere.ecs import (
     KernelCapabilities,
     LinuxParameters,
     Tmpfs,
+    RuntimePlatform,
+    EphemeralStorage,
 )
 from troposphere.iam import Policy, PolicyType
 
@@ -60,14 +63,20 @@ from ecs_composex.common.services_helpers import (
 )
 from ecs_composex.ecs import ecs_params
 from ecs_composex.ecs.docker_tools import (
-    find_closest_fargate_configuration,
+    define_fargate_sizing,
     set_memory_to_mb,
     import_time_values_to_seconds,
 )
-from ecs_composex.ecs.ecs_conditions import USE_FARGATE_CON_T
+from ecs_composex.ecs.ecs_conditions import (
+    CREATE_LOG_GROUP_CON_T,
+    GENERATED_LOG_GROUP_NAME_CON_T,
+    USE_FARGATE_CON_T,
+)
 from ecs_composex.ecs.ecs_iam import add_service_roles
 from ecs_composex.ecs.ecs_params import (
     AWS_XRAY_IMAGE,
+    AWS_FLUENT_BIT_IMAGE,
+    LOG_ROUTER_NAME,
     LOG_GROUP_RETENTION,
     NETWORK_MODE,
     EXEC_ROLE_T,
@@ -84,6 +93,22 @@ from ecs_composex.vpc.vpc_params import APP_SUBNETS
 
 NUMBERS_REG = r"[^0-9.]"
 MINIMUM_SUPPORTED = 4
+LOGGING_MODES = ["blocking", "non-blocking"]
+BUFFER_SIZE_RE = re.compile(r"^[0-9]+(k|K|m|M|g|G)$")
+FIRELENS_KEY = "FireLens"
+CPU_ARCHITECTURES = {
+    "amd64": "X86_64",
+    "x86_64": "X86_64",
+    "arm64": "ARM64",
+    "aarch64": "ARM64",
+}
+OS_FAMILIES = [
+    "LINUX",
+    "WINDOWS_SERVER_2019_CORE",
+    "WINDOWS_SERVER_2019_FULL",
+    "WINDOWS_SERVER_2004_CORE",
+    "WINDOWS_SERVER_20H2_CORE",
+]
 
 
 class ComposeService(object):
@@ -126,6 +151,7 @@ class ComposeService(object):
         ("init", bool),
         ("isolation", str),
         ("pid", str),
+        ("platform", str),
         ("ports", list),
         ("privileged", bool),
         ("read_only", bool),
@@ -146,6 +172,7 @@ class ComposeService(object):
         ("x-xray", bool),
         ("x-scaling", dict),
         ("x-network", dict),
+        ("x-ecs", dict),
         ("x-codeguru-profiler", (str, bool, dict)),
     ]
 
@@ -193,6 +220,7 @@ class ComposeService(object):
         self.x_configs = set_else_none("x-configs", self.definition)
         self.x_scaling = set_else_none("x-scaling", self.definition, None, False)
         self.x_network = set_else_none("x-network", self.definition, None, False)
+        self.x_ecs = set_else_none("x-ecs", self.definition, None, False)
         self.x_iam = set_else_none("x-iam", self.definition)
         self.x_logging = {"RetentionInDays": 14, "CreateLogGroup": True}
         self.x_repo_credentials = None
@@ -246,6 +274,9 @@ class ComposeService(object):
         self.define_logging()
         self.container_parameters = {}
 
+        self.runtime_platform = None
+        self.ephemeral_storage = None
+        self.set_runtime_platform()
         self.set_user_group()
         self.map_volumes(volumes)
         self.map_secrets(secrets)
@@ -291,6 +322,7 @@ class ComposeService(object):
                     "awslogs-group": self.logical_name,
                     "awslogs-region": Ref(AWS_REGION),
                     "awslogs-stream-prefix": self.name,
+                    **self.logging_options,
                 },
             ),
             Command=self.command,
@@ -549,6 +581,65 @@ class ComposeService(object):
             return rendered_limits
         return Ref(AWS_NO_VALUE)
 
+    def set_runtime_platform(self):
+        """
+        Method to define the CPU architecture, OS family and ephemeral storage for the service, from x-ecs or the
+        compose platform, i.e. linux/arm64
+        """
+        if self.x_ecs and keyisset("RuntimePlatform", self.x_ecs):
+            platform = self.x_ecs["RuntimePlatform"]
+            self.runtime_platform = {
+                "CpuArchitecture": platform.get("CpuArchitecture", "X86_64"),
+                "OperatingSystemFamily": platform.get("OperatingSystemFamily", "LINUX"),
+            }
+        elif keyisset("platform", self.definition):
+            platform = self.definition["platform"].split("/")
+            if platform[0] != "linux" or len(platform) < 2:
+                raise ValueError(
+                    f"{self.name} - platform must be linux/<architecture>. Got",
+                    self.definition["platform"],
+                )
+            if platform[1] not in CPU_ARCHITECTURES.keys():
+                raise ValueError(
+                    f"{self.name} - platform architecture must be one of",
+                    list(CPU_ARCHITECTURES.keys()),
+                    "Got",
+                    platform[1],
+                )
+            self.runtime_platform = {
+                "CpuArchitecture": CPU_ARCHITECTURES[platform[1]],
+                "OperatingSystemFamily": "LINUX",
+            }
+        if self.runtime_platform:
+            if self.runtime_platform["CpuArchitecture"] not in set(
+                CPU_ARCHITECTURES.values()
+            ):
+                raise ValueError(
+                    f"{self.name} - CpuArchitecture must be one of",
+                    sorted(set(CPU_ARCHITECTURES.values())),
+                    "Got",
+                    self.runtime_platform["CpuArchitecture"],
+                )
+            if self.runtime_platform["OperatingSystemFamily"] not in OS_FAMILIES:
+                raise ValueError(
+                    f"{self.name} - OperatingSystemFamily must be one of",
+                    OS_FAMILIES,
+                    "Got",
+                    self.runtime_platform["OperatingSystemFamily"],
+                )
+            if (
+                self.runtime_platform["CpuArchitecture"] == "ARM64"
+                and self.runtime_platform["OperatingSystemFamily"] != "LINUX"
+            ):
+                raise ValueError(f"{self.name} - ARM64 is only supported with LINUX")
+        if self.x_ecs and keyisset("EphemeralStorage", self.x_ecs):
+            self.ephemeral_storage = int(self.x_ecs["EphemeralStorage"])
+            if not 21 <= self.ephemeral_storage <= 200:
+                raise ValueError(
+                    f"{self.name} - EphemeralStorage must be between 21 and 200 GiB. Got",
+                    self.ephemeral_storage,
+                )
+
     def set_user_group(self):
         """
         Method to assign the user / group IDs for the container
@@ -715,6 +806,43 @@ class ComposeService(object):
             self.x_logging["RetentionInDays"] = int(
                 self.definition["x-aws-logs_retention"]
             )
+        self.set_logging_mode()
+
+    def set_logging_mode(self):
+        """
+        Method to define the log delivery mode from x-logging, or from the compose logging options.
+        In non-blocking mode, the logs are stored in an intermediate buffer and the container does not stall on
+        writes to stdout/stderr when the logs cannot be shipped fast enough.
+        """
+        compose_options = (
+            self.definition["logging"]["options"]
+            if keyisset("logging", self.definition)
+            and keyisset("options", self.definition["logging"])
+            else {}
+        )
+        mode = self.x_logging.get("Mode", compose_options.get("mode", "blocking"))
+        buffer_size = self.x_logging.get(
+            "MaxBufferSize", compose_options.get("max-buffer-size", None)
+        )
+        if mode not in LOGGING_MODES:
+            raise ValueError(
+                f"{self.name} - logging Mode must be one of", LOGGING_MODES, "Got", mode
+            )
+        if buffer_size and mode != "non-blocking":
+            raise ValueError(
+                f"{self.name} - MaxBufferSize is only valid with non-blocking mode"
+            )
+        if buffer_size and not BUFFER_SIZE_RE.match(str(buffer_size)):
+            raise ValueError(
+                f"{self.name} - MaxBufferSize must be a size such as 512k or 25m. Got",
+                buffer_size,
+            )
+        self.logging_options = {}
+        if mode == "non-blocking":
+            self.logging_options["mode"] = mode
+            self.logging_options["max-buffer-size"] = (
+                str(buffer_size) if buffer_size else "1m"
+            )
 
     def map_volumes(self, volumes=None):
         """
@@ -1145,6 +1273,8 @@ class ComposeFamily(object):
         self.ecs_service = None
         self.task_logging_options = {}
         self.stack_parameters = {}
+        self.fargate_sizing = {}
+        self.use_firelens = False
         self.set_xray()
         self.sort_container_configs()
         self.handle_iam()
@@ -1199,7 +1329,7 @@ class ComposeFamily(object):
         :return:
         """
         for service in self.services:
-            if service.x_logging and keyisset("RetentionInDays", service.x_logging):
+            if service.x_logging:
                 service.x_logging["RetentionInDays"] = closest_valid
             else:
                 service.x_logging = {"RetentionInDays": closest_valid}
@@ -1239,6 +1369,89 @@ class ComposeFamily(object):
                 "At least one of the services has CreateLogGroup set to False. Disabling new LogsGroups creation"
             )
             self.stack_parameters.update({ecs_params.CREATE_LOG_GROUP.title: "False"})
+        self.set_firelens()
+
+    def set_firelens(self):
+        """
+        Method to add the FireLens (Fluent Bit) log router to the family when one of the services requests it.
+        The other containers then send their logs to the log router, which ships them in batches to CloudWatch logs
+        using the Task Role.
+        """
+        firelens_configs = [
+            service.x_logging[FIRELENS_KEY]
+            for service in self.services
+            if service.x_logging and keyisset(FIRELENS_KEY, service.x_logging)
+        ]
+        if not firelens_configs:
+            return
+        self.use_firelens = True
+        config = next(
+            (config for config in firelens_configs if isinstance(config, dict)), {}
+        )
+        if LOG_ROUTER_NAME not in [service.name for service in self.services]:
+            self.add_log_router(config)
+        self.set_firelens_log_configuration(config)
+
+    def add_log_router(self, config):
+        """
+        Method to add the FireLens log router sidecar to the family, which all the other containers depend on.
+
+        :param dict config: the FireLens settings
+        """
+        log_router = ComposeService(
+            LOG_ROUTER_NAME,
+            {
+                "image": config.get("Image", AWS_FLUENT_BIT_IMAGE),
+                "deploy": {
+                    "resources": {"limits": {"cpus": 0.0625, "memory": "128M"}},
+                },
+            },
+        )
+        log_router.is_aws_sidecar = True
+        log_router.container_definition.FirelensConfiguration = FirelensConfiguration(
+            Type="fluentbit", Options={"enable-ecs-log-metadata": "true"}
+        )
+        for service in self.services:
+            service.depends_on.append(log_router.name)
+        self.add_service(log_router)
+        if log_router.name not in [service.name for service in self.ignored_services]:
+            self.ignored_services.append(log_router)
+
+    def set_firelens_log_configuration(self, config):
+        """
+        Method to set the awsfirelens log driver on the family containers, but the log router.
+
+        :param dict config: the FireLens settings
+        """
+        for service in self.services:
+            if (
+                service.name == LOG_ROUTER_NAME
+                or service.container_definition.LogConfiguration.LogDriver
+                == "awsfirelens"
+            ):
+                continue
+            options = {
+                "Name": "cloudwatch_logs",
+                "region": Ref(AWS_REGION),
+                "log_stream_prefix": f"{service.name}/",
+                "auto_create_group": If(
+                    CREATE_LOG_GROUP_CON_T,
+                    "false",
+                    If(GENERATED_LOG_GROUP_NAME_CON_T, "true", "false"),
+                ),
+            }
+            if keyisset("max-buffer-size", service.logging_options):
+                options["log-driver-buffer-limit"] = str(
+                    set_memory_to_mb(service.logging_options["max-buffer-size"])
+                    * pow(2, 20)
+                )
+            if keyisset("Options", config):
+                options.update(
+                    {key: str(value) for key, value in config["Options"].items()}
+                )
+            service.container_definition.LogConfiguration = LogConfiguration(
+                LogDriver="awsfirelens", Options=options
+            )
 
     def sort_container_configs(self):
         """
@@ -1403,14 +1616,24 @@ class ComposeFamily(object):
                     self.template.resources[TASK_ROLE_T],
                 )
 
-    def set_task_compute_parameter(self):
+    def get_task_compute_requirements(self):
         """
-        Method to update task parameter for CPU/RAM profile
+        Method to sum up the CPU and RAM required by the containers of the family,
+        including the sidecars added to the task definition, such as the AppMesh Envoy proxy.
+
+        :return: CPU units and RAM in MB
+        :rtype: tuple
         """
         tasks_cpu = 0
         tasks_ram = 0
-        for service in self.services:
-            container = service.container_definition
+        containers = [service.container_definition for service in self.services]
+        if self.task_definition:
+            containers += [
+                container
+                for container in self.task_definition.ContainerDefinitions
+                if container not in containers
+            ]
+        for container in containers:
             if isinstance(container.Cpu, int):
                 tasks_cpu += container.Cpu
             if isinstance(container.Memory, int) and isinstance(
@@ -1427,22 +1650,84 @@ class ComposeFamily(object):
                 tasks_ram += container.Memory
             else:
                 LOG.warning(
-                    f"{service.name} does not have RAM settings."
+                    f"{container.Name} does not have RAM settings."
                     "Based on CPU, it will pick the smaller RAM Fargate supports"
                 )
+        return tasks_cpu, tasks_ram
+
+    def set_task_compute_parameter(self):
+        """
+        Method to update task parameter for CPU/RAM profile
+        """
+        tasks_cpu, tasks_ram = self.get_task_compute_requirements()
         if tasks_cpu > 0 or tasks_ram > 0:
-            cpu_ram = find_closest_fargate_configuration(tasks_cpu, tasks_ram, True)
+            self.fargate_sizing = define_fargate_sizing(tasks_cpu, tasks_ram)
+            cpu_ram = f"{self.fargate_sizing['Cpu']}!{self.fargate_sizing['Memory']}"
             LOG.debug(
-                f"{self.logical_name} Task CPU: {tasks_cpu}, RAM: {tasks_ram} => {cpu_ram}"
+                f"{self.logical_name} Task CPU: {tasks_cpu}, RAM: {tasks_ram} => {cpu_ram}. "
+                f"Unused: {self.fargate_sizing['UnusedVCpu']} vCPU, {self.fargate_sizing['UnusedGB']} GB"
             )
             self.stack_parameters.update({ecs_params.FARGATE_CPU_RAM_CONFIG_T: cpu_ram})
 
+    def get_task_runtime_settings(self):
+        """
+        Method to define the task runtime platform and ephemeral storage from the services settings.
+        All the containers of the task run on the same CPU architecture and OS family.
+
+        :return: the runtime platform and ephemeral storage size, or None
+        :rtype: tuple
+        """
+        platforms = []
+        for service in self.services:
+            if service.runtime_platform and service.runtime_platform not in platforms:
+                platforms.append(service.runtime_platform)
+        if len(platforms) > 1:
+            raise ValueError(
+                f"{self.name} - The services of a family must use the same runtime platform. Got",
+                platforms,
+            )
+        storages = [
+            service.ephemeral_storage
+            for service in self.services
+            if service.ephemeral_storage
+        ]
+        return (
+            platforms[0] if platforms else None,
+            max(storages) if storages else None,
+        )
+
+    def set_task_runtime_parameters(self, platform, storage):
+        """
+        Method to ensure the Fargate platform version supports the runtime platform and ephemeral storage.
+        ARM64 and EphemeralStorage require Fargate platform version 1.4.0.
+
+        :param dict platform:
+        :param int storage:
+        """
+        if not storage and not (platform and platform["CpuArchitecture"] == "ARM64"):
+            return
+        if keyisset(ecs_params.FARGATE_VERSION_T, self.stack_parameters) and (
+            self.stack_parameters[ecs_params.FARGATE_VERSION_T]
+            not in ecs_params.FARGATE_1_4_VERSIONS
+        ):
+            raise ValueError(
+                f"{self.name} - ARM64 and EphemeralStorage require Fargate platform version",
+                ecs_params.FARGATE_1_4_VERSIONS,
+                "Got",
+                self.stack_parameters[ecs_params.FARGATE_VERSION_T],
+            )
+        self.template.parameters[
+            ecs_params.FARGATE_VERSION_T
+        ] = ecs_params.FARGATE_VERSION_1_4
+
     def set_task_definition(self):
         """
         Function to set or update the task definition
 
         :param self: the self of services
         """
+        platform, storage = self.get_task_runtime_settings()
+        self.set_task_runtime_parameters(platform, storage)
         self.task_definition = TaskDefinition(
             TASK_T,
             template=self.template,
@@ -1454,6 +1739,16 @@ class ComposeFamily(object):
             ExecutionRoleArn=GetAtt(EXEC_ROLE_T, "Arn"),
             ContainerDefinitions=[s.container_definition for s in self.services],
             RequiresCompatibilities=["EC2", "FARGATE"],
+            RuntimePlatform=RuntimePlatform(**platform)
+            if platform
+            else Ref(AWS_NO_VALUE),
+            EphemeralStorage=If(
+                USE_FARGATE_CON_T,
+                EphemeralStorage(SizeInGiB=storage),
+                Ref(AWS_NO_VALUE),
+            )
+            if storage
+            else Ref(AWS_NO_VALUE),
             Tags=Tags(
                 {
                     "Name": Ref(ecs_params.SERVICE_NAME),
@@ -1474,7 +1769,12 @@ class ComposeFamily(object):
         for service in self.services:
             c_def = service.container_definition
             logging_def = c_def.LogConfiguration
-            logging_def.Options.update(self.task_logging_options)
+            if logging_def.LogDriver == "awsfirelens":
+                logging_def.Options["log_group_name"] = self.task_logging_options[
+                    "awslogs-group"
+                ]
+            else:
+                logging_def.Options.update(self.task_logging_options)
 
     def init_task_definition(self):
         add_service_roles(self)
@@ -15,7 +15,16 @@
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-from ecs_composex.common import LOG, keyisset
+import re
+
+from ecs_composex.common import LOG, keyisset, keypresent
+from ecs_composex.compute.capacity_planner import define_capacity_plan
+
+ECR_IMAGE_RE = re.compile(
+    r"^(?P<registry>(?P<account_id>[0-9]{12})\.dkr\.ecr\.(?P<region>[a-z0-9-]+)\.amazonaws\.com(?:\.cn)?)/"
+)
+AGENT_DURATION_RE = re.compile(r"^[0-9]+(ns|us|ms|s|m|h)$")
+IMAGE_PULL_BEHAVIORS = ["default", "always", "once", "prefer-cached"]
 
 
 class ComposeXConfig(object):
@@ -44,6 +53,7 @@ class ComposeXConfig(object):
 class ComputeConfig(ComposeXConfig):
     """
     Class to determine the compute settings to use when deploying on top of EC2.
+    Without spot_config set, the instance types, weights and capacity are planned from the families to run.
     """
 
     default_spot_config = {
@@ -66,8 +76,158 @@ class ComputeConfig(ComposeXConfig):
         super().__init__(settings)
         if keyisset(self.spot_key, self.composex_config):
             self.spot_config = self.composex_config[self.spot_key]
-        else:
+            return
+        self.spot_config = define_capacity_plan(list(settings.families.values()))
+        if not self.spot_config:
             LOG.warning(
                 "No spot_config set in configs of ComposeX File. Setting to defaults"
             )
             self.spot_config = self.default_spot_config
+
+
+class HostProfileConfig(ComposeXConfig):
+    """
+    Class to determine the ECS Agent, docker daemon and packages settings of the EC2 hosts.
+    With PrePullImages, the images of the families services are pulled when the host boots.
+    """
+
+    profile_key = "host_profile"
+    default_profile = {
+        "ImagePullBehavior": "prefer-cached",
+        "MaxConcurrentDownloads": 10,
+        "ContainerStartTimeout": "3m",
+        "ContainerStopTimeout": "30s",
+        "TaskCleanupWaitDuration": "15m",
+        "ImageCleanupInterval": "10m",
+        "ImageMinimumCleanupAge": "1h",
+        "Ulimits": {"nofile": {"soft": 65536, "hard": 65536}},
+        "Packages": ["amazon-ssm-agent", "awslogs"],
+        "PrePullImages": False,
+    }
+    durations = [
+        "ContainerStartTimeout",
+        "ContainerStopTimeout",
+        "TaskCleanupWaitDuration",
+        "ImageCleanupInterval",
+        "ImageMinimumCleanupAge",
+    ]
+
+    def __init__(self, settings):
+        """
+        Method to initialize the host profile config
+
+        :param ecs_composex.common.settings.ComposeXSettings settings: The settings for execution
+        """
+        super().__init__(settings)
+        self.profile = dict(self.default_profile)
+        if keyisset(self.profile_key, self.composex_config):
+            self.profile.update(self.composex_config[self.profile_key])
+        self.validate_profile()
+        self.warm_pools_check = False
+        self.images = []
+        if keyisset("PrePullImages", self.profile):
+            self.images = self.get_families_images(settings)
+
+    def validate_profile(self):
+        """
+        Method to validate the host profile settings
+
+        :raises: ValueError, TypeError
+        """
+        unknown = [key for key in self.profile if key not in self.default_profile]
+        if unknown:
+            raise KeyError(
+                f"{self.profile_key} - Invalid settings",
+                unknown,
+                "Valid settings are",
+                list(self.default_profile.keys()),
+            )
+        if self.profile["ImagePullBehavior"] not in IMAGE_PULL_BEHAVIORS:
+            raise ValueError(
+                f"{self.profile_key}.ImagePullBehavior must be one of",
+                IMAGE_PULL_BEHAVIORS,
+                "Got",
+                self.profile["ImagePullBehavior"],
+            )
+        for key in self.durations:
+            if not AGENT_DURATION_RE.match(str(self.profile[key])):
+                raise ValueError(
+                    f"{self.profile_key}.{key} must be a duration, i.e. 30s, 15m, 1h. Got",
+                    self.profile[key],
+                )
+        if not 1 <= int(self.profile["MaxConcurrentDownloads"]) <= 100:
+            raise ValueError(
+                f"{self.profile_key}.MaxConcurrentDownloads must be between 1 and 100. Got",
+                self.profile["MaxConcurrentDownloads"],
+            )
+        if not isinstance(self.profile["Ulimits"], dict):
+            raise TypeError(
+                f"{self.profile_key}.Ulimits must be",
+                dict,
+                "Got",
+                type(self.profile["Ulimits"]),
+            )
+        if not isinstance(self.profile["Packages"], list):
+            raise TypeError(
+                f"{self.profile_key}.Packages must be",
+                list,
+                "Got",
+                type(self.profile["Packages"]),
+            )
+
+    @property
+    def ulimits(self):
+        """
+        Property to return the docker daemon default ulimits, from the compose ulimits syntax
+
+        :rtype: list
+        """
+        ulimits = []
+        for name, limits in self.profile["Ulimits"].items():
+            if isinstance(limits, dict):
+                if not keypresent("soft", limits) or not keypresent("hard", limits):
+                    raise KeyError(
+                        f"{self.profile_key}.Ulimits.{name} must define both soft and hard"
+                    )
+                if int(limits["soft"]) > int(limits["hard"]):
+                    raise ValueError(
+                        f"{self.profile_key}.Ulimits.{name} soft limit cannot be higher than the hard limit"
+                    )
+                ulimits.append(f"{name}={limits['soft']}:{limits['hard']}")
+            else:
+                ulimits.append(f"{name}={limits}:{limits}")
+        return ulimits
+
+    @property
+    def ecr_registries(self):
+        """
+        Property to return the ECR registries to log into to pull the images, with their region
+
+        :rtype: dict
+        """
+        registries = {}
+        for image in self.images:
+            parts = ECR_IMAGE_RE.match(image)
+            if parts:
+                registries[parts.group("registry")] = parts.group("region")
+        return registries
+
+    def get_families_images(self, settings):
+        """
+        Method to list the images of the services to pre-pull on the hosts.
+        Images from private registries, which require the service credentials, are not pre-pulled.
+
+        :param ecs_composex.common.settings.ComposeXSettings settings: The settings for execution
+        :rtype: list
+        """
+        images = []
+        for family in settings.families.values():
+            for service in family.services:
+                if service.x_repo_credentials:
+                    LOG.warning(
+                        f"{family.name}.{service.name} - Image from a private registry is not pre-pulled"
+                    )
+                    continue
+                if service.image not in images:
+                    images.append(service.image)
+        return images
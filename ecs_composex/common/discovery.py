@@ -0,0 +1,160 @@
+#  -*- coding: utf-8 -*-
+#   ECS ComposeX <https://github.com/lambda-my-aws/ecs_composex>
+#   Copyright (C) 2020-2021  John Mille <john@lambda-my-aws.io>
+#  #
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#  #
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#  #
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module to index the CloudMap namespaces, Route53 hosted zones and AppMesh meshes of an account and region.
+Each list is fetched once with the API paginators, the first time it is queried, and kept in the WARM_STATE so
+consecutive lookups, zones or meshes, only query the local index.
+"""
+
+from ecs_composex.common import LOG
+from ecs_composex.common.cache import WARM_STATE, session_cache_key
+
+
+def paginate(session, service_name, operation, key, **kwargs):
+    """
+    Function to go through all the pages of a list operation
+
+    :param boto3.session.Session session:
+    :param str service_name: The AWS service
+    :param str operation: The paginated operation, i.e. list_meshes
+    :param str key: The key holding the list of items in each page
+    :return: all the items
+    :rtype: list
+    """
+    client = WARM_STATE.get_client(session, service_name)
+    items = []
+    for page in client.get_paginator(operation).paginate(**kwargs):
+        items += page[key]
+    LOG.debug(f"{service_name}.{operation} - {len(items)} items")
+    return items
+
+
+def index_by(items, key, normalize=None):
+    """
+    Function to group items by the value of one of their keys
+
+    :param list items:
+    :param str key:
+    :param normalize: function to apply to the value before indexing
+    :return: the items for each value
+    :rtype: dict
+    """
+    index = {}
+    for item in items:
+        value = item[key] if not normalize else normalize(item[key])
+        index.setdefault(value, []).append(item)
+    return index
+
+
+def zone_name(name):
+    """
+    Function to normalize a DNS name, lower case and without the trailing dot
+
+    :param str name:
+    :rtype: str
+    """
+    return name.lower().rstrip(".")
+
+
+class DiscoveryIndex(object):
+    """
+    Class to keep the namespaces, hosted zones and meshes of one session (account/role and region), by name.
+    """
+
+    def __init__(self, session):
+        """
+        :param boto3.session.Session session:
+        """
+        self.session = session
+        self._namespaces = None
+        self._hosted_zones = None
+        self._meshes = None
+
+    @property
+    def namespaces(self):
+        if self._namespaces is None:
+            self._namespaces = index_by(
+                paginate(
+                    self.session, "servicediscovery", "list_namespaces", "Namespaces"
+                ),
+                "Name",
+                zone_name,
+            )
+        return self._namespaces
+
+    @property
+    def hosted_zones(self):
+        if self._hosted_zones is None:
+            self._hosted_zones = index_by(
+                paginate(self.session, "route53", "list_hosted_zones", "HostedZones"),
+                "Name",
+                zone_name,
+            )
+        return self._hosted_zones
+
+    @property
+    def meshes(self):
+        if self._meshes is None:
+            self._meshes = index_by(
+                paginate(self.session, "appmesh", "list_meshes", "meshes"), "meshName"
+            )
+        return self._meshes
+
+    def find_namespaces(self, name):
+        """
+        Method to return the CloudMap namespaces with the given name
+
+        :param str name:
+        :rtype: list
+        """
+        return self.namespaces.get(zone_name(name), [])
+
+    def find_hosted_zones(self, name):
+        """
+        Method to return the Route53 hosted zones with the given name
+
+        :param str name:
+        :rtype: list
+        """
+        return self.hosted_zones.get(zone_name(name), [])
+
+    def find_meshes(self, name, owner=None):
+        """
+        Method to return the meshes with the given name, owned by the given account if set.
+
+        :param str name:
+        :param str owner: the mesh owner account ID
+        :rtype: list
+        """
+        return [
+            mesh
+            for mesh in self.meshes.get(name, [])
+            if owner is None or mesh["meshOwner"] == owner
+        ]
+
+
+def get_discovery_index(session):
+    """
+    Function to get the discovery index for the session, created if not present or expired.
+
+    :param boto3.session.Session session:
+    :rtype: DiscoveryIndex
+    """
+    return WARM_STATE.get_or_set(
+        ("discovery", session_cache_key(session)), DiscoveryIndex, session
+    )
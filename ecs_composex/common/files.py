@@ -19,6 +19,7 @@ from botocore.exceptions import ClientError
 from troposphere import Template
 from ecs_composex.common import FILE_PREFIX
 from ecs_composex.common import LOG
+from ecs_composex.common.cache import WARM_STATE
 
 JSON_MIME = "application/json"
 YAML_MIME = "application/x-yaml"
@@ -51,7 +52,7 @@ def upload_file(
         prefix = FILE_PREFIX
 
     key = f"{prefix}/{file_name}"
-    client = settings.session.client("s3")
+    client = WARM_STATE.get_client(settings.session, "s3")
     client.put_object(
         Body=body,
         Key=key,
@@ -160,9 +161,9 @@ class FileArtifact(object):
         """
         try:
             if not settings.no_upload and self.url:
-                settings.session.client("cloudformation").validate_template(
-                    TemplateURL=self.url
-                )
+                WARM_STATE.get_client(
+                    settings.session, "cloudformation"
+                ).validate_template(TemplateURL=self.url)
             elif settings.no_upload or not self.url:
                 if not self.file_path:
                     self.write(settings)
@@ -173,9 +174,9 @@ class FileArtifact(object):
                         " No upload is True, so skipping."
                     )
                 else:
-                    settings.session.client("cloudformation").validate_template(
-                        TemplateBody=self.body
-                    )
+                    WARM_STATE.get_client(
+                        settings.session, "cloudformation"
+                    ).validate_template(TemplateBody=self.body)
             LOG.debug(f"Template {self.file_name} was validated successfully by CFN")
         except ClientError as error:
             LOG.error(error)
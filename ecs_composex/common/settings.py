@@ -44,6 +44,7 @@ from ecs_composex.iam import ROLE_ARN_ARG
 from ecs_composex.iam import validate_iam_role_arn
 from ecs_composex.ingress_settings import set_service_ports
 from ecs_composex.secrets.compose_secrets import ComposeSecret
+from ecs_composex.secrets.secrets_aws import build_secrets_indexes
 from ecs_composex.utils.init_ecs import set_ecs_settings
 from ecs_composex.utils.init_s3 import create_bucket
 
@@ -381,7 +382,9 @@ class ComposeXSettings(object):
         Class to init the configuration
         """
         self.for_cfn_macro = for_macro
-        self.session = boto3.session.Session()
+        self.session = (
+            session if session and not profile_name else boto3.session.Session()
+        )
         self.override_session(session, profile_name, kwargs)
         self.aws_region = (
             kwargs[self.region_arg]
@@ -404,6 +407,7 @@ class ComposeXSettings(object):
         self.subnets_parameters = []
         self.subnets_mappings = {}
         self.secrets_mappings = {}
+        self.secrets_indexes = {}
         self.mappings = {}
         self.families = {}
         self.account_id = None
@@ -429,6 +433,25 @@ class ComposeXSettings(object):
         self.use_appmesh = keyisset("x-appmesh", self.compose_content)
         self.name = kwargs[self.name_arg]
         self.ecs_cluster = None
+        self.ecs_cluster_providers = None
+        self.ecs_cluster_providers_association = None
+        self.ecs_cluster_hosts_default = False
+
+    def set_secrets_indexes(self):
+        """
+        Method to list and index, once per session/role, all the secrets to lookup.
+        """
+        lookups = []
+        for secret_def in self.compose_content[ComposeSecret.main_key].values():
+            if (
+                isinstance(secret_def, dict)
+                and keyisset(ComposeSecret.x_key, secret_def)
+                and isinstance(secret_def[ComposeSecret.x_key], dict)
+                and keyisset("Lookup", secret_def[ComposeSecret.x_key])
+            ):
+                lookups.append(ComposeSecret.get_lookup_info(secret_def))
+        if lookups:
+            self.secrets_indexes = build_secrets_indexes(lookups, self.session)
 
     def set_secrets(self):
         """
@@ -439,6 +462,7 @@ class ComposeXSettings(object):
         """
         if not keyisset(ComposeSecret.main_key, self.compose_content):
             return
+        self.set_secrets_indexes()
         for secret_name in self.compose_content[ComposeSecret.main_key]:
             secret_def = self.compose_content[ComposeSecret.main_key][secret_name]
             if keyisset(ComposeSecret.x_key, secret_def) and isinstance(
@@ -753,7 +777,9 @@ class ComposeXSettings(object):
     def set_bucket_name_from_account_id(self):
         if self.bucket_name and isinstance(self.bucket_name, str):
             return
-        if self.account_id is None:
+        if self.account_id is not None:
+            self.bucket_name = f"ecs-composex-{self.account_id}-{self.aws_region}"
+        else:
             try:
                 self.account_id = get_account_id(session=self.session)
                 self.bucket_name = f"ecs-composex-{self.account_id}-{self.aws_region}"
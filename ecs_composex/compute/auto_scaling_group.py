@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+#  ECS ComposeX <https://github.com/lambda-my-aws/ecs_composex>
+#  Copyright (C) 2020-2021  John Mille <john@lambda-my-aws.io>
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Functions to add to the Cluster template when people want to use an AutoScaling Group for their ECS Cluster.
+
+The AutoScaling Group is driven by an ECS Capacity Provider with managed scaling, so ECS scales the hosts
+from the tasks to place, and with managed termination protection, so hosts running tasks are not scaled in.
+"""
+
+from troposphere import AWS_NO_VALUE, GetAtt, Output, Ref, Sub
+from troposphere.autoscaling import (
+    AutoScalingGroup,
+    LaunchTemplate as AsgLaunchTemplate,
+    LaunchTemplateOverrides,
+    LaunchTemplateSpecification,
+    MixedInstancesPolicy,
+    Tags as AsgTags,
+    WarmPool,
+)
+from troposphere.ecs import AutoScalingGroupProvider, CapacityProvider, ManagedScaling
+
+from ecs_composex.common import LOG, keyisset, keypresent
+from ecs_composex.common.config import ComposeXConfig
+from ecs_composex.ecs.ecs_params import CLUSTER_NAME_T
+from ecs_composex.vpc import vpc_params
+
+ASG_KEY = "asg_config"
+WARM_POOL_KEY = "WarmPool"
+ASG_T = "EcsHostsAutoScalingGroup"
+WARM_POOL_T = "EcsHostsWarmPool"
+CAPACITY_PROVIDER_T = "EcsCapacityProvider"
+WARM_POOL_STATES = ["Stopped", "Running", "Hibernated"]
+RESERVED_PROVIDER_PREFIXES = ["aws", "ecs", "fargate"]
+
+DEFAULT_ASG_CONFIG = {
+    "MinSize": 0,
+    "MaxSize": 10,
+    "TargetCapacity": 100,
+    "MinimumScalingStepSize": 1,
+    "MaximumScalingStepSize": 100,
+    "InstanceWarmupPeriod": 300,
+    "ManagedTerminationProtection": True,
+}
+ASG_CONFIG_KEYS = list(DEFAULT_ASG_CONFIG.keys()) + [
+    "CapacityProviderName",
+    "InstanceTypes",
+    WARM_POOL_KEY,
+]
+
+
+def validate_asg_config(asg_config):
+    """
+    Function to validate the AutoScaling Group and Capacity Provider settings
+
+    :param dict asg_config:
+    :raises: KeyError, ValueError
+    """
+    unknown = [key for key in asg_config if key not in ASG_CONFIG_KEYS]
+    if unknown:
+        raise KeyError(
+            f"{ASG_KEY} - Invalid settings",
+            unknown,
+            "Valid settings are",
+            ASG_CONFIG_KEYS,
+        )
+    if not 1 <= int(asg_config["TargetCapacity"]) <= 100:
+        raise ValueError(
+            f"{ASG_KEY}.TargetCapacity must be between 1 and 100. Got",
+            asg_config["TargetCapacity"],
+        )
+    if not 0 <= int(asg_config["MinSize"]) <= int(asg_config["MaxSize"]):
+        raise ValueError(
+            f"{ASG_KEY}.MinSize must be positive and lower than MaxSize. Got",
+            asg_config["MinSize"],
+            asg_config["MaxSize"],
+        )
+    if int(asg_config["MaxSize"]) < 1:
+        raise ValueError(f"{ASG_KEY}.MaxSize must be at least 1")
+    if int(asg_config["MinimumScalingStepSize"]) > int(
+        asg_config["MaximumScalingStepSize"]
+    ):
+        raise ValueError(
+            f"{ASG_KEY}.MinimumScalingStepSize cannot be higher than MaximumScalingStepSize"
+        )
+    if keyisset("CapacityProviderName", asg_config) and [
+        prefix
+        for prefix in RESERVED_PROVIDER_PREFIXES
+        if asg_config["CapacityProviderName"].lower().startswith(prefix)
+    ]:
+        raise ValueError(
+            f"{ASG_KEY}.CapacityProviderName cannot start with",
+            RESERVED_PROVIDER_PREFIXES,
+        )
+    if keyisset(WARM_POOL_KEY, asg_config):
+        if keyisset("InstanceTypes", asg_config):
+            raise ValueError(
+                f"{ASG_KEY} - A {WARM_POOL_KEY} cannot be used with multiple InstanceTypes"
+            )
+        state = asg_config[WARM_POOL_KEY].get("PoolState", "Stopped")
+        if state not in WARM_POOL_STATES:
+            raise ValueError(
+                f"{ASG_KEY}.{WARM_POOL_KEY}.PoolState must be one of",
+                WARM_POOL_STATES,
+                "Got",
+                state,
+            )
+
+
+def get_asg_config(settings):
+    """
+    Function to get the AutoScaling Group settings from x-configs, if set
+
+    :param ecs_composex.common.settings.ComposeXSettings settings:
+    :return: the ASG settings or None
+    :rtype: dict
+    """
+    config = ComposeXConfig(settings)
+    if not keyisset(ASG_KEY, config.composex_config):
+        return None
+    asg_config = dict(DEFAULT_ASG_CONFIG)
+    asg_config.update(config.composex_config[ASG_KEY])
+    validate_asg_config(asg_config)
+    return asg_config
+
+
+def define_asg_launch_template(launch_template, asg_config):
+    """
+    Function to define the launch template of the ASG, with the instance types overrides if any.
+
+    :param troposphere.ec2.LaunchTemplate launch_template:
+    :param dict asg_config:
+    :return: the ASG properties for the launch template
+    :rtype: dict
+    """
+    lt_spec = LaunchTemplateSpecification(
+        LaunchTemplateId=Ref(launch_template),
+        Version=GetAtt(launch_template, "LatestVersionNumber"),
+    )
+    if not keyisset("InstanceTypes", asg_config):
+        return {"LaunchTemplate": lt_spec}
+    return {
+        "MixedInstancesPolicy": MixedInstancesPolicy(
+            LaunchTemplate=AsgLaunchTemplate(
+                LaunchTemplateSpecification=lt_spec,
+                Overrides=[
+                    LaunchTemplateOverrides(InstanceType=instance_type)
+                    for instance_type in asg_config["InstanceTypes"]
+                ],
+            )
+        )
+    }
+
+
+def add_auto_scaling_group(template, launch_template, asg_config):
+    """
+    Function to add the AutoScaling Group. The desired capacity is left to the ECS managed scaling.
+    With managed termination protection, the new instances are protected from scale in.
+
+    :param troposphere.Template template:
+    :param troposphere.ec2.LaunchTemplate launch_template:
+    :param dict asg_config:
+    :rtype: troposphere.autoscaling.AutoScalingGroup
+    """
+    asg = AutoScalingGroup(
+        ASG_T,
+        template=template,
+        MinSize=int(asg_config["MinSize"]),
+        MaxSize=int(asg_config["MaxSize"]),
+        NewInstancesProtectedFromScaleIn=keyisset(
+            "ManagedTerminationProtection", asg_config
+        ),
+        VPCZoneIdentifier=Ref(vpc_params.APP_SUBNETS),
+        Tags=AsgTags(Name=(Sub(f"EcsNodes-${{{CLUSTER_NAME_T}}}"), False)),
+        **define_asg_launch_template(launch_template, asg_config),
+    )
+    if keyisset(WARM_POOL_KEY, asg_config):
+        warm_pool = asg_config[WARM_POOL_KEY]
+        WarmPool(
+            WARM_POOL_T,
+            template=template,
+            AutoScalingGroupName=Ref(asg),
+            MinSize=int(warm_pool.get("MinSize", 0)),
+            MaxGroupPreparedCapacity=int(warm_pool["MaxGroupPreparedCapacity"])
+            if keypresent("MaxGroupPreparedCapacity", warm_pool)
+            else Ref(AWS_NO_VALUE),
+            PoolState=warm_pool.get("PoolState", "Stopped"),
+        )
+    return asg
+
+
+def add_capacity_provider(template, asg, asg_config):
+    """
+    Function to add the ECS Capacity Provider for the AutoScaling Group, and its name to the template outputs
+
+    :param troposphere.Template template:
+    :param troposphere.autoscaling.AutoScalingGroup asg:
+    :param dict asg_config:
+    :rtype: troposphere.ecs.CapacityProvider
+    """
+    provider = CapacityProvider(
+        CAPACITY_PROVIDER_T,
+        template=template,
+        Name=asg_config["CapacityProviderName"]
+        if keyisset("CapacityProviderName", asg_config)
+        else Ref(AWS_NO_VALUE),
+        AutoScalingGroupProvider=AutoScalingGroupProvider(
+            AutoScalingGroupArn=Ref(asg),
+            ManagedScaling=ManagedScaling(
+                Status="ENABLED",
+                TargetCapacity=int(asg_config["TargetCapacity"]),
+                MinimumScalingStepSize=int(asg_config["MinimumScalingStepSize"]),
+                MaximumScalingStepSize=int(asg_config["MaximumScalingStepSize"]),
+                InstanceWarmupPeriod=int(asg_config["InstanceWarmupPeriod"]),
+            ),
+            ManagedTerminationProtection="ENABLED"
+            if keyisset("ManagedTerminationProtection", asg_config)
+            else "DISABLED",
+        ),
+    )
+    template.add_output(
+        Output(
+            CAPACITY_PROVIDER_T,
+            Value=Ref(provider),
+            Description=Sub(f"Capacity provider of ${{{CLUSTER_NAME_T}}} hosts"),
+        )
+    )
+    return provider
+
+
+def add_asg_capacity_provider(template, launch_template, asg_config):
+    """
+    Function to add the AutoScaling Group and its ECS Capacity Provider to the Cluster template.
+
+    :param troposphere.Template template: the compute template
+    :param troposphere.ec2.LaunchTemplate launch_template: the hosts launch template
+    :param dict asg_config: the ASG settings
+    :rtype: troposphere.ecs.CapacityProvider
+    """
+    asg = add_auto_scaling_group(template, launch_template, asg_config)
+    LOG.info(
+        f"AutoScaling Group from {asg_config['MinSize']} to {asg_config['MaxSize']} hosts, "
+        f"scaled by ECS to {asg_config['TargetCapacity']}% of capacity used"
+    )
+    return add_capacity_provider(template, asg, asg_config)
@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+#  ECS ComposeX <https://github.com/lambda-my-aws/ecs_composex>
+#  Copyright (C) 2020-2021  John Mille <john@lambda-my-aws.io>
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module to plan the EC2 capacity required to run the families tasks.
+
+Each family task size (the CPU/RAM set in the Task Definition) and desired count are packed onto the instance types
+of the bundled catalog, so the SpotFleet instance types, weights and target capacity match the services to run.
+The weights are expressed in tasks, so the SpotFleet target capacity is the number of tasks to place.
+"""
+
+from json import loads
+from math import ceil, floor
+from os import path
+
+from ecs_composex.common import LOG, keyisset
+from ecs_composex.ecs.docker_tools import find_closest_fargate_configuration
+from ecs_composex.ecs.ecs_scaling import merge_family_services_scaling
+
+INSTANCE_TYPES_FILE = f"{path.abspath(path.dirname(__file__))}/instance_types.json"
+HOST_MEMORY_RATIO = 0.92
+MAX_INSTANCE_TYPES = 3
+
+
+def load_instance_types(file_path=None):
+    """
+    Function to load the instance types catalog shipped with ECS ComposeX.
+
+    :param str file_path: Override path to the catalog
+    :return: the instance types definitions
+    :rtype: dict
+    """
+    if file_path is None:
+        file_path = INSTANCE_TYPES_FILE
+    with open(file_path, "r", encoding="utf-8-sig") as catalog_fd:
+        catalog = loads(catalog_fd.read())
+    LOG.debug(f"Instance types catalog version {catalog['Version']}")
+    return catalog["InstanceTypes"]
+
+
+INSTANCE_TYPES = load_instance_types()
+
+
+def get_instance_capacity(instance_type):
+    """
+    Function to return the CPU units and RAM available for tasks on a given instance type
+
+    :param dict instance_type: The instance type definition from the catalog
+    :return: CPU units and RAM in MB
+    :rtype: tuple
+    """
+    return (
+        instance_type["VCpus"] * 1024,
+        int(instance_type["MemoryMB"] * HOST_MEMORY_RATIO),
+    )
+
+
+def get_family_tasks(family):
+    """
+    Function to define the task size and the desired and maximum count of tasks for a family.
+    The task size is the CPU/RAM configuration set in the Task Definition, which ECS reserves on the host.
+
+    :param ecs_composex.common.compose_services.ComposeFamily family:
+    :return: task definition
+    :rtype: dict
+    """
+    tasks_cpu, tasks_ram = family.get_task_compute_requirements()
+    cpu, ram = find_closest_fargate_configuration(tasks_cpu, tasks_ram)
+    desired_count = max([service.replicas for service in family.services])
+    scaling = merge_family_services_scaling(family.services)
+    max_count = desired_count
+    if keyisset("Range", scaling):
+        max_count = max(desired_count, scaling["Range"]["max"])
+    return {
+        "Family": family.logical_name,
+        "Cpu": cpu,
+        "Memory": ram,
+        "DesiredCount": desired_count,
+        "MaxCount": max_count,
+    }
+
+
+def pack_tasks(tasks, cpu_capacity, ram_capacity):
+    """
+    Function to place the tasks onto hosts with the same capacity, first fit decreasing.
+
+    :param list tasks: list of (cpu, ram) tuples, one per task to place
+    :param int cpu_capacity: CPU units of a host
+    :param int ram_capacity: RAM of a host, in MB
+    :return: The hosts with the CPU, RAM and number of tasks placed, or None if a task does not fit any host.
+    :rtype: list
+    """
+    hosts = []
+    for cpu, ram in sorted(
+        tasks, key=lambda task: max(task[0] / cpu_capacity, task[1] / ram_capacity)
+    )[::-1]:
+        if cpu > cpu_capacity or ram > ram_capacity:
+            return None
+        for host in hosts:
+            if host[0] + cpu <= cpu_capacity and host[1] + ram <= ram_capacity:
+                host[0] += cpu
+                host[1] += ram
+                host[2] += 1
+                break
+        else:
+            hosts.append([cpu, ram, 1])
+    return hosts
+
+
+def plan_instance_type(instance_name, instance_type, tasks):
+    """
+    Function to define how many hosts of a given instance type are required to run the tasks.
+
+    :param str instance_name:
+    :param dict instance_type:
+    :param list tasks: list of (cpu, ram) tuples, one per task to place
+    :return: The plan for the instance type, None if the tasks cannot run on it.
+    :rtype: dict
+    """
+    cpu_capacity, ram_capacity = get_instance_capacity(instance_type)
+    hosts = pack_tasks(tasks, cpu_capacity, ram_capacity)
+    if not hosts:
+        return None
+    hosts_count = len(hosts)
+    return {
+        "InstanceType": instance_name,
+        "Family": instance_type["Family"],
+        "Hosts": hosts_count,
+        "Weight": max(1, floor(len(tasks) / hosts_count)),
+        "HourlyPrice": round(hosts_count * instance_type["HourlyPrice"], 4),
+        "CpuEfficiency": round(
+            sum(host[0] for host in hosts) / (hosts_count * cpu_capacity), 3
+        ),
+        "RamEfficiency": round(
+            sum(host[1] for host in hosts) / (hosts_count * ram_capacity), 3
+        ),
+    }
+
+
+def define_spot_instance_types(tasks, instance_types, max_types):
+    """
+    Function to pick the cheapest instance type of each instance family, and keep the cheapest of these
+    so the SpotFleet diversifies across instance families.
+
+    :param list tasks: list of (cpu, ram) tuples, one per task to place
+    :param dict instance_types: the catalog of instance types
+    :param int max_types: maximum number of instance types to keep
+    :return: list of the instance types plans
+    :rtype: list
+    """
+    cheapest_per_family = {}
+    for instance_name, instance_type in instance_types.items():
+        plan = plan_instance_type(instance_name, instance_type, tasks)
+        if not plan:
+            continue
+        sort_key = (plan["HourlyPrice"], -plan["CpuEfficiency"], instance_name)
+        if (
+            plan["Family"] not in cheapest_per_family
+            or sort_key < cheapest_per_family[plan["Family"]][0]
+        ):
+            cheapest_per_family[plan["Family"]] = (sort_key, plan)
+    return [plan for sort_key, plan in sorted(cheapest_per_family.values())][:max_types]
+
+
+def define_capacity_plan(
+    families, instance_types=None, max_types=MAX_INSTANCE_TYPES, use_spot=True
+):
+    """
+    Function to generate the spot_config out of the families to run on the cluster.
+
+    :param list families: the families, ComposeFamily, to run on the cluster
+    :param dict instance_types: Override the catalog of instance types
+    :param int max_types: maximum number of instance types to use
+    :param bool use_spot:
+    :return: the spot_config, with the capacity plan details, or None if no instance type fits the tasks
+    :rtype: dict
+    """
+    if instance_types is None:
+        instance_types = INSTANCE_TYPES
+    families_tasks = [get_family_tasks(family) for family in families]
+    tasks = []
+    max_tasks = 0
+    for family_tasks in families_tasks:
+        tasks += [(family_tasks["Cpu"], family_tasks["Memory"])] * family_tasks[
+            "DesiredCount"
+        ]
+        max_tasks += family_tasks["MaxCount"]
+    if not tasks:
+        return None
+    plans = define_spot_instance_types(tasks, instance_types, max_types)
+    if not plans:
+        LOG.warning(
+            "None of the instance types in the catalog can run the largest task. Not planning capacity."
+        )
+        return None
+    spot_config = {
+        "use_spot": use_spot,
+        "bid_price": max(
+            ceil(
+                instance_types[plan["InstanceType"]]["HourlyPrice"]
+                / plan["Weight"]
+                * 10000
+            )
+            / 10000
+            for plan in plans
+        ),
+        "spot_instance_types": {
+            plan["InstanceType"]: {"weight": plan["Weight"]} for plan in plans
+        },
+        "target_capacity": len(tasks),
+        "max_capacity": max(max_tasks, len(tasks)),
+        "capacity_plan": {"Tasks": families_tasks, "InstanceTypes": plans},
+    }
+    report_capacity_plan(spot_config)
+    return spot_config
+
+
+def report_capacity_plan(spot_config):
+    """
+    Function to log the packing efficiency of the instance types selected.
+
+    :param dict spot_config:
+    """
+    LOG.info(
+        f"Capacity plan: {spot_config['target_capacity']} tasks,"
+        f" up to {spot_config['max_capacity']} with scaling."
+    )
+    for plan in spot_config["capacity_plan"]["InstanceTypes"]:
+        LOG.info(
+            f"{plan['InstanceType']}: {plan['Hosts']} hosts, {plan['Weight']} tasks per host,"
+            f" CPU {plan['CpuEfficiency'] * 100:.1f}% / RAM {plan['RamEfficiency'] * 100:.1f}% allocated,"
+            f" {plan['HourlyPrice']}$ per hour On-Demand"
+        )
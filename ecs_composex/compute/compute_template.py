@@ -24,7 +24,7 @@ That way it is easy for anyone to deploy an instance in standalone if you wanted
 
 from troposphere import Ref, If, GetAtt
 
-from ecs_composex.common import build_template
+from ecs_composex.common import build_template, keyisset
 from ecs_composex.common import cfn_conditions
 from ecs_composex.common.cfn_params import (
     ROOT_STACK_NAME,
@@ -32,9 +32,14 @@ from ecs_composex.common.cfn_params import (
     USE_FLEET,
     USE_ONDEMAND,
 )
-from ecs_composex.common.config import ComputeConfig
+from ecs_composex.common.config import ComputeConfig, HostProfileConfig
 from ecs_composex.common.stacks import ComposeXStack
 from ecs_composex.compute import compute_params, compute_conditions
+from ecs_composex.compute.auto_scaling_group import (
+    WARM_POOL_KEY,
+    add_asg_capacity_provider,
+    get_asg_config,
+)
 from ecs_composex.compute.hosts_template import add_hosts_resources
 from ecs_composex.compute.spot_fleet import generate_spot_fleet_template
 from ecs_composex.ecs.ecs_params import CLUSTER_NAME
@@ -43,7 +48,8 @@ from ecs_composex.vpc import vpc_params
 
 def add_spotfleet_stack(template, settings, launch_template):
     """
-    Function to build the spotfleet stack and add it to the Cluster parent template
+    Function to build the spotfleet stack and add it to the Cluster parent template.
+    When the capacity was planned from the families, the planned capacity overrides the cluster capacity parameters.
 
     :param launch_template: the launch template
     :param troposphere.Template template: parent cluster template
@@ -65,20 +71,35 @@ def add_spotfleet_stack(template, settings, launch_template):
         compute_params.MIN_CAPACITY_T: Ref(compute_params.MIN_CAPACITY),
         compute_params.TARGET_CAPACITY_T: Ref(compute_params.TARGET_CAPACITY),
     }
+    if keyisset("target_capacity", compute_config.spot_config):
+        parameters.update(
+            {
+                compute_params.MIN_CAPACITY_T: compute_config.spot_config[
+                    "target_capacity"
+                ],
+                compute_params.TARGET_CAPACITY_T: compute_config.spot_config[
+                    "target_capacity"
+                ],
+                compute_params.MAX_CAPACITY_T: compute_config.spot_config[
+                    "max_capacity"
+                ],
+            }
+        )
     fleet_template = generate_spot_fleet_template(settings, compute_config.spot_config)
     template.add_resource(
         ComposeXStack(
             "SpotFleet",
             stack_template=fleet_template,
             Condition=cfn_conditions.USE_SPOT_CON_T,
-            Parameters=parameters,
+            stack_parameters=parameters,
         )
     )
 
 
 def generate_compute_template(settings):
     """
-    Function that generates the Compute resources to run ECS services on top of EC2
+    Function that generates the Compute resources to run ECS services on top of EC2.
+    With asg_config set, the hosts are in an AutoScaling Group scaled by ECS, otherwise in a SpotFleet.
 
     :param ComposeXSettings settings: The settings for executio
     :return: ECS Cluster Template
@@ -102,6 +123,14 @@ def generate_compute_template(settings):
         compute_conditions.MAX_IS_MIN_T, compute_conditions.MAX_IS_MIN
     )
     template.add_condition(cfn_conditions.USE_SPOT_CON_T, cfn_conditions.USE_SPOT_CON)
-    launch_template = add_hosts_resources(template)
-    add_spotfleet_stack(template, settings, launch_template)
+    asg_config = get_asg_config(settings)
+    host_profile = HostProfileConfig(settings)
+    host_profile.warm_pools_check = bool(asg_config) and keyisset(
+        WARM_POOL_KEY, asg_config
+    )
+    launch_template = add_hosts_resources(template, host_profile)
+    if asg_config:
+        add_asg_capacity_provider(template, launch_template, asg_config)
+    else:
+        add_spotfleet_stack(template, settings, launch_template)
     return template
@@ -46,12 +46,13 @@ from ecs_composex.iam import service_role_trust_policy
 from ecs_composex.vpc import vpc_params
 
 
-def add_hosts_profile(template):
+def add_hosts_profile(template, host_profile=None):
     """
-    Adds role to the template
+    Adds role to the template. When images are pulled from ECR at boot, the hosts get read-only access to ECR.
 
     :parm template: EC2 Cluster template to add the role and profile to
     :type template: troposphere.Template
+    :param ecs_composex.common.config.HostProfileConfig host_profile: the hosts settings
 
     :returns: troposphere IAM Role for EC2 hosts
     :rtype: troposphere.iam.Role
@@ -88,11 +89,18 @@ def add_hosts_profile(template):
             ],
         },
     )
+    managed_policies = ["arn:aws:iam::aws:policy/service-role/AmazonEC2RoleforSSM"]
+    if host_profile and host_profile.ecr_registries:
+        managed_policies.append(
+            Sub(
+                "arn:${AWS::Partition}:iam::aws:policy/AmazonEC2ContainerRegistryReadOnly"
+            )
+        )
     role = Role(
         HOST_ROLE_T,
         template=template,
         AssumeRolePolicyDocument=service_role_trust_policy("ec2"),
-        ManagedPolicyArns=["arn:aws:iam::aws:policy/service-role/AmazonEC2RoleforSSM"],
+        ManagedPolicyArns=managed_policies,
         Policies=[ecs_policy],
     )
     InstanceProfile(
@@ -121,13 +129,155 @@ def add_hosts_security_group(template):
     )
 
 
-def add_launch_template(template, hosts_sg):
+def define_packages_config(host_profile):
+    """
+    Function to define the packages to install on the hosts, only if these are not already installed in the AMI.
+    cfn-init runs the commands in the alphabetical order of their names, so the packages are checked after
+    being installed.
+
+    :param ecs_composex.common.config.HostProfileConfig host_profile:
+    :rtype: troposphere.cloudformation.InitConfig
+    """
+    commands = {}
+    for count, package in enumerate(host_profile.profile["Packages"]):
+        commands[f"{count + 100:03d}-install-{package}"] = {
+            "command": f"yum install -y {package}",
+            "test": f"! rpm -q {package}",
+        }
+    commands["901-check-packages"] = {"command": "rpm -qa | grep amazon"}
+    commands["902-check-packages"] = {"command": "rpm -qa | grep aws"}
+    return cloudformation.InitConfig(commands=commands)
+
+
+def define_docker_config(host_profile):
+    """
+    Function to define the docker daemon configuration, with the default ulimits for the containers and the number
+    of layers pulled in parallel.
+
+    :param ecs_composex.common.config.HostProfileConfig host_profile:
+    :rtype: troposphere.cloudformation.InitConfig
+    """
+    options = [f"--default-ulimit {ulimit}" for ulimit in host_profile.ulimits]
+    options.append(
+        f"--max-concurrent-downloads {host_profile.profile['MaxConcurrentDownloads']}"
+    )
+    return cloudformation.InitConfig(
+        commands={
+            "001-stop-docker": {"command": "systemctl stop docker"},
+            "098-reload-systemd": {"command": "systemctl daemon-reload"},
+        },
+        files={
+            "/etc/sysconfig/docker": {
+                "owner": "root",
+                "group": "root",
+                "mode": "644",
+                "content": Join(
+                    "\n",
+                    [
+                        "DAEMON_MAXFILES=1048576",
+                        f"OPTIONS={' '.join(options)}",
+                        "DAEMON_PIDFILE_TIMEOUT=10",
+                        "#EOF",
+                        "",
+                    ],
+                ),
+            }
+        },
+        services={
+            "sysvinit": {
+                "docker": {
+                    "enabled": True,
+                    "ensureRunning": True,
+                    "files": ["/etc/sysconfig/docker"],
+                    "commands": ["098-reload-systemd"],
+                }
+            }
+        },
+    )
+
+
+def define_ecs_config(host_profile):
+    """
+    Function to define the ECS Agent configuration
+
+    :param ecs_composex.common.config.HostProfileConfig host_profile:
+    :rtype: troposphere.cloudformation.InitConfig
+    """
+    profile = host_profile.profile
+    return cloudformation.InitConfig(
+        files={
+            "/etc/ecs/ecs.config": {
+                "owner": "root",
+                "group": "root",
+                "mode": "644",
+                "content": Join(
+                    "\n",
+                    [
+                        Sub(f"ECS_CLUSTER=${{{CLUSTER_NAME_T}}}"),
+                        "ECS_ENABLE_TASK_IAM_ROLE=true",
+                        "ECS_ENABLE_SPOT_INSTANCE_DRAINING=true",
+                        "ECS_ENABLE_TASK_IAM_ROLE_NETWORK_HOST=true",
+                        "ECS_ENABLE_CONTAINER_METADATA=true",
+                        "ECS_ENABLE_UNTRACKED_IMAGE_CLEANUP=true",
+                        "ECS_UPDATES_ENABLED=true",
+                        f"ECS_IMAGE_PULL_BEHAVIOR={profile['ImagePullBehavior']}",
+                        "ECS_PULL_DEPENDENT_CONTAINERS_UPFRONT=true",
+                        f"ECS_CONTAINER_START_TIMEOUT={profile['ContainerStartTimeout']}",
+                        f"ECS_CONTAINER_STOP_TIMEOUT={profile['ContainerStopTimeout']}",
+                        f"ECS_ENGINE_TASK_CLEANUP_WAIT_DURATION={profile['TaskCleanupWaitDuration']}",
+                        f"ECS_IMAGE_CLEANUP_INTERVAL={profile['ImageCleanupInterval']}",
+                        f"ECS_IMAGE_MINIMUM_CLEANUP_AGE={profile['ImageMinimumCleanupAge']}",
+                        "ECS_NUM_IMAGES_DELETE_PER_CYCLE=100",
+                        "ECS_ENABLE_TASK_ENI=true",
+                        "ECS_AWSVPC_BLOCK_IMDS=true",
+                        "ECS_TASK_METADATA_RPS_LIMIT=300,400",
+                        "ECS_ENABLE_AWSLOGS_EXECUTIONROLE_OVERRIDE=true",
+                        'ECS_AVAILABLE_LOGGING_DRIVERS=["awslogs", "json-file"]',
+                    ]
+                    + (
+                        ["ECS_WARM_POOLS_CHECK=true"]
+                        if host_profile.warm_pools_check
+                        else []
+                    )
+                    + ["#EOF"],
+                ),
+            }
+        },
+        commands={"0001-restartecs": {"command": "systemctl --no-block restart ecs"}},
+    )
+
+
+def define_images_prepull_config(host_profile):
+    """
+    Function to pull the services images once the ECS Agent is restarted, logging into the ECR registries first.
+    A failed pull does not fail the host bootstrap, the ECS Agent pulls the image when the task starts.
+
+    :param ecs_composex.common.config.HostProfileConfig host_profile:
+    :rtype: troposphere.cloudformation.InitConfig
+    """
+    commands = {}
+    for count, registry in enumerate(host_profile.ecr_registries.items()):
+        commands[f"{count + 1:03d}-ecr-login"] = {
+            "command": f"aws ecr get-login-password --region {registry[1]} | "
+            f"docker login --username AWS --password-stdin {registry[0]}",
+            "ignoreErrors": True,
+        }
+    for count, image in enumerate(host_profile.images):
+        commands[f"{count + 100:03d}-pull"] = {
+            "command": f"docker pull {image}",
+            "ignoreErrors": True,
+        }
+    return cloudformation.InitConfig(commands=commands)
+
+
+def add_launch_template(template, hosts_sg, host_profile):
     """Function to create a launch template.
 
     :param template: ECS Cluster template
     :type template: troposphere.Template
     :param hosts_sg: security group for the EC2 hosts
     :type hosts_sg: troposphere.ec2.SecurityGroup
+    :param ecs_composex.common.config.HostProfileConfig host_profile: the hosts settings
 
     :return: launch_template
     :rtype: troposphere.ec2.LaunchTemplate
@@ -149,100 +299,31 @@ def add_launch_template(template, hosts_sg):
     #     Handle=Ref(wait_handle),
     #     Timeout='900'
     # )
+    config_sets = ["awspackages", "dockerconfig", "ecsconfig"]
+    configs = {
+        "awspackages": define_packages_config(host_profile),
+        "dockerconfig": define_docker_config(host_profile),
+        "ecsconfig": define_ecs_config(host_profile),
+    }
+    if "amazon-ssm-agent" in host_profile.profile["Packages"]:
+        config_sets.append("awsservices")
+        configs["awsservices"] = cloudformation.InitConfig(
+            services={
+                "sysvinit": {
+                    "amazon-ssm-agent": {"enabled": True, "ensureRunning": True}
+                }
+            }
+        )
+    if host_profile.images:
+        config_sets.append("imagesprepull")
+        configs["imagesprepull"] = define_images_prepull_config(host_profile)
 
     launch_template = LaunchTemplate(
         "LaunchTemplate",
         template=template,
         Metadata=cloudformation.Metadata(
             cloudformation.Init(
-                cloudformation.InitConfigSets(
-                    default=["awspackages", "dockerconfig", "ecsconfig", "awsservices"]
-                ),
-                awspackages=cloudformation.InitConfig(
-                    packages={"yum": {"awslogs": [], "amazon-ssm-agent": []}},
-                    commands={
-                        "001-check-packages": {"command": "rpm -qa | grep amazon"},
-                        "002-check-packages": {"command": "rpm -qa | grep aws"},
-                    },
-                ),
-                awsservices=cloudformation.InitConfig(
-                    services={
-                        "sysvinit": {
-                            "amazon-ssm-agent": {"enabled": True, "ensureRunning": True}
-                        }
-                    }
-                ),
-                dockerconfig=cloudformation.InitConfig(
-                    commands={
-                        "001-stop-docker": {"command": "systemctl stop docker"},
-                        "098-reload-systemd": {"command": "systemctl daemon-reload"},
-                    },
-                    files={
-                        "/etc/sysconfig/docker": {
-                            "owner": "root",
-                            "group": "root",
-                            "mode": "644",
-                            "content": Join(
-                                "\n",
-                                [
-                                    "DAEMON_MAXFILES=1048576",
-                                    Join(
-                                        " ",
-                                        ["OPTIONS=--default-ulimit nofile=1024:4096"],
-                                    ),
-                                    "DAEMON_PIDFILE_TIMEOUT=10",
-                                    "#EOF",
-                                    "",
-                                ],
-                            ),
-                        }
-                    },
-                    services={
-                        "sysvinit": {
-                            "docker": {
-                                "enabled": True,
-                                "ensureRunning": True,
-                                "files": ["/etc/sysconfig/docker"],
-                                "commands": ["098-reload-systemd"],
-                            }
-                        }
-                    },
-                ),
-                ecsconfig=cloudformation.InitConfig(
-                    files={
-                        "/etc/ecs/ecs.config": {
-                            "owner": "root",
-                            "group": "root",
-                            "mode": "644",
-                            "content": Join(
-                                "\n",
-                                [
-                                    Sub(f"ECS_CLUSTER=${{{CLUSTER_NAME_T}}}"),
-                                    "ECS_ENABLE_TASK_IAM_ROLE=true",
-                                    "ECS_ENABLE_SPOT_INSTANCE_DRAINING=true",
-                                    "ECS_ENABLE_TASK_IAM_ROLE_NETWORK_HOST=true",
-                                    "ECS_ENABLE_CONTAINER_METADATA=true",
-                                    "ECS_ENABLE_UNTRACKED_IMAGE_CLEANUP=true",
-                                    "ECS_UPDATES_ENABLED=true",
-                                    "ECS_ENGINE_TASK_CLEANUP_WAIT_DURATION=15m",
-                                    "ECS_IMAGE_CLEANUP_INTERVAL=10m",
-                                    "ECS_NUM_IMAGES_DELETE_PER_CYCLE=100",
-                                    "ECS_ENABLE_TASK_ENI=true",
-                                    "ECS_AWSVPC_BLOCK_IMDS=true",
-                                    "ECS_TASK_METADATA_RPS_LIMIT=300,400",
-                                    "ECS_ENABLE_AWSLOGS_EXECUTIONROLE_OVERRIDE=true",
-                                    'ECS_AVAILABLE_LOGGING_DRIVERS=["awslogs", "json-file"]',
-                                    "#EOF",
-                                ],
-                            ),
-                        }
-                    },
-                    commands={
-                        "0001-restartecs": {
-                            "command": "systemctl --no-block restart ecs"
-                        }
-                    },
-                ),
+                cloudformation.InitConfigSets(default=config_sets), **configs
             )
         ),
         LaunchTemplateData=LaunchTemplateData(
@@ -296,16 +377,17 @@ def add_launch_template(template, hosts_sg):
     return launch_template
 
 
-def add_hosts_resources(template):
+def add_hosts_resources(template, host_profile):
     """Function to add the LaunchTemplate, SG and IAM Profile to go along with the ECS Cluster
 
     :param template: the ecs_cluster template to add the hosts config to
     :type template: troposphere.Template
+    :param ecs_composex.common.config.HostProfileConfig host_profile: the hosts settings
 
     :return: launch_template
     :rtype: troposphere.ec2.LaunchTemplate
     """
     hosts_sg = add_hosts_security_group(template)
-    add_hosts_profile(template)
-    launch_template = add_launch_template(template, hosts_sg)
+    add_hosts_profile(template, host_profile)
+    launch_template = add_launch_template(template, hosts_sg, host_profile)
     return launch_template
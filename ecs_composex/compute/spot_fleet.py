@@ -38,7 +38,7 @@ from troposphere.ec2 import (
 )
 from troposphere.iam import Role
 
-from ecs_composex.common import LOG, build_template
+from ecs_composex.common import LOG, build_template, keyisset
 from ecs_composex.compute import compute_params, compute_conditions
 from ecs_composex.iam import service_role_trust_policy
 from ecs_composex.vpc import vpc_params
@@ -120,7 +120,23 @@ def define_overrides(settings, lt_id, lt_version, spot_config):
     return configs
 
 
-def add_scaling_policies(template, spot_fleet, role):
+def define_scaling_adjustment(spot_config):
+    """
+    Function to define the capacity added or removed by each scaling step.
+    With the capacity plan, the weights are in tasks per host, so a step is one host of the smallest instance type.
+
+    :param dict spot_config: SpotFleet configuration for pricing and instance types
+    :rtype: int
+    """
+    if not keyisset("capacity_plan", spot_config):
+        return 1
+    return min(
+        instance_type["weight"]
+        for instance_type in spot_config["spot_instance_types"].values()
+    )
+
+
+def add_scaling_policies(template, spot_fleet, role, adjustment=1):
     """Function to add Scaling to the SpotFleet
 
     :param template: source template to add the resources to
@@ -129,6 +145,7 @@ def add_scaling_policies(template, spot_fleet, role):
     :type spot_fleet: troposphere.ec2.SpotFleet
     :param role: IAM Role for the SpotFleet
     :type role: troposphere.iam.Role
+    :param int adjustment: The capacity to add or remove per scaling step
 
     :returns: tuple(scale_in_policy, scale_out_policy)
     :rtype: tuple
@@ -159,7 +176,9 @@ def add_scaling_policies(template, spot_fleet, role):
             Cooldown=300,
             MetricAggregationType="Average",
             StepAdjustments=[
-                StepAdjustment(MetricIntervalLowerBound=10, ScalingAdjustment="-1")
+                StepAdjustment(
+                    MetricIntervalLowerBound=10, ScalingAdjustment=f"-{adjustment}"
+                )
             ],
         ),
     )
@@ -175,7 +194,9 @@ def add_scaling_policies(template, spot_fleet, role):
             Cooldown=300,
             MetricAggregationType="Average",
             StepAdjustments=[
-                StepAdjustment(MetricIntervalLowerBound=10, ScalingAdjustment="1")
+                StepAdjustment(
+                    MetricIntervalLowerBound=10, ScalingAdjustment=f"{adjustment}"
+                )
             ],
         ),
     )
@@ -261,7 +282,9 @@ def define_spot_fleet(template, settings, lt_id, lt_version, spot_config):
             LaunchTemplateConfigs=configs,
         ),
     )
-    scaling_set = add_scaling_policies(template, fleet, role)
+    scaling_set = add_scaling_policies(
+        template, fleet, role, define_scaling_adjustment(spot_config)
+    )
     define_default_cw_alarms(template, fleet, scaling_set)
 
 
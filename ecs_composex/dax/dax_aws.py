@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+#  ECS ComposeX <https://github.com/lambda-my-aws/ecs_composex>
+#  Copyright (C) 2020-2021  John Mille <john@lambda-my-aws.io>
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module to find the DAX clusters in lookup
+"""
+
+from botocore.exceptions import ClientError
+
+from ecs_composex.common import LOG, keyisset
+from ecs_composex.common.aws import (
+    find_aws_resource_arn_from_tags_api,
+    define_lookup_role_from_info,
+)
+from ecs_composex.dax.dax_params import DAX_ARN, DAX_ENDPOINT, DAX_NAME, DAX_SG
+
+
+def get_cluster_config(cluster_arn, session):
+    """
+    Function to get the settings of the DAX cluster for the services to use it
+
+    :param str cluster_arn:
+    :param boto3.session.Session session:
+    :return: the cluster mapping settings
+    :rtype: dict
+    """
+    cluster_name = cluster_arn.split("/")[-1]
+    client = session.client("dax")
+    try:
+        cluster = client.describe_clusters(ClusterNames=[cluster_name])["Clusters"][0]
+    except client.exceptions.ClusterNotFoundFault:
+        return None
+    except ClientError as error:
+        LOG.error(error)
+        raise
+    endpoint = cluster["ClusterDiscoveryEndpoint"]
+    return {
+        DAX_NAME.title: cluster["ClusterName"],
+        DAX_ARN.return_value: cluster["ClusterArn"],
+        DAX_ENDPOINT.return_value: endpoint["URL"]
+        if keyisset("URL", endpoint)
+        else f"dax://{endpoint['Address']}",
+        DAX_SG.return_value: [
+            group["SecurityGroupIdentifier"]
+            for group in cluster["SecurityGroups"]
+            if group["Status"] == "active"
+        ],
+        "Port": str(endpoint["Port"]),
+    }
+
+
+def lookup_dax_config(lookup, session):
+    """
+    Function to find the DAX cluster in the AWS account
+
+    :param dict lookup: The Lookup definition for the cluster
+    :param boto3.session.Session session: Boto3 session for clients
+    :return: the cluster mapping settings
+    :rtype: dict
+    """
+    dax_types = {
+        "dax:cache": {
+            "regexp": r"(?:^arn:aws(?:-[a-z]+)?:dax:[\w-]+:[0-9]{12}:cache/)([\S]+)$"
+        },
+    }
+    lookup_session = define_lookup_role_from_info(lookup, session)
+    cluster_arn = find_aws_resource_arn_from_tags_api(
+        lookup, lookup_session, "dax:cache", types=dax_types
+    )
+    if not cluster_arn:
+        return None
+    config = get_cluster_config(cluster_arn, lookup_session)
+    LOG.debug(config)
+    return config
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+#  ECS ComposeX <https://github.com/lambda-my-aws/ecs_composex>
+#  Copyright (C) 2020-2021  John Mille <john@lambda-my-aws.io>
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module to give the ECS services access to the DAX clusters.
+"""
+
+from troposphere import FindInMap, Ref, Select
+
+from ecs_composex.common import LOG, keyisset
+from ecs_composex.common.compose_resources import get_parameter_settings
+from ecs_composex.dax.dax_aws import lookup_dax_config
+from ecs_composex.dax.dax_params import (
+    DAX_ARN,
+    DAX_ENDPOINT,
+    DAX_NAME,
+    DAX_SG,
+    MOD_KEY,
+)
+from ecs_composex.resource_settings import (
+    assign_new_resource_to_service,
+    get_selected_services,
+    handle_lookup_resource,
+)
+from ecs_composex.tcp_resources_settings import add_security_group_ingress
+
+
+def create_lookup_mappings(mappings, lookup_resources, settings):
+    """
+    Function to create the DAX clusters mappings to add to services templates
+
+    :param dict mappings:
+    :param list lookup_resources:
+    :param ecs_composex.common.settings.ComposeXSettings settings:
+    """
+    for resource in lookup_resources:
+        config = lookup_dax_config(resource.lookup, settings.session)
+        if not config:
+            LOG.warning(f"No DAX cluster found from lookup. Skipping {resource.name}")
+            continue
+        mappings[resource.logical_name] = config
+
+
+def add_ingress_to_cluster(resource, sg_id, port):
+    """
+    Function to allow the services selected to the DAX cluster security group
+
+    :param ecs_composex.dax.dax_stack.DaxCluster resource:
+    :param sg_id: the cluster security group ID
+    :param port: the cluster port
+    """
+    for target in resource.families_targets:
+        if get_selected_services(resource, target):
+            add_security_group_ingress(
+                target[0].stack, resource.logical_name, sg_id=sg_id, port=port
+            )
+
+
+def dax_to_ecs(resources, services_stack, res_root_stack, settings):
+    """
+    Entrypoint function to map new and lookup DAX clusters to ECS Services
+
+    :param dict resources:
+    :param ecs_composex.common.stacks.ComposeXStack services_stack:
+    :param ecs_composex.common.stacks.ComposeXStack res_root_stack:
+    :param ecs_composex.common.settings.ComposeXSettings settings:
+    """
+    new_resources = [
+        resources[res_name]
+        for res_name in resources
+        if not resources[res_name].lookup and resources[res_name].services
+    ]
+    lookup_resources = [
+        resources[res_name]
+        for res_name in resources
+        if resources[res_name].lookup and resources[res_name].services
+    ]
+    for new_res in new_resources:
+        assign_new_resource_to_service(
+            new_res, res_root_stack, DAX_ARN, [DAX_NAME, DAX_ENDPOINT, DAX_SG]
+        )
+        sg_settings = get_parameter_settings(new_res, DAX_SG)
+        add_ingress_to_cluster(new_res, Ref(sg_settings[1]), new_res.port)
+    mappings = {}
+    create_lookup_mappings(mappings, lookup_resources, settings)
+    for lookup_res in lookup_resources:
+        if not keyisset(lookup_res.logical_name, mappings):
+            continue
+        handle_lookup_resource(mappings, MOD_KEY, lookup_res, DAX_ARN)
+        add_ingress_to_cluster(
+            lookup_res,
+            Select(0, FindInMap(MOD_KEY, lookup_res.logical_name, DAX_SG.return_value)),
+            FindInMap(MOD_KEY, lookup_res.logical_name, "Port"),
+        )
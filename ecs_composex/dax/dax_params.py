@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+#  ECS ComposeX <https://github.com/lambda-my-aws/ecs_composex>
+#  Copyright (C) 2020-2021  John Mille <john@lambda-my-aws.io>
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Parameters for the DAX clusters
+"""
+
+from os import path
+
+from ecs_composex.ecs_composex import X_KEY
+from ecs_composex.common.cfn_params import Parameter
+from ecs_composex.vpc.vpc_params import SG_ID_TYPE
+
+MOD_KEY = path.basename(path.dirname(path.abspath(__file__)))
+RES_KEY = f"{X_KEY}{MOD_KEY}"
+
+DAX_PORT = 8111
+DAX_TLS_PORT = 9111
+
+DAX_NAME_T = "ClusterName"
+DAX_NAME = Parameter(DAX_NAME_T, Type="String")
+
+DAX_ARN_T = "Arn"
+DAX_ARN = Parameter(DAX_ARN_T, return_value="Arn", Type="String")
+
+DAX_ENDPOINT_T = "ClusterEndpoint"
+DAX_ENDPOINT = Parameter(
+    DAX_ENDPOINT_T, return_value="ClusterDiscoveryEndpointURL", Type="String"
+)
+
+DAX_SG_T = "DaxSg"
+DAX_SG = Parameter(DAX_SG_T, return_value="GroupId", Type=SG_ID_TYPE)
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+#  ECS ComposeX <https://github.com/lambda-my-aws/ecs_composex>
+#  Copyright (C) 2020-2021  John Mille <john@lambda-my-aws.io>
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module to create the root stack for DAX clusters
+"""
+
+from troposphere import Ref, GetAtt
+from troposphere.ecs import Environment
+
+from ecs_composex.common.compose_resources import XResource, set_resources
+from ecs_composex.common.stacks import ComposeXStack
+from ecs_composex.dax.dax_params import (
+    MOD_KEY,
+    RES_KEY,
+    DAX_ARN,
+    DAX_ENDPOINT,
+    DAX_NAME,
+    DAX_SG,
+)
+from ecs_composex.dax.dax_perms import ACCESS_TYPES
+from ecs_composex.dax.dax_template import (
+    add_x_dynamodb_tables,
+    create_dax_template,
+    init_dax_template,
+)
+from ecs_composex.vpc.vpc_params import STORAGE_SUBNETS
+
+
+class DaxCluster(XResource):
+    """
+    Class to represent a DAX cluster
+    """
+
+    subnets_param = STORAGE_SUBNETS
+    policies_scaffolds = ACCESS_TYPES
+
+    def __init__(self, name, definition, module_name, settings):
+        self.db_sg = None
+        self.subnet_group = None
+        self.iam_role = None
+        self.port = None
+        self.tables_arns = []
+        super().__init__(name, definition, module_name, settings)
+        self.set_override_subnets()
+
+    def init_outputs(self):
+        """
+        Method to init the DAX cluster output attributes
+        """
+        self.output_properties = {
+            DAX_NAME: (self.logical_name, self.cfn_resource, Ref, None),
+            DAX_ARN: (
+                f"{self.logical_name}{DAX_ARN.title}",
+                self.cfn_resource,
+                GetAtt,
+                DAX_ARN.return_value,
+            ),
+            DAX_ENDPOINT: (
+                f"{self.logical_name}{DAX_ENDPOINT.title}",
+                self.cfn_resource,
+                GetAtt,
+                DAX_ENDPOINT.return_value,
+            ),
+            DAX_SG: (
+                f"{self.logical_name}Sg",
+                self.db_sg,
+                GetAtt,
+                DAX_SG.return_value,
+            ),
+        }
+
+    def generate_resource_envvars(self):
+        """
+        Method to define the env vars of the cluster name and endpoint, named after the parameters titles.
+        """
+        for env_name in self.init_env_names():
+            for parameter in [DAX_NAME, DAX_ENDPOINT]:
+                self.env_vars.append(
+                    Environment(
+                        Name=f"{env_name}_{parameter.title}",
+                        Value=self.attributes_outputs[parameter]["ImportValue"]
+                        if self.lookup
+                        else Ref(self.attributes_outputs[parameter]["ImportParameter"]),
+                    )
+                )
+        self.env_vars = list({v.Name: v for v in self.env_vars}.values())
+
+
+class XStack(ComposeXStack):
+    """
+    Class for the DAX clusters root stack
+    """
+
+    def __init__(self, title, settings, **kwargs):
+        set_resources(settings, DaxCluster, RES_KEY, MOD_KEY)
+        new_resources = [
+            cluster
+            for cluster in settings.compose_content[RES_KEY].values()
+            if not cluster.lookup and not cluster.use
+        ]
+        if new_resources:
+            stack_template = init_dax_template()
+            super().__init__(title, stack_template, **kwargs)
+            create_dax_template(stack_template, new_resources, self)
+        else:
+            self.is_void = True
+        for resource in settings.compose_content[RES_KEY].values():
+            resource.stack = self
+
+    def add_xdependencies(self, root_stack, settings):
+        """
+        Method to add the x-dynamodb tables fronted by the clusters to their IAM role.
+
+        :param ecs_composex.common.stacks.ComposeXStack root_stack:
+        :param ecs_composex.common.settings.ComposeXSettings settings:
+        """
+        for resource in settings.compose_content[RES_KEY].values():
+            if resource.cfn_resource:
+                add_x_dynamodb_tables(self, resource, root_stack, settings)
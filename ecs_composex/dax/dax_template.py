@@ -0,0 +1,312 @@
+# -*- coding: utf-8 -*-
+#  ECS ComposeX <https://github.com/lambda-my-aws/ecs_composex>
+#  Copyright (C) 2020-2021  John Mille <john@lambda-my-aws.io>
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module to create the DAX clusters, with their subnet group, parameter group, security group and IAM role.
+
+The IAM role of the cluster only grants access to the DynamoDB tables listed in MacroParameters.Tables,
+which are either tables defined in x-dynamodb, table names or table ARNs.
+"""
+
+from troposphere import AWS_NO_VALUE, AWS_PARTITION, AWS_REGION, AWS_ACCOUNT_ID
+from troposphere import AWS_STACK_NAME, GetAtt, Ref, Sub
+from troposphere import dax
+from troposphere.ec2 import SecurityGroup
+from troposphere.iam import Policy as IamPolicy, Role as IamRole
+
+from ecs_composex.common import LOG, add_parameters, build_template, keyisset
+from ecs_composex.common.compose_resources import get_parameter_settings
+from ecs_composex.dax.dax_params import DAX_PORT, DAX_TLS_PORT
+from ecs_composex.dynamodb.dynamodb_aws import lookup_dynamodb_config
+from ecs_composex.dynamodb.dynamodb_params import (
+    RES_KEY as DYNAMODB_KEY,
+    MOD_KEY as DYNAMODB_MOD_KEY,
+    TABLE_ARN,
+)
+from ecs_composex.iam import define_iam_policy, service_role_trust_policy
+from ecs_composex.resources_import import import_record_properties
+from ecs_composex.vpc.vpc_params import VPC_ID, STORAGE_SUBNETS
+
+TABLES_KEY = "Tables"
+DAX_TABLE_ACTIONS = [
+    "dynamodb:DescribeTable",
+    "dynamodb:BatchGetItem",
+    "dynamodb:GetItem",
+    "dynamodb:Query",
+    "dynamodb:Scan",
+    "dynamodb:ConditionCheckItem",
+    "dynamodb:BatchWriteItem",
+    "dynamodb:PutItem",
+    "dynamodb:UpdateItem",
+    "dynamodb:DeleteItem",
+]
+TTL_PARAMETERS = {
+    "QueryTTL": "query-ttl-millis",
+    "RecordTTL": "record-ttl-millis",
+}
+CLUSTER_DEFAULTS = {
+    "NodeType": "dax.t3.small",
+    "ReplicationFactor": 1,
+    "ClusterEndpointEncryptionType": "TLS",
+}
+
+
+def init_dax_template():
+    """
+    Function to generate the root template for the DAX clusters.
+
+    :return: the root template
+    :rtype: troposphere.Template
+    """
+    return build_template("Root template for DAX clusters", [VPC_ID, STORAGE_SUBNETS])
+
+
+def define_table_arns(table_arn):
+    """
+    Function to define the IAM resources of a table and its indexes
+
+    :param table_arn: the table ARN
+    :rtype: list
+    """
+    if isinstance(table_arn, str):
+        return [table_arn, f"{table_arn}/index/*"]
+    return [table_arn, Sub("${TableArn}/index/*", TableArn=table_arn)]
+
+
+def import_table_from_name_or_arn(table):
+    """
+    Function to define the IAM resources of a table from its name or ARN
+
+    :param str table:
+    :rtype: list
+    """
+    if table.startswith("arn:aws"):
+        return define_table_arns(table)
+    return define_table_arns(
+        Sub(
+            f"arn:${{{AWS_PARTITION}}}:dynamodb:${{{AWS_REGION}}}:${{{AWS_ACCOUNT_ID}}}:table/{table}"
+        )
+    )
+
+
+def get_cluster_tables(resource):
+    """
+    Function to get and validate the tables fronted by the DAX cluster
+
+    :param ecs_composex.dax.dax_stack.DaxCluster resource:
+    :return: the list of tables
+    :rtype: list
+    :raises: KeyError, TypeError
+    """
+    if not keyisset(TABLES_KEY, resource.parameters):
+        raise KeyError(
+            f"{resource.name} - MacroParameters.{TABLES_KEY} must list the DynamoDB tables the cluster fronts"
+        )
+    tables = resource.parameters[TABLES_KEY]
+    if not isinstance(tables, list) or not all(
+        isinstance(table, str) for table in tables
+    ):
+        raise TypeError(f"{resource.name} - {TABLES_KEY} must be a list of str")
+    return tables
+
+
+def add_parameter_group(template, resource):
+    """
+    Function to add the DAX parameter group to set the items and queries cache TTLs, in milliseconds.
+
+    :param troposphere.Template template:
+    :param ecs_composex.dax.dax_stack.DaxCluster resource:
+    :return: the parameter group, if TTLs are set
+    :rtype: troposphere.dax.ParameterGroup
+    """
+    values = {
+        name: str(int(resource.parameters[key]))
+        for key, name in TTL_PARAMETERS.items()
+        if keyisset(key, resource.parameters)
+    }
+    if not values:
+        return None
+    return dax.ParameterGroup(
+        f"{resource.logical_name}ParameterGroup",
+        template=template,
+        Description=Sub(f"{resource.logical_name} TTLs in ${{{AWS_STACK_NAME}}}"),
+        ParameterNameValues=values,
+    )
+
+
+def add_cluster_role(template, resource):
+    """
+    Function to add the IAM role of the cluster, to access the DynamoDB tables it fronts.
+    The tables defined in x-dynamodb are added to the policy with the other x-resources dependencies.
+
+    :param troposphere.Template template:
+    :param ecs_composex.dax.dax_stack.DaxCluster resource:
+    :rtype: troposphere.iam.Role
+    """
+    for table in get_cluster_tables(resource):
+        if not table.startswith(DYNAMODB_KEY):
+            resource.tables_arns += import_table_from_name_or_arn(table)
+    return IamRole(
+        f"{resource.logical_name}IamRole",
+        template=template,
+        AssumeRolePolicyDocument=service_role_trust_policy("dax"),
+        PermissionsBoundary=define_iam_policy(
+            resource.parameters["PermissionsBoundary"]
+        )
+        if keyisset("PermissionsBoundary", resource.parameters)
+        else Ref(AWS_NO_VALUE),
+        Policies=[
+            IamPolicy(
+                PolicyName="DynamoDBTablesAccess",
+                PolicyDocument={
+                    "Version": "2012-10-17",
+                    "Statement": [
+                        {
+                            "Sid": "DynamoDBTablesAccess",
+                            "Effect": "Allow",
+                            "Action": DAX_TABLE_ACTIONS,
+                            "Resource": resource.tables_arns,
+                        }
+                    ],
+                },
+            )
+        ],
+    )
+
+
+def create_dax_cluster(template, resource):
+    """
+    Function to create the DAX cluster and its subnet group, parameter group, security group and IAM role
+
+    :param troposphere.Template template:
+    :param ecs_composex.dax.dax_stack.DaxCluster resource:
+    """
+    resource.subnet_group = dax.SubnetGroup(
+        f"{resource.logical_name}SubnetGroup",
+        template=template,
+        Description=Sub(f"{resource.logical_name} in ${{{AWS_STACK_NAME}}}"),
+        SubnetIds=Ref(resource.subnets_override)
+        if resource.subnets_override
+        else Ref(STORAGE_SUBNETS),
+    )
+    resource.db_sg = SecurityGroup(
+        f"{resource.logical_name}Sg",
+        template=template,
+        GroupDescription=Sub(f"SG for dax-{resource.logical_name}"),
+        GroupName=Sub(f"${{{AWS_STACK_NAME}}}.dax.{resource.logical_name}"),
+        VpcId=Ref(VPC_ID),
+    )
+    resource.iam_role = add_cluster_role(template, resource)
+    parameter_group = add_parameter_group(template, resource)
+    props = dict(CLUSTER_DEFAULTS)
+    if resource.properties:
+        props.update(
+            import_record_properties(
+                resource.properties, dax.Cluster, ignore_missing_required=True
+            )
+        )
+    props.update(
+        {
+            "IAMRoleARN": GetAtt(resource.iam_role, "Arn"),
+            "SubnetGroupName": Ref(resource.subnet_group),
+            "SecurityGroupIds": [GetAtt(resource.db_sg, "GroupId")],
+            "SSESpecification": dax.SSESpecification(SSEEnabled=True),
+        }
+    )
+    if parameter_group:
+        props["ParameterGroupName"] = Ref(parameter_group)
+    resource.port = (
+        DAX_PORT if props["ClusterEndpointEncryptionType"] == "NONE" else DAX_TLS_PORT
+    )
+    resource.cfn_resource = dax.Cluster(resource.logical_name, **props)
+    template.add_resource(resource.cfn_resource)
+
+
+def create_dax_template(template, new_resources, self_stack):
+    """
+    Function to add the new DAX clusters to the root template
+
+    :param troposphere.Template template:
+    :param list new_resources:
+    :param ecs_composex.dax.dax_stack.XStack self_stack:
+    """
+    for resource in new_resources:
+        resource.stack = self_stack
+        create_dax_cluster(template, resource)
+        resource.init_outputs()
+        resource.generate_outputs()
+        template.add_output(resource.outputs)
+        LOG.info(
+            f"{resource.name} - DAX cluster of {resource.cfn_resource.ReplicationFactor} "
+            f"{resource.cfn_resource.NodeType} node(s) on port {resource.port}"
+        )
+
+
+def get_x_dynamodb_table(table_name, settings):
+    """
+    Function to get the table defined in x-dynamodb
+
+    :param str table_name: the table reference, x-dynamodb::<name>
+    :param ecs_composex.common.settings.ComposeXSettings settings:
+    :rtype: ecs_composex.dynamodb.dynamodb_stack.Table
+    :raises: KeyError
+    """
+    name = table_name.split("::")[-1]
+    tables = (
+        settings.compose_content[DYNAMODB_KEY]
+        if keyisset(DYNAMODB_KEY, settings.compose_content)
+        else {}
+    )
+    if name not in tables:
+        raise KeyError(
+            f"No table {name} defined in {DYNAMODB_KEY}. Tables defined",
+            list(tables.keys()),
+        )
+    return tables[name]
+
+
+def add_x_dynamodb_tables(dax_stack, resource, root_stack, settings):
+    """
+    Function to add the tables defined in x-dynamodb to the policy of the cluster IAM role.
+    New tables ARN come from the DynamoDB stack outputs, looked up tables ARN from the lookup.
+
+    :param ecs_composex.dax.dax_stack.XStack dax_stack:
+    :param ecs_composex.dax.dax_stack.DaxCluster resource:
+    :param ecs_composex.common.stacks.ComposeXStack root_stack:
+    :param ecs_composex.common.settings.ComposeXSettings settings:
+    """
+    for table_name in get_cluster_tables(resource):
+        if not table_name.startswith(DYNAMODB_KEY):
+            continue
+        table = get_x_dynamodb_table(table_name, settings)
+        if table.lookup:
+            table_config = lookup_dynamodb_config(table.lookup, settings.session)
+            if not table_config:
+                raise LookupError(
+                    f"{resource.name} - Could not find the table of {table.name}"
+                )
+            resource.tables_arns += define_table_arns(table_config[TABLE_ARN.title])
+        elif TABLE_ARN in table.attributes_outputs:
+            arn_settings = get_parameter_settings(table, TABLE_ARN)
+            add_parameters(dax_stack.stack_template, [arn_settings[1]])
+            dax_stack.Parameters.update({arn_settings[0]: arn_settings[2]})
+            resource.tables_arns += define_table_arns(Ref(arn_settings[1]))
+            if (
+                DYNAMODB_MOD_KEY in root_stack.stack_template.resources
+                and DYNAMODB_MOD_KEY not in dax_stack.DependsOn
+            ):
+                dax_stack.DependsOn.append(DYNAMODB_MOD_KEY)
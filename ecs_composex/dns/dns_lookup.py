@@ -17,7 +17,9 @@
 
 import re
 from ecs_composex.dns.dns_params import ZONES_PATTERN
-from ecs_composex.common import LOG, keyisset
+from ecs_composex.common import keyisset
+from ecs_composex.common.cache import WARM_STATE
+from ecs_composex.common.discovery import get_discovery_index
 
 
 LAST_DOT_RE = re.compile(r"(\.{1}$)")
@@ -38,57 +40,40 @@ def validate_zone_id_input(zone_id):
     return zones_groups[0]
 
 
-def get_all_dns_namespaces(session, namespaces=None, next_token=None):
+def lookup_service_discovery_namespace(zone, session, private):
     """
-    Function to recursively fetch all namespaces in account
+    Function to find the CloudMap namespace of the zone from the discovery index
 
-    :param list namespaces:
+    :param ecs_composex.dns.DnsZone zone:
     :param boto3.session.Session session:
-    :param str next_token:
-    :return:
+    :param bool private:
+    :return: the zone info
+    :rtype: dict
     """
-    if namespaces is None:
-        namespaces = []
-    filters = [{"Name": "TYPE", "Values": ["DNS_PRIVATE"], "Condition": "EQ"}]
-    client = session.client("servicediscovery")
-    if not next_token:
-        namespaces_r = client.list_namespaces(Filters=filters)
-    else:
-        namespaces_r = client.list_namespaces(Filters=filters, NextToken=next_token)
-    namespaces += namespaces_r["Namespaces"]
-    if "NextToken" in namespaces_r:
-        return get_all_dns_namespaces(session, namespaces, namespaces_r["NextToken"])
-    return namespaces
-
-
-def lookup_service_discovery_namespace(zone, session, private):
-    client = session.client("servicediscovery")
-    try:
-        namespaces = get_all_dns_namespaces(session)
-        if zone.name not in [z["Name"] for z in namespaces]:
-            raise LookupError("No private namespace found for zone", zone.name)
-        the_zone = None
-        for l_zone in namespaces:
-            if zone.name == l_zone["Name"]:
-                the_zone = l_zone
-        zone_r = client.get_namespace(Id=the_zone["Id"])
-        properties = zone_r["Namespace"]["Properties"]
-        if zone_r["Namespace"]["Type"] == "HTTP":
-            raise TypeError(
-                "Unsupported CloudMap namespace HTTP. "
-                "Only DNS namespaces, private or public, are supported"
-            )
-        return {
-            "Route53ID": properties["DnsProperties"]["HostedZoneId"],
-            "ZoneTld": LAST_DOT_RE.sub("", properties["HttpProperties"]["HttpName"]),
-            "ZoneId": zone_r["Namespace"]["Id"],
-        }
-    except client.exceptions.NamespaceNotFound:
-        LOG.error(f"Namespace not found for {zone.name}")
-        raise
-    except client.exceptions.InvalidInput:
-        LOG.error("Failed to retrieve the zone info")
-        raise
+    namespace_type = "DNS_PRIVATE" if private else "DNS_PUBLIC"
+    namespaces = get_discovery_index(session).find_namespaces(zone.name)
+    dns_namespaces = [
+        namespace for namespace in namespaces if namespace["Type"] == namespace_type
+    ]
+    if not dns_namespaces and any(
+        namespace["Type"] == "HTTP" for namespace in namespaces
+    ):
+        raise TypeError(
+            "Unsupported CloudMap namespace HTTP. "
+            "Only DNS namespaces, private or public, are supported"
+        )
+    elif not dns_namespaces:
+        raise LookupError(f"No {namespace_type} namespace found for zone", zone.name)
+    the_zone = dns_namespaces[-1]
+    if not keyisset("Properties", the_zone):
+        client = WARM_STATE.get_client(session, "servicediscovery")
+        the_zone = client.get_namespace(Id=the_zone["Id"])["Namespace"]
+    properties = the_zone["Properties"]
+    return {
+        "Route53ID": properties["DnsProperties"]["HostedZoneId"],
+        "ZoneTld": LAST_DOT_RE.sub("", properties["HttpProperties"]["HttpName"]),
+        "ZoneId": the_zone["Id"],
+    }
 
 
 def filter_out_cloudmap_zones(zones, zone_name):
@@ -122,19 +107,26 @@ def filter_out_cloudmap_zones(zones, zone_name):
 
 
 def lookup_route53_namespace(zone, session, private):
-    client = session.client("route53")
-    try:
-        zones_req = client.list_hosted_zones_by_name(DNSName=zone.name)["HostedZones"]
-        zones_r = filter_out_cloudmap_zones(zones_req, zone.name)
-        zone_r = client.get_hosted_zone(Id=zones_r["Id"])["HostedZone"]
-        if zone_r["Config"]["PrivateZone"] != private:
-            raise ValueError(f"The zone {zone.name} is not a private zone.")
-        return {
-            "ZoneId": zone_r["Id"].split(r"/")[-1],
-            "ZoneTld": LAST_DOT_RE.sub("", zone_r["Name"]),
-        }
-    except client.exceptions.InvalidDomainName:
-        LOG.warning(f"Zone {zone.name} is invalid or malformed.")
+    """
+    Function to find the Route53 hosted zone from the discovery index
+
+    :param ecs_composex.dns.DnsZone zone:
+    :param boto3.session.Session session:
+    :param bool private:
+    :return: the zone info
+    :rtype: dict
+    """
+    zones = get_discovery_index(session).find_hosted_zones(zone.name)
+    zones = [
+        zone_r for zone_r in zones if zone_r["Config"]["PrivateZone"] == private
+    ] or zones
+    zone_r = filter_out_cloudmap_zones(zones, zone.name)
+    if zone_r["Config"]["PrivateZone"] != private:
+        raise ValueError(f"The zone {zone.name} is not a private zone.")
+    return {
+        "ZoneId": zone_r["Id"].split(r"/")[-1],
+        "ZoneTld": LAST_DOT_RE.sub("", zone_r["Name"]),
+    }
 
 
 def lookup_namespace(zone, session):
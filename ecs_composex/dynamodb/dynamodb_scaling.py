@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+#  ECS ComposeX <https://github.com/lambda-my-aws/ecs_composex>
+#  Copyright (C) 2020-2021  John Mille <john@lambda-my-aws.io>
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module to define the billing mode of the DynamoDB tables, and the Application Auto Scaling of the read and write
+capacity of the PROVISIONED tables and of their global secondary indexes.
+"""
+
+from copy import deepcopy
+
+from troposphere import Ref, Sub
+from troposphere.applicationautoscaling import (
+    PredefinedMetricSpecification,
+    ScalableTarget,
+    ScalingPolicy,
+    TargetTrackingScalingPolicyConfiguration,
+)
+
+from ecs_composex.common import LOG, NONALPHANUM, keyisset, keypresent
+
+BILLING_MODE_KEY = "BillingMode"
+PROVISIONED = "PROVISIONED"
+PAY_PER_REQUEST = "PAY_PER_REQUEST"
+BILLING_MODES = [PROVISIONED, PAY_PER_REQUEST]
+SCALING_KEY = "AutoScaling"
+INDEXES_KEY = "Indexes"
+CAPACITIES = {
+    "ReadCapacity": ("ReadCapacityUnits", "Read"),
+    "WriteCapacity": ("WriteCapacityUnits", "Write"),
+}
+CAPACITY_DEFAULTS = {"TargetUtilization": 70}
+CAPACITY_KEYS = ["Min", "Max", "TargetUtilization"]
+SCALING_DEFAULTS = {"ScaleInCooldown": 60, "ScaleOutCooldown": 60}
+
+
+def validate_capacity_settings(name, capacity):
+    """
+    Function to validate the scaling settings of a read or write capacity
+
+    :param str name: the table or index name, for the errors
+    :param dict capacity:
+    :raises: KeyError, ValueError
+    """
+    unknown = [key for key in capacity if key not in CAPACITY_KEYS]
+    if unknown:
+        raise KeyError(
+            f"{name} - Invalid capacity settings", unknown, "Valid ones", CAPACITY_KEYS
+        )
+    if not keypresent("Min", capacity) or not keypresent("Max", capacity):
+        raise KeyError(f"{name} - Capacity scaling requires Min and Max")
+    if not 1 <= int(capacity["Min"]) <= int(capacity["Max"]):
+        raise ValueError(
+            f"{name} - Min must be at least 1 and lower than Max. Got",
+            capacity["Min"],
+            capacity["Max"],
+        )
+    if not 20 <= int(capacity["TargetUtilization"]) <= 90:
+        raise ValueError(
+            f"{name} - TargetUtilization must be between 20 and 90. Got",
+            capacity["TargetUtilization"],
+        )
+
+
+def define_capacities(name, settings, defaults=None):
+    """
+    Function to define the read and write capacities scaling settings, from the defaults if not set
+
+    :param str name:
+    :param dict settings:
+    :param dict defaults: the table capacities, for the indexes
+    :return: the capacities settings
+    :rtype: dict
+    """
+    capacities = {}
+    for key in CAPACITIES:
+        if keyisset(key, settings):
+            capacity = dict(CAPACITY_DEFAULTS)
+            capacity.update(settings[key])
+        elif defaults and keyisset(key, defaults):
+            capacity = dict(defaults[key])
+        else:
+            continue
+        validate_capacity_settings(f"{name}.{key}", capacity)
+        capacities[key] = capacity
+    return capacities
+
+
+def get_table_scaling(table, properties):
+    """
+    Function to get and validate the scaling settings of the table and its global secondary indexes.
+    The indexes use the table capacities settings, unless overridden in Indexes.
+
+    :param ecs_composex.dynamodb.dynamodb_stack.Table table:
+    :param dict properties: the table properties
+    :return: the scaling settings of the table, and of each index
+    :rtype: tuple
+    """
+    settings = table.parameters[SCALING_KEY]
+    table_capacities = define_capacities(table.name, settings)
+    if not table_capacities:
+        raise KeyError(
+            f"{table.name}.{SCALING_KEY} - At least one of",
+            list(CAPACITIES),
+            "must be set",
+        )
+    indexes_names = [
+        index["IndexName"] for index in properties.get("GlobalSecondaryIndexes", [])
+    ]
+    indexes_settings = settings.get(INDEXES_KEY, {}) or {}
+    unknown = [name for name in indexes_settings if name not in indexes_names]
+    if unknown:
+        raise KeyError(
+            f"{table.name}.{SCALING_KEY}.{INDEXES_KEY} - Indexes",
+            unknown,
+            "are not defined in GlobalSecondaryIndexes",
+            indexes_names,
+        )
+    indexes_capacities = {
+        name: define_capacities(
+            f"{table.name}.{name}",
+            indexes_settings.get(name, {}) or {},
+            table_capacities,
+        )
+        for name in indexes_names
+    }
+    return table_capacities, indexes_capacities
+
+
+def set_provisioned_throughput(name, definition, capacities):
+    """
+    Function to set the ProvisionedThroughput of the table or index from the scaling minimum, when not defined.
+
+    :param str name:
+    :param dict definition: the table or index properties
+    :param dict capacities: the scaling capacities
+    :raises: ValueError
+    """
+    throughput = definition.setdefault("ProvisionedThroughput", {})
+    for key, (units, _) in CAPACITIES.items():
+        if keyisset(units, throughput):
+            continue
+        if not keyisset(key, capacities):
+            raise ValueError(
+                f"{name} - {units} must be set in ProvisionedThroughput for {PROVISIONED} billing"
+            )
+        throughput[units] = int(capacities[key]["Min"])
+
+
+def set_billing_mode(table):
+    """
+    Function to define the table properties for the billing mode, set in MacroParameters or Properties.
+    With PAY_PER_REQUEST, the provisioned throughput of the table and indexes is removed and scaling cannot be used.
+    With PROVISIONED, the throughput not defined is set to the scaling minimum.
+
+    :param ecs_composex.dynamodb.dynamodb_stack.Table table:
+    :return: the table properties
+    :rtype: dict
+    """
+    properties = deepcopy(table.properties)
+    mode = table.parameters.get(
+        BILLING_MODE_KEY, properties.get(BILLING_MODE_KEY, PROVISIONED)
+    )
+    if mode not in BILLING_MODES:
+        raise ValueError(
+            f"{table.name} - {BILLING_MODE_KEY} must be one of",
+            BILLING_MODES,
+            "Got",
+            mode,
+        )
+    properties[BILLING_MODE_KEY] = mode
+    indexes = properties.get("GlobalSecondaryIndexes", [])
+    if mode == PAY_PER_REQUEST:
+        if keyisset(SCALING_KEY, table.parameters):
+            raise ValueError(
+                f"{table.name} - {SCALING_KEY} cannot be used with {PAY_PER_REQUEST} billing"
+            )
+        for definition in [properties] + indexes:
+            if keypresent("ProvisionedThroughput", definition):
+                del definition["ProvisionedThroughput"]
+        LOG.info(f"{table.name} - {PAY_PER_REQUEST} billing, on-demand capacity")
+        return properties
+    table_capacities, indexes_capacities = {}, {}
+    if keyisset(SCALING_KEY, table.parameters):
+        table_capacities, indexes_capacities = get_table_scaling(table, properties)
+    set_provisioned_throughput(table.name, properties, table_capacities)
+    for index in indexes:
+        set_provisioned_throughput(
+            f"{table.name}.{index['IndexName']}",
+            index,
+            indexes_capacities.get(index["IndexName"], {}),
+        )
+    return properties
+
+
+def add_capacity_scaling(table, capacities, index_name=None):
+    """
+    Function to define the scalable targets and target tracking policies of the table or index capacities
+
+    :param ecs_composex.dynamodb.dynamodb_stack.Table table:
+    :param dict capacities:
+    :param str index_name: the index name, for a global secondary index
+    :return: the scaling resources
+    :rtype: list
+    """
+    resources = []
+    settings = dict(SCALING_DEFAULTS)
+    settings.update(
+        {
+            key: table.parameters[SCALING_KEY][key]
+            for key in SCALING_DEFAULTS
+            if keypresent(key, table.parameters[SCALING_KEY])
+        }
+    )
+    prefix = (
+        f"{table.logical_name}{NONALPHANUM.sub('', index_name) if index_name else ''}"
+    )
+    resource_id = (
+        Sub(f"table/${{{table.cfn_resource.title}}}/index/{index_name}")
+        if index_name
+        else Sub(f"table/${{{table.cfn_resource.title}}}")
+    )
+    dimension_type = "index" if index_name else "table"
+    for key, (units, name) in CAPACITIES.items():
+        if not keyisset(key, capacities):
+            continue
+        target = ScalableTarget(
+            f"{prefix}{name}ScalableTarget",
+            MinCapacity=int(capacities[key]["Min"]),
+            MaxCapacity=int(capacities[key]["Max"]),
+            ResourceId=resource_id,
+            ScalableDimension=f"dynamodb:{dimension_type}:{units}",
+            ServiceNamespace="dynamodb",
+            RoleARN=Sub(
+                "arn:${AWS::Partition}:iam::${AWS::AccountId}:role/"
+                "aws-service-role/dynamodb.application-autoscaling.amazonaws.com/"
+                "AWSServiceRoleForApplicationAutoScaling_DynamoDBTable"
+            ),
+        )
+        policy = ScalingPolicy(
+            f"{prefix}{name}TrackingPolicy",
+            ScalingTargetId=Ref(target),
+            PolicyName=f"{name}CapacityTrackingScalingPolicy",
+            PolicyType="TargetTrackingScaling",
+            TargetTrackingScalingPolicyConfiguration=TargetTrackingScalingPolicyConfiguration(
+                ScaleInCooldown=int(settings["ScaleInCooldown"]),
+                ScaleOutCooldown=int(settings["ScaleOutCooldown"]),
+                TargetValue=float(capacities[key]["TargetUtilization"]),
+                PredefinedMetricSpecification=PredefinedMetricSpecification(
+                    PredefinedMetricType=f"DynamoDB{name}CapacityUtilization"
+                ),
+            ),
+        )
+        resources += [target, policy]
+    return resources
+
+
+def define_table_scaling(table, properties):
+    """
+    Function to define the scaling resources of the table and of its global secondary indexes
+
+    :param ecs_composex.dynamodb.dynamodb_stack.Table table:
+    :param dict properties: the table properties
+    :return: the scaling resources
+    :rtype: list
+    """
+    if not keyisset(SCALING_KEY, table.parameters):
+        return []
+    table_capacities, indexes_capacities = get_table_scaling(table, properties)
+    resources = add_capacity_scaling(table, table_capacities)
+    for index_name, capacities in indexes_capacities.items():
+        resources += add_capacity_scaling(table, capacities, index_name)
+    LOG.info(
+        f"{table.name} - Capacity scaling for the table and {len(indexes_capacities)} index(es)"
+    )
+    return resources
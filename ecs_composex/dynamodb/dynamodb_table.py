@@ -22,17 +22,18 @@ from troposphere import dynamodb
 from ecs_composex.common import LOG
 from ecs_composex.common.cfn_params import ROOT_STACK_NAME
 from ecs_composex.dynamodb import metadata
+from ecs_composex.dynamodb.dynamodb_scaling import set_billing_mode
 from ecs_composex.resources_import import import_record_properties
 
 
 def define_table(table):
     """
-    Function to create the DynamoDB table resource
+    Function to create the DynamoDB table resource, with the properties for its billing mode
 
     :param table:
     :type table: ecs_composex.common.compose_resources.Table
     """
-    table_props = import_record_properties(table.properties, dynamodb.Table)
+    table_props = import_record_properties(set_billing_mode(table), dynamodb.Table)
     table_props.update(
         {
             "Metadata": metadata,
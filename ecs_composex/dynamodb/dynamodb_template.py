@@ -23,6 +23,7 @@ from troposphere import MAX_OUTPUTS
 
 from ecs_composex.common import build_template
 from ecs_composex.common.stacks import ComposeXStack
+from ecs_composex.dynamodb.dynamodb_scaling import define_table_scaling
 from ecs_composex.dynamodb.dynamodb_table import generate_table
 
 CFN_MAX_OUTPUTS = MAX_OUTPUTS - 10
@@ -45,14 +46,17 @@ def create_dynamodb_template(new_tables, template, self_stack):
         if table.cfn_resource:
             table.init_outputs()
             table.generate_outputs()
+            scaling_resources = define_table_scaling(table, table.properties)
             if mono_template:
                 template.add_resource(table.cfn_resource)
+                template.add_resource(scaling_resources)
                 template.add_output(table.outputs)
             elif not mono_template:
                 table_template = build_template(
-                    f"Template for DynamoDB table {table.title}"
+                    f"Template for DynamoDB table {table.logical_name}"
                 )
-                table_template.add_resource(table)
+                table_template.add_resource(table.cfn_resource)
+                table_template.add_resource(scaling_resources)
                 table_template.add_output(table.outputs)
                 table_stack = ComposeXStack(
                     table.logical_name, stack_template=table_template
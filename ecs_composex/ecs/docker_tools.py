@@ -20,14 +20,19 @@ Docker compose integration related function, wrapping transformation to Containe
 """
 
 import re
+from bisect import bisect_left
 
 from ecs_composex.common import LOG
 from ecs_composex.ecs.ecs_params import FARGATE_MODES
-from ecs_composex.vpc.vpc_maths import clpow2, nxtpow2
 
 NUMBERS_REG = r"[^0-9.]"
 MINIMUM_SUPPORTED = 4
 
+FARGATE_VCPU_HOUR_PRICE = 0.04048
+FARGATE_GB_HOUR_PRICE = 0.004445
+FARGATE_CPUS = sorted(FARGATE_MODES.keys())
+FARGATE_RAM_TABLE = {cpu: sorted(FARGATE_MODES[cpu]) for cpu in FARGATE_CPUS}
+
 
 def import_time_values_to_seconds(time_string, as_tuple=False):
     """
@@ -118,50 +123,105 @@ def set_memory_to_mb(value):
     return int(final_amount)
 
 
+def get_fargate_hourly_price(cpu, ram):
+    """
+    Function to return the hourly price of a Fargate task, based on the us-east-1 Linux/x86 prices.
+    Used to compare configurations with each other more than as an accurate billing estimate.
+
+    :param int cpu: CPU units (1024 = 1 vCPU)
+    :param int ram: RAM in MB
+    :return: the price in USD
+    :rtype: float
+    """
+    return (cpu / 1024) * FARGATE_VCPU_HOUR_PRICE + (ram / 1024) * FARGATE_GB_HOUR_PRICE
+
+
 def find_closest_ram_config(ram, ram_range):
     """
     Function to find the closest RAM configuration
 
     :param int ram: amount of RAM we are trying to match up
-    :param list ram_range: List of possible values for Fargate
+    :param list ram_range: Sorted list of possible values for Fargate
     :return: the closest amount of RAM.
     :rtype: int
     """
     LOG.debug(f"{ram} - {ram_range[0]} - {ram_range[-1]}")
-    if ram >= ram_range[-1]:
+    ram_index = bisect_left(ram_range, ram)
+    if ram_index >= len(ram_range):
         return ram_range[-1]
-    elif ram <= ram_range[0]:
-        return ram_range[0]
-    else:
-        for ram_value in ram_range:
-            if ram <= ram_value:
-                LOG.debug(f"BEST RAM FOUND: {ram_value}")
-                return ram_value
+    return ram_range[ram_index]
+
+
+def find_cheapest_fargate_configuration(cpu, ram):
+    """
+    Function to find the cheapest Fargate configuration with at least the given CPU and RAM.
+
+    :param int cpu: CPU units required
+    :param int ram: RAM in MB required
+    :return: the CPU and RAM of the configuration, None if no configuration is big enough
+    :rtype: tuple
+    """
+    candidates = []
+    for fargate_cpu in FARGATE_CPUS[bisect_left(FARGATE_CPUS, cpu) :]:
+        rams = FARGATE_RAM_TABLE[fargate_cpu]
+        ram_index = bisect_left(rams, ram)
+        if ram_index < len(rams):
+            fargate_ram = rams[ram_index]
+            candidates.append(
+                (
+                    get_fargate_hourly_price(fargate_cpu, fargate_ram),
+                    fargate_cpu,
+                    fargate_ram,
+                )
+            )
+    if not candidates:
+        return None
+    return min(candidates)[1:]
 
 
 def find_closest_fargate_configuration(cpu, ram, as_param_string=False):
     """
     Function to get the closest Fargate CPU / RAM Configuration out of a CPU and RAM combination.
+    Picks the cheapest configuration that fits both. If the requirements are bigger than what Fargate supports,
+    uses the largest possible configuration.
 
     :param int cpu: CPU count for the Task Definition
     :param int ram: RAM in MB for the Task Definition
     :param bool as_param_string: Returns the value as a CFN Fargate Configuration.
     :return:
     """
-    fargate_cpus = list(FARGATE_MODES.keys())
-    fargate_cpus.sort()
-    fargate_cpu = clpow2(cpu)
-    if fargate_cpu < cpu:
-        fargate_cpu = nxtpow2(cpu)
-    if fargate_cpu not in fargate_cpus:
+    config = find_cheapest_fargate_configuration(cpu, ram)
+    if not config:
         LOG.warning(
-            f"Value {cpu} is not valid for Fargate. Valid modes: {fargate_cpus}"
+            f"CPU {cpu} / RAM {ram} is not valid for Fargate. Valid modes: {FARGATE_MODES}"
         )
-        if fargate_cpu < fargate_cpus[0]:
-            fargate_cpu = fargate_cpus[0]
-        elif fargate_cpu > fargate_cpus[-1]:
-            fargate_cpu = fargate_cpus[-1]
-    fargate_ram = find_closest_ram_config(ram, FARGATE_MODES[fargate_cpu])
+        config = find_cheapest_fargate_configuration(
+            min(cpu, FARGATE_CPUS[-1]),
+            min(ram, FARGATE_RAM_TABLE[FARGATE_CPUS[-1]][-1]),
+        )
+    fargate_cpu, fargate_ram = config
     if as_param_string:
         return f"{fargate_cpu}!{fargate_ram}"
     return fargate_cpu, fargate_ram
+
+
+def define_fargate_sizing(cpu, ram):
+    """
+    Function to define the Fargate configuration for the CPU and RAM required by the containers, along with
+    the resources paid for but not allocated to any container.
+
+    :param int cpu: Sum of the containers CPU units
+    :param int ram: Sum of the containers RAM, in MB
+    :return: The sizing details
+    :rtype: dict
+    """
+    fargate_cpu, fargate_ram = find_closest_fargate_configuration(cpu, ram)
+    return {
+        "Cpu": fargate_cpu,
+        "Memory": fargate_ram,
+        "RequiredCpu": cpu,
+        "RequiredMemory": ram,
+        "UnusedVCpu": round(max(fargate_cpu - cpu, 0) / 1024, 3),
+        "UnusedGB": round(max(fargate_ram - ram, 0) / 1024, 3),
+        "HourlyPrice": round(get_fargate_hourly_price(fargate_cpu, fargate_ram), 5),
+    }
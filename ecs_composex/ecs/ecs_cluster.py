@@ -20,10 +20,19 @@ import re
 
 from botocore.exceptions import ClientError
 from troposphere import AWS_STACK_NAME
-from troposphere import Ref, FindInMap
-from troposphere.ecs import Cluster, CapacityProviderStrategyItem
+from troposphere import Ref, FindInMap, GetAtt
+from troposphere.ecs import (
+    Cluster,
+    CapacityProviderStrategy,
+    CapacityProviderStrategyItem,
+    ClusterCapacityProviderAssociations,
+    ClusterSetting,
+)
 
 from ecs_composex.common import LOG, keyisset
+from ecs_composex.common.cfn_params import COMPUTE_STACK_NAME
+from ecs_composex.common.compose_resources import get_setting_key
+from ecs_composex.compute.auto_scaling_group import CAPACITY_PROVIDER_T, get_asg_config
 from ecs_composex.ecs import metadata
 from ecs_composex.ecs.ecs_params import CLUSTER_NAME, CLUSTER_T
 from ecs_composex.resources_import import import_record_properties
@@ -32,6 +41,7 @@ RES_KEY = "x-cluster"
 FARGATE_PROVIDER = "FARGATE"
 FARGATE_SPOT_PROVIDER = "FARGATE_SPOT"
 DEFAULT_PROVIDERS = [FARGATE_PROVIDER, FARGATE_SPOT_PROVIDER]
+CONTAINER_INSIGHTS = "containerInsights"
 DEFAULT_STRATEGY = [
     CapacityProviderStrategyItem(
         Weight=2, Base=1, CapacityProvider=FARGATE_SPOT_PROVIDER
@@ -57,6 +67,48 @@ def get_default_cluster_config():
     )
 
 
+def uses_backlog_scaling(settings):
+    """
+    Function to find whether any service scales on the backlog per task of a x-sqs queue, which uses the
+    RunningTaskCount metric of Container Insights.
+
+    :param ecs_composex.common.settings.ComposeXSettings settings:
+    :rtype: bool
+    """
+    queues = settings.compose_content.get("x-sqs", None) or {}
+    for queue in queues.values():
+        if not isinstance(queue, dict):
+            continue
+        for service in queue.get("Services", None) or []:
+            scaling = service.get(get_setting_key("scaling", service), None) or {}
+            if keyisset("BacklogPerTask", scaling):
+                return True
+    return False
+
+
+def enable_container_insights(cluster):
+    """
+    Function to enable Container Insights on the new cluster, unless the cluster settings explicitly disable it.
+
+    :param troposphere.ecs.Cluster cluster:
+    """
+    cluster_settings = cluster.properties.setdefault("ClusterSettings", [])
+    for setting in cluster_settings:
+        setting = setting.to_dict() if isinstance(setting, ClusterSetting) else setting
+        if setting["Name"] != CONTAINER_INSIGHTS:
+            continue
+        if setting["Value"] != "enabled":
+            LOG.warning(
+                f"{CONTAINER_INSIGHTS} is {setting['Value']} on the cluster. "
+                "The services scaling on the SQS backlog per task will not scale."
+            )
+        return
+    cluster_settings.append(ClusterSetting(Name=CONTAINER_INSIGHTS, Value="enabled"))
+    LOG.info(
+        f"{CONTAINER_INSIGHTS} enabled on the cluster for backlog per task scaling"
+    )
+
+
 def lookup_ecs_cluster(session, cluster_lookup):
     """
     Function to find the ECS Cluster.
@@ -128,6 +180,47 @@ def import_from_x_aws_cluster(compose_content):
     compose_content[RES_KEY] = {"Use": cluster_name}
 
 
+def add_asg_capacity_provider_association(
+    root_stack, settings, cluster, asg_config, keep_strategy=True
+):
+    """
+    Function to associate the capacity provider of the EC2 hosts AutoScaling Group to the new cluster.
+    The cluster capacity providers are moved to the association, as both cannot be set together.
+    Unless the cluster defines its own, the default capacity provider strategy places all tasks on the EC2 hosts.
+
+    :param ecs_composex.common.stacks.ComposeXStack root_stack:
+    :param ecs_composex.common.settings.ComposeXSettings settings:
+    :param troposphere.ecs.Cluster cluster:
+    :param dict asg_config: the AutoScaling Group settings
+    :param bool keep_strategy: Whether to keep the cluster default capacity provider strategy
+    """
+    asg_provider = GetAtt(COMPUTE_STACK_NAME, f"Outputs.{CAPACITY_PROVIDER_T}")
+    providers = cluster.properties.pop("CapacityProviders", [])
+    strategy = cluster.properties.pop("DefaultCapacityProviderStrategy", [])
+    if strategy and keep_strategy:
+        default_strategy = [
+            CapacityProviderStrategy(**item.to_dict()) for item in strategy
+        ]
+    else:
+        default_strategy = [
+            CapacityProviderStrategy(CapacityProvider=asg_provider, Weight=1)
+        ]
+    association = root_stack.stack_template.add_resource(
+        ClusterCapacityProviderAssociations(
+            f"{cluster.title}CapacityProviders",
+            Cluster=Ref(cluster),
+            CapacityProviders=providers + [asg_provider],
+            DefaultCapacityProviderStrategy=default_strategy,
+        )
+    )
+    settings.ecs_cluster_providers_association = association.title
+    settings.ecs_cluster_hosts_default = not (strategy and keep_strategy)
+    settings.ecs_cluster_providers = list(providers)
+    if keyisset("CapacityProviderName", asg_config):
+        settings.ecs_cluster_providers.append(asg_config["CapacityProviderName"])
+    settings.create_compute = True
+
+
 def add_ecs_cluster(root_stack, settings):
     """
     Function to create the ECS Cluster.
@@ -138,13 +231,21 @@ def add_ecs_cluster(root_stack, settings):
     """
     cluster_identifier = Ref(AWS_STACK_NAME)
     cluster_mapping = {}
+    asg_config = get_asg_config(settings)
     if keyisset("x-aws-cluster", settings.compose_content):
         import_from_x_aws_cluster(settings.compose_content)
         LOG.info("x-aws-cluster was set. Overriding any defined x-cluster settings")
     if not keyisset(RES_KEY, settings.compose_content):
         LOG.info("No cluster information provided. Creating a new one")
-        root_stack.stack_template.add_resource(get_default_cluster_config())
-        cluster_identifier = Ref(CLUSTER_T)
+        cluster = root_stack.stack_template.add_resource(get_default_cluster_config())
+        settings.ecs_cluster_providers = DEFAULT_PROVIDERS
+        if uses_backlog_scaling(settings):
+            enable_container_insights(cluster)
+        if asg_config:
+            add_asg_capacity_provider_association(
+                root_stack, settings, cluster, asg_config, keep_strategy=False
+            )
+        return Ref(CLUSTER_T)
     elif isinstance(settings.compose_content[RES_KEY], dict):
         if keyisset("Use", settings.compose_content[RES_KEY]):
             LOG.info(f"Using cluster {settings.compose_content[RES_KEY]['Use']}")
@@ -159,8 +260,26 @@ def add_ecs_cluster(root_stack, settings):
                 cluster_mapping = {CLUSTER_NAME.title: {"Name": cluster_name}}
         elif keyisset("Properties", settings.compose_content[RES_KEY]):
             cluster = define_cluster(settings.compose_content[RES_KEY])
+            settings.ecs_cluster_providers = getattr(cluster, "CapacityProviders", [])
+            if uses_backlog_scaling(settings):
+                enable_container_insights(cluster)
             root_stack.stack_template.add_resource(cluster)
+            if asg_config:
+                add_asg_capacity_provider_association(
+                    root_stack, settings, cluster, asg_config
+                )
             return Ref(cluster)
+    if cluster_mapping and uses_backlog_scaling(settings):
+        LOG.warning(
+            f"Services scale on the SQS backlog per task, which requires {CONTAINER_INSIGHTS} to be enabled "
+            "on the existing cluster. Without it, the scaling policies have no data and never scale."
+        )
+    if asg_config:
+        LOG.warning(
+            "The EC2 hosts capacity provider is not associated to an existing cluster, which would replace its "
+            "capacity providers. Add it to the cluster capacity providers."
+        )
+        settings.create_compute = True
     if cluster_mapping:
         root_stack.stack_template.add_mapping("Ecs", cluster_mapping)
         cluster_identifier = FindInMap("Ecs", CLUSTER_NAME.title, "Name")
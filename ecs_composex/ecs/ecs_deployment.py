@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+#  ECS ComposeX <https://github.com/lambda-my-aws/ecs_composex>
+#  Copyright (C) 2020-2021  John Mille <john@lambda-my-aws.io>
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module to define the ECS Service deployment configuration (rolling update percentages and circuit breaker)
+and the health check grace period from the family services x-ecs and deploy.update_config definitions.
+"""
+
+from json import dumps
+from math import ceil
+
+from troposphere import AWS_NO_VALUE, If, Ref
+from troposphere.ecs import DeploymentCircuitBreaker, DeploymentConfiguration
+
+from ecs_composex.common import LOG, keyisset, keypresent
+from ecs_composex.ecs import ecs_conditions
+
+DEPLOYMENT_KEY = "DeploymentConfiguration"
+GRACE_PERIOD_KEY = "HealthCheckGracePeriodSeconds"
+CIRCUIT_BREAKER_KEY = "DeploymentCircuitBreaker"
+MIN_HEALTHY_KEY = "MinimumHealthyPercent"
+MAX_PERCENT_KEY = "MaximumPercent"
+FAILURE_ACTIONS = ["continue", "rollback", "pause"]
+UPDATE_ORDERS = ["stop-first", "start-first"]
+
+
+def import_update_config(update_config, replicas):
+    """
+    Function to import the docker compose deploy.update_config into the x-ecs DeploymentConfiguration.
+    The parallelism is the number of tasks replaced at once. With stop-first, that many tasks are stopped before new
+    ones start, and with start-first, that many new tasks are started before the old ones stop.
+    The failure_action rollback enables the circuit breaker with rollback, pause enables it without rollback.
+
+    :param dict update_config: the deploy.update_config definition
+    :param int replicas: the number of tasks of the service
+    :return: the DeploymentConfiguration settings
+    :rtype: dict
+    """
+    config = {}
+    order = update_config.get("order", "stop-first")
+    if order not in UPDATE_ORDERS:
+        raise ValueError(
+            "deploy.update_config.order must be one of", UPDATE_ORDERS, "Got", order
+        )
+    if keyisset("parallelism", update_config):
+        wave_percent = min(
+            100, ceil(int(update_config["parallelism"]) * 100 / max(replicas, 1))
+        )
+        if order == "stop-first":
+            config[MIN_HEALTHY_KEY] = 100 - wave_percent
+            config[MAX_PERCENT_KEY] = 100
+        else:
+            config[MIN_HEALTHY_KEY] = 100
+            config[MAX_PERCENT_KEY] = 100 + wave_percent
+    failure_action = update_config.get("failure_action", "continue")
+    if failure_action not in FAILURE_ACTIONS:
+        raise ValueError(
+            "deploy.update_config.failure_action must be one of",
+            FAILURE_ACTIONS,
+            "Got",
+            failure_action,
+        )
+    if failure_action != "continue":
+        config[CIRCUIT_BREAKER_KEY] = {
+            "Enable": True,
+            "Rollback": failure_action == "rollback",
+        }
+    return config
+
+
+def validate_deployment_configuration(config):
+    """
+    Function to validate the percentages of the deployment configuration
+
+    :param dict config:
+    :raises: ValueError
+    """
+    min_healthy = int(config.get(MIN_HEALTHY_KEY, 100))
+    max_percent = int(config.get(MAX_PERCENT_KEY, 200))
+    if not 0 <= min_healthy <= 100:
+        raise ValueError(
+            f"{MIN_HEALTHY_KEY} must be between 0 and 100. Got", min_healthy
+        )
+    if not 100 <= max_percent <= 200:
+        raise ValueError(
+            f"{MAX_PERCENT_KEY} must be between 100 and 200. Got", max_percent
+        )
+    if min_healthy == 100 and max_percent == 100:
+        raise ValueError(
+            f"{MIN_HEALTHY_KEY} and {MAX_PERCENT_KEY} cannot both be 100, "
+            "no task could ever be replaced"
+        )
+
+
+def get_service_deployment_config(service):
+    """
+    Function to get the deployment settings of a service, x-ecs prevailing over deploy.update_config.
+
+    :param ecs_composex.common.compose_services.ComposeService service:
+    :rtype: tuple
+    """
+    config = {}
+    if service.deploy and keyisset("update_config", service.deploy):
+        config.update(
+            import_update_config(service.deploy["update_config"], service.replicas)
+        )
+    grace_period = None
+    if service.x_ecs:
+        if keyisset(DEPLOYMENT_KEY, service.x_ecs):
+            config.update(service.x_ecs[DEPLOYMENT_KEY])
+        if keypresent(GRACE_PERIOD_KEY, service.x_ecs):
+            grace_period = int(service.x_ecs[GRACE_PERIOD_KEY])
+    return config, grace_period
+
+
+def merge_family_services_deployment(services):
+    """
+    Function to merge the deployment settings of all the services of the family.
+    The circuit breaker and rollback are enabled if any service enables them, the percentages are taken from the first
+    service which defines them, and the longest grace period is kept.
+
+    :param list services:
+    :rtype: tuple
+    """
+    deployment = {}
+    grace_periods = []
+    for service in services:
+        config, grace_period = get_service_deployment_config(service)
+        if grace_period is not None:
+            grace_periods.append(grace_period)
+        for key in [MIN_HEALTHY_KEY, MAX_PERCENT_KEY]:
+            if not keypresent(key, config):
+                continue
+            if not keypresent(key, deployment):
+                deployment[key] = int(config[key])
+            elif deployment[key] != int(config[key]):
+                LOG.warning(
+                    f"{service.name} - {key} differs from the one already defined for the family. "
+                    f"Keeping {deployment[key]}"
+                )
+        if keyisset(CIRCUIT_BREAKER_KEY, config):
+            breaker = deployment.setdefault(
+                CIRCUIT_BREAKER_KEY, {"Enable": False, "Rollback": False}
+            )
+            for key in ["Enable", "Rollback"]:
+                breaker[key] = breaker[key] or keyisset(
+                    key, config[CIRCUIT_BREAKER_KEY]
+                )
+    return deployment, max(grace_periods) if grace_periods else None
+
+
+class ServiceDeployment(object):
+    """
+    Class to group the deployment configuration settings of the ECS Service
+    """
+
+    def __init__(self, services):
+        self.configuration, self.grace_period = merge_family_services_deployment(
+            services
+        )
+        if self.configuration:
+            validate_deployment_configuration(self.configuration)
+        if self.grace_period is not None and self.grace_period < 0:
+            raise ValueError(
+                f"{GRACE_PERIOD_KEY} must be positive. Got", self.grace_period
+            )
+
+    def define_deployment_configuration(self):
+        """
+        Method to generate the ECS Service DeploymentConfiguration.
+        MaximumPercent is not set for the DAEMON scheduling strategy used on EC2.
+
+        :rtype: troposphere.ecs.DeploymentConfiguration or Ref
+        """
+        if not self.configuration:
+            return Ref(AWS_NO_VALUE)
+        breaker = Ref(AWS_NO_VALUE)
+        if keyisset(CIRCUIT_BREAKER_KEY, self.configuration):
+            breaker = DeploymentCircuitBreaker(
+                Enable=self.configuration[CIRCUIT_BREAKER_KEY]["Enable"],
+                Rollback=self.configuration[CIRCUIT_BREAKER_KEY]["Rollback"],
+            )
+        return DeploymentConfiguration(
+            MinimumHealthyPercent=self.configuration[MIN_HEALTHY_KEY]
+            if keypresent(MIN_HEALTHY_KEY, self.configuration)
+            else Ref(AWS_NO_VALUE),
+            MaximumPercent=If(
+                ecs_conditions.USE_FARGATE_CON_T,
+                self.configuration[MAX_PERCENT_KEY],
+                Ref(AWS_NO_VALUE),
+            )
+            if keypresent(MAX_PERCENT_KEY, self.configuration)
+            else Ref(AWS_NO_VALUE),
+            DeploymentCircuitBreaker=breaker,
+        )
+
+    def __repr__(self):
+        return dumps(
+            {DEPLOYMENT_KEY: self.configuration, GRACE_PERIOD_KEY: self.grace_period},
+            indent=4,
+        )
@@ -53,6 +53,13 @@ FARGATE_VERSION = Parameter(
     AllowedValues=["DEFAULT", "1.4.0", "1.3.0"],
     Default="1.4.0",
 )
+FARGATE_1_4_VERSIONS = ["DEFAULT", "1.4.0"]
+FARGATE_VERSION_1_4 = Parameter(
+    FARGATE_VERSION_T,
+    Type="String",
+    AllowedValues=FARGATE_1_4_VERSIONS,
+    Default="1.4.0",
+)
 
 IS_PUBLIC_T = "ExposeServicePublicly"
 IS_PUBLIC = Parameter(IS_PUBLIC_T, AllowedValues=["True", "False"], Type="String")
@@ -168,6 +175,9 @@ AWS_XRAY_IMAGE = "public.ecr.aws/w1m2m2a3/aws-xray-daemon:latest"
 XRAY_IMAGE_T = "AWSXRayImage"
 XRAY_IMAGE = Parameter(XRAY_IMAGE_T, Type="String", Default=AWS_XRAY_IMAGE)
 
+AWS_FLUENT_BIT_IMAGE = "public.ecr.aws/aws-observability/aws-for-fluent-bit:stable"
+LOG_ROUTER_NAME = "log_router"
+
 
 def get_import_service_group_id(remote_service_name):
     """
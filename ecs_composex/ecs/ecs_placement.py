@@ -0,0 +1,478 @@
+# -*- coding: utf-8 -*-
+#  ECS ComposeX <https://github.com/lambda-my-aws/ecs_composex>
+#  Copyright (C) 2020-2021  John Mille <john@lambda-my-aws.io>
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module to define the ECS Service placement strategies, placement constraints and capacity provider strategy
+from the family services x-ecs and deploy.placement definitions.
+"""
+
+import re
+from json import dumps
+
+from troposphere import AWS_NO_VALUE, Ref
+from troposphere.ecs import (
+    CapacityProviderStrategyItem,
+    PlacementConstraint,
+    PlacementStrategy,
+)
+
+from ecs_composex.common import LOG, keyisset, keypresent
+from ecs_composex.ecs.ecs_cluster import DEFAULT_PROVIDERS
+
+X_KEY = "x-ecs"
+STRATEGIES_KEY = "PlacementStrategies"
+CONSTRAINTS_KEY = "PlacementConstraints"
+CAPACITY_PROVIDERS_KEY = "CapacityProviderStrategy"
+
+MAX_STRATEGIES = 5
+MAX_CONSTRAINTS = 10
+MAX_PROVIDER_WEIGHT = 1000
+MAX_PROVIDER_BASE = 100000
+BINPACK_FIELDS = ["cpu", "memory"]
+STRATEGIES_TYPES = ["spread", "binpack", "random"]
+CONSTRAINTS_TYPES = ["memberOf", "distinctInstance"]
+SWARM_CONSTRAINT_RE = re.compile(
+    r"^\s*(?P<field>(?:node|engine)\.[\w.\-]+)\s*(?P<operator>==|!=)\s*(?P<value>\S+)\s*$"
+)
+SWARM_LABELS_PREFIX = "node.labels."
+SWARM_PLATFORM_ATTRIBUTES = {
+    "node.platform.os": ("ecs.os-type", {}),
+    "node.platform.arch": ("ecs.cpu-architecture", {"aarch64": "arm64"}),
+}
+
+
+def define_default_placement_strategies():
+    """
+    Function to generate placement strategies. Defaults to spreading across all AZs
+
+    :return: list of placement strategies
+    :rtype: list
+    """
+    return [
+        {"Type": "spread", "Field": "instanceId"},
+        {"Type": "spread", "Field": "attribute:ecs.availability-zone"},
+    ]
+
+
+def translate_swarm_field(field, value=None):
+    """
+    Function to translate a Swarm node field, and its value, into the ECS attribute equivalent.
+    node.labels.<name> becomes the custom attribute <name>, and the node platform the ECS os-type and
+    cpu-architecture attributes.
+
+    :param str field: the Swarm field, i.e. node.labels.zone
+    :param str value: the value to match, if any
+    :return: the ECS attribute and value, or None if there is no ECS equivalent
+    :rtype: tuple
+    """
+    if field.startswith(SWARM_LABELS_PREFIX) and len(field) > len(SWARM_LABELS_PREFIX):
+        return f"attribute:{field[len(SWARM_LABELS_PREFIX):]}", value
+    if field in SWARM_PLATFORM_ATTRIBUTES:
+        attribute, values = SWARM_PLATFORM_ATTRIBUTES[field]
+        return f"attribute:{attribute}", values.get(value, value)
+    return None
+
+
+def import_deploy_constraint(constraint):
+    """
+    Function to import a deploy.placement constraint. The Swarm constraints, i.e. node.labels.zone==eu-west-1a,
+    are translated into ECS cluster query language expressions when there is an ECS equivalent, and skipped otherwise.
+    Other constraints are ECS expressions, or distinctInstance.
+
+    :param str constraint:
+    :return: the placement constraint, or None if skipped
+    :rtype: dict
+    """
+    if constraint == "distinctInstance":
+        return {"Type": constraint}
+    parts = SWARM_CONSTRAINT_RE.match(constraint)
+    if not parts:
+        return {"Type": "memberOf", "Expression": constraint}
+    translated = translate_swarm_field(parts.group("field"), parts.group("value"))
+    if not translated:
+        LOG.warning(
+            f"deploy.placement.constraints - {constraint} has no ECS equivalent. Skipping"
+        )
+        return None
+    attribute, value = translated
+    return {
+        "Type": "memberOf",
+        "Expression": f"{attribute} {parts.group('operator')} {value}",
+    }
+
+
+def import_deploy_preference(preference):
+    """
+    Function to import a deploy.placement preference. The strategy type maps to the field,
+    i.e. spread: attribute:ecs.availability-zone. The Swarm node fields, i.e. spread: node.labels.zone,
+    are translated when there is an ECS equivalent, and skipped otherwise.
+
+    :param dict preference:
+    :return: the placement strategy, or None if skipped
+    :rtype: dict
+    """
+    if not isinstance(preference, dict) or len(preference.keys()) != 1:
+        raise ValueError(
+            "deploy.placement.preferences must be a list of one key mappings. Got",
+            preference,
+        )
+    strategy_type = list(preference.keys())[0]
+    strategy = {"Type": strategy_type}
+    field = preference[strategy_type]
+    if field and str(field).startswith(("node.", "engine.")):
+        translated = translate_swarm_field(field)
+        if not translated:
+            LOG.warning(
+                f"deploy.placement.preferences - {strategy_type}: {field} has no ECS equivalent. Skipping"
+            )
+            return None
+        field = translated[0]
+    if field:
+        strategy["Field"] = field
+    return strategy
+
+
+def import_deploy_placement(placement):
+    """
+    Function to import the docker compose deploy.placement into the x-ecs placement definitions.
+
+    :param dict placement: the deploy.placement definition
+    :return: the x-ecs placement settings
+    :rtype: dict
+    """
+    config = {}
+    if keyisset("constraints", placement):
+        constraints = [
+            import_deploy_constraint(constraint)
+            for constraint in placement["constraints"]
+        ]
+        if any(constraints):
+            config[CONSTRAINTS_KEY] = [
+                constraint for constraint in constraints if constraint
+            ]
+    if keyisset("preferences", placement):
+        strategies = [
+            import_deploy_preference(preference)
+            for preference in placement["preferences"]
+        ]
+        if any(strategies):
+            config[STRATEGIES_KEY] = [strategy for strategy in strategies if strategy]
+    return config
+
+
+def validate_placement_strategies(strategies):
+    """
+    Function to validate the placement strategies definitions
+
+    :param list strategies:
+    :raises: ValueError
+    """
+    if len(strategies) > MAX_STRATEGIES:
+        raise ValueError(
+            f"A service can have up to {MAX_STRATEGIES} placement strategies. Got",
+            len(strategies),
+        )
+    for strategy in strategies:
+        if not keyisset("Type", strategy) or strategy["Type"] not in STRATEGIES_TYPES:
+            raise ValueError(
+                "Placement strategy Type must be one of",
+                STRATEGIES_TYPES,
+                "Got",
+                strategy,
+            )
+        if strategy["Type"] == "binpack" and (
+            not keyisset("Field", strategy) or strategy["Field"] not in BINPACK_FIELDS
+        ):
+            raise ValueError(
+                "binpack placement strategy Field must be one of",
+                BINPACK_FIELDS,
+                "Got",
+                strategy,
+            )
+        if strategy["Type"] == "spread" and not keyisset("Field", strategy):
+            raise ValueError(
+                "spread placement strategy requires a Field. Got", strategy
+            )
+        if strategy["Type"] == "random" and keyisset("Field", strategy):
+            raise ValueError("random placement strategy takes no Field. Got", strategy)
+
+
+def validate_placement_constraints(constraints):
+    """
+    Function to validate the placement constraints definitions
+
+    :param list constraints:
+    :raises: ValueError
+    """
+    if len(constraints) > MAX_CONSTRAINTS:
+        raise ValueError(
+            f"A service can have up to {MAX_CONSTRAINTS} placement constraints. Got",
+            len(constraints),
+        )
+    for constraint in constraints:
+        if (
+            not keyisset("Type", constraint)
+            or constraint["Type"] not in CONSTRAINTS_TYPES
+        ):
+            raise ValueError(
+                "Placement constraint Type must be one of",
+                CONSTRAINTS_TYPES,
+                "Got",
+                constraint,
+            )
+        if constraint["Type"] == "memberOf" and not keyisset("Expression", constraint):
+            raise ValueError(
+                "memberOf constraint requires an Expression. Got", constraint
+            )
+        if constraint["Type"] == "distinctInstance" and keyisset(
+            "Expression", constraint
+        ):
+            raise ValueError(
+                "distinctInstance constraint takes no Expression. Got", constraint
+            )
+
+
+def validate_capacity_provider_strategy(strategy, cluster_providers):
+    """
+    Function to validate the capacity provider strategy against the cluster capacity providers.
+
+    :param list strategy: The capacity provider strategy items
+    :param list cluster_providers: The cluster capacity providers, None if unknown.
+    :raises: ValueError
+    """
+    providers = []
+    for item in strategy:
+        if not keyisset("CapacityProvider", item):
+            raise ValueError("CapacityProvider is required. Got", item)
+        if item["CapacityProvider"] in providers:
+            raise ValueError(
+                "Capacity provider", item["CapacityProvider"], "is set more than once"
+            )
+        providers.append(item["CapacityProvider"])
+        if not 0 <= int(item.get("Weight", 0)) <= MAX_PROVIDER_WEIGHT:
+            raise ValueError(
+                f"Weight must be between 0 and {MAX_PROVIDER_WEIGHT}. Got", item
+            )
+        if not 0 <= int(item.get("Base", 0)) <= MAX_PROVIDER_BASE:
+            raise ValueError(
+                f"Base must be between 0 and {MAX_PROVIDER_BASE}. Got", item
+            )
+    if len([item for item in strategy if keyisset("Base", item)]) > 1:
+        raise ValueError("Only one capacity provider can have a Base. Got", strategy)
+    if not any(keyisset("Weight", item) for item in strategy):
+        raise ValueError(
+            "At least one capacity provider must have a Weight greater than 0. Got",
+            strategy,
+        )
+    fargate = [provider for provider in providers if provider in DEFAULT_PROVIDERS]
+    if fargate and len(fargate) != len(providers):
+        raise ValueError(
+            "FARGATE and FARGATE_SPOT cannot be mixed with Auto Scaling group providers",
+            providers,
+        )
+    if cluster_providers is None:
+        LOG.warning(
+            "The cluster capacity providers are not known. Cannot validate "
+            f"{providers} for the service capacity provider strategy"
+        )
+        return
+    missing = [provider for provider in providers if provider not in cluster_providers]
+    if missing:
+        raise ValueError(
+            "Capacity providers",
+            missing,
+            "are not defined for the cluster. Cluster capacity providers are",
+            cluster_providers,
+        )
+
+
+def get_service_placement_config(service):
+    """
+    Function to get the placement settings of a service, x-ecs prevailing over deploy.placement.
+
+    :param ecs_composex.common.compose_services.ComposeService service:
+    :rtype: dict
+    """
+    config = {}
+    if service.deploy and keyisset("placement", service.deploy):
+        config.update(import_deploy_placement(service.deploy["placement"]))
+    if service.x_ecs:
+        for key in [STRATEGIES_KEY, CONSTRAINTS_KEY, CAPACITY_PROVIDERS_KEY]:
+            if keypresent(key, service.x_ecs):
+                if not isinstance(service.x_ecs[key], list):
+                    raise TypeError(
+                        f"{service.name} - {X_KEY}.{key} must be",
+                        list,
+                        "Got",
+                        type(service.x_ecs[key]),
+                    )
+                config[key] = service.x_ecs[key]
+    return config
+
+
+def handle_first_defined(config, key, new_config, service_name):
+    """
+    Function to keep the first definition of the family for settings which cannot be combined.
+    """
+    if config[key] is None:
+        config[key] = new_config
+    elif config[key] != new_config:
+        LOG.warning(
+            f"{service_name} - {key} differs from the one already defined for the family. "
+            f"Keeping {dumps(config[key])}"
+        )
+
+
+def handle_constraints(config, key, new_config, service_name):
+    """
+    Function to add up the placement constraints of the family services, as all must be met.
+    """
+    if config[key] is None:
+        config[key] = []
+    for constraint in new_config:
+        if constraint not in config[key]:
+            config[key].append(constraint)
+
+
+def merge_family_services_placement(services):
+    """
+    Function to merge the placement settings of all the services of the family.
+
+    :param list services:
+    :rtype: dict
+    """
+    placement = {
+        STRATEGIES_KEY: None,
+        CONSTRAINTS_KEY: None,
+        CAPACITY_PROVIDERS_KEY: None,
+    }
+    valid_keys = [
+        (STRATEGIES_KEY, handle_first_defined),
+        (CONSTRAINTS_KEY, handle_constraints),
+        (CAPACITY_PROVIDERS_KEY, handle_first_defined),
+    ]
+    for service in services:
+        config = get_service_placement_config(service)
+        for key in valid_keys:
+            if keyisset(key[0], config):
+                key[1](placement, key[0], config[key[0]], service.name)
+    return placement
+
+
+class ServicePlacement(object):
+    """
+    Class to group the placement and capacity provider settings of the ECS Service
+    """
+
+    def __init__(self, services, cluster_providers=None, hosts_default=False):
+        """
+        :param list services: the family services
+        :param list cluster_providers: the cluster capacity providers, None if unknown.
+        :param bool hosts_default: Whether the cluster default capacity provider strategy uses the EC2 hosts
+        """
+        self.hosts_default = hosts_default
+        configuration = merge_family_services_placement(services)
+        self.strategies = configuration[STRATEGIES_KEY]
+        self.constraints = configuration[CONSTRAINTS_KEY]
+        self.capacity_provider_strategy = configuration[CAPACITY_PROVIDERS_KEY]
+        if self.strategies:
+            validate_placement_strategies(self.strategies)
+        if self.constraints:
+            validate_placement_constraints(self.constraints)
+        if self.capacity_provider_strategy:
+            validate_capacity_provider_strategy(
+                self.capacity_provider_strategy, cluster_providers
+            )
+            if self.use_fargate_providers and (self.strategies or self.constraints):
+                LOG.warning(
+                    "Placement strategies and constraints are ignored with FARGATE capacity providers"
+                )
+
+    @property
+    def use_fargate_providers(self):
+        return self.capacity_provider_strategy and all(
+            item["CapacityProvider"] in DEFAULT_PROVIDERS
+            for item in self.capacity_provider_strategy
+        )
+
+    def define_placement_strategies(self):
+        """
+        Method to generate the placement strategies, defaulting to spread across instances and AZs.
+
+        :rtype: list
+        """
+        strategies = (
+            self.strategies
+            if self.strategies
+            else define_default_placement_strategies()
+        )
+        return [
+            PlacementStrategy(
+                Type=strategy["Type"],
+                Field=strategy["Field"]
+                if keyisset("Field", strategy)
+                else Ref(AWS_NO_VALUE),
+            )
+            for strategy in strategies
+        ]
+
+    def define_placement_constraints(self):
+        """
+        Method to generate the placement constraints
+
+        :rtype: list or Ref
+        """
+        if not self.constraints:
+            return Ref(AWS_NO_VALUE)
+        return [
+            PlacementConstraint(
+                Type=constraint["Type"],
+                Expression=constraint["Expression"]
+                if keyisset("Expression", constraint)
+                else Ref(AWS_NO_VALUE),
+            )
+            for constraint in self.constraints
+        ]
+
+    def define_capacity_provider_strategy(self):
+        """
+        Method to generate the service capacity provider strategy
+
+        :rtype: list or Ref
+        """
+        if not self.capacity_provider_strategy:
+            return Ref(AWS_NO_VALUE)
+        return [
+            CapacityProviderStrategyItem(
+                CapacityProvider=item["CapacityProvider"],
+                Weight=int(item["Weight"]) if keypresent("Weight", item) else 0,
+                Base=int(item["Base"])
+                if keypresent("Base", item)
+                else Ref(AWS_NO_VALUE),
+            )
+            for item in self.capacity_provider_strategy
+        ]
+
+    def __repr__(self):
+        return dumps(
+            {
+                STRATEGIES_KEY: self.strategies,
+                CONSTRAINTS_KEY: self.constraints,
+                CAPACITY_PROVIDERS_KEY: self.capacity_provider_strategy,
+            },
+            indent=4,
+        )
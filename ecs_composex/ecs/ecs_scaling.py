@@ -20,18 +20,98 @@ Module to help generate target scaling policies for given alarms.
 """
 
 import random
+import re
 import string
+from copy import deepcopy
 from json import dumps
 
-from troposphere import Ref, AWS_NO_VALUE
+from troposphere import AWSProperty, GetAtt, Ref, AWS_NO_VALUE
 from troposphere.applicationautoscaling import (
+    CustomizedMetricSpecification,
+    MetricDimension,
+    ScalableTargetAction,
     ScalingPolicy,
+    ScheduledAction,
     StepScalingPolicyConfiguration,
     StepAdjustment,
+    TargetTrackingScalingPolicyConfiguration,
 )
+from troposphere.validators import boolean
 
 from ecs_composex.common import LOG, keyisset, keypresent
-from ecs_composex.ecs.ecs_params import SERVICE_SCALING_TARGET
+from ecs_composex.ecs.ecs_params import CLUSTER_NAME, SERVICE_SCALING_TARGET
+
+QUEUE_SCALING_KEY = "QueueScaling"
+QUEUE_SCALING_SETTINGS = [
+    ("AcceptableLatency", (int, float)),
+    ("MessageProcessingTime", (int, float)),
+    ("ScaleInCooldown", int),
+    ("ScaleOutCooldown", int),
+    ("DisableScaleIn", bool),
+]
+SCHEDULED_ACTIONS_KEY = "ScheduledActions"
+SCHEDULED_ACTION_SETTINGS = [
+    ("Name", str),
+    ("Schedule", str),
+    ("Timezone", str),
+    ("StartTime", str),
+    ("EndTime", str),
+    ("MinCapacity", int),
+    ("MaxCapacity", int),
+]
+PRE_WARM_KEY = "PreWarm"
+PRE_WARM_SETTINGS = [
+    ("Start", str),
+    ("End", str),
+    ("Days", str),
+    ("Timezone", str),
+    ("LeadTime", int),
+    ("MinCapacity", int),
+]
+DEFAULT_LEAD_TIME = 15
+SCHEDULE_RE = re.compile(
+    r"^(at\([0-9]{4}-[0-9]{2}-[0-9]{2}T[0-9]{2}:[0-9]{2}:[0-9]{2}\)"
+    r"|rate\([1-9][0-9]* (minute|minutes|hour|hours|day|days)\)"
+    r"|cron\(\S+ \S+ \S+ \S+ \S+ \S+\))$"
+)
+TIME_RE = re.compile(r"^([01]?[0-9]|2[0-3]):[0-5][0-9]$")
+WEEK_DAYS = ["SUN", "MON", "TUE", "WED", "THU", "FRI", "SAT"]
+
+
+class TargetTrackingMetric(AWSProperty):
+    props = {
+        "Dimensions": ([MetricDimension], False),
+        "MetricName": (str, False),
+        "Namespace": (str, False),
+    }
+
+
+class TargetTrackingMetricStat(AWSProperty):
+    props = {
+        "Metric": (TargetTrackingMetric, False),
+        "Stat": (str, False),
+        "Unit": (str, False),
+    }
+
+
+class TargetTrackingMetricDataQuery(AWSProperty):
+    props = {
+        "Expression": (str, False),
+        "Id": (str, False),
+        "Label": (str, False),
+        "MetricStat": (TargetTrackingMetricStat, False),
+        "ReturnData": (boolean, False),
+    }
+
+
+class MetricMathSpecification(CustomizedMetricSpecification):
+    """
+    CustomizedMetricSpecification using metric math, with Metrics instead of a single metric.
+    """
+
+    props = {
+        "Metrics": ([TargetTrackingMetricDataQuery], True),
+    }
 
 
 def validate_steps_definition(steps, unordered):
@@ -295,6 +375,383 @@ def handle_defined_x_aws_autoscaling(configs, service):
         configs.append(service.x_scaling)
 
 
+def validate_queue_scaling(queue_scaling):
+    """
+    Function to validate the QueueScaling definition
+
+    :param dict queue_scaling:
+    :raises KeyError: if a key is not supported or a required key is missing
+    :raises TypeError: if a value type is invalid
+    :raises ValueError: if the latency or processing time is not strictly positive
+    """
+    allowed_keys = [setting[0] for setting in QUEUE_SCALING_SETTINGS]
+    if not all(key in allowed_keys for key in queue_scaling.keys()):
+        raise KeyError(
+            f"{QUEUE_SCALING_KEY} only allows",
+            allowed_keys,
+            "Got",
+            queue_scaling.keys(),
+        )
+    for key, key_type in QUEUE_SCALING_SETTINGS:
+        if key in queue_scaling.keys() and not isinstance(queue_scaling[key], key_type):
+            raise TypeError(f"{key} must be", key_type, "Got", type(queue_scaling[key]))
+    for key in allowed_keys[:2]:
+        if key not in queue_scaling.keys() or not queue_scaling[key] > 0:
+            raise ValueError(
+                f"{QUEUE_SCALING_KEY}.{key} must be set and greater than 0",
+                queue_scaling,
+            )
+
+
+def handle_queue_scaling(config, key, new_config):
+    """
+    Function to merge the QueueScaling of the services. Keeps the lowest latency and highest processing time,
+    to meet the strictest latency, and scales out the fastest and in the slowest.
+    """
+    validate_queue_scaling(new_config)
+    if not config[key]:
+        config[key] = deepcopy(new_config)
+        return
+    merged = config[key]
+    merged["AcceptableLatency"] = min(
+        merged["AcceptableLatency"], new_config["AcceptableLatency"]
+    )
+    merged["MessageProcessingTime"] = max(
+        merged["MessageProcessingTime"], new_config["MessageProcessingTime"]
+    )
+    for cooldown, function in [("ScaleInCooldown", max), ("ScaleOutCooldown", min)]:
+        if keypresent(cooldown, new_config):
+            merged[cooldown] = (
+                function(merged[cooldown], new_config[cooldown])
+                if keypresent(cooldown, merged)
+                else new_config[cooldown]
+            )
+    if keyisset("DisableScaleIn", new_config):
+        merged["DisableScaleIn"] = True
+
+
+def define_backlog_per_task_target(queue_scaling):
+    """
+    Function to define the number of messages per task that can be processed within the acceptable latency.
+
+    :param dict queue_scaling:
+    :return: the backlog per task target
+    :rtype: float
+    """
+    target = queue_scaling["AcceptableLatency"] / queue_scaling["MessageProcessingTime"]
+    if target < 1:
+        LOG.warning(
+            f"AcceptableLatency {queue_scaling['AcceptableLatency']} is lower than MessageProcessingTime"
+            f" {queue_scaling['MessageProcessingTime']}. Scaling for 1 message per task."
+        )
+        return 1.0
+    return round(target, 2)
+
+
+def generate_backlog_tracking_policy(family, queue_name, queue_scaling, scaling_source):
+    """
+    Function to create the target tracking policy on the number of visible messages in the queue per running task.
+    The running tasks count comes from Container Insights, which must be enabled on the cluster.
+
+    :param ecs_composex.common.compose_services.ComposeFamily family:
+    :param queue_name: The queue name, or a reference to it.
+    :param dict queue_scaling: The family QueueScaling definition
+    :param str scaling_source: The name of the queue, used for the policy name
+    :return: The scaling policy
+    :rtype: ScalingPolicy
+    """
+    backlog_metrics = [
+        TargetTrackingMetricDataQuery(
+            Id="messages",
+            MetricStat=TargetTrackingMetricStat(
+                Metric=TargetTrackingMetric(
+                    Namespace="AWS/SQS",
+                    MetricName="ApproximateNumberOfMessagesVisible",
+                    Dimensions=[MetricDimension(Name="QueueName", Value=queue_name)],
+                ),
+                Stat="Sum",
+            ),
+            ReturnData=False,
+        ),
+        TargetTrackingMetricDataQuery(
+            Id="tasks",
+            MetricStat=TargetTrackingMetricStat(
+                Metric=TargetTrackingMetric(
+                    Namespace="ECS/ContainerInsights",
+                    MetricName="RunningTaskCount",
+                    Dimensions=[
+                        MetricDimension(Name="ClusterName", Value=Ref(CLUSTER_NAME)),
+                        MetricDimension(
+                            Name="ServiceName",
+                            Value=GetAtt(family.service_definition, "Name"),
+                        ),
+                    ],
+                ),
+                Stat="Average",
+            ),
+            ReturnData=False,
+        ),
+        TargetTrackingMetricDataQuery(
+            Id="backlog",
+            Expression="IF(tasks > 0, messages / tasks, messages)",
+            Label="BacklogPerTask",
+            ReturnData=True,
+        ),
+    ]
+    return ScalingPolicy(
+        f"BacklogTrackingPolicy{scaling_source}",
+        template=family.template,
+        PolicyName=f"BacklogTrackingPolicy{scaling_source}{family.logical_name}",
+        PolicyType="TargetTrackingScaling",
+        ScalingTargetId=Ref(SERVICE_SCALING_TARGET),
+        TargetTrackingScalingPolicyConfiguration=TargetTrackingScalingPolicyConfiguration(
+            TargetValue=define_backlog_per_task_target(queue_scaling),
+            DisableScaleIn=keyisset("DisableScaleIn", queue_scaling),
+            ScaleInCooldown=queue_scaling["ScaleInCooldown"]
+            if keypresent("ScaleInCooldown", queue_scaling)
+            else 300,
+            ScaleOutCooldown=queue_scaling["ScaleOutCooldown"]
+            if keypresent("ScaleOutCooldown", queue_scaling)
+            else 60,
+            CustomizedMetricSpecification=MetricMathSpecification(
+                Metrics=backlog_metrics
+            ),
+        ),
+    )
+
+
+def validate_scheduled_action(action):
+    """
+    Function to validate a scheduled action definition
+
+    :param dict action:
+    :raises KeyError: if a key is not supported or the Schedule is missing
+    :raises ValueError: if the schedule expression is invalid or no capacity is set
+    """
+    allowed_keys = [setting[0] for setting in SCHEDULED_ACTION_SETTINGS]
+    if not all(key in allowed_keys for key in action.keys()):
+        raise KeyError(
+            f"{SCHEDULED_ACTIONS_KEY} only allows", allowed_keys, "Got", action.keys()
+        )
+    for key, key_type in SCHEDULED_ACTION_SETTINGS:
+        if key in action.keys() and not isinstance(action[key], key_type):
+            raise TypeError(f"{key} must be", key_type, "Got", type(action[key]))
+    if not keyisset("Schedule", action) or not SCHEDULE_RE.match(action["Schedule"]):
+        raise ValueError(
+            "Schedule must be a valid at(), rate() or cron() expression", action
+        )
+    if not keypresent("MinCapacity", action) and not keypresent("MaxCapacity", action):
+        raise ValueError("You must define MinCapacity and/or MaxCapacity", action)
+
+
+def handle_scheduled_actions(config, key, new_actions):
+    """
+    Function to merge the scheduled actions of the services. Actions with the same schedule and timezone are
+    merged, keeping the highest capacities.
+    """
+    if config[key] is None:
+        config[key] = []
+    for action in new_actions:
+        validate_scheduled_action(action)
+        for existing in config[key]:
+            if existing["Schedule"] == action["Schedule"] and existing.get(
+                "Timezone"
+            ) == action.get("Timezone"):
+                for capacity in ["MinCapacity", "MaxCapacity"]:
+                    if keypresent(capacity, action):
+                        existing[capacity] = max(
+                            existing.get(capacity, action[capacity]), action[capacity]
+                        )
+                break
+        else:
+            config[key].append(deepcopy(action))
+
+
+def validate_pre_warm(pre_warm):
+    """
+    Function to validate a pre-warm definition
+
+    :param dict pre_warm:
+    """
+    allowed_keys = [setting[0] for setting in PRE_WARM_SETTINGS]
+    if not all(key in allowed_keys for key in pre_warm.keys()):
+        raise KeyError(
+            f"{PRE_WARM_KEY} only allows", allowed_keys, "Got", pre_warm.keys()
+        )
+    for key, key_type in PRE_WARM_SETTINGS:
+        if key in pre_warm.keys() and not isinstance(pre_warm[key], key_type):
+            raise TypeError(f"{key} must be", key_type, "Got", type(pre_warm[key]))
+    for key in ["Start", "End"]:
+        if not keyisset(key, pre_warm) or not TIME_RE.match(pre_warm[key]):
+            raise ValueError(f"{PRE_WARM_KEY}.{key} must be set as HH:MM", pre_warm)
+    if not keypresent("MinCapacity", pre_warm):
+        raise ValueError(f"{PRE_WARM_KEY}.MinCapacity must be set", pre_warm)
+    expand_week_days(pre_warm.get("Days", "*"))
+
+
+def handle_pre_warm(config, key, new_pre_warms):
+    """
+    Function to merge the pre-warm periods of the services. Identical periods are merged, keeping the highest
+    capacity and longest lead time.
+    """
+    if config[key] is None:
+        config[key] = []
+    for pre_warm in new_pre_warms:
+        validate_pre_warm(pre_warm)
+        period = [pre_warm.get(prop, "*") for prop in ["Start", "End", "Days"]]
+        for existing in config[key]:
+            if [
+                existing.get(prop, "*") for prop in ["Start", "End", "Days"]
+            ] == period and existing.get("Timezone") == pre_warm.get("Timezone"):
+                existing["MinCapacity"] = max(
+                    existing["MinCapacity"], pre_warm["MinCapacity"]
+                )
+                existing["LeadTime"] = max(
+                    existing.get("LeadTime", DEFAULT_LEAD_TIME),
+                    pre_warm.get("LeadTime", DEFAULT_LEAD_TIME),
+                )
+                break
+        else:
+            config[key].append(deepcopy(pre_warm))
+
+
+def expand_week_days(days):
+    """
+    Function to expand the days of the week of a cron expression, i.e. MON-FRI, into the list of days.
+
+    :param str days: *, day names, ranges of day names, comma separated.
+    :return: the list of days names, None for every day
+    :rtype: list
+    """
+    if days in ["*", "?"]:
+        return None
+    expanded = []
+    for days_range in days.upper().split(","):
+        bounds = days_range.split("-")
+        if not all(day in WEEK_DAYS for day in bounds) or len(bounds) > 2:
+            raise ValueError(
+                f"Days must be * or days names and ranges, i.e. MON-FRI. Got {days}"
+            )
+        start = WEEK_DAYS.index(bounds[0])
+        end = WEEK_DAYS.index(bounds[-1])
+        for offset in range((end - start) % len(WEEK_DAYS) + 1):
+            day = WEEK_DAYS[(start + offset) % len(WEEK_DAYS)]
+            if day not in expanded:
+                expanded.append(day)
+    return sorted(expanded, key=WEEK_DAYS.index)
+
+
+def define_cron(minutes, days):
+    """
+    Function to define the cron expression at a given minute of the day, on the given days.
+    Days are shifted by one when the minute is on the day before.
+
+    :param int minutes: minutes since midnight, negative for the day before
+    :param list days: days of the week, None for every day
+    :rtype: str
+    """
+    day_offset, minutes = divmod(minutes, 24 * 60)
+    if days:
+        days = ",".join(
+            sorted(
+                (
+                    WEEK_DAYS[(WEEK_DAYS.index(day) + day_offset) % len(WEEK_DAYS)]
+                    for day in days
+                ),
+                key=WEEK_DAYS.index,
+            )
+        )
+        return f"cron({minutes % 60} {minutes // 60} ? * {days} *)"
+    return f"cron({minutes % 60} {minutes // 60} * * ? *)"
+
+
+def define_pre_warm_actions(pre_warm, scaling_range):
+    """
+    Function to define the scheduled actions raising the minimum capacity LeadTime minutes before the start of
+    the period, and resetting it to the Range minimum at the end of it.
+
+    :param list pre_warm: The pre-warm periods
+    :param dict scaling_range: the service Range
+    :return: the scheduled actions definitions
+    :rtype: list
+    """
+    actions = []
+    for count, period in enumerate(pre_warm):
+        days = expand_week_days(period.get("Days", "*"))
+        start_hour, start_minute = (int(part) for part in period["Start"].split(":"))
+        end_hour, end_minute = (int(part) for part in period["End"].split(":"))
+        start = (
+            start_hour * 60 + start_minute - period.get("LeadTime", DEFAULT_LEAD_TIME)
+        )
+        end = end_hour * 60 + end_minute
+        if end <= start_hour * 60 + start_minute:
+            end += 24 * 60
+        for suffix, minutes, capacity in [
+            ("Start", start, period["MinCapacity"]),
+            ("End", end, scaling_range["min"]),
+        ]:
+            action = {
+                "Name": f"PreWarm{count}{suffix}",
+                "Schedule": define_cron(minutes, days),
+                "MinCapacity": capacity,
+            }
+            if keyisset("Timezone", period):
+                action["Timezone"] = period["Timezone"]
+            actions.append(action)
+    return actions
+
+
+def define_scheduled_actions(scheduled_actions, pre_warm, scaling_range):
+    """
+    Function to create the ScalableTarget scheduled actions, from the ScheduledActions and PreWarm definitions.
+
+    :param list scheduled_actions:
+    :param list pre_warm:
+    :param dict scaling_range: the service Range
+    :return: the scheduled actions
+    :rtype: list
+    """
+    definitions = (scheduled_actions if scheduled_actions else []) + (
+        define_pre_warm_actions(pre_warm, scaling_range) if pre_warm else []
+    )
+    actions = []
+    for count, action in enumerate(definitions):
+        for capacity in ["MinCapacity", "MaxCapacity"]:
+            if keypresent(capacity, action) and not (
+                0 <= action[capacity] <= scaling_range["max"]
+            ):
+                raise ValueError(
+                    f"{capacity} {action[capacity]} must be between 0 and the Range max {scaling_range['max']}",
+                    action,
+                )
+        actions.append(
+            ScheduledAction(
+                ScheduledActionName=action["Name"]
+                if keyisset("Name", action)
+                else f"ScheduledAction{count}",
+                Schedule=action["Schedule"],
+                Timezone=action["Timezone"]
+                if keyisset("Timezone", action)
+                else Ref(AWS_NO_VALUE),
+                StartTime=action["StartTime"]
+                if keyisset("StartTime", action)
+                else Ref(AWS_NO_VALUE),
+                EndTime=action["EndTime"]
+                if keyisset("EndTime", action)
+                else Ref(AWS_NO_VALUE),
+                ScalableTargetAction=ScalableTargetAction(
+                    MinCapacity=action["MinCapacity"]
+                    if keypresent("MinCapacity", action)
+                    else Ref(AWS_NO_VALUE),
+                    MaxCapacity=action["MaxCapacity"]
+                    if keypresent("MaxCapacity", action)
+                    else Ref(AWS_NO_VALUE),
+                ),
+            )
+        )
+    return actions
+
+
 def merge_family_services_scaling(services):
     x_scaling = {
         "Range": None,
@@ -303,6 +760,9 @@ def merge_family_services_scaling(services):
             "ScaleInCooldown": 300,
             "ScaleOutCooldown": 60,
         },
+        QUEUE_SCALING_KEY: None,
+        SCHEDULED_ACTIONS_KEY: None,
+        PRE_WARM_KEY: None,
     }
     x_scaling_configs = []
     for service in services:
@@ -310,6 +770,9 @@ def merge_family_services_scaling(services):
     valid_keys = [
         ("Range", str, handle_range),
         ("TargetScaling", dict, handle_target_scaling),
+        (QUEUE_SCALING_KEY, dict, handle_queue_scaling),
+        (SCHEDULED_ACTIONS_KEY, list, handle_scheduled_actions),
+        (PRE_WARM_KEY, list, handle_pre_warm),
     ]
     for key in valid_keys:
         for config in x_scaling_configs:
@@ -334,10 +797,16 @@ class ServiceScaling(object):
         configuration = merge_family_services_scaling(services)
         self.scaling_range = None
         self.target_scaling = None
+        self.queue_scaling = None
+        self.scheduled_actions = None
+        self.pre_warm = None
         if not keyisset("Range", configuration):
             self.defined = False
             return
         self.scaling_range = configuration["Range"]
+        self.queue_scaling = configuration[QUEUE_SCALING_KEY]
+        self.scheduled_actions = configuration[SCHEDULED_ACTIONS_KEY]
+        self.pre_warm = configuration[PRE_WARM_KEY]
         for key in self.target_scaling_keys:
             if keyisset("TargetScaling", configuration) and keyisset(
                 key, configuration["TargetScaling"]
@@ -346,6 +815,12 @@ class ServiceScaling(object):
 
     def __repr__(self):
         return dumps(
-            {"Range": self.scaling_range, "TargetScaling": self.target_scaling},
+            {
+                "Range": self.scaling_range,
+                "TargetScaling": self.target_scaling,
+                QUEUE_SCALING_KEY: self.queue_scaling,
+                SCHEDULED_ACTIONS_KEY: self.scheduled_actions,
+                PRE_WARM_KEY: self.pre_warm,
+            },
             indent=4,
         )
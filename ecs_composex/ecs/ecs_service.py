@@ -32,7 +32,6 @@ from troposphere import applicationautoscaling
 from troposphere.ec2 import SecurityGroup
 from troposphere.ecs import (
     Service as EcsService,
-    PlacementStrategy,
     AwsvpcConfiguration,
     NetworkConfiguration,
     DeploymentController,
@@ -65,21 +64,61 @@ from ecs_composex.ecs.ecs_params import (
     SERVICE_NAME_T,
     SG_T,
 )
+from ecs_composex.ecs.ecs_scaling import define_scheduled_actions
 from ecs_composex.vpc import vpc_params
 from ecs_composex.vpc.vpc_params import VPC_ID, PUBLIC_SUBNETS
 
 
-def define_placement_strategies():
+def define_service_placement(placement):
     """
-    Function to generate placement strategies. Defaults to spreading across all AZs
-
-    :return: list of placement strategies
-    :rtype: list
+    Function to define the placement and launch properties of the ECS Service.
+    Placement only applies to EC2 instances. When a capacity provider strategy is defined for the family,
+    it replaces the launch type and the cluster default capacity provider strategy.
+    The Fargate platform version is not set when the tasks run on the EC2 hosts capacity provider.
+
+    :param ecs_composex.ecs.ecs_placement.ServicePlacement placement:
+    :return: the ECS Service properties
+    :rtype: dict
     """
-    return [
-        PlacementStrategy(Field="instanceId", Type="spread"),
-        PlacementStrategy(Field="attribute:ecs.availability-zone", Type="spread"),
-    ]
+    props = {
+        "PlacementStrategies": If(
+            ecs_conditions.USE_FARGATE_CON_T,
+            Ref(AWS_NO_VALUE),
+            placement.define_placement_strategies(),
+        ),
+        "PlacementConstraints": If(
+            ecs_conditions.USE_FARGATE_CON_T,
+            Ref(AWS_NO_VALUE),
+            placement.define_placement_constraints(),
+        )
+        if placement.constraints
+        else Ref(AWS_NO_VALUE),
+        "LaunchType": If(
+            ecs_conditions.USE_CLUSTER_CAPACITY_PROVIDERS_CON_T,
+            Ref(AWS_NO_VALUE),
+            Ref(ecs_params.LAUNCH_TYPE),
+        ),
+        "CapacityProviderStrategy": Ref(AWS_NO_VALUE),
+        "PlatformVersion": Ref(AWS_NO_VALUE)
+        if placement.hosts_default
+        else Ref(ecs_params.FARGATE_VERSION),
+    }
+    if not placement.capacity_provider_strategy:
+        return props
+    props["LaunchType"] = Ref(AWS_NO_VALUE)
+    props["CapacityProviderStrategy"] = placement.define_capacity_provider_strategy()
+    props["PlatformVersion"] = (
+        Ref(ecs_params.FARGATE_VERSION)
+        if placement.use_fargate_providers
+        else Ref(AWS_NO_VALUE)
+    )
+    if placement.use_fargate_providers:
+        props["PlacementStrategies"] = Ref(AWS_NO_VALUE)
+        props["PlacementConstraints"] = Ref(AWS_NO_VALUE)
+    else:
+        props["PlacementStrategies"] = placement.define_placement_strategies()
+        props["PlacementConstraints"] = placement.define_placement_constraints()
+    return props
 
 
 def define_public_mapping(eips, azs):
@@ -239,6 +278,15 @@ def create_scalable_target(family):
                 DynamicScalingInSuspended=False
             ),
         )
+        if (
+            family.service_config.scaling.scheduled_actions
+            or family.service_config.scaling.pre_warm
+        ):
+            family.scalable_target.ScheduledActions = define_scheduled_actions(
+                family.service_config.scaling.scheduled_actions,
+                family.service_config.scaling.pre_warm,
+                family.service_config.scaling.scaling_range,
+            )
     if family.scalable_target and family.service_config.scaling.target_scaling:
         if keyisset("CpuTarget", family.service_config.scaling.target_scaling):
             applicationautoscaling.ScalingPolicy(
@@ -355,6 +403,7 @@ class Service(object):
         ]
         service_sgs += [sg for sg in self.sgs if isinstance(sg, (Ref, Sub, If, GetAtt))]
         attrs = define_service_ingress(family, settings)
+        placement = define_service_placement(family.service_config.placement)
         self.ecs_service = EcsService(
             ecs_params.SERVICE_T,
             template=family.template,
@@ -362,6 +411,7 @@ class Service(object):
             DeploymentController=DeploymentController(
                 Type=Ref(ecs_params.ECS_CONTROLLER)
             ),
+            DeploymentConfiguration=family.service_config.deployment.define_deployment_configuration(),
             EnableECSManagedTags=True,
             DesiredCount=If(
                 ecs_conditions.SERVICE_COUNT_ZERO_AND_FARGATE_CON_T,
@@ -385,22 +435,16 @@ class Service(object):
                     "DAEMON",
                 ),
             ),
-            PlacementStrategies=If(
-                ecs_conditions.USE_FARGATE_CON_T,
-                Ref(AWS_NO_VALUE),
-                define_placement_strategies(),
-            ),
+            PlacementStrategies=placement["PlacementStrategies"],
+            PlacementConstraints=placement["PlacementConstraints"],
             NetworkConfiguration=NetworkConfiguration(
                 AwsvpcConfiguration=AwsvpcConfiguration(
                     Subnets=Ref(vpc_params.APP_SUBNETS), SecurityGroups=service_sgs
                 )
             ),
             TaskDefinition=Ref(family.task_definition),
-            LaunchType=If(
-                ecs_conditions.USE_CLUSTER_CAPACITY_PROVIDERS_CON_T,
-                Ref(AWS_NO_VALUE),
-                Ref(ecs_params.LAUNCH_TYPE),
-            ),
+            LaunchType=placement["LaunchType"],
+            CapacityProviderStrategy=placement["CapacityProviderStrategy"],
             Tags=Tags(
                 {
                     "Name": Ref(ecs_params.SERVICE_NAME),
@@ -408,7 +452,7 @@ class Service(object):
                 }
             ),
             PropagateTags="SERVICE",
-            PlatformVersion=Ref(ecs_params.FARGATE_VERSION),
+            PlatformVersion=placement["PlatformVersion"],
             **attrs,
         )
         family.service_definition = self.ecs_service
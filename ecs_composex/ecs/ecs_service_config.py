@@ -20,7 +20,9 @@ Module for the ServiceConfig Class which is used for Container, Task and Service
 """
 
 from ecs_composex.common import keyisset
-from ecs_composex.ecs.ecs_params import SERVICE_COUNT
+from ecs_composex.ecs.ecs_deployment import ServiceDeployment
+from ecs_composex.ecs.ecs_params import ELB_GRACE_PERIOD, SERVICE_COUNT
+from ecs_composex.ecs.ecs_placement import ServicePlacement
 from ecs_composex.ecs.ecs_scaling import ServiceScaling
 from ecs_composex.ecs.ecs_service_network_config import ServiceNetworking
 
@@ -47,6 +49,16 @@ class ServiceConfig(object):
         """
         self.network = ServiceNetworking(family)
         self.scaling = ServiceScaling(family.ordered_services)
+        self.placement = ServicePlacement(
+            family.ordered_services,
+            settings.ecs_cluster_providers,
+            settings.ecs_cluster_hosts_default,
+        )
+        self.deployment = ServiceDeployment(family.ordered_services)
+        if self.deployment.grace_period is not None:
+            family.stack_parameters[
+                ELB_GRACE_PERIOD.title
+            ] = self.deployment.grace_period
         self.use_appmesh = (
             False if not keyisset("x-appmesh", settings.compose_content) else True
         )
@@ -55,4 +67,6 @@ class ServiceConfig(object):
             family.stack_parameters[SERVICE_COUNT.title] = self.replicas
 
     def debug(self):
-        print(self.replicas, self.network, self.scaling)
+        print(
+            self.replicas, self.network, self.scaling, self.placement, self.deployment
+        )
@@ -58,6 +58,8 @@ def associate_services_to_root_stack(root_stack, settings, vpc_stack=None):
             family.stack.no_vpc_parameters(settings)
         else:
             family.stack.get_from_vpc_stack(vpc_stack)
+        if settings.ecs_cluster_providers_association:
+            family.stack.DependsOn.append(settings.ecs_cluster_providers_association)
         family.template.set_metadata(metadata)
         root_stack.stack_template.add_resource(family.stack)
         if settings.networks and family.service_config.network.networks:
@@ -25,7 +25,7 @@ from troposphere.ec2 import SecurityGroup
 from troposphere.iam import PolicyType
 from troposphere.logs import LogGroup
 
-from ecs_composex.common import build_template
+from ecs_composex.common import build_template, LOG
 from ecs_composex.common.cfn_params import (
     ROOT_STACK_NAME_T,
     ROOT_STACK_NAME,
@@ -132,7 +132,8 @@ def initialize_service_template(service_name):
 
 def create_log_group(service_tpl, family):
     """
-    Function to create a new Log Group for the services
+    Function to create a new Log Group for the services.
+    With FireLens, the log router ships the logs with the Task Role, which is granted access to the log group.
     :return:
     """
     svc_log = service_tpl.add_resource(
@@ -153,7 +154,9 @@ def create_log_group(service_tpl, family):
     service_tpl.add_resource(
         PolicyType(
             "CloudWatchLogsAcccess",
-            Roles=[Ref(ecs_params.EXEC_ROLE_T)],
+            Roles=[Ref(ecs_params.EXEC_ROLE_T)]
+            if not family.use_firelens
+            else [Ref(ecs_params.EXEC_ROLE_T), Ref(ecs_params.TASK_ROLE_T)],
             PolicyName=Sub(f"CloudWatchAccessFor${{{ecs_params.SERVICE_NAME_T}}}"),
             PolicyDocument={
                 "Version": "2012-10-17",
@@ -258,6 +261,34 @@ def get_service_family_name(services_families, service_name):
     return None
 
 
+def report_fargate_sizing(families):
+    """
+    Function to log the unused vCPU and RAM of each family Fargate configuration and the total for all families.
+
+    :param dict families: The families of the settings
+    """
+    sized_families = [family for family in families.values() if family.fargate_sizing]
+    if not sized_families:
+        return
+    for family in sized_families:
+        sizing = family.fargate_sizing
+        LOG.info(
+            f"{family.logical_name} - Fargate {sizing['Cpu']}/{sizing['Memory']} "
+            f"for {sizing['RequiredCpu']}/{sizing['RequiredMemory']} required. "
+            f"Unused {sizing['UnusedVCpu']} vCPU / {sizing['UnusedGB']} GB"
+        )
+    unused_cpu = sum(family.fargate_sizing["UnusedVCpu"] for family in sized_families)
+    unused_ram = sum(family.fargate_sizing["UnusedGB"] for family in sized_families)
+    hourly_price = sum(
+        family.fargate_sizing["HourlyPrice"] for family in sized_families
+    )
+    LOG.info(
+        f"Fargate sizing for {len(sized_families)} families: "
+        f"unused {round(unused_cpu, 3)} vCPU / {round(unused_ram, 3)} GB per task, "
+        f"{round(hourly_price, 4)} USD/hour for one task of each family."
+    )
+
+
 def generate_services(settings):
     """
     Function to handle creation of services within the same family.
@@ -296,3 +327,4 @@ def generate_services(settings):
         family.set_repository_credentials(settings)
         family.set_codeguru_profiles_arns()
         family.set_volumes()
+    report_fargate_sizing(settings.families)
@@ -33,6 +33,7 @@ from ecs_composex.common import (
     keyisset,
 )
 from ecs_composex.common.cfn_params import (
+    COMPUTE_STACK_NAME,
     ROOT_STACK_NAME_T,
 )
 from ecs_composex.common.ecs_composex import X_KEY, X_AWS_KEY
@@ -42,12 +43,12 @@ from ecs_composex.compute.compute_stack import ComputeStack
 from ecs_composex.dns import DnsSettings
 from ecs_composex.dns.dns_records import DnsRecords
 from ecs_composex.ecs.ecs_cluster import add_ecs_cluster
+from ecs_composex.ecs.ecs_params import CLUSTER_NAME_T
 from ecs_composex.ecs.ecs_stack import associate_services_to_root_stack
 from ecs_composex.vpc import vpc_params
 from ecs_composex.vpc.vpc_stack import add_vpc_to_root
 
 RES_REGX = re.compile(r"(^([x-]+))")
-COMPUTE_STACK_NAME = "Ec2Compute"
 VPC_STACK_NAME = "vpc"
 MESH_TITLE = "RootMesh"
 
@@ -65,6 +66,7 @@ SUPPORTED_X_MODULE_NAMES = [
     "kinesis",
     "elasticache",
     "efs",
+    "dax",
 ]
 
 SUPPORTED_X_MODULES = [f"{X_KEY}{mod_name}" for mod_name in SUPPORTED_X_MODULE_NAMES]
@@ -77,7 +79,7 @@ EXCLUDED_X_KEYS = [
     f"{X_KEY}dns",
     f"{X_KEY}cluster",
 ]
-TCP_MODES = ["rds", "appmesh", "elbv2", "docdb", "elasticache", "efs"]
+TCP_MODES = ["rds", "appmesh", "elbv2", "docdb", "elasticache", "efs", "dax"]
 TCP_SERVICES = [f"{X_KEY}{mode}" for mode in TCP_MODES]
 
 
@@ -210,11 +212,17 @@ def add_compute(root_template, settings, vpc_stack):
     """
     if not settings.create_compute:
         return None
-    parameters = {ROOT_STACK_NAME_T: Ref(AWS_STACK_NAME)}
+    parameters = {
+        ROOT_STACK_NAME_T: Ref(AWS_STACK_NAME),
+        CLUSTER_NAME_T: settings.ecs_cluster,
+    }
     compute_stack = ComputeStack(
         COMPUTE_STACK_NAME, settings=settings, parameters=parameters
     )
-    if isinstance(settings.ecs_cluster, Ref):
+    if (
+        isinstance(settings.ecs_cluster, Ref)
+        and settings.ecs_cluster.data["Ref"] != AWS_STACK_NAME
+    ):
         compute_stack.DependsOn.append(settings.ecs_cluster.data["Ref"])
     if vpc_stack is not None:
         compute_stack.get_from_vpc_stack(vpc_stack)
@@ -336,6 +344,7 @@ def generate_full_template(settings):
     settings.set_networks(vpc_stack, root_stack)
     dns_settings = DnsSettings(root_stack, settings, get_vpc_id(vpc_stack))
     settings.ecs_cluster = add_ecs_cluster(root_stack, settings)
+    add_compute(root_stack.stack_template, settings, vpc_stack)
     associate_services_to_root_stack(root_stack, settings, vpc_stack)
     if keyisset(ACM_KEY, settings.compose_content):
         init_acm_certs(settings, dns_settings, root_stack)
@@ -82,6 +82,17 @@ def get_replica_group_config(resource, cluster_name, session):
             CacheClusterId=cluster["MemberClusters"][0]
         )
         sg_id = node_r["CacheClusters"][0]["SecurityGroups"][0]["SecurityGroupId"]
+        if keyisset("ClusterEnabled", cluster):
+            resource.port_attr = elasticache_params.REPLICA_CONFIG_PORT
+            return {
+                elasticache_params.REPLICA_CONFIG_ADDRESS.title: cluster[
+                    "ConfigurationEndpoint"
+                ]["Address"],
+                elasticache_params.REPLICA_CONFIG_PORT.title: cluster[
+                    "ConfigurationEndpoint"
+                ]["Port"],
+                elasticache_params.CLUSTER_SG.title: [sg_id],
+            }
         resource.port_attr = elasticache_params.REPLICA_PRIMARY_PORT
         return {
             elasticache_params.REPLICA_PRIMARY_ADDRESS.title: cluster["NodeGroups"][0][
@@ -96,6 +107,12 @@ def get_replica_group_config(resource, cluster_name, session):
             elasticache_params.REPLICA_READ_ENDPOINT_PORTS.title: [
                 cluster["NodeGroups"][0]["ReaderEndpoint"]["Port"]
             ],
+            elasticache_params.REPLICA_READER_ADDRESS.title: cluster["NodeGroups"][0][
+                "ReaderEndpoint"
+            ]["Address"],
+            elasticache_params.REPLICA_READER_PORT.title: cluster["NodeGroups"][0][
+                "ReaderEndpoint"
+            ]["Port"],
             elasticache_params.CLUSTER_SG.title: [sg_id],
         }
     except client.exceptions.ReplicationGroupNotFoundFault as error:
@@ -21,9 +21,13 @@ Module to handle Linking ECS tasks and the elastic cache clusters
 
 from troposphere import FindInMap, Select
 
-from ecs_composex.common import keyisset
+from ecs_composex.common import LOG, add_parameters, keyisset
+from ecs_composex.common.compose_resources import get_parameter_settings
+from ecs_composex.common.services_helpers import extend_container_envvars
+from ecs_composex.ecs.ecs_iam import define_service_containers
 from ecs_composex.elasticache.elasticache_aws import lookup_cluster_resource
-from ecs_composex.elasticache.elasticache_params import CLUSTER_SG
+from ecs_composex.elasticache.elasticache_params import CLUSTER_CONFIG, CLUSTER_SG
+from ecs_composex.resource_settings import get_selected_services
 from ecs_composex.tcp_resources_settings import (
     handle_new_tcp_resource,
     add_security_group_ingress,
@@ -51,6 +55,36 @@ def link_cluster_to_service(cluster, cluster_mappings, mapping_name):
         )
 
 
+def add_cluster_env_vars(cluster):
+    """
+    Function to pass the cluster endpoints and JSON config to the services as environment variables
+
+    :param ecs_composex.elasticache.elasticache_stack.CacheCluster cluster:
+    """
+    parameters = list(cluster.env_vars_parameters)
+    if CLUSTER_CONFIG in cluster.attributes_outputs:
+        parameters.append(CLUSTER_CONFIG)
+    if not parameters:
+        return
+    cluster.generate_resource_envvars()
+    for target in cluster.families_targets:
+        selected_services = get_selected_services(cluster, target)
+        if not selected_services:
+            continue
+        settings = [
+            get_parameter_settings(cluster, parameter) for parameter in parameters
+        ]
+        add_parameters(target[0].template, [setting[1] for setting in settings])
+        target[0].stack.Parameters.update(
+            {setting[0]: setting[2] for setting in settings}
+        )
+        for container in define_service_containers(target[0].template):
+            for service in selected_services:
+                if container.Name == service.name:
+                    LOG.debug(f"{cluster.name} - Env vars for {service.name}")
+                    extend_container_envvars(container, cluster.env_vars)
+
+
 def create_lookup_mappings(mappings, lookup_resources, settings):
     """
     Function to build up the Mappings for ElastiCache
@@ -90,6 +124,7 @@ def elasticache_to_ecs(resources, services_stack, res_root_stack, settings):
             port_parameter=new_res.port_attr,
             sg_parameter=CLUSTER_SG,
         )
+        add_cluster_env_vars(new_res)
     create_lookup_mappings(db_mappings, lookup_resources, settings)
     for lookup_res in lookup_resources:
         if keyisset(lookup_res.logical_name, db_mappings):
@@ -35,7 +35,7 @@ CLUSTER_SG = Parameter(CLUSTER_SG_T, return_value="GroupId", Type=SG_ID_TYPE)
 
 CLUSTER_PORT_T = "Port"
 CLUSTER_PORT = Parameter(
-    CLUSTER_PORT_T, Type="Number", MinValue=1, MaxValue=((2 ** 16) - 1)
+    CLUSTER_PORT_T, Type="Number", MinValue=1, MaxValue=((2**16) - 1)
 )
 
 CLUSTER_MEMCACHED_ADDRESS_T = "ClusterConfigAddress"
@@ -80,6 +80,32 @@ REPLICA_PRIMARY_PORT = Parameter(
     Type="String",
 )
 
+REPLICA_READER_ADDRESS_T = "ReaderEndPointAddress"
+REPLICA_READER_ADDRESS = Parameter(
+    REPLICA_READER_ADDRESS_T, return_value="ReaderEndPoint.Address", Type="String"
+)
+
+REPLICA_READER_PORT_T = "ReaderEndPointPort"
+REPLICA_READER_PORT = Parameter(
+    REPLICA_READER_PORT_T,
+    return_value="ReaderEndPoint.Port",
+    Type="String",
+)
+
+REPLICA_CONFIG_ADDRESS_T = "ConfigurationEndPointAddress"
+REPLICA_CONFIG_ADDRESS = Parameter(
+    REPLICA_CONFIG_ADDRESS_T,
+    return_value="ConfigurationEndPoint.Address",
+    Type="String",
+)
+
+REPLICA_CONFIG_PORT_T = "ConfigurationEndPointPort"
+REPLICA_CONFIG_PORT = Parameter(
+    REPLICA_CONFIG_PORT_T,
+    return_value="ConfigurationEndPoint.Port",
+    Type="String",
+)
+
 REPLICA_READ_ENDPOINT_ADDRESSES_T = "ReadEndPointAddresses"
 REPLICA_READ_ENDPOINT_ADDRESSES = Parameter(
     REPLICA_READ_ENDPOINT_ADDRESSES_T,
@@ -22,6 +22,7 @@ Module to handle the AWS ES Stack and resources creation
 import json
 
 from troposphere import Ref, GetAtt, Sub
+from troposphere.ecs import Environment
 from troposphere.ssm import Parameter as SSMParameter
 
 from ecs_composex.common.compose_resources import XResource, set_resources
@@ -38,6 +39,10 @@ from ecs_composex.elasticache.elasticache_params import (
     REPLICA_READ_ENDPOINT_PORTS,
     REPLICA_PRIMARY_ADDRESS,
     REPLICA_PRIMARY_PORT,
+    REPLICA_READER_ADDRESS,
+    REPLICA_READER_PORT,
+    REPLICA_CONFIG_ADDRESS,
+    REPLICA_CONFIG_PORT,
     CLUSTER_SG,
     CLUSTER_CONFIG,
 )
@@ -60,6 +65,7 @@ class CacheCluster(XResource):
         self.engine = None
         self.port_attr = None
         self.config_parameter = None
+        self.env_vars_parameters = []
         super().__init__(name, definition, module_name, settings)
         self.set_override_subnets()
 
@@ -83,6 +89,7 @@ class CacheCluster(XResource):
             ),
             CLUSTER_SG: (self.db_sg.title, self.db_sg, GetAtt, CLUSTER_SG.return_value),
         }
+        self.env_vars_parameters = [CLUSTER_MEMCACHED_ADDRESS, CLUSTER_MEMCACHED_PORT]
 
     def add_memcahed_config(self, template):
         self.port_attr = CLUSTER_MEMCACHED_PORT
@@ -134,9 +141,27 @@ class CacheCluster(XResource):
                 GetAtt,
                 REPLICA_READ_ENDPOINT_PORTS.return_value,
             ),
+            REPLICA_READER_ADDRESS: (
+                f"{self.logical_name}{REPLICA_READER_ADDRESS.title}",
+                self.cfn_resource,
+                GetAtt,
+                REPLICA_READER_ADDRESS.return_value,
+            ),
+            REPLICA_READER_PORT: (
+                f"{self.logical_name}{REPLICA_READER_PORT.title}",
+                self.cfn_resource,
+                GetAtt,
+                REPLICA_READER_PORT.return_value,
+            ),
             CLUSTER_SG: (self.db_sg.title, self.db_sg, GetAtt, CLUSTER_SG.return_value),
         }
         self.port_attr = REPLICA_PRIMARY_PORT
+        self.env_vars_parameters = [
+            REPLICA_PRIMARY_ADDRESS,
+            REPLICA_PRIMARY_PORT,
+            REPLICA_READER_ADDRESS,
+            REPLICA_READER_PORT,
+        ]
 
     def add_redis_replica_config(self, template):
         if not self.lookup:
@@ -149,8 +174,10 @@ class CacheCluster(XResource):
                         {
                             "endpoint": f"${{{self.logical_name}.{REPLICA_PRIMARY_ADDRESS.return_value}}}",
                             "port": f"${{{self.logical_name}.{REPLICA_PRIMARY_PORT.return_value}}}",
-                            "readendpoints": f"{{{self.logical_name}{REPLICA_READ_ENDPOINT_ADDRESSES.return_value}}}",
-                            "readports": f"{{{self.logical_name}{REPLICA_READ_ENDPOINT_PORTS.return_value}}}",
+                            "readendpoints": f"${{{self.logical_name}.{REPLICA_READ_ENDPOINT_ADDRESSES.return_value}}}",
+                            "readports": f"${{{self.logical_name}.{REPLICA_READ_ENDPOINT_PORTS.return_value}}}",
+                            "readerendpoint": f"${{{self.logical_name}.{REPLICA_READER_ADDRESS.return_value}}}",
+                            "readerport": f"${{{self.logical_name}.{REPLICA_READER_PORT.return_value}}}",
                             "url": f"redis://${{{self.logical_name}.{REPLICA_PRIMARY_ADDRESS.return_value}}}:"
                             f"${{{self.logical_name}.{REPLICA_PRIMARY_PORT.return_value}}}",
                         }
@@ -164,6 +191,55 @@ class CacheCluster(XResource):
                 None,
             )
 
+    def init_redis_cluster_mode_outputs(self):
+        """
+        Method to init the outputs of a Redis replication group with cluster mode enabled,
+        which clients reach via the configuration endpoint.
+        """
+        self.output_properties = {
+            CLUSTER_NAME: (self.logical_name, self.cfn_resource, Ref, None),
+            REPLICA_CONFIG_ADDRESS: (
+                f"{self.logical_name}{REPLICA_CONFIG_ADDRESS.title}",
+                self.cfn_resource,
+                GetAtt,
+                REPLICA_CONFIG_ADDRESS.return_value,
+            ),
+            REPLICA_CONFIG_PORT: (
+                f"{self.logical_name}{REPLICA_CONFIG_PORT.title}",
+                self.cfn_resource,
+                GetAtt,
+                REPLICA_CONFIG_PORT.return_value,
+            ),
+            CLUSTER_SG: (self.db_sg.title, self.db_sg, GetAtt, CLUSTER_SG.return_value),
+        }
+        self.port_attr = REPLICA_CONFIG_PORT
+        self.env_vars_parameters = [REPLICA_CONFIG_ADDRESS, REPLICA_CONFIG_PORT]
+
+    def add_redis_cluster_mode_config(self, template):
+        if not self.lookup:
+            self.config_parameter = SSMParameter(
+                f"{self.logical_name}Config",
+                template=template,
+                Type="String",
+                Value=Sub(
+                    json.dumps(
+                        {
+                            "endpoint": f"${{{self.logical_name}.{REPLICA_CONFIG_ADDRESS.return_value}}}",
+                            "port": f"${{{self.logical_name}.{REPLICA_CONFIG_PORT.return_value}}}",
+                            "url": f"redis://${{{self.logical_name}.{REPLICA_CONFIG_ADDRESS.return_value}}}:"
+                            f"${{{self.logical_name}.{REPLICA_CONFIG_PORT.return_value}}}",
+                            "clustermode": True,
+                        }
+                    ),
+                ),
+            )
+            self.output_properties[CLUSTER_CONFIG] = (
+                self.config_parameter.title,
+                self.config_parameter,
+                Ref,
+                None,
+            )
+
     def init_redis_outputs(self):
         self.output_properties = {
             CLUSTER_NAME: (self.logical_name, self.cfn_resource, Ref, None),
@@ -182,6 +258,7 @@ class CacheCluster(XResource):
             CLUSTER_SG: (self.db_sg.title, self.db_sg, GetAtt, CLUSTER_SG.return_value),
         }
         self.port_attr = CLUSTER_REDIS_PORT
+        self.env_vars_parameters = [CLUSTER_REDIS_ADDRESS, CLUSTER_REDIS_PORT]
 
     def add_redis_config(self, template):
         if not self.lookup:
@@ -207,6 +284,32 @@ class CacheCluster(XResource):
                 None,
             )
 
+    def generate_resource_envvars(self):
+        """
+        Method to define the env vars of the cluster endpoints, named after the parameters titles as the
+        return values contain dots, and the cluster JSON config from SSM under the resource name.
+        """
+        for env_name in self.init_env_names():
+            for parameter in self.env_vars_parameters:
+                self.env_vars.append(
+                    Environment(
+                        Name=f"{env_name}_{parameter.title}",
+                        Value=Ref(
+                            self.attributes_outputs[parameter]["ImportParameter"]
+                        ),
+                    )
+                )
+            if CLUSTER_CONFIG in self.attributes_outputs:
+                self.env_vars.append(
+                    Environment(
+                        Name=env_name,
+                        Value=Ref(
+                            self.attributes_outputs[CLUSTER_CONFIG]["ImportParameter"]
+                        ),
+                    )
+                )
+        self.env_vars = list({v.Name: v for v in self.env_vars}.values())
+
 
 class XStack(ComposeXStack):
     """
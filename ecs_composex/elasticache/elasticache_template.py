@@ -19,7 +19,7 @@
 Module to create the ElasticCache Cluster and nodes
 """
 
-from troposphere import AWS_STACK_NAME
+from troposphere import AWS_NO_VALUE, AWS_STACK_NAME
 from troposphere import Ref, Sub, GetAtt, Tags
 from troposphere.ec2 import SecurityGroup
 from troposphere.elasticache import (
@@ -33,6 +33,15 @@ from ecs_composex.common import build_template, keyisset, LOG
 from ecs_composex.resources_import import import_record_properties
 from ecs_composex.vpc.vpc_params import VPC_ID, STORAGE_SUBNETS
 
+CLUSTER_MODE_KEY = "ClusterMode"
+DATA_TIERING_NODES_PREFIX = "cache.r6gd."
+CLUSTER_MODE_PARAMETER_GROUPS = {
+    "3": "default.redis3.2.cluster.on",
+    "4": "default.redis4.0.cluster.on",
+    "5": "default.redis5.0.cluster.on",
+    "6": "default.redis6.x.cluster.on",
+}
+
 
 def init_root_template():
     return build_template("Root stack for ElasticCache", [VPC_ID, STORAGE_SUBNETS])
@@ -178,6 +187,13 @@ def create_cluster_from_parameters(cluster, template):
     :return:
     """
     required_keys = ["Engine", "EngineVersion"]
+    if keyisset(CLUSTER_MODE_KEY, cluster.parameters):
+        if not all(keyisset(key, cluster.parameters) for key in required_keys):
+            raise KeyError(
+                f"{cluster.name} - {CLUSTER_MODE_KEY} requires at least", required_keys
+            )
+        create_cluster_mode_replication_group(cluster, template)
+        return
     if not cluster.properties and not all(
         key in required_keys for key in cluster.parameters
     ):
@@ -202,6 +218,125 @@ def create_cluster_from_parameters(cluster, template):
     template.add_resource(cluster.cfn_resource)
 
 
+def is_cluster_mode_enabled(cluster):
+    """
+    Function to determine whether the replication group has cluster mode enabled, sharding the data across node groups.
+    A single node group can also be cluster mode disabled, so it is only enabled with ClusterMode, more than one node
+    group, or a cluster mode enabled parameter group.
+
+    :param ecs_composex.elasticache.elasticache_stack.CacheCluster cluster:
+    :rtype: bool
+    """
+    resource = cluster.cfn_resource
+    if not isinstance(resource, ReplicationGroup):
+        return False
+    if keyisset(CLUSTER_MODE_KEY, cluster.parameters):
+        return True
+    props = resource.properties
+    num_node_groups = props.get("NumNodeGroups", None)
+    if isinstance(num_node_groups, (int, str)) and int(num_node_groups) > 1:
+        return True
+    if len(props.get("NodeGroupConfiguration", None) or []) > 1:
+        return True
+    group_name = props.get("CacheParameterGroupName", None)
+    if isinstance(group_name, str) and group_name.endswith(".cluster.on"):
+        return True
+    return bool(
+        cluster.parameter_group
+        and str(
+            cluster.parameter_group.properties.get("Properties", {}).get(
+                "cluster-enabled", "no"
+            )
+        ).lower()
+        == "yes"
+    )
+
+
+def define_cluster_mode_props(cluster_mode, parameters):
+    """
+    Function to define the sharding, replicas and failover properties of a cluster mode enabled replication group.
+    Automatic failover is required with cluster mode enabled, and Multi-AZ is enabled when there are replicas.
+
+    :param dict cluster_mode: the ClusterMode definition
+    :param dict parameters: the MacroParameters
+    :return: the replication group properties
+    :rtype: dict
+    :raises: ValueError
+    """
+    shards = int(cluster_mode.get("NumNodeGroups", 1))
+    replicas = int(cluster_mode.get("ReplicasPerNodeGroup", 1))
+    if not 1 <= shards <= 500:
+        raise ValueError(f"{CLUSTER_MODE_KEY}.NumNodeGroups must be between 1 and 500")
+    if not 0 <= replicas <= 5:
+        raise ValueError(
+            f"{CLUSTER_MODE_KEY}.ReplicasPerNodeGroup must be between 0 and 5"
+        )
+    multi_az = cluster_mode.get("MultiAZ", replicas > 0)
+    if multi_az and not replicas:
+        raise ValueError(f"{CLUSTER_MODE_KEY}.MultiAZ requires ReplicasPerNodeGroup")
+    node_type = parameters.get("CacheNodeType", "cache.t3.small")
+    if keyisset("DataTiering", cluster_mode) and not node_type.startswith(
+        DATA_TIERING_NODES_PREFIX
+    ):
+        raise ValueError(
+            f"{CLUSTER_MODE_KEY}.DataTiering requires {DATA_TIERING_NODES_PREFIX}* CacheNodeType. Got",
+            node_type,
+        )
+    return {
+        "CacheNodeType": node_type,
+        "NumNodeGroups": shards,
+        "ReplicasPerNodeGroup": replicas,
+        "AutomaticFailoverEnabled": True,
+        "MultiAZEnabled": bool(multi_az),
+        "DataTieringEnabled": True
+        if keyisset("DataTiering", cluster_mode)
+        else Ref(AWS_NO_VALUE),
+    }
+
+
+def create_cluster_mode_replication_group(cluster, template):
+    """
+    Function to create a Redis replication group with cluster mode enabled from the MacroParameters
+
+    :param ecs_composex.elasticache.elasticache_stack.CacheCluster cluster:
+    :param troposphere.Template template:
+    """
+    if cluster.parameters["Engine"] != "redis":
+        raise ValueError(f"{CLUSTER_MODE_KEY} is only supported for the redis Engine")
+    version = str(cluster.parameters["EngineVersion"])
+    props = define_cluster_mode_props(
+        cluster.parameters[CLUSTER_MODE_KEY], cluster.parameters
+    )
+    if keyisset("ParameterGroup", cluster.parameters):
+        create_parameter_group(cluster, cluster.parameters["ParameterGroup"])
+        template.add_resource(cluster.parameter_group)
+        props["CacheParameterGroupName"] = Ref(cluster.parameter_group)
+    elif keyisset(version.split(".")[0], CLUSTER_MODE_PARAMETER_GROUPS):
+        props["CacheParameterGroupName"] = CLUSTER_MODE_PARAMETER_GROUPS[
+            version.split(".")[0]
+        ]
+    else:
+        raise ValueError(
+            f"{cluster.name} - No default cluster mode parameter group for redis {version}."
+            " Define a ParameterGroup with cluster-enabled set to yes"
+        )
+    cluster.cfn_resource = ReplicationGroup(
+        cluster.logical_name,
+        template=template,
+        ReplicationGroupDescription=f"{cluster.name} redis cluster",
+        Engine="redis",
+        EngineVersion=version,
+        CacheSubnetGroupName=Ref(cluster.db_subnet_group),
+        SecurityGroupIds=[GetAtt(cluster.db_sg, "GroupId")],
+        Tags=Tags(Name=cluster.logical_name, ComposeName=cluster.name),
+        **props,
+    )
+    LOG.info(
+        f"{cluster.name} - Redis cluster with {props['NumNodeGroups']} shards "
+        f"and {props['ReplicasPerNodeGroup']} replicas per shard"
+    )
+
+
 def create_root_template(new_resources):
     """
     Function to create the root template and add the new resources to it.
@@ -241,6 +376,9 @@ def create_root_template(new_resources):
             elif resource.cfn_resource.Engine == "redis":
                 resource.init_redis_outputs()
                 resource.add_redis_config(root_template)
+        elif is_cluster_mode_enabled(resource):
+            resource.init_redis_cluster_mode_outputs()
+            resource.add_redis_cluster_mode_config(root_template)
         elif isinstance(resource.cfn_resource, ReplicationGroup):
             resource.init_redis_replica_outputs()
             resource.add_redis_replica_config(root_template)
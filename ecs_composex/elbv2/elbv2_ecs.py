@@ -221,6 +221,154 @@ def validate_attributes(target_definition):
         )
 
 
+TARGET_GROUP_ATTRIBUTES_KEY = "TargetGroupAttributes"
+DEREGISTRATION_DELAY = "deregistration_delay.timeout_seconds"
+SLOW_START = "slow_start.duration_seconds"
+LB_ALGORITHM = "load_balancing.algorithm.type"
+
+
+def validate_int_range(key, value, minimum, maximum):
+    if not isinstance(value, int) or not minimum <= value <= maximum:
+        raise ValueError(
+            f"{key} must be an integer between {minimum} and {maximum}. Got", value
+        )
+    return str(value)
+
+
+def validate_bool(key, value):
+    if not isinstance(value, bool):
+        raise TypeError(f"{key} must be", bool, "Got", type(value))
+    return str(value).lower()
+
+
+def validate_slow_start(key, value):
+    if value != 0:
+        return validate_int_range(key, value, 30, 900)
+    return str(value)
+
+
+def validate_allowed_values(allowed):
+    def validate(key, value):
+        if value not in allowed:
+            raise ValueError(f"{key} must be one of", allowed, "Got", value)
+        return str(value)
+
+    return validate
+
+
+def validate_string(key, value):
+    if not isinstance(value, str) or not value:
+        raise TypeError(f"{key} must be a non empty string. Got", value)
+    return value
+
+
+def get_target_group_attributes_settings():
+    """
+    Function to return the supported target group attributes, with their validation function and whether
+    they apply to the Application LB and the Network LB.
+
+    :return: list of (attribute key, validation function, is valid for ALB, is valid for NLB)
+    :rtype: list
+    """
+    return [
+        (
+            DEREGISTRATION_DELAY,
+            lambda key, value: validate_int_range(key, value, 0, 3600),
+            True,
+            True,
+        ),
+        (SLOW_START, validate_slow_start, True, False),
+        (
+            LB_ALGORITHM,
+            validate_allowed_values(["round_robin", "least_outstanding_requests"]),
+            True,
+            False,
+        ),
+        ("stickiness.enabled", validate_bool, True, True),
+        (
+            "stickiness.type",
+            validate_allowed_values(["lb_cookie", "app_cookie", "source_ip"]),
+            True,
+            True,
+        ),
+        (
+            "stickiness.lb_cookie.duration_seconds",
+            lambda key, value: validate_int_range(key, value, 1, 604800),
+            True,
+            False,
+        ),
+        ("stickiness.app_cookie.cookie_name", validate_string, True, False),
+        (
+            "stickiness.app_cookie.duration_seconds",
+            lambda key, value: validate_int_range(key, value, 1, 604800),
+            True,
+            False,
+        ),
+        (
+            "deregistration_delay.connection_termination.enabled",
+            validate_bool,
+            False,
+            True,
+        ),
+        ("proxy_protocol_v2.enabled", validate_bool, False, True),
+        ("preserve_client_ip.enabled", validate_bool, False, True),
+    ]
+
+
+def define_target_group_attributes(resource, target_definition):
+    """
+    Function to define the target group attributes from the x-elbv2 service definition.
+    Attributes are validated according to the LB type. The deregistration delay defaults to 60 seconds.
+
+    :param ecs_composex.elbv2.elbv2_stack.Elbv2 resource:
+    :param dict target_definition:
+    :return: the target group attributes
+    :rtype: list
+    """
+    attributes = {DEREGISTRATION_DELAY: "60"}
+    if not keyisset(TARGET_GROUP_ATTRIBUTES_KEY, target_definition):
+        return [
+            TargetGroupAttribute(Key=key, Value=value)
+            for key, value in attributes.items()
+        ]
+    settings = {
+        setting[0]: setting for setting in get_target_group_attributes_settings()
+    }
+    for key, value in target_definition[TARGET_GROUP_ATTRIBUTES_KEY].items():
+        if key not in settings.keys():
+            raise KeyError(
+                f"{target_definition['name']} - Target group attribute {key} is not supported. Supported",
+                list(settings.keys()),
+            )
+        setting = settings[key]
+        if (resource.is_alb() and not setting[2]) or (
+            resource.is_nlb() and not setting[3]
+        ):
+            raise ValueError(
+                f"{target_definition['name']} - {key} is not valid for a {resource.lb_type} LB"
+            )
+        attributes[key] = setting[1](key, value)
+    if keyisset("stickiness.type", attributes) and (
+        (resource.is_nlb() and attributes["stickiness.type"] != "source_ip")
+        or (resource.is_alb() and attributes["stickiness.type"] == "source_ip")
+    ):
+        raise ValueError(
+            f"{target_definition['name']} - stickiness.type {attributes['stickiness.type']} "
+            f"is not valid for a {resource.lb_type} LB"
+        )
+    if (
+        keyisset(SLOW_START, attributes)
+        and attributes[SLOW_START] != "0"
+        and attributes.get(LB_ALGORITHM) == "least_outstanding_requests"
+    ):
+        raise ValueError(
+            f"{target_definition['name']} - slow start is not supported with least_outstanding_requests"
+        )
+    return [
+        TargetGroupAttribute(Key=key, Value=value) for key, value in attributes.items()
+    ]
+
+
 def validate_props_and_service_definition(props, service):
     """
     Function to validate that the defined settings are valid according to the service definition.
@@ -298,9 +446,9 @@ def define_service_target_group(
         else target_definition["protocol"]
     )
     props["TargetType"] = "ip"
-    props["TargetGroupAttributes"] = [
-        TargetGroupAttribute(Key="deregistration_delay.timeout_seconds", Value="60")
-    ]
+    props["TargetGroupAttributes"] = define_target_group_attributes(
+        resource, target_definition
+    )
     validate_props_and_service_definition(props, service)
     target_group = TargetGroup(
         f"Tgt{resource.logical_name}{family.logical_name}{service.logical_name}{props['Port']}",
@@ -0,0 +1,502 @@
+#  -*- coding: utf-8 -*-
+#   ECS ComposeX <https://github.com/lambda-my-aws/ecs_composex>
+#   Copyright (C) 2020-2021  John Mille <john@lambda-my-aws.io>
+#  #
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#  #
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#  #
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module to compile the listener Targets access into Listener Rules.
+
+The access of the targets forwarding to the same target, with the same authentication, are merged into the fewest
+rules allowed by the ALB limits of 3 values per condition and 5 values per rule. Rules are then ordered by weight,
+highest first, whilst keeping the order of declaration between rules of different targets that might match the same
+requests. Rules that can never be evaluated, because the rules before match all their requests, are dropped.
+"""
+
+import re
+from json import dumps
+
+from troposphere import Ref
+from troposphere.elasticloadbalancingv2 import (
+    Condition,
+    HostHeaderConfig,
+    ListenerRule,
+    PathPatternConfig,
+)
+
+from ecs_composex.common import LOG, NONALPHANUM
+
+ALB_MAX_CONDITION_VALUES = 3
+ALB_MAX_RULE_VALUES = 5
+ALB_MAX_RULES = 100
+AUTH_KEYS = ["AuthenticateCognitoConfig", "AuthenticateOidcConfig"]
+WEIGHT_KEY = "weight"
+
+DOMAIN_PATH_RE = re.compile(
+    r"^((?=.{1,255}$)(?!-)[A-Za-z0-9\-]{1,63}(?:\.[A-Za-z0-9\-]{1,63})*\.?(?<!-))(?::[0-9]{1,5})?(/[\S]+$)"
+)
+DOMAIN_RE = re.compile(
+    r"^(?=.{1,255}$)(?!-)[A-Za-z0-9\-]{1,63}(\.[A-Za-z0-9\-]{1,63})*\.?(?<!-)$"
+)
+PATH_RE = re.compile(r"(?:.*)^[/][\S]+$")
+
+
+def parse_access_string(access_string):
+    """
+    Function to parse and understand what type of condition that is.
+    Supported :
+    * path based
+    * domain name
+    * domain name and path
+
+    :param str access_string:
+    :return: the host and the path, None when not set
+    :rtype: tuple
+    """
+    if (
+        DOMAIN_PATH_RE.match(access_string)
+        and len(DOMAIN_PATH_RE.match(access_string).groups()) == 2
+    ):
+        return DOMAIN_PATH_RE.match(access_string).groups()
+    elif DOMAIN_RE.match(access_string):
+        return access_string, None
+    elif PATH_RE.match(access_string):
+        return None, access_string
+    raise ValueError(f"Could not understand what the access is for {access_string}")
+
+
+def build_conditions(hosts, paths):
+    """
+    Function to create the host-header and path-pattern conditions
+
+    :param list hosts:
+    :param list paths:
+    :rtype: list
+    """
+    conditions = []
+    if hosts:
+        conditions.append(
+            Condition(
+                Field="host-header",
+                HostHeaderConfig=HostHeaderConfig(Values=hosts),
+            )
+        )
+    if paths:
+        conditions.append(
+            Condition(
+                Field="path-pattern",
+                PathPatternConfig=PathPatternConfig(Values=paths),
+            )
+        )
+    return conditions
+
+
+def get_target_accesses(service_def):
+    """
+    Function to return the list of access strings of a target, which can be a string or a list of strings
+
+    :param dict service_def:
+    :rtype: list
+    """
+    access = service_def["access"]
+    if isinstance(access, str):
+        return [access]
+    elif isinstance(access, list) and all(isinstance(item, str) for item in access):
+        return access
+    raise TypeError(
+        f"access for {service_def['name']} must be a string or a list of strings. Got",
+        type(access),
+    )
+
+
+def get_target_weight(service_def):
+    """
+    Function to return the weight of a target, 0 if not set
+
+    :param dict service_def:
+    :rtype: int
+    """
+    if WEIGHT_KEY not in service_def.keys():
+        return 0
+    if not isinstance(service_def[WEIGHT_KEY], int):
+        raise TypeError(
+            f"{WEIGHT_KEY} for {service_def['name']} must be an integer. Got",
+            type(service_def[WEIGHT_KEY]),
+        )
+    return service_def[WEIGHT_KEY]
+
+
+def pattern_covers(pattern, value):
+    """
+    Function to define whether a condition pattern, with * and ? wildcards, matches all that the value matches.
+    A * in the value is only matched by a * in the pattern.
+
+    :param str pattern:
+    :param str value:
+    :rtype: bool
+    """
+    regex = re.escape(pattern).replace(r"\*", ".*").replace(r"\?", r"[^*]")
+    return re.fullmatch(regex, value, re.IGNORECASE) is not None
+
+
+def patterns_cover(patterns, values):
+    """
+    Function to define whether a list of patterns matches all that the values match. None means any.
+
+    :param list patterns:
+    :param list values:
+    :rtype: bool
+    """
+    if patterns is None:
+        return True
+    if values is None:
+        return False
+    return all(
+        any(pattern_covers(pattern, value) for pattern in patterns) for value in values
+    )
+
+
+def patterns_intersect(pattern, other):
+    """
+    Function to define whether two patterns might match the same value.
+    Two patterns with wildcards are considered intersecting unless their literal prefixes or suffixes differ.
+
+    :param str pattern:
+    :param str other:
+    :rtype: bool
+    """
+    if pattern_covers(pattern, other) or pattern_covers(other, pattern):
+        return True
+    wildcards = re.compile(r"[*?]")
+    if not wildcards.search(pattern) or not wildcards.search(other):
+        return False
+    prefixes = sorted(
+        [wildcards.split(pattern)[0].lower(), wildcards.split(other)[0].lower()],
+        key=len,
+    )
+    suffixes = sorted(
+        [wildcards.split(pattern)[-1].lower(), wildcards.split(other)[-1].lower()],
+        key=len,
+    )
+    return prefixes[1].startswith(prefixes[0]) and suffixes[1].endswith(suffixes[0])
+
+
+def patterns_overlap(patterns, others):
+    """
+    Function to define whether two lists of patterns might match the same value. None means any.
+
+    :param list patterns:
+    :param list others:
+    :rtype: bool
+    """
+    if patterns is None or others is None:
+        return True
+    return any(
+        patterns_intersect(pattern, other) for pattern in patterns for other in others
+    )
+
+
+def remove_covered_values(values):
+    """
+    Function to drop the values matched by another value of the list, i.e. /api/v1/* with /api/*
+
+    :param list values:
+    :rtype: list
+    """
+    kept = []
+    for count, value in enumerate(values):
+        if not any(
+            pattern_covers(other, value)
+            and (not pattern_covers(value, other) or other_count < count)
+            for other_count, other in enumerate(values)
+            if other_count != count
+        ):
+            kept.append(value)
+    return kept
+
+
+class CompiledRule(object):
+    """
+    Class to represent a listener rule, with its conditions values, before it gets its priority.
+    """
+
+    def __init__(self, service_def, actions_key, hosts, paths, weight, index):
+        """
+        :param dict service_def: The target definition, used to define the actions
+        :param tuple actions_key: identifies the target and authentication of the rule actions
+        :param list hosts: the host-header values, None for any host
+        :param list paths: the path-pattern values, None for any path
+        :param int weight:
+        :param tuple index: order of declaration
+        """
+        self.service_def = service_def
+        self.actions_key = actions_key
+        self.hosts = hosts
+        self.paths = paths
+        self.weight = weight
+        self.index = index
+
+    def __repr__(self):
+        return f"{self.service_def['name']}({self.hosts}, {self.paths})"
+
+    def covers(self, rule):
+        """
+        Method to define whether this rule matches all the requests the other rule matches.
+
+        :param CompiledRule rule:
+        :rtype: bool
+        """
+        return patterns_cover(self.hosts, rule.hosts) and patterns_cover(
+            self.paths, rule.paths
+        )
+
+    def overlaps(self, rule):
+        """
+        Method to define whether this rule and the other rule might match the same requests
+
+        :param CompiledRule rule:
+        :rtype: bool
+        """
+        return patterns_overlap(self.hosts, rule.hosts) and patterns_overlap(
+            self.paths, rule.paths
+        )
+
+    def conflicts(self, rule):
+        """
+        Method to define whether the order between this rule and the other changes where requests are sent to.
+
+        :param CompiledRule rule:
+        :rtype: bool
+        """
+        return self.actions_key != rule.actions_key and self.overlaps(rule)
+
+    def is_shadowed(self, rules):
+        """
+        Method to define whether all the hosts and paths combinations of this rule are matched by the given rules.
+
+        :param list rules: The rules evaluated before this one
+        :rtype: bool
+        """
+        for host in self.hosts if self.hosts else [None]:
+            for path in self.paths if self.paths else [None]:
+                combo = CompiledRule(
+                    self.service_def,
+                    self.actions_key,
+                    [host] if host else None,
+                    [path] if path else None,
+                    self.weight,
+                    self.index,
+                )
+                if not any(rule.covers(combo) for rule in rules):
+                    return False
+        return True
+
+
+def chunk(values, size):
+    """
+    Function to split the values into lists of size at most.
+
+    :param list values:
+    :param int size:
+    :rtype: list
+    """
+    return [values[count : count + size] for count in range(0, len(values), size)]
+
+
+def define_targets_access_rules(services_defs):
+    """
+    Function to define one rule per access of each target, in order of declaration.
+
+    :param list services_defs:
+    :rtype: list
+    """
+    rules = []
+    for index, service_def in enumerate(services_defs):
+        actions_key = (
+            service_def["name"],
+            dumps(
+                [service_def.get(key) for key in AUTH_KEYS], sort_keys=True, default=str
+            ),
+        )
+        weight = get_target_weight(service_def)
+        for access_index, access in enumerate(get_target_accesses(service_def)):
+            host, path = parse_access_string(access)
+            rules.append(
+                CompiledRule(
+                    service_def,
+                    actions_key,
+                    [host] if host else None,
+                    [path] if path else None,
+                    weight,
+                    (index, access_index),
+                )
+            )
+    return rules
+
+
+def merge_rules(rules):
+    """
+    Function to merge the rules with the same target and authentication into the fewest rules, within the ALB
+    limits of values per condition and per rule: paths of the same host together, hosts without paths together.
+    Rules that might match the same requests as rules of another target are not merged, so their order is kept.
+
+    :param list rules: rules of a single access, in order of declaration
+    :return: the merged rules
+    :rtype: list
+    """
+    groups = {}
+    merged = []
+    for rule in rules:
+        if any(rule.conflicts(other) for other in rules):
+            merged.append(rule)
+            continue
+        if rule.hosts and rule.paths:
+            group_key = (rule.actions_key, rule.hosts[0].lower(), "paths")
+        elif rule.hosts:
+            group_key = (rule.actions_key, None, "hosts")
+        else:
+            group_key = (rule.actions_key, None, "paths")
+        if group_key not in groups:
+            groups[group_key] = CompiledRule(
+                rule.service_def,
+                rule.actions_key,
+                rule.hosts,
+                [] if rule.paths else None,
+                rule.weight,
+                rule.index,
+            )
+            if not rule.paths:
+                groups[group_key].hosts = []
+        group = groups[group_key]
+        group.weight = max(group.weight, rule.weight)
+        values = group.paths if rule.paths else group.hosts
+        value = rule.paths[0] if rule.paths else rule.hosts[0]
+        if value not in values:
+            values.append(value)
+    for group_key, group in groups.items():
+        if group_key[-1] == "hosts":
+            for hosts in chunk(
+                remove_covered_values(group.hosts), ALB_MAX_CONDITION_VALUES
+            ):
+                merged.append(
+                    CompiledRule(
+                        group.service_def,
+                        group.actions_key,
+                        hosts,
+                        None,
+                        group.weight,
+                        group.index,
+                    )
+                )
+        else:
+            size = min(
+                ALB_MAX_CONDITION_VALUES,
+                ALB_MAX_RULE_VALUES - (len(group.hosts) if group.hosts else 0),
+            )
+            for paths in chunk(remove_covered_values(group.paths), size):
+                merged.append(
+                    CompiledRule(
+                        group.service_def,
+                        group.actions_key,
+                        group.hosts,
+                        paths,
+                        group.weight,
+                        group.index,
+                    )
+                )
+    return merged
+
+
+def order_rules(rules):
+    """
+    Function to order the rules by weight, highest first, then declaration order.
+    A rule is only placed once the rules of other targets declared before it, which might match the same requests,
+    have been placed.
+
+    :param list rules:
+    :return: the ordered rules
+    :rtype: list
+    """
+    left = sorted(rules, key=lambda rule: (-rule.weight, rule.index))
+    ordered = []
+    while left:
+        for rule in left:
+            if not any(
+                other.index < rule.index and rule.conflicts(other) for other in left
+            ):
+                break
+        else:
+            rule = left[0]
+        left.remove(rule)
+        ordered.append(rule)
+    return ordered
+
+
+def remove_shadowed_rules(listener_name, rules):
+    """
+    Function to drop the rules that the rules before them already match entirely.
+
+    :param str listener_name:
+    :param list rules: ordered rules
+    :return: the reachable rules
+    :rtype: list
+    """
+    reachable = []
+    for rule in rules:
+        if rule.is_shadowed(reachable):
+            LOG.warning(
+                f"{listener_name} - {rule} is never evaluated, the rules before it match all its requests."
+                " Skipping"
+            )
+            continue
+        reachable.append(rule)
+    return reachable
+
+
+def compile_listener_rules(listener, services_defs, actions_function):
+    """
+    Function to create the ListenerRules for the targets of a listener, merged, ordered and without shadowed rules.
+
+    :param ecs_composex.elbv2.elbv2_stack.ComposeListener listener:
+    :param list services_defs: the targets definitions
+    :param actions_function: function to define the actions for a target definition
+    :return: the listener rules
+    :rtype: list
+    """
+    rules = define_targets_access_rules(services_defs)
+    access_count = len(rules)
+    rules = remove_shadowed_rules(listener.title, order_rules(merge_rules(rules)))
+    LOG.info(
+        f"{listener.title} - {access_count} targets access compiled into {len(rules)} listener rules"
+    )
+    if len(rules) > ALB_MAX_RULES:
+        LOG.warning(
+            f"{listener.title} - {len(rules)} rules exceeds the default limit of {ALB_MAX_RULES} rules per listener."
+        )
+    listener_rules = []
+    names = {}
+    for priority, rule in enumerate(rules, start=1):
+        name = NONALPHANUM.sub("", rule.service_def["name"])
+        names[name] = names.get(name, 0) + 1
+        suffix = "" if names[name] == 1 else str(names[name])
+        listener_rules.append(
+            ListenerRule(
+                f"{listener.title}{name}Rule{suffix}",
+                ListenerArn=Ref(listener),
+                Actions=actions_function(listener, rule.service_def),
+                Priority=priority,
+                Conditions=build_conditions(rule.hosts, rule.paths),
+            )
+        )
+    return listener_rules
@@ -31,16 +31,12 @@ from troposphere.elasticloadbalancingv2 import (
     LoadBalancerAttributes,
     SubnetMapping,
     Listener,
-    ListenerRule,
     ListenerCertificate,
     Certificate,
     Action,
-    Condition,
     RedirectConfig,
     ForwardConfig,
     FixedResponseConfig,
-    HostHeaderConfig,
-    PathPatternConfig,
     TargetGroupTuple,
     AuthenticateCognitoConfig,
     AuthenticateOidcConfig,
@@ -55,6 +51,7 @@ from ecs_composex.common.cfn_params import ROOT_STACK_NAME, Parameter
 from ecs_composex.common.compose_resources import XResource, set_resources
 from ecs_composex.common.outputs import ComposeXOutput
 from ecs_composex.common.stacks import ComposeXStack
+from ecs_composex.elbv2.elbv2_rules import compile_listener_rules, get_target_accesses
 from ecs_composex.elbv2.elbv2_params import (
     MOD_KEY,
     RES_KEY,
@@ -188,74 +185,6 @@ def handle_default_actions(listener):
                 action[1](listener, source_value)
 
 
-def handle_string_condition_format(access_string):
-    """
-    Function to parse and understand what type of condition that is.
-    Supported :
-    * path based
-    * domain name
-
-    :param access_string:
-    :return:
-    """
-    domain_path_re = re.compile(
-        r"^((?=.{1,255}$)(?!-)[A-Za-z0-9\-]{1,63}(?:\.[A-Za-z0-9\-]{1,63})*\.?(?<!-))(?::[0-9]{1,5})?(/[\S]+$)"
-    )
-    domain_re = re.compile(
-        r"^(?=.{1,255}$)(?!-)[A-Za-z0-9\-]{1,63}(\.[A-Za-z0-9\-]{1,63})*\.?(?<!-)$"
-    )
-    path_re = re.compile(r"(?:.*)^[/][\S]+$")
-    if (
-        domain_path_re.match(access_string)
-        and len(domain_path_re.match(access_string).groups()) == 2
-    ):
-        return [
-            Condition(
-                Field="host-header",
-                HostHeaderConfig=HostHeaderConfig(
-                    Values=[domain_path_re.match(access_string).groups()[0]],
-                ),
-            ),
-            Condition(
-                Field="path-pattern",
-                PathPatternConfig=PathPatternConfig(
-                    Values=[domain_path_re.match(access_string).groups()[1]]
-                ),
-            ),
-        ]
-    elif domain_re.match(access_string):
-        return [
-            Condition(
-                Field="host-header",
-                HostHeaderConfig=HostHeaderConfig(
-                    HttpHeaderName="Host", Values=[access_string]
-                ),
-            )
-        ]
-    elif path_re.match(access_string):
-        return [
-            Condition(
-                Field="path-pattern",
-                PathPatternConfig=PathPatternConfig(Values=[access_string]),
-            )
-        ]
-    else:
-        raise ValueError(f"Could not understand what the access is for {access_string}")
-
-
-def define_target_conditions(definition):
-    """
-    Function to create the conditions for forward to target
-    :param definition:
-    :return: list of conditions
-    :rtype: list
-    """
-    conditions = []
-    if isinstance(definition["access"], str):
-        return handle_string_condition_format(definition["access"])
-    return conditions
-
-
 def define_actions(listener, target_def):
     """
     Function to identify the Target definition and create the resulting rule appropriately.
@@ -334,17 +263,7 @@ def define_listener_rules_actions(listener, left_services):
     :param list left_services:
     :return: The action to add or action list for default target
     """
-    rules = []
-    for count, service_def in enumerate(left_services):
-        rule = ListenerRule(
-            f"{listener.title}{NONALPHANUM.sub('', service_def['name'])}Rule",
-            ListenerArn=Ref(listener),
-            Actions=define_actions(listener, service_def),
-            Priority=(count + 1),
-            Conditions=define_target_conditions(service_def),
-        )
-        rules.append(rule)
-    return rules
+    return compile_listener_rules(listener, left_services, define_actions)
 
 
 def handle_non_default_services(listener, services_def):
@@ -356,10 +275,14 @@ def handle_non_default_services(listener, services_def):
     """
     default_target = None
     left_services = deepcopy(services_def)
-    for count, service_def in enumerate(services_def):
-        if isinstance(service_def["access"], str) and service_def["access"] == "/":
+    for count, service_def in enumerate(left_services):
+        accesses = get_target_accesses(service_def)
+        if "/" in accesses:
             default_target = service_def
-            left_services.pop(count)
+            if len(accesses) == 1:
+                left_services.pop(count)
+            else:
+                service_def["access"] = [access for access in accesses if access != "/"]
             break
     if not default_target:
         LOG.warning("No service path matches /. Defaulting to return TeaPot")
@@ -787,6 +710,7 @@ class Elbv2(XResource):
             ("port", int),
             ("healthcheck", str),
             ("protocol", str),
+            ("TargetGroupAttributes", dict),
         ]
         for service in self.services:
             if not all(
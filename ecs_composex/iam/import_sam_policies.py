@@ -20,24 +20,29 @@ Module to import Policies templates from AWS SAM policies templates.
 """
 
 import json
+from copy import deepcopy
+
 from samtranslator.policy_templates_data import POLICY_TEMPLATES_FILE
 
+SAM_POLICIES = {}
+
 
 def import_and_cleanse_policies():
     """
     Function to go over each policy defined in AWS SAM policies and align it to ECS ComposeX expected format.
+    The policies file is only parsed once per python process, each call gets its own copy.
 
     :return: The policies
     :rtype: dict
     """
-
+    if SAM_POLICIES:
+        return deepcopy(SAM_POLICIES)
     with open(POLICY_TEMPLATES_FILE, "r") as policies_fd:
         policies_orig = json.loads(policies_fd.read())["Templates"]
-    import_policies = {}
 
     for name, value in policies_orig.items():
-        import_policies[name] = {
+        SAM_POLICIES[name] = {
             "Action": value["Definition"]["Statement"][0]["Action"],
             "Effect": "Allow",
         }
-    return import_policies
+    return deepcopy(SAM_POLICIES)
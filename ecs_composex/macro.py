@@ -22,52 +22,221 @@ Passes all the arguments to ECS ComposeX to render the CFN templates for the doc
 
 import re
 import requests
-import boto3
 import tempfile
 import yaml
-from os import path
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
+from hashlib import sha1
+from os import fdopen, makedirs, path, remove, replace
 from urllib.parse import urlparse
 
+from botocore.exceptions import ClientError
+from requests.adapters import HTTPAdapter
+
 from ecs_composex.common import LOG, keyisset
+from ecs_composex.common.aws import get_account_id
+from ecs_composex.common.cache import WARM_STATE
 from ecs_composex.common.settings import ComposeXSettings
 from ecs_composex.common.stacks import process_stacks
 from ecs_composex.ecs_composex import generate_full_template
 
 
+REMOTE_FILES_CACHE_DIR = "/tmp/composex-remote-files"
+REMOTE_FILES_CHUNK_SIZE = 64 * 1024
+REMOTE_FILES_MAX_WORKERS = 8
+S3_FILE_RE = re.compile(r"(?:s3://)([a-z0-9-.]+)/([\S]+$)")
+
+
+def get_http_session():
+    """
+    Function to get the requests session used for HTTPS files, which keeps the connections pool between invocations.
+
+    :return: requests session
+    :rtype: requests.Session
+    """
+
+    def create_http_session():
+        http_session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=REMOTE_FILES_MAX_WORKERS,
+            pool_maxsize=REMOTE_FILES_MAX_WORKERS,
+        )
+        http_session.mount("https://", adapter)
+        return http_session
+
+    return WARM_STATE.get_or_set("http_session", create_http_session)
+
+
+def get_cached_file_paths(file):
+    """
+    Function to define where a remote file and its ETag are stored locally.
+
+    :param str file: The URL of the remote file
+    :return: the file path and the etag path
+    :rtype: tuple
+    """
+    file_hash = sha1(file.encode("utf-8")).hexdigest()
+    file_name = path.basename(urlparse(file).path)
+    file_path = path.abspath(f"{REMOTE_FILES_CACHE_DIR}/{file_hash}-{file_name}")
+    return file_path, f"{file_path}.etag"
+
+
+def get_cached_etag(file_path, etag_path):
+    """
+    Function to return the ETag of the previously downloaded file, if the file is still present.
+
+    :param str file_path:
+    :param str etag_path:
+    :return: The ETag or None
+    """
+    if not path.exists(file_path) or not path.exists(etag_path):
+        return None
+    with open(etag_path, "r") as etag_fd:
+        return etag_fd.read().strip() or None
+
+
+def write_cached_file(chunks, file_path, etag_path, etag):
+    """
+    Function to stream the chunks of the file to disk and record its ETag.
+    The content is written to a unique temporary file first so a failed download never replaces a valid cached file,
+    and concurrent downloads of the same file do not write into the same temporary file.
+
+    :param chunks: iterable of bytes
+    :param str file_path:
+    :param str etag_path:
+    :param str etag:
+    """
+    makedirs(path.dirname(file_path), exist_ok=True)
+    tmp_fd, tmp_path = tempfile.mkstemp(
+        dir=path.dirname(file_path),
+        prefix=f"{path.basename(file_path)}.",
+        suffix=".tmp",
+    )
+    try:
+        with fdopen(tmp_fd, "wb") as file_fd:
+            for chunk in chunks:
+                if chunk:
+                    file_fd.write(chunk)
+        replace(tmp_path, file_path)
+    except BaseException:
+        if path.exists(tmp_path):
+            remove(tmp_path)
+        raise
+    if etag:
+        with open(etag_path, "w") as etag_fd:
+            etag_fd.write(etag)
+    elif path.exists(etag_path):
+        remove(etag_path)
+
+
+def fetch_s3_file(file, client):
+    """
+    Function to download a file from S3, unless the local copy has the same ETag.
+
+    :param str file: s3:// URL of the file
+    :param client: boto3 S3 client
+    :return: local path to the file
+    :rtype: str
+    """
+    bucket_name, key = S3_FILE_RE.match(file).groups()
+    file_path, etag_path = get_cached_file_paths(file)
+    etag = get_cached_etag(file_path, etag_path)
+    get_args = {"Bucket": bucket_name, "Key": key}
+    if etag:
+        get_args["IfNoneMatch"] = etag
+    try:
+        file_r = client.get_object(**get_args)
+    except client.exceptions.NoSuchKey:
+        LOG.error(f"Failed to download the file {file} from S3")
+        raise
+    except ClientError as error:
+        if etag and error.response["Error"]["Code"] in ["304", "NotModified"]:
+            LOG.debug(f"{file} not modified since last download.")
+            return file_path
+        raise
+    write_cached_file(
+        file_r["Body"].iter_chunks(REMOTE_FILES_CHUNK_SIZE),
+        file_path,
+        etag_path,
+        file_r.get("ETag"),
+    )
+    return file_path
+
+
+def fetch_https_file(file, http_session):
+    """
+    Function to download a file over HTTPS, unless the local copy has the same ETag.
+
+    :param str file: https:// URL of the file
+    :param requests.Session http_session:
+    :return: local path to the file
+    :rtype: str
+    """
+    file_path, etag_path = get_cached_file_paths(file)
+    etag = get_cached_etag(file_path, etag_path)
+    headers = {"If-None-Match": etag} if etag else {}
+    with http_session.get(file, headers=headers, stream=True) as file_r:
+        if etag and file_r.status_code == 304:
+            LOG.debug(f"{file} not modified since last download.")
+            return file_path
+        if not file_r.status_code == 200:
+            raise FileNotFoundError(
+                f"Unable to retrieve {file}. Status code {file_r.status_code}"
+            )
+        write_cached_file(
+            file_r.iter_content(REMOTE_FILES_CHUNK_SIZE),
+            file_path,
+            etag_path,
+            file_r.headers.get("ETag"),
+        )
+    return file_path
+
+
+def fetch_remote_file(file, client, http_session):
+    """
+    Function to download a remote file based on its URL scheme.
+
+    :param str file:
+    :param client: boto3 S3 client
+    :param requests.Session http_session:
+    :return: local path to the file
+    :rtype: str
+    """
+    if file.startswith("s3://") and S3_FILE_RE.match(file):
+        return fetch_s3_file(file, client)
+    elif file.startswith("https://"):
+        return fetch_https_file(file, http_session)
+    LOG.warning(f"{file} is neither a valid s3:// nor https:// URL. Skipping")
+    return None
+
+
 def set_settings_from_remote_files(files, settings_params, folder, session=None):
+    """
+    Function to download all the ComposeFiles concurrently and add them in the same order to the input files.
+    Files are kept in REMOTE_FILES_CACHE_DIR between invocations and only downloaded again if their ETag changed.
+
+    :param list files: List of s3:// or https:// URLs
+    :param dict settings_params:
+    :param folder: Temporary folder of the invocation
+    :param boto3.session.Session session:
+    """
     if not keyisset(ComposeXSettings.input_file_arg, settings_params):
         local_files = []
         settings_params[ComposeXSettings.input_file_arg] = local_files
     else:
         local_files = settings_params[ComposeXSettings.input_file_arg]
     if not session:
-        session = boto3.session.Session()
-    client = session.client("s3")
-    bucket_re = re.compile(r"(?:s3://)([a-z0-9-.]+)/([\S]+$)")
-    for file in files:
-        if file.startswith("s3://") and bucket_re.match(file):
-            try:
-                bucket_name = bucket_re.match(file).groups()[0]
-                file_path = bucket_re.match(file).groups()[1]
-                file_name = path.basename(file_path)
-                new_file_path = path.abspath(f"{folder.name}/{file_name}")
-                with open(new_file_path, "wb") as fd:
-                    file_r = client.get_object(Bucket=bucket_name, Key=file_path)
-                    fd.write(file_r["Body"].read())
-                    local_files.append(new_file_path)
-            except client.exceptions.NoSuchKey:
-                LOG.error(f"Failed to download the file {file} from S3")
-                raise
-        elif file.startswith("https://"):
-            file_name = path.basename(urlparse(file).path)
-            new_file_path = path.abspath(f"{folder.name}/{file_name}")
-            file_r = requests.get(file)
-            if not file_r.status_code == "200":
-                raise FileNotFoundError(f"Unable to retrieve {file}")
-            with open(new_file_path, "w") as fd:
-                fd.write(file_r.text)
-            local_files.append(new_file_path)
+        session = WARM_STATE.get_session()
+    client = WARM_STATE.get_client(session, "s3")
+    http_session = get_http_session()
+    LOG.debug(f"Downloading {len(files)} files for {folder.name}")
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(len(files), REMOTE_FILES_MAX_WORKERS))
+    ) as executor:
+        files_paths = executor.map(
+            lambda file: fetch_remote_file(file, client, http_session), files
+        )
+        local_files += [file_path for file_path in files_paths if file_path]
 
 
 def settings_from_raw_content(settings, content, folder):
@@ -81,7 +250,7 @@ def settings_from_raw_content(settings, content, folder):
         settings.update({ComposeXSettings.input_file_arg: [file_path]})
 
 
-def init_settings_params(settings_params, fragment, request_id, folder):
+def init_settings_params(settings_params, fragment, request_id, folder, session=None):
     """
     Function to define the parameters to send to ECS ComposeX Settings
 
@@ -89,6 +258,7 @@ def init_settings_params(settings_params, fragment, request_id, folder):
     :param fragment:
     :param str request_id:
     :param folder: Temporary folder to store all the files into.
+    :param boto3.session.Session session: The session to use to retrieve remote files
     :return:
     """
     new_fragment = {}
@@ -99,13 +269,28 @@ def init_settings_params(settings_params, fragment, request_id, folder):
         settings_from_raw_content(settings_params, settings_params["Raw"], folder)
     if keyisset("ComposeFiles", settings_params):
         set_settings_from_remote_files(
-            settings_params["ComposeFiles"], settings_params, folder
+            settings_params["ComposeFiles"], settings_params, folder, session
         )
     if not keyisset("Name", settings_params):
         settings_params.update({"Name": request_id})
     return new_fragment
 
 
+def set_settings_account_id(settings, settings_params, account_id):
+    """
+    Function to set the account ID used for the settings bucket name. The event account ID is the one of the macro,
+    so when a role is assumed, the account ID is taken from the role session instead.
+
+    :param ecs_composex.common.settings.ComposeXSettings settings:
+    :param dict settings_params:
+    :param str account_id: The account ID of the macro event
+    """
+    if keyisset(ComposeXSettings.arn_arg, settings_params):
+        settings.account_id = get_account_id(settings.session)
+    else:
+        settings.account_id = account_id
+
+
 def lambda_handler(event, context):
     """
     Lambda function entrypoint.
@@ -125,9 +310,14 @@ def lambda_handler(event, context):
     folder = tempfile.TemporaryDirectory(prefix=request_id)
 
     settings_params = deepcopy(params)
+    WARM_STATE.cache_lookups = True
+    session = WARM_STATE.get_session(region)
 
-    new_fragment = init_settings_params(settings_params, fragment, request_id, folder)
-    settings = ComposeXSettings(for_macro=True, **settings_params)
+    new_fragment = init_settings_params(
+        settings_params, fragment, request_id, folder, session
+    )
+    settings = ComposeXSettings(for_macro=True, session=session, **settings_params)
+    set_settings_account_id(settings, settings_params, account_id)
     settings.set_bucket_name_from_account_id()
     settings.set_azs_from_api()
     settings.deploy = True
@@ -55,6 +55,8 @@ from ecs_composex.rds.rds_params import (
     PARAMETER_GROUP_T,
     CLUSTER_PARAMETER_GROUP_T,
 )
+from ecs_composex.rds.rds_proxy import add_new_db_proxy, use_proxy
+from ecs_composex.rds.rds_scaling import SCALING_KEY, add_replicas_scaling
 from ecs_composex.resources_import import import_record_properties
 from ecs_composex.secrets import (
     add_db_secret,
@@ -300,13 +302,14 @@ def set_parameters_groups_from_macro_parameters(db, template):
         setattr(db.cfn_resource, "DBParameterGroupName", Ref(params))
 
 
-def add_parameter_group(template, db):
+def add_parameter_group(template, db, session=None):
     """
     Function to create a parameter group which uses the same values as default which can later be altered
 
     :param troposphere.Template template: the RDS template
     :param db: the db object as imported from Docker composeX file
     :type db: ecs_composex.common.compose_resources.Rds
+    :param boto3.session.Session session: Session to use for engines missing from the catalog
     """
 
     parameters_properties = ["DBClusterParameterGroupName", "DBParameterGroupName"]
@@ -336,6 +339,7 @@ def add_parameter_group(template, db):
         db_family = get_family_from_engine_version(
             db.properties[DB_ENGINE_NAME.title],
             db.properties[DB_ENGINE_VERSION.title],
+            session=session,
         )
 
     elif (
@@ -346,10 +350,11 @@ def add_parameter_group(template, db):
         db_family = get_family_from_engine_version(
             db.parameters[DB_ENGINE_NAME.title],
             db.parameters[DB_ENGINE_VERSION.title],
+            session=session,
         )
     else:
         raise RuntimeError("Failed to determine the DB Parameters family.", db.name)
-    db_settings = get_family_settings(db_family)
+    db_settings = get_family_settings(db_family, session)
     if isinstance(db.cfn_resource, DBInstance):
         params = DBParameterGroup(
             PARAMETER_GROUP_T,
@@ -428,8 +433,11 @@ def add_instances_from_parameters(db_template, db):
 
     :param troposphere.Template db_template: The template to add the resources to.
     :param ecs_composex.rds.rds_stack.Rds db: The Db object defined in compose.
+    :return: the DB instances
+    :rtype: list
     :raises: TypeError
     """
+    instances = []
     aurora_compatible = [
         "Engine",
         "UseDefaultProcessorFeatures",
@@ -471,6 +479,8 @@ def add_instances_from_parameters(db_template, db):
             **instance_props,
         )
         db_template.add_resource(db_instance)
+        instances.append(db_instance)
+    return instances
 
 
 def create_from_properties(db_template, db):
@@ -519,14 +529,16 @@ def add_db_instances_for_cluster(db_template, db):
 
     :param troposphere.Template db_template:
     :param ecs_composex.rds.rds_stack.Rds db:
+    :return: the DB instances of the cluster
+    :rtype: list
     """
     if not db.parameters or (
         db.parameters and not keyisset("Instances", db.parameters)
     ):
         db_instance = add_default_instance_definition(db, for_cluster=True)
         db_template.add_resource(db_instance)
-    elif db.parameters and keyisset("Instances", db.parameters):
-        add_instances_from_parameters(db_template, db)
+        return [db_instance]
+    return add_instances_from_parameters(db_template, db)
 
 
 def generate_database_template(db, settings):
@@ -546,8 +558,23 @@ def generate_database_template(db, settings):
     elif not db.properties and db.parameters:
         create_from_parameters(db_template, db)
     if isinstance(db.cfn_resource, DBCluster):
-        add_db_instances_for_cluster(db_template, db)
-    add_parameter_group(db_template, db)
+        instances = add_db_instances_for_cluster(db_template, db)
+        if db.parameters and keyisset(SCALING_KEY, db.parameters):
+            add_replicas_scaling(db_template, db, instances)
+    elif db.parameters and keyisset(SCALING_KEY, db.parameters):
+        raise ValueError(
+            f"{db.name} - {SCALING_KEY} is only supported for Aurora clusters"
+        )
+    add_parameter_group(db_template, db, settings.session)
+    if use_proxy(db):
+        add_new_db_proxy(
+            db_template,
+            db,
+            db.properties[DB_ENGINE_NAME.title]
+            if keyisset(DB_ENGINE_NAME.title, db.properties)
+            else db.parameters[DB_ENGINE_NAME.title],
+            Ref(STORAGE_SUBNETS),
+        )
     add_db_dependency(db.cfn_resource, db.db_secret)
     attach_to_secret_to_resource(db_template, db.cfn_resource, db.db_secret)
     db.init_outputs()
@@ -19,23 +19,37 @@
 Module to provide services with access to the RDS databases.
 """
 
-from troposphere import Select, FindInMap
+from troposphere import FindInMap, Ref, Select
+from troposphere.rds import DBCluster
+from troposphere.ecs import Environment
 
-from ecs_composex.common import LOG, keyisset
+from ecs_composex.common import LOG, add_parameters, keyisset
+from ecs_composex.common.compose_resources import get_parameter_settings
+from ecs_composex.common.services_helpers import extend_container_envvars
+from ecs_composex.ecs.ecs_iam import define_service_containers
 from ecs_composex.rds.rds_aws import validate_rds_lookup, lookup_rds_resource
 from ecs_composex.rds.rds_params import (
     DB_ENDPOINT_PORT,
+    DB_PROXY_ENDPOINT,
+    DB_PROXY_SG,
+    DB_READER_ENDPOINT_T,
+    DB_RO_ENDPOINT_ADDRESS,
     DB_SG,
     DB_SECRET_ARN,
     DB_SECRET_T,
 )
+from ecs_composex.resource_settings import get_selected_services
 from ecs_composex.tcp_resources_settings import (
     handle_new_tcp_resource,
     add_secret_to_container,
     add_secrets_access_policy,
     add_security_group_ingress,
+    define_db_prefix,
+    define_secrets_keys_mappings,
 )
 
+SECRET_HOST_KEY = "host"
+
 
 def handle_import_dbs_to_services(db, rds_mapping, target, mapping_name):
     """
@@ -70,6 +84,8 @@ def handle_import_dbs_to_services(db, rds_mapping, target, mapping_name):
         LOG.warning(
             f"Don't forget, we did not assigned access to a secret from SecretsManager for {db.logical_name}"
         )
+    if getattr(db, "proxy", None):
+        return
     add_security_group_ingress(
         target[0].stack,
         db.logical_name,
@@ -80,6 +96,177 @@ def handle_import_dbs_to_services(db, rds_mapping, target, mapping_name):
     )
 
 
+def add_envvars_to_services(db, target, env_vars):
+    """
+    Function to add environment variables to the containers of the services selected for the DB
+
+    :param ecs_composex.rds.rds_stack.Rds db:
+    :param tuple target:
+    :param list env_vars:
+    """
+    selected_services = get_selected_services(db, target)
+    for container in define_service_containers(target[0].template):
+        for service in selected_services:
+            if container.Name == service.name:
+                extend_container_envvars(container, env_vars)
+
+
+def define_reader_envvars(db, value):
+    """
+    Function to define the environment variables of the Aurora cluster reader endpoint
+
+    :param ecs_composex.rds.rds_stack.Rds db:
+    :param value: the reader endpoint address
+    :rtype: list
+    """
+    return [
+        Environment(Name=f"{env_name}_{DB_READER_ENDPOINT_T}", Value=value)
+        for env_name in db.init_env_names()
+    ]
+
+
+def add_reader_endpoint_to_services(db, res_root_stack):
+    """
+    Function to give the services the reader endpoint of a new Aurora cluster, to send the read traffic to the replicas
+
+    :param ecs_composex.rds.rds_stack.Rds db:
+    :param ecs_composex.common.stacks.ComposeXStack res_root_stack:
+    """
+    reader_settings = get_parameter_settings(db, DB_RO_ENDPOINT_ADDRESS)
+    env_vars = define_reader_envvars(db, Ref(reader_settings[1]))
+    for target in db.families_targets:
+        add_parameters(target[0].template, [reader_settings[1]])
+        target[0].stack.Parameters.update({reader_settings[0]: reader_settings[2]})
+        if res_root_stack.title not in target[0].stack.DependsOn:
+            target[0].stack.DependsOn.append(res_root_stack.title)
+        add_envvars_to_services(db, target, env_vars)
+
+
+def get_secret_host_var_name(db, target):
+    """
+    Function to get the name of the environment variable the DB secret host is exposed as, via the SecretsMappings
+    of the service or the DB.
+
+    :param ecs_composex.rds.rds_stack.Rds db:
+    :param tuple target:
+    :return: the variable name, or None if the host is not mapped
+    :rtype: str
+    """
+    if keyisset("SecretsMappings", target[-1]):
+        mappings_definition = target[-1]["SecretsMappings"]
+    elif keyisset("SecretsMappings", db.settings):
+        mappings_definition = db.settings["SecretsMappings"]
+    else:
+        return None
+    prefix = define_db_prefix(db, mappings_definition)
+    for mapping in define_secrets_keys_mappings(mappings_definition):
+        if mapping["SecretKey"] == SECRET_HOST_KEY:
+            return f"{prefix}{mapping['VarName']}"
+    return None
+
+
+def override_secret_host(db, target, endpoint):
+    """
+    Function to replace the DB host mapped from the DB secret with the proxy endpoint, so the services connect
+    through the proxy with the secret as-is.
+
+    :param ecs_composex.rds.rds_stack.Rds db:
+    :param tuple target:
+    :param endpoint: the proxy endpoint
+    :return: whether the host was overridden
+    :rtype: bool
+    """
+    var_name = get_secret_host_var_name(db, target)
+    if not var_name:
+        return False
+    for service in get_selected_services(db, target):
+        container = service.container_definition
+        secrets = getattr(container, "Secrets", None)
+        if isinstance(secrets, list):
+            setattr(
+                container,
+                "Secrets",
+                [secret for secret in secrets if secret.Name != var_name],
+            )
+        extend_container_envvars(
+            container, [Environment(Name=var_name, Value=endpoint)]
+        )
+    return True
+
+
+def add_db_ingress(db, target, mapping_name):
+    """
+    Function to allow the services to the DB itself, for the services which use the DB secret host.
+
+    :param ecs_composex.rds.rds_stack.Rds db:
+    :param tuple target:
+    :param str mapping_name: the mapping name of the looked up DBs
+    """
+    if db.lookup:
+        sg_id = Select(
+            0, FindInMap(mapping_name, db.logical_name, "VpcSecurityGroupIds")
+        )
+        port = FindInMap(mapping_name, db.logical_name, "Port")
+    else:
+        sg_settings = get_parameter_settings(db, DB_SG)
+        port_settings = get_parameter_settings(db, DB_ENDPOINT_PORT)
+        add_parameters(target[0].template, [sg_settings[1], port_settings[1]])
+        target[0].stack.Parameters.update(
+            {sg_settings[0]: sg_settings[2], port_settings[0]: port_settings[2]}
+        )
+        sg_id = Ref(sg_settings[1])
+        port = Ref(port_settings[1])
+    add_security_group_ingress(target[0].stack, f"{db.logical_name}Db", sg_id, port)
+
+
+def add_proxy_to_services(db, res_root_stack, port=None, mapping_name="Rds"):
+    """
+    Function to give the services the RDS Proxy endpoint, and for looked up DBs, access to the proxy.
+    New DBs get access to the proxy via the TCP resources settings.
+    When the DB secret host is mapped to an environment variable, it is replaced with the proxy endpoint.
+    Otherwise, the services keep access to the DB, as the host in the secret still points to it.
+
+    :param ecs_composex.rds.rds_stack.Rds db:
+    :param ecs_composex.common.stacks.ComposeXStack res_root_stack:
+    :param port: the DB port, to allow access to the proxy from the services
+    :param str mapping_name: the mapping name of the looked up DBs
+    """
+    endpoint_settings = get_parameter_settings(db, DB_PROXY_ENDPOINT)
+    sg_settings = get_parameter_settings(db, DB_PROXY_SG)
+    env_vars = [
+        Environment(
+            Name=f"{env_name}_{DB_PROXY_ENDPOINT.title}",
+            Value=Ref(endpoint_settings[1]),
+        )
+        for env_name in db.init_env_names()
+    ]
+    for target in db.families_targets:
+        add_parameters(target[0].template, [endpoint_settings[1], sg_settings[1]])
+        target[0].stack.Parameters.update(
+            {
+                endpoint_settings[0]: endpoint_settings[2],
+                sg_settings[0]: sg_settings[2],
+            }
+        )
+        if port is not None:
+            add_security_group_ingress(
+                target[0].stack,
+                f"{db.logical_name}Proxy",
+                sg_id=Ref(sg_settings[1]),
+                port=port,
+            )
+        if not override_secret_host(db, target, Ref(endpoint_settings[1])):
+            LOG.warning(
+                f"{db.name} - The {SECRET_HOST_KEY} in the secret is the DB itself. {target[0].name} keeps access "
+                f"to the DB. Map the {SECRET_HOST_KEY} key with SecretsMappings, or use the "
+                f"{DB_PROXY_ENDPOINT.title} variable, to connect through the proxy."
+            )
+            add_db_ingress(db, target, mapping_name)
+        if res_root_stack.title not in target[0].stack.DependsOn:
+            target[0].stack.DependsOn.append(res_root_stack.title)
+        add_envvars_to_services(db, target, env_vars)
+
+
 def create_rds_db_config_mapping(db, db_config):
     """
 
@@ -102,6 +289,8 @@ def create_rds_db_config_mapping(db, db_config):
     }
     if keyisset(DB_SECRET_T, db_config):
         mapping[db.logical_name][DB_SECRET_T] = db_config[DB_SECRET_T]
+    if keyisset(DB_READER_ENDPOINT_T, db_config):
+        mapping[db.logical_name][DB_READER_ENDPOINT_T] = db_config[DB_READER_ENDPOINT_T]
     return mapping
 
 
@@ -117,6 +306,15 @@ def import_dbs(db, db_mappings, mapping_name):
     for target in db.families_targets:
         target[0].template.add_mapping(mapping_name, db_mappings)
         handle_import_dbs_to_services(db, db_mappings, target, mapping_name)
+        if keyisset(DB_READER_ENDPOINT_T, db_mappings[db.logical_name]):
+            add_envvars_to_services(
+                db,
+                target,
+                define_reader_envvars(
+                    db,
+                    FindInMap(mapping_name, db.logical_name, DB_READER_ENDPOINT_T),
+                ),
+            )
 
 
 def create_lookup_mappings(mappings, lookup_dbs, settings):
@@ -129,7 +327,11 @@ def create_lookup_mappings(mappings, lookup_dbs, settings):
     """
     for db in lookup_dbs:
         validate_rds_lookup(db.name, db.lookup)
-        db_config = lookup_rds_resource(db.lookup, settings.session)
+        db_config = (
+            db.lookup_config
+            if db.lookup_config
+            else lookup_rds_resource(db.lookup, settings.session)
+        )
         if not db_config:
             LOG.warning(
                 f"No RDS DB Configuration could be defined from provided lookup. Skipping {db.name}"
@@ -166,9 +368,19 @@ def rds_to_ecs(rds_dbs, services_stack, res_root_stack, settings):
             res_root_stack,
             port_parameter=DB_ENDPOINT_PORT,
             secret_parameter=DB_SECRET_ARN,
-            sg_parameter=DB_SG,
+            sg_parameter=DB_PROXY_SG if new_res.proxy else DB_SG,
         )
+        if new_res.proxy:
+            add_proxy_to_services(new_res, res_root_stack)
+        if isinstance(new_res.cfn_resource, DBCluster):
+            add_reader_endpoint_to_services(new_res, res_root_stack)
     create_lookup_mappings(db_mappings, lookup_resources, settings)
     for lookup_res in lookup_resources:
         if keyisset(lookup_res.logical_name, db_mappings):
             import_dbs(lookup_res, db_mappings, mapping_name="Rds")
+            if lookup_res.proxy:
+                add_proxy_to_services(
+                    lookup_res,
+                    res_root_stack,
+                    port=FindInMap("Rds", lookup_res.logical_name, "Port"),
+                )
@@ -16,44 +16,196 @@
 #  along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 """
-Helper to generate default parameter group settings from engine name and version
+Helper to generate default parameter group settings from engine name and version.
+
+The engine families and the cluster parameters defaults come from the catalog shipped with ECS ComposeX, so rendering
+the databases does not require any RDS API call. Families missing from the catalog are retrieved from the RDS API
+and stored on disk, in COMPOSEX_RDS_CACHE_DIR, so they are only queried once.
 """
-import boto3
-from botocore.exceptions import ClientError
+
+from functools import lru_cache
+from json import dumps, loads
+from os import environ, fdopen, makedirs, path, remove, replace
+from tempfile import gettempdir, mkstemp
+
+from botocore.exceptions import BotoCoreError, ClientError
+
 from ecs_composex.common import LOG
+from ecs_composex.common.cache import WARM_STATE
+
+ENGINES_CATALOG_FILE = (
+    f"{path.abspath(path.dirname(__file__))}/rds_engines_catalog.json"
+)
+ENGINES_CACHE_DIR_ENV = "COMPOSEX_RDS_CACHE_DIR"
+ENGINES_FAMILIES_CACHE_FILE = "engines_families.json"
+
+
+def get_engines_cache_dir():
+    """
+    Function to define the folder where the engines families and defaults retrieved from the API are stored.
+
+    :rtype: str
+    """
+    return environ.get(ENGINES_CACHE_DIR_ENV, f"{gettempdir()}/composex-rds-engines")
 
 
-def get_db_cluster_engine_parameter_group_defaults(engine_family):
+@lru_cache(maxsize=None)
+def load_engines_catalog(file_path=ENGINES_CATALOG_FILE):
     """
-    Returns a dict of all the parameter group parameters and default values
+    Function to load the engines catalog shipped with ECS ComposeX, the first time it is needed.
+
+    :param str file_path: Override path to the catalog
+    :return: the engines families and cluster parameters defaults
+    :rtype: dict
+    """
+    with open(file_path, "r", encoding="utf-8-sig") as catalog_fd:
+        catalog = loads(catalog_fd.read())
+    LOG.debug(f"RDS engines catalog version {catalog['Version']}")
+    return catalog
+
 
-    :parm str engine_family: Engine family we are getting the cluster settings for, i.e. aurora-mysql5.7
+def read_cache_file(file_name):
     """
+    Function to read a JSON file from the engines cache folder
 
-    client = boto3.client("rds")
+    :param str file_name:
+    :return: the file content or None if missing or invalid
+    :rtype: dict
+    """
+    file_path = f"{get_engines_cache_dir()}/{file_name}"
+    if not path.exists(file_path):
+        return None
     try:
-        req = client.describe_engine_default_cluster_parameters(
-            DBParameterGroupFamily=engine_family
-        )
-    except ClientError as error:
-        LOG.error(error)
+        with open(file_path, "r") as cache_fd:
+            return loads(cache_fd.read())
+    except (OSError, ValueError) as error:
+        LOG.warning(f"Ignoring RDS engines cache file {file_path}: {error}")
         return None
+
+
+def write_cache_file(file_name, content):
+    """
+    Function to write a JSON file into the engines cache folder.
+    The content is written to a unique temporary file first so concurrent renders never read a partial file
+    nor write into the same temporary file.
+
+    :param str file_name:
+    :param dict content:
+    """
+    cache_dir = get_engines_cache_dir()
+    file_path = f"{cache_dir}/{file_name}"
+    try:
+        makedirs(cache_dir, exist_ok=True)
+        tmp_fd, tmp_path = mkstemp(dir=cache_dir, prefix=f"{file_name}.", suffix=".tmp")
+        try:
+            with fdopen(tmp_fd, "w") as cache_fd:
+                cache_fd.write(dumps(content, indent=2))
+            replace(tmp_path, file_path)
+        except OSError:
+            if path.exists(tmp_path):
+                remove(tmp_path)
+            raise
+    except OSError as error:
+        LOG.warning(f"Failed to write RDS engines cache file {file_path}: {error}")
+
+
+def filter_engine_defaults(parameters):
+    """
+    Function to keep the modifiable parameters which have a static default value.
+
+    :param list parameters: The Parameters as returned by describe_engine_default_cluster_parameters
+    :return: the parameters names and values
+    :rtype: dict
+    """
     params_return = {}
-    if "EngineDefaults" in req.keys():
-        params = req["EngineDefaults"]["Parameters"]
-        for param in params:
-            if (
-                "ParameterValue" in param.keys()
-                and "{" not in param["ParameterValue"]
-                and "IsModifiable" in param.keys()
-                and param["IsModifiable"] is True
-            ):
-                params_return[param["ParameterName"]] = param["ParameterValue"]
-            if param["ParameterName"] == "binlog_format":
-                params_return[param["ParameterName"]] = "MIXED"
+    for param in parameters:
+        if (
+            "ParameterValue" in param.keys()
+            and "{" not in param["ParameterValue"]
+            and "IsModifiable" in param.keys()
+            and param["IsModifiable"] is True
+        ):
+            params_return[param["ParameterName"]] = param["ParameterValue"]
+        if param["ParameterName"] == "binlog_format":
+            params_return[param["ParameterName"]] = "MIXED"
     return params_return
 
 
+def refresh_family_defaults(engine_family, session=None):
+    """
+    Function to retrieve the cluster parameters defaults of an engine family from the RDS API and store them on disk.
+
+    :param str engine_family: Engine family we are getting the cluster settings for, i.e. aurora-mysql5.7
+    :param boto3.session.Session session: override session for boto3 client
+    :return: the parameters defaults or None if the API call failed
+    :rtype: dict
+    """
+    if not session:
+        session = WARM_STATE.get_session()
+    client = WARM_STATE.get_client(session, "rds")
+    parameters = []
+    try:
+        for page in client.get_paginator(
+            "describe_engine_default_cluster_parameters"
+        ).paginate(DBParameterGroupFamily=engine_family):
+            parameters += page["EngineDefaults"]["Parameters"]
+    except (ClientError, BotoCoreError) as error:
+        LOG.error(f"Failed to retrieve the defaults of {engine_family}: {error}")
+        return None
+    params_return = filter_engine_defaults(parameters)
+    write_cache_file(
+        f"{engine_family}.json", {"Family": engine_family, "Parameters": params_return}
+    )
+    return params_return
+
+
+def get_db_cluster_engine_parameter_group_defaults(
+    engine_family, session=None, refresh=False
+):
+    """
+    Returns a dict of all the parameter group parameters and default values.
+    Looks into the engines cache folder, then the bundled catalog, and only then the RDS API.
+
+    :param str engine_family: Engine family we are getting the cluster settings for, i.e. aurora-mysql5.7
+    :param boto3.session.Session session: override session for boto3 client
+    :param bool refresh: Whether to ignore the catalog and cache and query the RDS API.
+    :rtype: dict
+    """
+    if not refresh:
+        cached = read_cache_file(f"{engine_family}.json")
+        if cached and "Parameters" in cached.keys():
+            return cached["Parameters"]
+        catalog = load_engines_catalog()
+        if engine_family in catalog["ClusterDefaults"].keys():
+            return dict(catalog["ClusterDefaults"][engine_family])
+        LOG.info(f"{engine_family} is not in the RDS engines catalog.")
+    return refresh_family_defaults(engine_family, session)
+
+
+def get_catalog_family(engine_name, engine_version):
+    """
+    Function to find the engine family from the catalog, matching the longest version prefix, i.e. 11 for 11.7
+
+    :param str engine_name: engine name, ie. aurora-mysql
+    :param str engine_version: engine version, ie. 5.7.12
+    :return: engine_family or None
+    :rtype: str
+    """
+    engine_version = str(engine_version)
+    cached = read_cache_file(ENGINES_FAMILIES_CACHE_FILE) or {}
+    if engine_name in cached.keys() and engine_version in cached[engine_name].keys():
+        return cached[engine_name][engine_version]
+    versions = load_engines_catalog()["EngineFamilies"].get(engine_name, {})
+    matches = [
+        version
+        for version in versions.keys()
+        if engine_version == version or engine_version.startswith(f"{version}.")
+    ]
+    if not matches:
+        return None
+    return versions[max(matches, key=len)]
+
+
 def get_family_from_engine_version(
     engine_name, engine_version, session=None, client=None
 ):
@@ -70,26 +222,58 @@ def get_family_from_engine_version(
     :return: engine_family
     :rtype: str
     """
+    db_family = get_catalog_family(engine_name, engine_version)
+    if db_family:
+        return db_family
+    LOG.info(f"{engine_name} {engine_version} is not in the RDS engines catalog.")
     if not client:
         if not session:
-            session = boto3.session.Session()
-        client = session.client("rds")
+            session = WARM_STATE.get_session()
+        client = WARM_STATE.get_client(session, "rds")
+    engine_versions = []
     try:
-        req = client.describe_db_engine_versions(
-            Engine=engine_name, EngineVersion=engine_version
-        )
-    except ClientError as error:
+        for page in client.get_paginator("describe_db_engine_versions").paginate(
+            Engine=engine_name, EngineVersion=str(engine_version)
+        ):
+            engine_versions += page["DBEngineVersions"]
+    except (ClientError, BotoCoreError) as error:
         LOG.error(error)
         return None
-
-    db_family = req["DBEngineVersions"][0]["DBParameterGroupFamily"]
+    if not engine_versions:
+        LOG.error(f"No engine version {engine_version} found for {engine_name}")
+        return None
+    db_family = engine_versions[0]["DBParameterGroupFamily"]
+    cached = read_cache_file(ENGINES_FAMILIES_CACHE_FILE) or {}
+    cached.setdefault(engine_name, {})[str(engine_version)] = db_family
+    write_cache_file(ENGINES_FAMILIES_CACHE_FILE, cached)
     return db_family
 
 
-def get_family_settings(db_family):
+def refresh_engines_catalog(session=None, families=None):
+    """
+    Function to refresh from the RDS API the cluster parameters defaults of the given families, or of all the
+    families of the bundled catalog, into the engines cache folder.
+
+    :param boto3.session.Session session: override session for boto3 client
+    :param list families: The engine families to refresh
+    :return: the families defaults successfully retrieved
+    :rtype: dict
+    """
+    if families is None:
+        families = list(load_engines_catalog()["ClusterDefaults"].keys())
+    refreshed = {}
+    for family in families:
+        defaults = refresh_family_defaults(family, session)
+        if defaults is not None:
+            refreshed[family] = defaults
+    return refreshed
+
+
+def get_family_settings(db_family, session=None):
     """
     Function to get the DB family settings
     :param str db_family: The DB family
+    :param boto3.session.Session session: override session for boto3 client
     :return: db settings or None
     :rtype: None or dict
     """
@@ -100,6 +284,6 @@ def get_family_settings(db_family):
     ):
         LOG.debug("Aurora based instance")
         LOG.debug(f"Looking for parameters for {db_family}")
-        return get_db_cluster_engine_parameter_group_defaults(db_family)
+        return get_db_cluster_engine_parameter_group_defaults(db_family, session)
     else:
         return None
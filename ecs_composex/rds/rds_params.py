@@ -93,6 +93,7 @@ DB_EXPORT_SG_ID_T = "RdsSecurityGroup"
 DB_ENDPOINT_PORT_T = "RDSClusterEndpointPort"
 DB_ENDPOINT_ADDRESS_T = "RDSClusterEndpointAddress"
 DB_RO_ENDPOINT_ADDRESS_T = "RDSClusterReadEndpointAddress"
+DB_READER_ENDPOINT_T = "ReaderEndpoint"
 
 DB_ENDPOINT_ADDRESS = Parameter(
     DB_ENDPOINT_ADDRESS_T, return_value="Endpoint.Address", Type="String"
@@ -105,3 +106,11 @@ DB_ENDPOINT_PORT = Parameter(
 )
 
 DB_SECRET_ARN = Parameter(DB_SECRET_T, Type="String")
+
+DB_PROXY_ENDPOINT_T = "ProxyEndpoint"
+DB_PROXY_ENDPOINT = Parameter(
+    DB_PROXY_ENDPOINT_T, return_value="Endpoint", Type="String"
+)
+
+DB_PROXY_SG_T = "RdsProxySg"
+DB_PROXY_SG = Parameter(DB_PROXY_SG_T, return_value="GroupId", Type=SG_ID_TYPE)
@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+#  ECS ComposeX <https://github.com/lambda-my-aws/ecs_composex>
+#  Copyright (C) 2020-2021  John Mille <john@lambda-my-aws.io>
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module to add a RDS Proxy in front of the new or looked up DBs, so that the services tasks share a pool of
+connections to the DB instead of each opening their own.
+
+The proxy authenticates to the DB with the DB secret, and the services connect to the proxy endpoint.
+"""
+
+from troposphere import AWS_NO_VALUE, GetAtt, Output, Ref, Sub
+from troposphere.ec2 import SecurityGroup, SecurityGroupIngress
+from troposphere.iam import Policy, Role
+from troposphere.rds import (
+    AuthFormat,
+    ConnectionPoolConfigurationInfoFormat,
+    DBCluster,
+    DBInstance,
+    DBProxy,
+    DBProxyTargetGroup,
+)
+
+from ecs_composex.common import LOG, keyisset
+from ecs_composex.common.cfn_params import ROOT_STACK_NAME_T, Parameter
+from ecs_composex.iam import define_iam_policy, service_role_trust_policy
+from ecs_composex.rds.rds_aws import lookup_rds_resource, validate_rds_lookup
+from ecs_composex.rds.rds_params import DB_PROXY_ENDPOINT, DB_PROXY_SG, DB_SECRET_T
+from ecs_composex.vpc.vpc_params import VPC_ID
+
+PROXY_KEY = "Proxy"
+PROXY_DEFAULTS = {
+    "MaxConnectionsPercent": 90,
+    "MaxIdleConnectionsPercent": 50,
+    "ConnectionBorrowTimeout": 120,
+    "IdleClientTimeout": 1800,
+    "RequireTLS": True,
+    "DebugLogging": False,
+}
+
+
+def get_proxy_engine_family(engine):
+    """
+    Function to get the RDS Proxy engine family from the DB engine
+
+    :param str engine:
+    :rtype: str
+    :raises: ValueError
+    """
+    if "postgres" in engine:
+        return "POSTGRESQL"
+    elif "mysql" in engine or "mariadb" in engine:
+        return "MYSQL"
+    raise ValueError(
+        "RDS Proxy only supports MySQL and PostgreSQL engines. Got", engine
+    )
+
+
+def use_proxy(db):
+    """
+    Function to determine whether the DB is accessed via a RDS Proxy. Proxy can be set to true or to its settings.
+
+    :param ecs_composex.rds.rds_stack.Rds db:
+    :rtype: bool
+    """
+    return bool(
+        db.parameters
+        and PROXY_KEY in db.parameters
+        and db.parameters[PROXY_KEY] not in [None, False]
+    )
+
+
+def get_proxy_settings(db):
+    """
+    Function to get the RDS Proxy settings of the DB, from MacroParameters
+
+    :param ecs_composex.rds.rds_stack.Rds db:
+    :return: the proxy settings, or None if no proxy is defined
+    :rtype: dict
+    :raises: KeyError, ValueError
+    """
+    if not use_proxy(db):
+        return None
+    settings = dict(PROXY_DEFAULTS)
+    if isinstance(db.parameters[PROXY_KEY], dict):
+        unknown = [key for key in db.parameters[PROXY_KEY] if key not in settings]
+        if unknown:
+            raise KeyError(
+                f"{db.name}.{PROXY_KEY} - Invalid settings",
+                unknown,
+                "Valid settings are",
+                list(settings.keys()),
+            )
+        settings.update(db.parameters[PROXY_KEY])
+    for key in ["MaxConnectionsPercent", "MaxIdleConnectionsPercent"]:
+        if not 0 <= int(settings[key]) <= 100:
+            raise ValueError(f"{db.name}.{PROXY_KEY}.{key} must be between 0 and 100")
+    if int(settings["MaxIdleConnectionsPercent"]) > int(
+        settings["MaxConnectionsPercent"]
+    ):
+        raise ValueError(
+            f"{db.name}.{PROXY_KEY}.MaxIdleConnectionsPercent cannot be higher than MaxConnectionsPercent"
+        )
+    return settings
+
+
+def add_proxy_role(template, db, secret_arn):
+    """
+    Function to add the IAM role the proxy uses to read the DB secret
+
+    :param troposphere.Template template:
+    :param ecs_composex.rds.rds_stack.Rds db:
+    :param secret_arn: the DB secret ARN
+    :rtype: troposphere.iam.Role
+    """
+    return Role(
+        f"{db.logical_name}ProxyRole",
+        template=template,
+        AssumeRolePolicyDocument=service_role_trust_policy("rds"),
+        Description=Sub(f"{db.logical_name} RDS Proxy IAM Role in ${{AWS::StackName}}"),
+        PermissionsBoundary=define_iam_policy(db.parameters["PermissionsBoundary"])
+        if keyisset("PermissionsBoundary", db.parameters)
+        else Ref(AWS_NO_VALUE),
+        Policies=[
+            Policy(
+                PolicyName="GetDbSecret",
+                PolicyDocument={
+                    "Version": "2012-10-17",
+                    "Statement": [
+                        {
+                            "Sid": "AccessToDbSecret",
+                            "Effect": "Allow",
+                            "Action": ["secretsmanager:GetSecretValue"],
+                            "Resource": [secret_arn],
+                        }
+                    ],
+                },
+            )
+        ],
+    )
+
+
+def add_db_proxy(template, db, engine, secret_arn, db_sg_id, port, subnets, targets):
+    """
+    Function to add the RDS Proxy, its target group, security group and IAM role,
+    and allow the proxy to connect to the DB.
+
+    :param troposphere.Template template:
+    :param ecs_composex.rds.rds_stack.Rds db:
+    :param str engine: the DB engine
+    :param secret_arn: the DB secret ARN
+    :param db_sg_id: the DB security group ID
+    :param port: the DB port
+    :param subnets: the subnets for the proxy
+    :param dict targets: the DB cluster or instance identifiers
+    """
+    settings = get_proxy_settings(db)
+    db.proxy_sg = SecurityGroup(
+        f"{db.logical_name}ProxySg",
+        template=template,
+        GroupDescription=Sub(f"RDS Proxy for {db.logical_name} in ${{AWS::StackName}}"),
+        VpcId=Ref(VPC_ID),
+    )
+    SecurityGroupIngress(
+        f"{db.logical_name}ProxyToDb",
+        template=template,
+        GroupId=db_sg_id,
+        SourceSecurityGroupId=GetAtt(db.proxy_sg, "GroupId"),
+        FromPort=port,
+        ToPort=port,
+        IpProtocol="tcp",
+        Description=Sub(f"Allow FROM {db.logical_name} RDS Proxy TO {db.logical_name}"),
+    )
+    role = add_proxy_role(template, db, secret_arn)
+    db.proxy = DBProxy(
+        f"{db.logical_name}Proxy",
+        template=template,
+        DBProxyName=Sub(f"${{{ROOT_STACK_NAME_T}}}-{db.logical_name}"),
+        EngineFamily=get_proxy_engine_family(engine),
+        Auth=[
+            AuthFormat(AuthScheme="SECRETS", IAMAuth="DISABLED", SecretArn=secret_arn)
+        ],
+        RoleArn=GetAtt(role, "Arn"),
+        VpcSubnetIds=subnets,
+        VpcSecurityGroupIds=[GetAtt(db.proxy_sg, "GroupId")],
+        RequireTLS=keyisset("RequireTLS", settings),
+        DebugLogging=keyisset("DebugLogging", settings),
+        IdleClientTimeout=int(settings["IdleClientTimeout"]),
+    )
+    DBProxyTargetGroup(
+        f"{db.logical_name}ProxyTargetGroup",
+        template=template,
+        DependsOn=[
+            title
+            for title, resource in template.resources.items()
+            if isinstance(resource, (DBCluster, DBInstance))
+        ],
+        DBProxyName=Ref(db.proxy),
+        TargetGroupName="default",
+        ConnectionPoolConfigurationInfo=ConnectionPoolConfigurationInfoFormat(
+            MaxConnectionsPercent=int(settings["MaxConnectionsPercent"]),
+            MaxIdleConnectionsPercent=int(settings["MaxIdleConnectionsPercent"]),
+            ConnectionBorrowTimeout=int(settings["ConnectionBorrowTimeout"]),
+        ),
+        **targets,
+    )
+    LOG.info(
+        f"{db.name} - RDS Proxy with up to {settings['MaxConnectionsPercent']}% of the DB connections"
+    )
+
+
+def add_new_db_proxy(template, db, engine, subnets):
+    """
+    Function to add the RDS Proxy of a new DB into the DB template
+
+    :param troposphere.Template template: the DB template
+    :param ecs_composex.rds.rds_stack.Rds db:
+    :param str engine: the DB engine
+    :param subnets: the subnets for the proxy
+    """
+    if isinstance(db.cfn_resource, DBCluster):
+        targets = {"DBClusterIdentifiers": [Ref(db.cfn_resource)]}
+    else:
+        targets = {"DBInstanceIdentifiers": [Ref(db.cfn_resource)]}
+    add_db_proxy(
+        template,
+        db,
+        engine,
+        secret_arn=Ref(db.db_secret),
+        db_sg_id=GetAtt(db.db_sg, "GroupId"),
+        port=GetAtt(db.cfn_resource, "Endpoint.Port"),
+        subnets=subnets,
+        targets=targets,
+    )
+
+
+def add_lookup_db_proxy(template, db, stack_title, subnets, session):
+    """
+    Function to add the RDS Proxy of a looked up DB into the RDS root template,
+    and the proxy outputs the services import.
+
+    :param troposphere.Template template: the RDS root template
+    :param ecs_composex.rds.rds_stack.Rds db:
+    :param str stack_title: the title of the RDS root stack
+    :param subnets: the subnets for the proxy
+    :param boto3.session.Session session:
+    :raises: LookupError
+    """
+    validate_rds_lookup(db.name, db.lookup)
+    db.lookup_config = lookup_rds_resource(db.lookup, session)
+    if not db.lookup_config or not keyisset(DB_SECRET_T, db.lookup_config):
+        raise LookupError(
+            f"{db.name} - The DB and its secret must be found to create the RDS Proxy"
+        )
+    config = db.lookup_config
+    if keyisset("DBClusterIdentifier", config) and config["Engine"].startswith(
+        "aurora"
+    ):
+        targets = {"DBClusterIdentifiers": [config["DBClusterIdentifier"]]}
+    else:
+        targets = {"DBInstanceIdentifiers": [config["DBInstanceIdentifier"]]}
+    add_db_proxy(
+        template,
+        db,
+        config["Engine"],
+        secret_arn=config[DB_SECRET_T],
+        db_sg_id=[
+            group["VpcSecurityGroupId"]
+            for group in config["VpcSecurityGroups"]
+            if group["Status"] == "active"
+        ][0],
+        port=config["Port"],
+        subnets=subnets,
+        targets=targets,
+    )
+    for parameter, value in [
+        (DB_PROXY_ENDPOINT, GetAtt(db.proxy, DB_PROXY_ENDPOINT.return_value)),
+        (DB_PROXY_SG, GetAtt(db.proxy_sg, DB_PROXY_SG.return_value)),
+    ]:
+        output_name = f"{db.logical_name}{parameter.title}"
+        template.add_output(Output(output_name, Value=value))
+        db.attributes_outputs[parameter] = {
+            "Name": output_name,
+            "ImportParameter": Parameter(
+                output_name, return_value=parameter.return_value, Type=parameter.Type
+            ),
+            "ImportValue": GetAtt(stack_title, f"Outputs.{output_name}"),
+        }
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+#  ECS ComposeX <https://github.com/lambda-my-aws/ecs_composex>
+#  Copyright (C) 2020-2021  John Mille <john@lambda-my-aws.io>
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module to add Application Auto Scaling of the Aurora replicas, so that the read traffic sent to the cluster
+reader endpoint is spread over more replicas as the load grows.
+"""
+
+from troposphere import Ref, Sub
+from troposphere.applicationautoscaling import (
+    PredefinedMetricSpecification,
+    ScalableTarget,
+    ScalingPolicy,
+    TargetTrackingScalingPolicyConfiguration,
+)
+
+from ecs_composex.common import LOG, keyisset, keypresent
+
+SCALING_KEY = "ReplicasScaling"
+MAX_REPLICAS = 15
+SCALING_DEFAULTS = {
+    "MinCapacity": 1,
+    "ScaleInCooldown": 300,
+    "ScaleOutCooldown": 300,
+    "DisableScaleIn": False,
+}
+SCALING_TARGETS = {
+    "CpuTarget": ("Cpu", "RDSReaderAverageCPUUtilization"),
+    "ConnectionsTarget": ("Connections", "RDSReaderAverageDatabaseConnections"),
+}
+SCALING_KEYS = list(SCALING_DEFAULTS.keys()) + ["MaxCapacity"] + list(SCALING_TARGETS)
+
+
+def get_replicas_scaling_settings(db):
+    """
+    Function to get and validate the replicas scaling settings of the DB
+
+    :param ecs_composex.rds.rds_stack.Rds db:
+    :return: the scaling settings
+    :rtype: dict
+    :raises: KeyError, ValueError
+    """
+    settings = dict(SCALING_DEFAULTS)
+    settings.update(db.parameters[SCALING_KEY])
+    unknown = [key for key in settings if key not in SCALING_KEYS]
+    if unknown:
+        raise KeyError(
+            f"{db.name}.{SCALING_KEY} - Invalid settings",
+            unknown,
+            "Valid settings are",
+            SCALING_KEYS,
+        )
+    if not keypresent("MaxCapacity", settings):
+        raise KeyError(f"{db.name}.{SCALING_KEY} - MaxCapacity is required")
+    if not 0 <= int(settings["MinCapacity"]) <= int(settings["MaxCapacity"]):
+        raise ValueError(
+            f"{db.name}.{SCALING_KEY} - MinCapacity must be positive and lower than MaxCapacity. Got",
+            settings["MinCapacity"],
+            settings["MaxCapacity"],
+        )
+    if not 1 <= int(settings["MaxCapacity"]) <= MAX_REPLICAS:
+        raise ValueError(
+            f"{db.name}.{SCALING_KEY} - MaxCapacity must be between 1 and {MAX_REPLICAS}. Got",
+            settings["MaxCapacity"],
+        )
+    if not [key for key in SCALING_TARGETS if keyisset(key, settings)]:
+        raise KeyError(
+            f"{db.name}.{SCALING_KEY} - At least one of",
+            list(SCALING_TARGETS),
+            "must be set",
+        )
+    return settings
+
+
+def add_replicas_scaling(template, db, instances):
+    """
+    Function to add the scalable target of the Aurora cluster replicas and the target tracking policies.
+    The scalable target depends on the cluster instances, as the replicas can only be added once the writer is up.
+
+    :param troposphere.Template template: the DB template
+    :param ecs_composex.rds.rds_stack.Rds db:
+    :param list instances: the DB instances of the cluster
+    :return: the scalable target
+    :rtype: troposphere.applicationautoscaling.ScalableTarget
+    """
+    settings = get_replicas_scaling_settings(db)
+    target = ScalableTarget(
+        f"{db.logical_name}ReplicasScalableTarget",
+        template=template,
+        DependsOn=[instance.title for instance in instances],
+        MinCapacity=int(settings["MinCapacity"]),
+        MaxCapacity=int(settings["MaxCapacity"]),
+        ScalableDimension="rds:cluster:ReadReplicaCount",
+        ServiceNamespace="rds",
+        RoleARN=Sub(
+            "arn:${AWS::Partition}:iam::${AWS::AccountId}:role/"
+            "aws-service-role/rds.application-autoscaling.amazonaws.com/"
+            "AWSServiceRoleForApplicationAutoScaling_RDSCluster"
+        ),
+        ResourceId=Sub(f"cluster:${{{db.cfn_resource.title}}}"),
+    )
+    for key, (name, metric) in SCALING_TARGETS.items():
+        if not keyisset(key, settings):
+            continue
+        ScalingPolicy(
+            f"{db.logical_name}Replicas{name}TrackingPolicy",
+            template=template,
+            ScalingTargetId=Ref(target),
+            PolicyName=f"{name}TrackingScalingPolicy",
+            PolicyType="TargetTrackingScaling",
+            TargetTrackingScalingPolicyConfiguration=TargetTrackingScalingPolicyConfiguration(
+                DisableScaleIn=keyisset("DisableScaleIn", settings),
+                ScaleInCooldown=int(settings["ScaleInCooldown"]),
+                ScaleOutCooldown=int(settings["ScaleOutCooldown"]),
+                TargetValue=float(settings[key]),
+                PredefinedMetricSpecification=PredefinedMetricSpecification(
+                    PredefinedMetricType=metric
+                ),
+            ),
+        )
+    LOG.info(
+        f"{db.name} - Aurora replicas scaling from {settings['MinCapacity']} to {settings['MaxCapacity']}"
+    )
+    return target
@@ -20,14 +20,18 @@ Module to handle AWS RDS CFN Templates creation
 """
 
 from troposphere import Ref, GetAtt
+from troposphere.rds import DBCluster
 
 from ecs_composex.common import build_template
 from ecs_composex.common.compose_resources import XResource, set_resources
 from ecs_composex.common.stacks import ComposeXStack
 from ecs_composex.rds.rds_features import apply_extra_parameters
 from ecs_composex.rds.rds_params import DB_NAME, DB_ENDPOINT_PORT, DB_SECRET_ARN, DB_SG
+from ecs_composex.rds.rds_params import DB_PROXY_ENDPOINT, DB_PROXY_SG
+from ecs_composex.rds.rds_params import DB_RO_ENDPOINT_ADDRESS
 from ecs_composex.rds.rds_params import MOD_KEY, RES_KEY
-from ecs_composex.rds.rds_template import generate_rds_templates
+from ecs_composex.rds.rds_proxy import add_lookup_db_proxy, use_proxy
+from ecs_composex.rds.rds_template import RdsDbStack, generate_rds_templates
 from ecs_composex.vpc.vpc_params import STORAGE_SUBNETS, VPC_ID
 
 
@@ -42,6 +46,9 @@ class Rds(XResource):
         self.db_secret = None
         self.db_sg = None
         self.db_subnet_group = None
+        self.proxy = None
+        self.proxy_sg = None
+        self.lookup_config = None
         super().__init__(name, definition, module_name, settings)
         self.set_override_subnets()
 
@@ -73,6 +80,29 @@ class Rds(XResource):
                 "RdsDbSecurityGroup",
             ),
         }
+        if isinstance(self.cfn_resource, DBCluster):
+            self.output_properties[DB_RO_ENDPOINT_ADDRESS] = (
+                f"{self.logical_name}{DB_RO_ENDPOINT_ADDRESS.title}",
+                self.cfn_resource,
+                GetAtt,
+                DB_RO_ENDPOINT_ADDRESS.return_value,
+                DB_RO_ENDPOINT_ADDRESS.return_value.replace(r".", ""),
+            )
+        if self.proxy:
+            self.output_properties[DB_PROXY_ENDPOINT] = (
+                self.proxy.title,
+                self.proxy,
+                GetAtt,
+                DB_PROXY_ENDPOINT.return_value,
+                "RdsProxyEndpoint",
+            )
+            self.output_properties[DB_PROXY_SG] = (
+                self.proxy_sg.title,
+                self.proxy_sg,
+                GetAtt,
+                DB_PROXY_SG.return_value,
+                "RdsProxySecurityGroup",
+            )
 
 
 class XStack(ComposeXStack):
@@ -89,6 +119,8 @@ class XStack(ComposeXStack):
         :return:
         """
         for name, stack in self.stack_template.resources.items():
+            if not isinstance(stack, RdsDbStack):
+                continue
             db = stack.db
             if db.parameters:
                 apply_extra_parameters(settings, stack, db, stack.stack_template)
@@ -100,12 +132,27 @@ class XStack(ComposeXStack):
             for db in settings.compose_content[RES_KEY].values()
             if not db.lookup and not db.use
         ]
-        if new_dbs:
+        proxied_lookup_dbs = [
+            db
+            for db in settings.compose_content[RES_KEY].values()
+            if db.lookup and use_proxy(db)
+        ]
+        if new_dbs or proxied_lookup_dbs:
             stack_template = build_template(
                 "Root stack for RDS DBs", [VPC_ID, STORAGE_SUBNETS]
             )
             super().__init__(title, stack_template, **kwargs)
             generate_rds_templates(stack_template, new_dbs, settings)
+            for db in proxied_lookup_dbs:
+                add_lookup_db_proxy(
+                    stack_template,
+                    db,
+                    title,
+                    Ref(
+                        db.subnets_override if db.subnets_override else STORAGE_SUBNETS
+                    ),
+                    settings.session,
+                )
             self.mark_nested_stacks()
         else:
             self.is_void = True
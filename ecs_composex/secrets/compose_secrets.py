@@ -179,7 +179,7 @@ class ComposeSecret(object):
         if not keyisset("Lookup", self.definition[self.x_key]):
             self.define_names_from_import()
         else:
-            self.define_names_from_lookup(settings.session)
+            self.define_names_from_lookup(settings.session, settings.secrets_indexes)
 
         self.define_links()
         self.validate_links()
@@ -289,15 +289,32 @@ class ComposeSecret(object):
                     self.map_name, self.logical_name, self.map_kms_name
                 )
 
-    def define_names_from_lookup(self, session):
+    @classmethod
+    def get_lookup_info(cls, definition):
+        """
+        Method to return the Lookup definition of the secret, with the Name of the secret if set.
+
+        :param dict definition: The secret definition
+        :return: the lookup definition
+        :rtype: dict
+        """
+        lookup_info = dict(definition[cls.x_key]["Lookup"])
+        if keyisset("Name", definition[cls.x_key]):
+            lookup_info["Name"] = definition[cls.x_key]["Name"]
+        return lookup_info
+
+    def define_names_from_lookup(self, session, indexes=None):
         """
         Method to Lookup the secret based on its tags.
+
+        :param boto3.session.Session session:
+        :param dict indexes: The secrets indexes, per session
         :return:
         """
-        lookup_info = self.definition[self.x_key]["Lookup"]
-        if keyisset("Name", self.definition[self.x_key]):
-            lookup_info["Name"] = self.definition[self.x_key]["Name"]
-        secret_config = lookup_secret_config(self.logical_name, lookup_info, session)
+        lookup_info = self.get_lookup_info(self.definition)
+        secret_config = lookup_secret_config(
+            self.logical_name, lookup_info, session, indexes
+        )
         self.aws_name = get_name_from_arn(secret_config[self.logical_name])
         self.arn = secret_config[self.logical_name]
         self.iam_arn = secret_config[self.logical_name]
@@ -26,6 +26,9 @@ from ecs_composex.common.aws import (
     find_aws_resource_arn_from_tags_api,
     define_lookup_role_from_info,
 )
+from ecs_composex.common.cache import WARM_STATE, session_cache_key
+
+FILTER_MAX_VALUES = 10
 
 
 def get_secret_config(logical_name, secret_arn, session):
@@ -53,21 +56,192 @@ def get_secret_config(logical_name, secret_arn, session):
         raise
 
 
-def lookup_secret_config(logical_name, lookup, session):
+def get_lookup_tags(lookup):
+    """
+    Function to return the tags of the lookup as a list of (key, value)
+
+    :param dict lookup:
+    :rtype: list
+    """
+    if not keyisset("Tags", lookup):
+        return []
+    return [(key, f"{value}") for tag in lookup["Tags"] for key, value in tag.items()]
+
+
+def define_secrets_filters(lookups):
+    """
+    Function to define the list_secrets filters that return all the secrets of the lookups, and as few others as
+    possible. Filters are ANDed together, so only one filter is used.
+
+    :param list lookups: the Lookup definitions
+    :return: list_secrets filters
+    :rtype: list
+    """
+    names = set(lookup["Name"] for lookup in lookups if keyisset("Name", lookup))
+    tags_keys = set(key for lookup in lookups for key, value in get_lookup_tags(lookup))
+    if len(names) == len(lookups) and len(names) <= FILTER_MAX_VALUES:
+        return [{"Key": "name", "Values": sorted(names)}]
+    elif (
+        all(get_lookup_tags(lookup) for lookup in lookups)
+        and len(tags_keys) <= FILTER_MAX_VALUES
+    ):
+        return [{"Key": "tag-key", "Values": sorted(tags_keys)}]
+    return []
+
+
+def list_secrets(session, filters):
+    """
+    Function to list all the secrets matching the filters, going through all the pages.
+
+    :param boto3.session.Session session:
+    :param list filters: list_secrets filters
+    :return: the secrets
+    :rtype: list
+    """
+    client = WARM_STATE.get_client(session, "secretsmanager")
+    paginator = client.get_paginator("list_secrets")
+    secrets = []
+    for page in paginator.paginate(Filters=filters):
+        secrets += page["SecretList"]
+    LOG.debug(f"Listed {len(secrets)} secrets with filters {filters}")
+    return secrets
+
+
+class SecretsIndex(object):
+    """
+    Class to index the secrets by name and tags, to resolve the secrets lookups locally.
+    """
+
+    def __init__(self, secrets):
+        """
+        :param list secrets: secrets as returned by list_secrets
+        """
+        self.secrets = {}
+        self.names = {}
+        self.tags = {}
+        for secret in secrets:
+            self.secrets[secret["ARN"]] = secret
+            self.names.setdefault(secret["Name"], set()).add(secret["ARN"])
+            if keyisset("Tags", secret):
+                for tag in secret["Tags"]:
+                    self.tags.setdefault((tag["Key"], tag["Value"]), set()).add(
+                        secret["ARN"]
+                    )
+
+    def find(self, lookup):
+        """
+        Method to find the secret matching the name and all the tags of the lookup.
+
+        :param dict lookup:
+        :return: the secret
+        :rtype: dict
+        :raises LookupError: if no or more than one secret matches
+        """
+        arns = set(self.secrets.keys())
+        if keyisset("Name", lookup):
+            arns &= self.names.get(lookup["Name"], set())
+        for tag in get_lookup_tags(lookup):
+            arns &= self.tags.get(tag, set())
+        if not arns:
+            raise LookupError(
+                "No secret was found with the provided name and tags", lookup
+            )
+        elif len(arns) > 1:
+            raise LookupError(
+                "More than one secret was found with the provided name and tags. Found",
+                sorted(arns),
+            )
+        return self.secrets[arns.pop()]
+
+
+def build_secrets_index(session, lookups):
+    """
+    Function to list the secrets for all the lookups done with the same session and index them.
+
+    :param boto3.session.Session session:
+    :param list lookups: the Lookup definitions
+    :return: the index, None if the secrets could not be listed
+    :rtype: SecretsIndex
+    """
+    filters = define_secrets_filters(lookups)
+    cache_key = ("secrets_index", session_cache_key(session), repr(filters))
+    if WARM_STATE.cache_lookups:
+        cached = WARM_STATE.get(cache_key)
+        if cached:
+            return cached
+    try:
+        index = SecretsIndex(list_secrets(session, filters))
+    except ClientError as error:
+        LOG.warning(f"Unable to list secrets, looking them up one by one. {error}")
+        return None
+    if WARM_STATE.cache_lookups:
+        WARM_STATE.set(cache_key, index)
+    return index
+
+
+def build_secrets_indexes(lookups, session):
+    """
+    Function to build one secrets index per session/role used for the lookups.
+
+    :param list lookups: the Lookup definitions
+    :param boto3.session.Session session: Default session for the lookups without RoleArn
+    :return: the secrets index for each session
+    :rtype: dict
     """
-    Function to find the DB in AWS account
+    sessions = {}
+    for lookup in lookups:
+        lookup_session = define_lookup_role_from_info(lookup, session)
+        key = session_cache_key(lookup_session)
+        if key not in sessions:
+            sessions[key] = (lookup_session, [])
+        sessions[key][1].append(lookup)
+    indexes = {}
+    for key, (lookup_session, session_lookups) in sessions.items():
+        index = build_secrets_index(lookup_session, session_lookups)
+        if index:
+            indexes[key] = index
+    return indexes
+
+
+def get_secret_config_from_index(logical_name, lookup, index):
+    """
+    Function to define the secret config from the secrets index
+
+    :param str logical_name:
+    :param dict lookup:
+    :param SecretsIndex index:
+    :return: the secret config
+    :rtype: dict
+    """
+    secret = index.find(lookup)
+    secret_config = {logical_name: secret["ARN"], "Name": secret["Name"]}
+    if keyisset("KmsKeyId", secret):
+        secret_config.update({"KmsKeyId": secret["KmsKeyId"]})
+    return secret_config
+
+
+def lookup_secret_config(logical_name, lookup, session, indexes=None):
+    """
+    Function to find the secret in AWS account. Uses the secrets index of the session when available.
 
     :param str logical_name: Logical name of the resource
     :param dict lookup: The Lookup definition
     :param boto3.session.Session session: Boto3 session for clients
+    :param dict indexes: The secrets indexes, per session
     :return:
     """
+    lookup_session = define_lookup_role_from_info(lookup, session)
+    if indexes and session_cache_key(lookup_session) in indexes:
+        config = get_secret_config_from_index(
+            logical_name, lookup, indexes[session_cache_key(lookup_session)]
+        )
+        LOG.debug(config)
+        return config
     secrets_types = {
         "secretsmanager:secret": {
             "regexp": r"(?:^arn:aws(?:-[a-z]+)?:secretsmanager:[\w-]+:[0-9]{12}:secret:)([\S]+)(?:-[A-Za-z0-9]+)$"
         },
     }
-    lookup_session = define_lookup_role_from_info(lookup, session)
     secret_arn = find_aws_resource_arn_from_tags_api(
         lookup,
         lookup_session,
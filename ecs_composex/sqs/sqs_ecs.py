@@ -26,7 +26,9 @@ from ecs_composex.common import LOG, keyisset, add_parameters
 from ecs_composex.common.cfn_params import Parameter
 from ecs_composex.ecs.ecs_params import SERVICE_SCALING_TARGET
 from ecs_composex.ecs.ecs_scaling import (
+    QUEUE_SCALING_KEY,
     generate_alarm_scaling_out_policy,
+    generate_backlog_tracking_policy,
     reset_to_zero_policy,
 )
 from ecs_composex.resource_settings import (
@@ -43,6 +45,33 @@ from ecs_composex.sqs.sqs_params import (
 )
 
 
+def handle_backlog_scaling(resource, target, queue_name):
+    """
+    Function to add the target tracking policy on the queue backlog per task, from the family x-scaling QueueScaling
+
+    :param ecs_composex.common.compose_resources.XResource resource:
+    :param tuple target:
+    :param queue_name: The queue name, or a reference to it.
+    :raises KeyError: if the family does not define QueueScaling or the scaling definition also has steps.
+    """
+    family = target[0]
+    if keyisset("steps", target[1]):
+        raise KeyError(
+            f"{resource.name} scaling for {family.name} cannot define both steps and BacklogPerTask"
+        )
+    if not family.service_config.scaling.queue_scaling:
+        raise KeyError(
+            f"{resource.name} scaling for {family.name} uses BacklogPerTask."
+            f" You must define x-scaling.{QUEUE_SCALING_KEY} for the services of {family.name}"
+        )
+    generate_backlog_tracking_policy(
+        family,
+        queue_name,
+        family.service_config.scaling.queue_scaling,
+        resource.logical_name,
+    )
+
+
 def handle_service_scaling(resource, res_root_stack):
     """
     Function to define and prepare settings for scaling rules based for SQS Queues discovered through lookup
@@ -66,6 +95,20 @@ def handle_service_scaling(resource, res_root_stack):
                 " You need to define `scaling.scaling_range` in x-configs first. No scaling applied"
             )
             return
+        if not resource.lookup:
+            resource_parameter = Parameter(
+                f"{resource.logical_name}{resource_attribute}", Type="String"
+            )
+            add_parameters(target[0].template, [resource_parameter])
+            target[0].stack.Parameters.update(
+                {resource_parameter.title: resource_value}
+            )
+            queue_name = Ref(resource_parameter)
+        else:
+            queue_name = resource_value
+        if keyisset("BacklogPerTask", target[1]):
+            handle_backlog_scaling(resource, target, queue_name)
+            continue
         scaling_out_policy = generate_alarm_scaling_out_policy(
             target[0].logical_name,
             target[0].template,
@@ -78,29 +121,13 @@ def handle_service_scaling(resource, res_root_stack):
             target[1],
             scaling_source=resource.logical_name,
         )
-        if not resource.lookup:
-            resource_parameter = Parameter(
-                f"{resource.logical_name}{resource_attribute}", Type="String"
-            )
-            add_parameters(target[0].template, [resource_parameter])
-            target[0].stack.Parameters.update(
-                {resource_parameter.title: resource_value}
-            )
-            add_alarm_for_resource(
-                resource,
-                target,
-                scaling_out_policy,
-                scaling_in_policy,
-                Ref(resource_parameter),
-            )
-        else:
-            add_alarm_for_resource(
-                resource,
-                target,
-                scaling_out_policy,
-                scaling_in_policy,
-                resource_value,
-            )
+        add_alarm_for_resource(
+            resource,
+            target,
+            scaling_out_policy,
+            scaling_in_policy,
+            queue_name,
+        )
 
 
 def add_alarm_for_resource(
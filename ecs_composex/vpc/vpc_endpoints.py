@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+#  ECS ComposeX <https://github.com/lambda-my-aws/ecs_composex>
+#  Copyright (C) 2020-2021  John Mille <john@lambda-my-aws.io>
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module to plan the VPC Endpoints of a new VPC from the x-resources and services in use, when AutoDetect is enabled,
+so that the traffic to the AWS services does not go through the NAT gateways.
+
+S3 and DynamoDB use free gateway endpoints, the other services use interface endpoints, which have an hourly cost
+in each AZ on top of their data processing cost.
+"""
+
+from ecs_composex.common import LOG, keyisset
+from ecs_composex.common.config import ECR_IMAGE_RE
+from ecs_composex.common.ecs_composex import X_KEY
+
+ENDPOINTS_KEY = "Endpoints"
+AUTO_DETECT_KEY = "AutoDetect"
+SERVICES_KEY = "AwsServices"
+TRAFFIC_KEY = "MonthlyTrafficGB"
+
+GATEWAY_SERVICES = ["s3", "dynamodb"]
+NAT_COST_PER_GB = 0.045
+INTERFACE_COST_PER_GB = 0.01
+INTERFACE_COST_PER_AZ_HOUR = 0.01
+HOURS_PER_MONTH = 730
+
+X_RESOURCES_ENDPOINTS = {
+    f"{X_KEY}s3": ["s3"],
+    f"{X_KEY}dynamodb": ["dynamodb"],
+    f"{X_KEY}sqs": ["sqs"],
+    f"{X_KEY}sns": ["sns"],
+    f"{X_KEY}kinesis": ["kinesis-streams"],
+    f"{X_KEY}kms": ["kms"],
+}
+ECR_ENDPOINTS = ["ecr.api", "ecr.dkr", "s3"]
+SECRETS_ENDPOINTS = ["secretsmanager"]
+LOGS_ENDPOINTS = ["logs"]
+
+
+def add_to_plan(plan, endpoints, reason):
+    """
+    Function to add endpoints to the plan, with the reason why they are needed
+
+    :param dict plan:
+    :param list endpoints:
+    :param str reason:
+    """
+    for endpoint in endpoints:
+        plan.setdefault(endpoint, [])
+        if reason not in plan[endpoint]:
+            plan[endpoint].append(reason)
+
+
+def detect_endpoints(settings):
+    """
+    Function to list the AWS services endpoints needed by the x-resources and services in use
+
+    :param ecs_composex.common.settings.ComposeXSettings settings:
+    :return: the endpoints and the reasons they are needed for
+    :rtype: dict
+    """
+    plan = {}
+    for x_key, endpoints in X_RESOURCES_ENDPOINTS.items():
+        if keyisset(x_key, settings.compose_content):
+            add_to_plan(plan, endpoints, x_key)
+    for service in settings.services:
+        add_to_plan(plan, LOGS_ENDPOINTS, "awslogs")
+        if service.secrets:
+            add_to_plan(plan, SECRETS_ENDPOINTS, f"{service.name} secrets")
+        if ECR_IMAGE_RE.match(service.image):
+            add_to_plan(plan, ECR_ENDPOINTS, f"{service.name} ECR image")
+    return plan
+
+
+def report_nat_savings(plan, traffic, azs_count):
+    """
+    Function to log the fixed monthly cost of the endpoints, and the net savings of moving the traffic off NAT.
+    Gateway endpoints have no cost. Interface endpoints have an hourly cost in each AZ, and a lower data processing
+    cost than NAT gateways, so they only save money above a break-even monthly traffic.
+
+    :param dict plan: the planned endpoints
+    :param dict traffic: the estimated monthly traffic in GB to each service
+    :param int azs_count: the number of AZs the interface endpoints are created in
+    :return: the estimated monthly net savings, in USD. Negative when the endpoints cost more than they save.
+    :rtype: float
+    """
+    net_savings = 0.0
+    fixed_cost = 0.0
+    for endpoint, reasons in plan.items():
+        if endpoint in GATEWAY_SERVICES:
+            endpoint_fixed, per_gb = 0.0, NAT_COST_PER_GB
+        else:
+            endpoint_fixed = INTERFACE_COST_PER_AZ_HOUR * HOURS_PER_MONTH * azs_count
+            per_gb = NAT_COST_PER_GB - INTERFACE_COST_PER_GB
+        fixed_cost += endpoint_fixed
+        prefix = f"VPC Endpoint {endpoint} for {', '.join(reasons)} - ~{endpoint_fixed:.2f} USD/month fixed"
+        if keyisset(endpoint, traffic):
+            endpoint_net = float(traffic[endpoint]) * per_gb - endpoint_fixed
+            net_savings += endpoint_net
+            LOG.info(
+                f"{prefix}, {traffic[endpoint]}GB/month off NAT, net ~{endpoint_net:.2f} USD/month"
+            )
+        else:
+            net_savings -= endpoint_fixed
+            LOG.info(
+                f"{prefix}, ~{per_gb:.3f} USD per GB moved off NAT. "
+                f"Break-even at {endpoint_fixed / per_gb:.0f}GB/month"
+            )
+    LOG.info(
+        f"VPC Endpoints fixed cost ~{fixed_cost:.2f} USD/month in {azs_count} AZs. "
+        f"Estimated net NAT savings: {net_savings:.2f} USD/month"
+    )
+    return net_savings
+
+
+def plan_vpc_endpoints(settings, endpoints):
+    """
+    Function to merge the endpoints defined in x-vpc with the ones detected from the resources in use,
+    if AutoDetect is set to true.
+
+    :param ecs_composex.common.settings.ComposeXSettings settings:
+    :param dict endpoints: the x-vpc Create Endpoints definition
+    :return: the endpoints definition with the AwsServices to create
+    :rtype: dict
+    """
+    if not isinstance(endpoints, dict):
+        endpoints = {}
+    services = [
+        service["service"] for service in endpoints.get(SERVICES_KEY, None) or []
+    ]
+    plan = {}
+    add_to_plan(plan, services, "x-vpc")
+    if keyisset(AUTO_DETECT_KEY, endpoints):
+        for endpoint, reasons in detect_endpoints(settings).items():
+            for reason in reasons:
+                add_to_plan(plan, [endpoint], reason)
+    report_nat_savings(
+        plan, endpoints.get(TRAFFIC_KEY, None) or {}, len(settings.aws_azs)
+    )
+    planned = dict(endpoints)
+    planned[SERVICES_KEY] = [{"service": endpoint} for endpoint in plan]
+    return planned
@@ -17,108 +17,275 @@
 #  along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 """
-3 Layers subnets calculator for 3-tier VPC
+Subnets planner for the VPC layers.
+
+All the computations are done on the integer value of the addresses and the prefix lengths: a subnet of prefix
+length p holds 2 ** (32 - p) addresses, and allocating subnets from the largest to the smallest out of an aligned
+block keeps every subnet aligned, without overlaps.
 """
 
 import ipaddress
-from math import log, ceil
 
-pow2_2_prefix = {
-    "16": 28,
-    "32": 27,
-    "64": 26,
-    "128": 25,
-    "256": 24,
-    "512": 23,
-    "1024": 22,
-    "2048": 21,
-    "4096": 20,
-    "8192": 19,
-    "16384": 18,
-    "32768": 17,
-    "65536": 16,
-    "131072": 15,
-    "262144": 14,
-    "524288": 13,
-    "1048576": 12,
-    "2097152": 11,
-    "4194304": 10,
-    "8388608": 9,
-    "16777216": 8,
-}
+IPV4_BITS = 32
+MAX_SUBNET_PREFIX = 28
+
+DEFAULT_LAYERS = {"app": 2, "pub": 1, "stor": 1}
 
 
-def clpow2(x):
+def floor_log2(value):
+    """
+    Function to return the exponent of the largest power of two lower or equal to value
+
+    :param int value: strictly positive integer
+    :rtype: int
     """
-    Function to return the closest power of two from given x
+    return int(value).bit_length() - 1
 
-    :param x: Number to look the closest power of two for
 
-    :returns: int() closest power of two
+def ceil_log2(value):
     """
-    return pow(2, int(log(x, 2) + 0.5))
+    Function to return the exponent of the smallest power of two greater or equal to value
 
+    :param int value: strictly positive integer
+    :rtype: int
+    """
+    return (int(value) - 1).bit_length()
 
-def nxtpow2(x):
-    """Function to find the next power of two from given x number
 
-    :param x: number to look for the next power of two
+def nxtpow2(value):
+    """
+    Function to find the next power of two from given number
 
+    :param int value: number to look for the next power of two
     :returns: next power of two number
+    :rtype: int
+    """
+    return 1 << ceil_log2(value)
+
+
+def parse_cidr(cidr):
+    """
+    Function to parse a CIDR into its network address and prefix length
+
+    :param str cidr: the IPv4 CIDR, i.e. 10.0.0.0/16
+    :return: the network address as integer and the prefix length
+    :rtype: tuple
+    :raises ValueError: if the CIDR is not a valid IPv4 network
+    """
+    network = ipaddress.IPv4Network(f"{cidr}")
+    return int(network.network_address), network.prefixlen
+
+
+def format_cidr(address, prefix):
+    """
+    Function to render the network address and prefix length as a CIDR
+
+    :param int address:
+    :param int prefix:
+    :rtype: str
     """
-    return int(pow(2, ceil(log(x, 2))))
+    return f"{ipaddress.IPv4Address(address)}/{prefix}"
 
 
-def cut_per_az(az_cidr, layers_cidr):
-    """Subdivide the range per AZ in the region
+def allocate_prefixes(address, prefix, requests):
+    """
+    Function to allocate the requested prefixes from a network, from the largest to the smallest.
+
+    :param int address: network address of the block to allocate from
+    :param int prefix: prefix length of the block to allocate from
+    :param list requests: list of (key, prefix) to allocate. Keys must be unique.
+    :return: the address of each key
+    :rtype: dict
+    :raises ValueError: if the requests do not fit into the block
+    """
+    block_size = 1 << (IPV4_BITS - prefix)
+    offset = 0
+    allocations = {}
+    for key, request_prefix in sorted(requests, key=lambda request: request[1]):
+        if request_prefix < prefix:
+            raise ValueError(
+                f"Cannot allocate a /{request_prefix} from {format_cidr(address, prefix)}"
+            )
+        allocations[key] = address + offset
+        offset += 1 << (IPV4_BITS - request_prefix)
+    if offset > block_size:
+        raise ValueError(
+            f"The requested subnets need {offset} addresses, "
+            f"{format_cidr(address, prefix)} only has {block_size}"
+        )
+    return allocations
+
 
-    :param az_cidr: CIDR to split
-    :param layers_cidr: dict() getting updated with layers
+def define_default_az_prefix(prefix, azs):
+    """
+    Function to define the prefix length of each AZ block as the previous 3-tiers split did, so that existing VPCs
+    keep the same subnets with the default layers. That split rounded odd AZ counts (but 1) to the next even number
+    and used the closest power of two to the AZ share of the VPC addresses.
 
-    :returns: NIL
+    :param int prefix: prefix length of the VPC
+    :param int azs: number of AZs
+    :return: the prefix length of each AZ block, None if that split does not fit all AZs within /28 subnets.
+    :rtype: int
     """
-    maj_splits = list(az_cidr.subnets(prefixlen_diff=1))
-    layers_cidr["app"].append(maj_splits[0])
-    min_splits = list(maj_splits[1].subnets(prefixlen_diff=1))
-    layers_cidr["pub"].append(min_splits[0])
-    layers_cidr["stor"].append(min_splits[1])
+    vpc_size = 1 << (IPV4_BITS - prefix)
+    blocks = azs if (azs == 2 or not azs % 2) else azs + 1
+    per_az = (vpc_size - 2) // blocks
+    if per_az < 1:
+        return None
+    exponent = floor_log2(per_az)
+    if (vpc_size - 2) ** 2 >= (1 << (2 * exponent + 1)) * blocks**2:
+        exponent += 1
+    az_prefix = IPV4_BITS - exponent
+    if (
+        az_prefix < prefix
+        or az_prefix + 2 > MAX_SUBNET_PREFIX
+        or (1 << (az_prefix - prefix)) < azs
+    ):
+        return None
+    return az_prefix
+
 
+def define_layers_prefixes(prefix, azs, layers=None):
+    """
+    Function to define the prefix length of the subnets of each layer.
+    With the default layers, the subnets are the same as the previous 3-tiers split whenever it fits all AZs.
+    Otherwise, each layer subnet gets the largest power of two within its share (weight) of the VPC for each AZ.
+    The space left is then given to the layers which got the least compared to their weight, as long as it fits.
 
-def get_subnets(cidr, azs):
+    :param int prefix: prefix length of the VPC
+    :param int azs: number of AZs
+    :param dict layers: weight of each layer
+    :return: the prefix length for the subnets of each layer
+    :rtype: dict
+    :raises ValueError: if the VPC is too small to fit the layers in all AZs
     """
-    Get the lists of Subnets CIDRs
+    if layers is None:
+        layers = DEFAULT_LAYERS
+    if azs < 1:
+        raise ValueError("At least one AZ is required to plan the subnets")
+    if not layers or not all(
+        isinstance(weight, int) and weight > 0 for weight in layers.values()
+    ):
+        raise ValueError("Layers weights must be strictly positive integers", layers)
+    if layers == DEFAULT_LAYERS:
+        az_prefix = define_default_az_prefix(prefix, azs)
+        if az_prefix is not None:
+            return {"app": az_prefix + 1, "pub": az_prefix + 2, "stor": az_prefix + 2}
+    vpc_size = 1 << (IPV4_BITS - prefix)
+    total_weight = sum(layers.values())
+    sizes = {}
+    for layer, weight in layers.items():
+        share = (vpc_size * weight) // (total_weight * azs)
+        if share < (1 << (IPV4_BITS - MAX_SUBNET_PREFIX)):
+            raise ValueError(
+                f"The VPC /{prefix} is too small for {azs} AZs subnets of layer {layer}. "
+                f"Subnets can be /{MAX_SUBNET_PREFIX} at most"
+            )
+        sizes[layer] = 1 << floor_log2(share)
+    order = sorted(layers, key=lambda name: (-layers[name], list(layers).index(name)))
+    while True:
+        layer = min(order, key=lambda name: sizes[name] * total_weight // layers[name])
+        if (sum(sizes.values()) + sizes[layer]) * azs > vpc_size:
+            break
+        sizes[layer] <<= 1
+    return {layer: IPV4_BITS - floor_log2(sizes[layer]) for layer in layers}
+
+
+def allocate_layers(address, prefix, azs, layers_prefixes):
     """
-    cidr = f"{cidr}"
-    vpc_net = ipaddress.IPv4Network(cidr)
-    number_ips = int(vpc_net.num_addresses - 2)
+    Function to allocate the subnets of each layer in each AZ.
+    When possible, each AZ gets its own block with all its layers subnets in it, which keeps the same subnets
+    for a given VPC CIDR as the previous 3-tiers split. Otherwise, the subnets are allocated layer by layer.
 
-    if (azs != 2) and (azs % 2):
-        azs += 1
+    :param int address: VPC network address
+    :param int prefix: VPC prefix length
+    :param int azs: number of AZs
+    :param dict layers_prefixes: the prefix length of the subnets of each layer
+    :return: the address of each (layer, az)
+    :rtype: dict
+    """
+    az_size = sum(
+        1 << (IPV4_BITS - layer_prefix) for layer_prefix in layers_prefixes.values()
+    )
+    az_prefix = IPV4_BITS - ceil_log2(az_size)
+    try:
+        azs_blocks = allocate_prefixes(
+            address, prefix, [(az, az_prefix) for az in range(azs)]
+        )
+    except ValueError:
+        return allocate_prefixes(
+            address,
+            prefix,
+            [
+                ((layer, az), layers_prefixes[layer])
+                for layer in layers_prefixes
+                for az in range(azs)
+            ],
+        )
+    allocations = {}
+    for az, az_address in azs_blocks.items():
+        az_allocations = allocate_prefixes(
+            az_address, az_prefix, list(layers_prefixes.items())
+        )
+        for layer, layer_address in az_allocations.items():
+            allocations[(layer, az)] = layer_address
+    return allocations
 
-    layers_cidr = {"app": [], "pub": [], "stor": []}
 
-    ips_per_az = number_ips / azs
-    pow2 = clpow2(ips_per_az)
-    azs_prefix = pow2_2_prefix["%d" % (pow2)]
-    subnets_per_az = list(vpc_net.subnets(new_prefix=azs_prefix))
+def get_subnets(cidr, azs, layers=None):
+    """
+    Get the lists of Subnets CIDRs of each layer, one per AZ.
 
-    for az in subnets_per_az:
-        cut_per_az(az, layers_cidr)
-    return layers_cidr
+    :param str cidr: The VPC CIDR
+    :param int azs: number of AZs
+    :param dict layers: weight of each layer
+    :return: the subnets CIDRs for each layer
+    :rtype: dict
+    """
+    address, prefix = parse_cidr(cidr)
+    layers_prefixes = define_layers_prefixes(prefix, azs, layers)
+    allocations = allocate_layers(address, prefix, azs, layers_prefixes)
+    return {
+        layer: [
+            format_cidr(allocations[(layer, az)], layers_prefixes[layer])
+            for az in range(azs)
+        ]
+        for layer in layers_prefixes
+    }
 
 
-def get_subnet_layers(cidr, azs):
+def get_subnet_layers(cidr, azs, layers=None):
     """
     Get Subnets layers based on number of AZs
+
+    :param str cidr: The VPC CIDR
+    :param int azs: number of AZs
+    :param dict layers: weight of each layer
+    :return: the subnets CIDRs for each layer
+    :rtype: dict
     """
-    layers = get_subnets(cidr, azs)
-    cidrs = {}
+    return get_subnets(cidr, azs, layers)
+
 
-    for layer in layers:
-        cidrs[layer] = []
-        sub_list = []
-        for subnet in layers[layer]:
-            sub_list.append("%s" % (subnet))
-        cidrs[layer] = sub_list
+def plan_vpcs(supernet, vpcs, azs, layers=None):
+    """
+    Function to allocate VPCs CIDRs out of a supernet, without overlaps, and plan their subnets.
 
-    return cidrs
+    :param str supernet: The CIDR to allocate the VPCs from
+    :param dict vpcs: prefix length of each VPC, by name
+    :param int azs: number of AZs
+    :param dict layers: weight of each layer
+    :return: The VPC CIDR and subnets layers, by VPC name
+    :rtype: dict
+    :raises ValueError: if the VPCs do not fit into the supernet
+    """
+    address, prefix = parse_cidr(supernet)
+    allocations = allocate_prefixes(address, prefix, list(vpcs.items()))
+    plan = {}
+    for name, vpc_prefix in vpcs.items():
+        vpc_cidr = format_cidr(allocations[name], vpc_prefix)
+        plan[name] = {
+            "VpcCidr": vpc_cidr,
+            "Layers": get_subnets(vpc_cidr, azs, layers),
+        }
+    return plan
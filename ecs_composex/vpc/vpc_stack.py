@@ -31,7 +31,8 @@ from ecs_composex.common.stacks import ComposeXStack
 from ecs_composex.dns import dns_params
 from ecs_composex.vpc import aws_mappings
 from ecs_composex.vpc.vpc_aws import lookup_x_vpc_settings
-from ecs_composex.vpc.vpc_maths import get_subnet_layers
+from ecs_composex.vpc.vpc_endpoints import ENDPOINTS_KEY, plan_vpc_endpoints
+from ecs_composex.vpc.vpc_maths import DEFAULT_LAYERS, get_subnet_layers
 from ecs_composex.vpc.vpc_params import (
     RES_KEY,
     VPC_ID,
@@ -59,6 +60,44 @@ AZ_INDEX_PATTERN = r"(([a-z0-9-]+)([a-z]{1}$))"
 AZ_INDEX_RE = re.compile(AZ_INDEX_PATTERN)
 
 
+LAYERS_KEY = "Layers"
+LAYERS_NAMES = {
+    APP_SUBNETS.title: "app",
+    PUBLIC_SUBNETS.title: "pub",
+    STORAGE_SUBNETS.title: "stor",
+}
+
+
+def define_layers_weights(vpc_settings):
+    """
+    Function to define the weight of each subnets layer from the VPC creation settings
+
+    :param dict vpc_settings:
+    :return: the weight of each layer
+    :rtype: dict
+    :raises KeyError: if a layer is not one of the VPC subnets
+    :raises ValueError: if a weight is not a strictly positive integer
+    """
+    layers = dict(DEFAULT_LAYERS)
+    if not keyisset(LAYERS_KEY, vpc_settings):
+        return layers
+    for layer_name, weight in vpc_settings[LAYERS_KEY].items():
+        if layer_name not in LAYERS_NAMES:
+            raise KeyError(
+                f"{LAYERS_KEY} only supports",
+                list(LAYERS_NAMES.keys()),
+                "Got",
+                layer_name,
+            )
+        if not isinstance(weight, int) or weight <= 0:
+            raise ValueError(
+                f"{LAYERS_KEY}.{layer_name} must be a strictly positive integer. Got",
+                weight,
+            )
+        layers[LAYERS_NAMES[layer_name]] = weight
+    return layers
+
+
 class VpcStack(ComposeXStack):
     """
     Class to create the VPC Stack
@@ -66,13 +105,12 @@ class VpcStack(ComposeXStack):
 
     def __init__(self, title, settings, vpc_settings, **kwargs):
 
-        if not keyisset("Endpoints", vpc_settings):
-            endpoints = []
-        else:
-            endpoints = vpc_settings["Endpoints"]
-
-        if endpoints is None:
-            endpoints = []
+        endpoints = plan_vpc_endpoints(
+            settings,
+            vpc_settings[ENDPOINTS_KEY]
+            if keyisset(ENDPOINTS_KEY, vpc_settings)
+            else {},
+        )
         curated_azs = []
         for az in settings.aws_azs:
             if isinstance(az, dict):
@@ -80,7 +118,11 @@ class VpcStack(ComposeXStack):
             elif isinstance(az, str):
                 curated_azs.append(az)
         azs_index = [AZ_INDEX_RE.match(az).groups()[-1] for az in curated_azs]
-        layers = get_subnet_layers(vpc_settings[VPC_CIDR.title], len(curated_azs))
+        layers = get_subnet_layers(
+            vpc_settings[VPC_CIDR.title],
+            len(curated_azs),
+            define_layers_weights(vpc_settings),
+        )
         template = build_template(
             "VpcTemplate generated via ECS ComposeX",
             [dns_params.PRIVATE_DNS_ZONE_NAME],
@@ -134,9 +176,10 @@ def define_create_settings(create_def):
         VPC_SINGLE_NAT.title: True
         if not keyisset(VPC_SINGLE_NAT.title, create_def)
         else create_def[VPC_SINGLE_NAT.title],
-        "Endpoints": create_def["Endpoints"]
-        if keyisset("Endpoints", create_def)
-        else [],
+        ENDPOINTS_KEY: create_def[ENDPOINTS_KEY]
+        if keyisset(ENDPOINTS_KEY, create_def)
+        else {},
+        LAYERS_KEY: create_def[LAYERS_KEY] if keyisset(LAYERS_KEY, create_def) else {},
     }
     create_def.update(create_settings)
     return create_def
@@ -151,7 +194,7 @@ def create_new_vpc(vpc_xkey, settings, default=False):
         create_settings = {
             VPC_CIDR.title: DEFAULT_VPC_CIDR,
             VPC_SINGLE_NAT.title: True,
-            "Endpoints": {
+            ENDPOINTS_KEY: {
                 "AwsServices": [{"service": "ecr.dkr"}, {"service": "ecr.api"}]
             },
         }
@@ -31,8 +31,6 @@ respective AZ
 
 """
 
-from math import log, ceil
-
 from troposphere import GetAtt, Tags, Ref, Sub, If
 from troposphere.ec2 import (
     Subnet,
@@ -53,6 +51,8 @@ from ecs_composex.common.cfn_conditions import USE_STACK_NAME_CON_T
 from ecs_composex.common.cfn_params import ROOT_STACK_NAME_T
 from ecs_composex.common.ecs_composex import CFN_EXPORT_DELIMITER as DELIM
 from ecs_composex.vpc import metadata
+from ecs_composex.vpc.vpc_endpoints import GATEWAY_SERVICES
+from ecs_composex.vpc.vpc_maths import nxtpow2
 from ecs_composex.vpc.vpc_params import VPC_T
 
 
@@ -117,7 +117,7 @@ def add_storage_subnets(template, vpc, az_index, layers):
             "StorageSubnetsPrefixList",
             AddressFamily="IPv4",
             Entries=entries,
-            MaxEntries=int((pow(2, ceil(log(len(entries), 2)))) * 2),
+            MaxEntries=nxtpow2(len(entries)) * 2,
             PrefixListName=Sub(f"${{{vpc.title}}}-storage-subnets"),
         )
     )
@@ -205,7 +205,7 @@ def add_public_subnets(template, vpc, az_index, layers, igw, single_nat):
             "PublicSubnetsPrefixList",
             AddressFamily="IPv4",
             Entries=entries,
-            MaxEntries=int((pow(2, ceil(log(len(entries), 2)))) * 2),
+            MaxEntries=nxtpow2(len(entries)) * 2,
             PrefixListName=Sub(f"${{{vpc.title}}}-public-subnets"),
         )
     )
@@ -325,7 +325,7 @@ def add_apps_subnets(template, vpc, az_index, layers, nats, endpoints=None):
             ],
         )
         for service in endpoints["AwsServices"]:
-            if service["service"] == "s3":
+            if service["service"] in GATEWAY_SERVICES:
                 add_gateway_endpoint(service, rtbs, template)
             else:
                 add_interface_endpoint(sg_endpoints, service, subnets, template)
@@ -335,7 +335,7 @@ def add_apps_subnets(template, vpc, az_index, layers, nats, endpoints=None):
             "AppsSubnetsPrefixList",
             AddressFamily="IPv4",
             Entries=entries,
-            MaxEntries=int((pow(2, ceil(log(len(entries), 2)))) * 2),
+            MaxEntries=nxtpow2(len(entries)) * 2,
             PrefixListName=Sub(f"${{{vpc.title}}}-apps-subnets"),
         )
     )
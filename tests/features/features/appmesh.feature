@@ -9,8 +9,9 @@ Feature: ecs_composex.appmesh
     Then I should have a mesh created
 
     Examples:
-      | file_path                   | override_file                  |
-      | use-cases/blog.features.yml | use-cases/appmesh/new_mesh.yml |
+      | file_path                   | override_file                          |
+      | use-cases/blog.features.yml | use-cases/appmesh/new_mesh.yml         |
+      | use-cases/blog.features.yml | use-cases/appmesh/traffic_policies.yml |
 
   @appmesh
   Scenario Outline: Shared or existing mesh
@@ -0,0 +1,143 @@
+#  -*- coding: utf-8 -*-
+#   ECS ComposeX <https://github.com/lambda-my-aws/ecs_composex>
+#   Copyright (C) 2020-2021  John Mille <john@lambda-my-aws.io>
+#  #
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#  #
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#  #
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module to test the AppMesh Envoy sizing, nodes listeners and routes traffic policies.
+"""
+
+import pytest
+from troposphere import GetAtt, Ref
+
+from ecs_composex.appmesh.appmesh_node import define_envoy_settings
+from ecs_composex.appmesh.appmesh_params import MESH_NAME
+from ecs_composex.appmesh.appmesh_policies import (
+    define_connection_pool,
+    define_duration,
+    define_listener_timeout,
+    define_outlier_detection,
+    define_retry_policy,
+)
+from ecs_composex.appmesh.appmesh_router import MeshRouter
+
+
+class Node(object):
+    weight = 1
+
+    def __init__(self, name):
+        self.get_node_param = GetAtt(name, "Outputs.VirtualNode")
+
+
+def test_durations():
+    assert define_duration(500).to_dict() == {"Unit": "ms", "Value": 500}
+    assert define_duration("15s").to_dict() == {"Unit": "s", "Value": 15}
+    assert define_duration("2m").to_dict() == {"Unit": "s", "Value": 120}
+    with pytest.raises(ValueError):
+        define_duration("1h")
+
+
+def test_listener_policies():
+    assert define_connection_pool(
+        {"MaxConnections": 1024, "MaxPendingRequests": 2048}, "Http"
+    ).to_dict() == {"HTTP": {"MaxConnections": 1024, "MaxPendingRequests": 2048}}
+    assert define_connection_pool({"MaxRequests": 512}, "Http2").to_dict() == {
+        "HTTP2": {"MaxRequests": 512}
+    }
+    with pytest.raises(KeyError):
+        define_connection_pool({"MaxPendingRequests": 10}, "Tcp")
+    outlier = define_outlier_detection({"MaxServerErrors": 3}).to_dict()
+    assert outlier["MaxServerErrors"] == 3
+    assert outlier["BaseEjectionDuration"] == {"Unit": "s", "Value": 30}
+    assert define_listener_timeout({"Idle": "5m"}, "Tcp").to_dict() == {
+        "TCP": {"Idle": {"Unit": "s", "Value": 300}}
+    }
+    with pytest.raises(KeyError):
+        define_listener_timeout({"PerRequest": "5s"}, "Tcp")
+
+
+def test_retry_policy():
+    policy = define_retry_policy({"MaxRetries": 2, "PerRetryTimeout": "2s"}).to_dict()
+    assert policy["HttpRetryEvents"] == ["server-error", "gateway-error"]
+    assert policy["TcpRetryEvents"] == ["connection-error"]
+    with pytest.raises(ValueError):
+        define_retry_policy(
+            {"MaxRetries": 2, "PerRetryTimeout": "2s", "HttpRetryEvents": ["5xx"]}
+        )
+    with pytest.raises(KeyError):
+        define_retry_policy({"MaxRetries": 2})
+
+
+def test_envoy_settings():
+    settings = define_envoy_settings(None)
+    assert settings["Cpu"] == 128 and settings["Memory"] == 256
+    settings = define_envoy_settings(
+        {"Cpu": 512, "Memory": 1024, "Ulimits": {"nofile": 65535}}
+    )
+    assert settings["Ulimits"][0].to_dict() == {
+        "Name": "nofile",
+        "SoftLimit": 65535,
+        "HardLimit": 65535,
+    }
+    with pytest.raises(ValueError):
+        define_envoy_settings({"Memory": 64})
+
+
+def test_routes_policies():
+    nodes = {"app01": Node("app01"), "app03": Node("app03")}
+    router = MeshRouter(
+        "http",
+        {
+            "Listener": {"Port": 5000, "Protocol": "Http"},
+            "Routes": {
+                "Http": [
+                    {
+                        "Match": {"Prefix": "/"},
+                        "Nodes": [{"Name": "app01"}],
+                        "RetryPolicy": {"MaxRetries": 3, "PerRetryTimeout": "1s"},
+                        "Timeout": {"PerRequest": "10s"},
+                    }
+                ]
+            },
+        },
+        Ref(MESH_NAME),
+        nodes,
+    )
+    route = router.routes[0].Spec.to_dict()["HttpRoute"]
+    assert route["RetryPolicy"]["MaxRetries"] == 3
+    assert route["Timeout"]["PerRequest"] == {"Unit": "s", "Value": 10}
+    router = MeshRouter(
+        "tcp",
+        {
+            "Listener": {"Port": 5000, "Protocol": "Tcp"},
+            "Routes": {
+                "Tcp": [{"Nodes": [{"Name": "app03"}], "Timeout": {"Idle": "60s"}}]
+            },
+        },
+        Ref(MESH_NAME),
+        nodes,
+    )
+    route = router.routes[0].Spec.to_dict()["TcpRoute"]
+    assert route["Timeout"] == {"Idle": {"Unit": "s", "Value": 60}}
+    with pytest.raises(AttributeError):
+        MeshRouter(
+            "tcp",
+            {
+                "Listener": {"Port": 5000, "Protocol": "Tcp"},
+                "Routes": {"Tcp": [{"Nodes": [{"Name": "app03"}], "Retries": 2}]},
+            },
+            Ref(MESH_NAME),
+            nodes,
+        )
@@ -0,0 +1,56 @@
+#  -*- coding: utf-8 -*-
+#   ECS ComposeX <https://github.com/lambda-my-aws/ecs_composex>
+#   Copyright (C) 2020-2021  John Mille <john@lambda-my-aws.io>
+#  #
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#  #
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#  #
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module to test the warm state kept between executions.
+"""
+
+from ecs_composex.common.cache import WarmState, session_cache_key
+
+
+def test_values_expiry():
+    state = WarmState(ttl=300)
+    state.set("account", "012345678912")
+    assert state.get("account") == "012345678912"
+    state.set("expired", "value", ttl=-1)
+    assert state.get("expired") is None
+    assert "expired" not in state.values
+
+
+def test_get_or_set():
+    state = WarmState(ttl=300)
+    calls = []
+
+    def lookup(value):
+        calls.append(value)
+        return value
+
+    for _ in range(3):
+        assert state.get_or_set("key", lookup, "result") == "result"
+    assert len(calls) == 1
+
+
+def test_sessions_and_clients():
+    state = WarmState(ttl=300)
+    session = state.get_session("eu-west-1")
+    assert state.get_session("eu-west-1") is session
+    assert state.get_session("eu-west-2") is not session
+    assert state.get_client(session, "s3") is state.get_client(session, "s3")
+    assert session_cache_key(session) == session_cache_key(session)
+    assert session_cache_key(session) != session_cache_key(
+        state.get_session("eu-west-2")
+    )
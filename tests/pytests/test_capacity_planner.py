@@ -0,0 +1,127 @@
+#  -*- coding: utf-8 -*-
+#   ECS ComposeX <https://github.com/lambda-my-aws/ecs_composex>
+#   Copyright (C) 2020-2021  John Mille <john@lambda-my-aws.io>
+#  #
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#  #
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#  #
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module to test the EC2 capacity planning for SpotFleet.
+"""
+
+from os import path
+
+import boto3
+import pytest
+
+from ecs_composex.common.config import ComputeConfig
+from ecs_composex.common.settings import ComposeXSettings
+from ecs_composex.compute.capacity_planner import (
+    INSTANCE_TYPES,
+    define_capacity_plan,
+    pack_tasks,
+    plan_instance_type,
+)
+from ecs_composex.compute.spot_fleet import (
+    define_scaling_adjustment,
+    generate_spot_fleet_template,
+)
+
+HERE = path.abspath(path.dirname(__file__))
+
+
+@pytest.fixture
+def blog_settings():
+    return ComposeXSettings(
+        session=boto3.session.Session(),
+        **{
+            ComposeXSettings.name_arg: "test",
+            ComposeXSettings.command_arg: ComposeXSettings.render_arg,
+            ComposeXSettings.input_file_arg: [
+                path.abspath(f"{HERE}/../../use-cases/blog.yml")
+            ],
+            ComposeXSettings.format_arg: "yaml",
+        },
+    )
+
+
+def test_pack_tasks():
+    hosts = pack_tasks([(1024, 2048)] * 3 + [(512, 1024)] * 2, 2048, 4096)
+    assert len(hosts) == 2
+    assert sum(host[2] for host in hosts) == 5
+    assert pack_tasks([(4096, 2048)], 2048, 4096) is None
+
+
+def test_plan_instance_type():
+    plan = plan_instance_type(
+        "c5.large", INSTANCE_TYPES["c5.large"], [(1024, 2048)] * 4
+    )
+    assert plan["Hosts"] == 4
+    assert plan["Weight"] == 1
+    plan = plan_instance_type(
+        "m5.xlarge", INSTANCE_TYPES["m5.xlarge"], [(1024, 2048)] * 4
+    )
+    assert plan["Hosts"] == 1
+    assert plan["Weight"] == 4
+    assert plan["CpuEfficiency"] == 1.0
+
+
+def test_capacity_plan(blog_settings):
+    spot_config = define_capacity_plan(list(blog_settings.families.values()))
+    families_tasks = spot_config["capacity_plan"]["Tasks"]
+    assert spot_config["target_capacity"] == sum(
+        family["DesiredCount"] for family in families_tasks
+    )
+    assert spot_config["max_capacity"] >= spot_config["target_capacity"]
+    assert 0 < len(spot_config["spot_instance_types"]) <= 3
+    for plan in spot_config["capacity_plan"]["InstanceTypes"]:
+        assert plan["Weight"] * plan["Hosts"] <= spot_config["target_capacity"]
+    assert ComputeConfig(blog_settings).spot_config["spot_instance_types"] == (
+        spot_config["spot_instance_types"]
+    )
+
+
+def test_capacity_plan_scaling(blog_settings):
+    spot_config = define_capacity_plan(list(blog_settings.families.values()))
+    weight = min(
+        instance_type["weight"]
+        for instance_type in spot_config["spot_instance_types"].values()
+    )
+    template = generate_spot_fleet_template(blog_settings, spot_config)
+    for policy, adjustment in [
+        ("FleetScalingInEcsClusterFleet", f"-{weight}"),
+        ("FleetScalingOutEcsClusterFleet", f"{weight}"),
+    ]:
+        steps = template.resources[policy].to_dict()["Properties"][
+            "StepScalingPolicyConfiguration"
+        ]["StepAdjustments"]
+        assert steps[0]["ScalingAdjustment"] == adjustment
+    assert define_scaling_adjustment(ComputeConfig.default_spot_config) == 1
+
+
+def test_no_capacity_plan(blog_settings):
+    assert define_capacity_plan([]) is None
+    assert (
+        define_capacity_plan(
+            list(blog_settings.families.values()),
+            instance_types={
+                "tiny.nano": {
+                    "Family": "tiny",
+                    "VCpus": 1,
+                    "MemoryMB": 128,
+                    "HourlyPrice": 0.001,
+                }
+            },
+        )
+        is None
+    )
@@ -26,7 +26,7 @@ from ecs_composex.common import keyisset
 from ecs_composex.common.settings import ComposeXSettings
 from ecs_composex.common.stacks import ComposeXStack
 from ecs_composex.ecs.ecs_cluster import add_ecs_cluster
-from ecs_composex.ecs.ecs_params import CLUSTER_NAME
+from ecs_composex.ecs.ecs_params import CLUSTER_NAME, CLUSTER_T
 
 
 @pytest.fixture
@@ -75,3 +75,60 @@ def test_ecs_cluster_lookup(existing_cluster, nonexisting_cluster):
     )
     add_ecs_cluster(stack, settings)
     assert not keyisset(CLUSTER_NAME.title, stack.Parameters)
+
+
+def test_container_insights_for_backlog_scaling(caplog):
+    """
+    Function to test Container Insights is enabled on the new cluster when services scale on the SQS backlog
+    """
+    queues = {
+        "x-sqs": {
+            "jobs": {
+                "Properties": {},
+                "Services": [
+                    {
+                        "name": "worker",
+                        "access": "RWMessages",
+                        "scaling": {"BacklogPerTask": True},
+                    }
+                ],
+            }
+        }
+    }
+    for content, expected in [
+        (dict(queues), [{"Name": "containerInsights", "Value": "enabled"}]),
+        (
+            dict(
+                queues,
+                **{
+                    "x-cluster": {
+                        "Properties": {
+                            "ClusterSettings": [
+                                {"Name": "containerInsights", "Value": "disabled"}
+                            ]
+                        }
+                    }
+                },
+            ),
+            [{"Name": "containerInsights", "Value": "disabled"}],
+        ),
+        ({}, None),
+    ]:
+        stack = ComposeXStack("test", stack_template=Template())
+        settings = ComposeXSettings(
+            content=content,
+            session=boto3.session.Session(),
+            **{
+                ComposeXSettings.name_arg: "test",
+                ComposeXSettings.command_arg: ComposeXSettings.render_arg,
+                ComposeXSettings.format_arg: "yaml",
+            },
+        )
+        add_ecs_cluster(stack, settings)
+        cluster = stack.stack_template.resources[CLUSTER_T].to_dict()["Properties"]
+        assert cluster.get("ClusterSettings") == expected
+    assert "on the existing cluster" not in caplog.text
+    settings.compose_content["x-cluster"] = {"Use": "existing-cluster"}
+    settings.compose_content.update(queues)
+    add_ecs_cluster(ComposeXStack("test", stack_template=Template()), settings)
+    assert "on the existing cluster" in caplog.text
@@ -0,0 +1,139 @@
+#  -*- coding: utf-8 -*-
+#   ECS ComposeX <https://github.com/lambda-my-aws/ecs_composex>
+#   Copyright (C) 2020-2021  John Mille <john@lambda-my-aws.io>
+#  #
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#  #
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#  #
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module to test the EC2 hosts AutoScaling Group and its ECS Capacity Provider.
+"""
+
+from os import path
+
+import boto3
+import pytest
+from troposphere import Template
+
+from ecs_composex.common.settings import ComposeXSettings
+from ecs_composex.common.stacks import ComposeXStack
+from ecs_composex.compute.auto_scaling_group import (
+    ASG_T,
+    CAPACITY_PROVIDER_T,
+    WARM_POOL_T,
+    get_asg_config,
+)
+from ecs_composex.compute.compute_template import generate_compute_template
+from ecs_composex.ecs.ecs_cluster import FARGATE_PROVIDER, add_ecs_cluster
+from ecs_composex.ecs.ecs_placement import ServicePlacement
+from ecs_composex.ecs.ecs_service import define_service_placement
+
+HERE = path.abspath(path.dirname(__file__))
+
+
+@pytest.fixture
+def asg_settings():
+    return ComposeXSettings(
+        session=boto3.session.Session(),
+        **{
+            ComposeXSettings.name_arg: "test",
+            ComposeXSettings.command_arg: ComposeXSettings.render_arg,
+            ComposeXSettings.input_file_arg: [
+                path.abspath(f"{HERE}/../../use-cases/blog.yml"),
+                path.abspath(f"{HERE}/../../use-cases/ec2compute/asg_config.yml"),
+            ],
+            ComposeXSettings.format_arg: "yaml",
+        },
+    )
+
+
+def test_asg_compute(asg_settings):
+    template = generate_compute_template(asg_settings)
+    assert "SpotFleet" not in template.resources
+    asg = template.resources[ASG_T].to_dict()["Properties"]
+    assert asg["NewInstancesProtectedFromScaleIn"] is True
+    assert asg["MaxSize"] == 20
+    assert template.resources[WARM_POOL_T].PoolState == "Stopped"
+    provider = template.resources[CAPACITY_PROVIDER_T].to_dict()["Properties"]
+    assert (
+        provider["AutoScalingGroupProvider"]["ManagedScaling"]["TargetCapacity"] == 90
+    )
+    assert (
+        provider["AutoScalingGroupProvider"]["ManagedTerminationProtection"]
+        == "ENABLED"
+    )
+    assert CAPACITY_PROVIDER_T in template.outputs
+    ecs_config = template.resources["LaunchTemplate"].Metadata.to_dict()[
+        "AWS::CloudFormation::Init"
+    ]["ecsconfig"]["files"]["/etc/ecs/ecs.config"]["content"]["Fn::Join"][1]
+    assert "ECS_WARM_POOLS_CHECK=true" in ecs_config
+
+
+def test_asg_cluster(asg_settings, caplog):
+    root_stack = ComposeXStack("root", stack_template=Template())
+    assert add_ecs_cluster(root_stack, asg_settings).to_dict() == {"Ref": "EcsCluster"}
+    assert "not associated to an existing cluster" not in caplog.text
+    cluster = root_stack.stack_template.resources["EcsCluster"]
+    assert not hasattr(cluster, "CapacityProviders")
+    association = root_stack.stack_template.resources[
+        asg_settings.ecs_cluster_providers_association
+    ].to_dict()["Properties"]
+    assert association["CapacityProviders"][0] == FARGATE_PROVIDER
+    assert association["DefaultCapacityProviderStrategy"] == [
+        {
+            "CapacityProvider": {
+                "Fn::GetAtt": ["Ec2Compute", f"Outputs.{CAPACITY_PROVIDER_T}"]
+            },
+            "Weight": 1,
+        }
+    ]
+    assert "blog-ec2-hosts" in asg_settings.ecs_cluster_providers
+    assert asg_settings.create_compute
+    assert asg_settings.ecs_cluster_hosts_default
+
+
+def test_asg_platform_version(asg_settings):
+    root_stack = ComposeXStack("root", stack_template=Template())
+    add_ecs_cluster(root_stack, asg_settings)
+    services = list(asg_settings.services)
+    placement = ServicePlacement(
+        services,
+        asg_settings.ecs_cluster_providers,
+        asg_settings.ecs_cluster_hosts_default,
+    )
+    assert define_service_placement(placement)["PlatformVersion"].to_dict() == {
+        "Ref": "AWS::NoValue"
+    }
+    placement = ServicePlacement(services, asg_settings.ecs_cluster_providers)
+    assert define_service_placement(placement)["PlatformVersion"].to_dict() == {
+        "Ref": "FargatePlatformVersion"
+    }
+
+
+def test_invalid_asg_config(asg_settings):
+    asg_config = asg_settings.compose_content["x-configs"]["composex"]["asg_config"]
+    asg_config["InstanceTypes"] = ["m5a.large", "m5.large"]
+    with pytest.raises(ValueError):
+        get_asg_config(asg_settings)
+    del asg_config["WarmPool"]
+    asg_config["TargetCapacity"] = 0
+    with pytest.raises(ValueError):
+        get_asg_config(asg_settings)
+    asg_config["TargetCapacity"] = 80
+    asg_config["CapacityProviderName"] = "ecs-hosts"
+    with pytest.raises(ValueError):
+        get_asg_config(asg_settings)
+    del asg_config["CapacityProviderName"]
+    template = generate_compute_template(asg_settings)
+    asg = template.resources[ASG_T].to_dict()["Properties"]
+    assert len(asg["MixedInstancesPolicy"]["LaunchTemplate"]["Overrides"]) == 2
@@ -0,0 +1,92 @@
+#  -*- coding: utf-8 -*-
+#   ECS ComposeX <https://github.com/lambda-my-aws/ecs_composex>
+#   Copyright (C) 2020-2021  John Mille <john@lambda-my-aws.io>
+#  #
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#  #
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#  #
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module to test the DAX clusters creation and lookup.
+"""
+
+from os import path
+
+import boto3
+import placebo
+import pytest
+from troposphere import Ref
+
+from ecs_composex.common.settings import ComposeXSettings
+from ecs_composex.dax.dax_aws import lookup_dax_config
+from ecs_composex.dax.dax_params import DAX_ENDPOINT, DAX_SG, DAX_TLS_PORT, RES_KEY
+from ecs_composex.dax.dax_stack import XStack
+from ecs_composex.dax.dax_template import get_cluster_tables
+from ecs_composex.dynamodb.dynamodb_stack import XStack as DynamoDbStack
+
+HERE = path.abspath(path.dirname(__file__))
+
+
+def test_new_dax_cluster():
+    settings = ComposeXSettings(
+        session=boto3.session.Session(),
+        **{
+            ComposeXSettings.name_arg: "test",
+            ComposeXSettings.command_arg: ComposeXSettings.render_arg,
+            ComposeXSettings.input_file_arg: [
+                path.abspath(f"{HERE}/../../use-cases/blog.yml"),
+                path.abspath(f"{HERE}/../../use-cases/dax/create_only.yml"),
+            ],
+            ComposeXSettings.format_arg: "yaml",
+        },
+    )
+    DynamoDbStack("dynamodb", settings)
+    stack = XStack("dax", settings)
+    stack.add_xdependencies(stack, settings)
+    cluster = settings.compose_content[RES_KEY]["cache01"]
+    resources = stack.stack_template.resources
+    assert int(resources["cache01"].ReplicationFactor) == 3
+    assert cluster.port == DAX_TLS_PORT
+    assert resources["cache01ParameterGroup"].ParameterNameValues == {
+        "query-ttl-millis": "60000",
+        "record-ttl-millis": "300000",
+    }
+    assert "tableAArn" in stack.stack_template.parameters
+    assert Ref("tableAArn") in cluster.tables_arns
+    assert len(cluster.tables_arns) == 4
+    assert DAX_ENDPOINT in cluster.attributes_outputs
+    assert DAX_SG in cluster.attributes_outputs
+
+
+def test_dax_tables_validation():
+    class Cluster(object):
+        name = "cache"
+        parameters = {}
+
+    with pytest.raises(KeyError):
+        get_cluster_tables(Cluster)
+    Cluster.parameters = {"Tables": "tableA"}
+    with pytest.raises(TypeError):
+        get_cluster_tables(Cluster)
+
+
+def test_lookup_dax_cluster():
+    session = boto3.session.Session()
+    pill = placebo.attach(session, data_path=f"{HERE}/x_dax")
+    pill.playback()
+    config = lookup_dax_config(
+        {"Name": "cache02", "Tags": [{"Name": "cache02"}]}, session
+    )
+    assert config["Arn"] == "arn:aws:dax:eu-west-1:000000000000:cache/cache02"
+    assert config["GroupId"] == ["sg-0c1f2e3d4b5a69788"]
+    assert config["Port"] == "9111"
+    assert config[DAX_ENDPOINT.return_value].startswith("daxs://")
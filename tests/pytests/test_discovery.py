@@ -0,0 +1,97 @@
+#  -*- coding: utf-8 -*-
+#   ECS ComposeX <https://github.com/lambda-my-aws/ecs_composex>
+#   Copyright (C) 2020-2021  John Mille <john@lambda-my-aws.io>
+#  #
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#  #
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#  #
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module to test the namespaces, hosted zones and meshes discovery index.
+"""
+
+from os import path
+
+import boto3
+import placebo
+import pytest
+
+from ecs_composex.appmesh.appmesh_aws import lookup_mesh_by_name
+from ecs_composex.appmesh.appmesh_params import MESH_NAME, MESH_OWNER_ID
+from ecs_composex.common.discovery import get_discovery_index
+from ecs_composex.dns.dns_lookup import (
+    lookup_route53_namespace,
+    lookup_service_discovery_namespace,
+)
+
+
+class Zone(object):
+    def __init__(self, name):
+        self.name = name
+
+
+@pytest.fixture
+def session():
+    here = path.abspath(path.dirname(__file__))
+    session = boto3.session.Session()
+    pill = placebo.attach(session, data_path=f"{here}/x_discovery")
+    pill.playback()
+    return session
+
+
+def test_namespaces_lookup(session):
+    index = get_discovery_index(session)
+    assert get_discovery_index(session) is index
+    assert len(index.namespaces) == 3
+    zone_info = lookup_service_discovery_namespace(
+        Zone("lambda-my-aws.internal."), session, True
+    )
+    assert zone_info == {
+        "Route53ID": "Z0123456789ABCDEFGHIJ",
+        "ZoneTld": "lambda-my-aws.internal",
+        "ZoneId": "ns-abcd1234abcd1234",
+    }
+    assert (
+        lookup_service_discovery_namespace(Zone("other.internal"), session, True)[
+            "ZoneId"
+        ]
+        == "ns-efgh5678efgh5678"
+    )
+    with pytest.raises(TypeError):
+        lookup_service_discovery_namespace(Zone("http.internal"), session, True)
+    with pytest.raises(LookupError):
+        lookup_service_discovery_namespace(Zone("none.internal"), session, True)
+
+
+def test_hosted_zones_lookup(session):
+    assert lookup_route53_namespace(Zone("lambda-my-aws.io"), session, False) == {
+        "ZoneId": "Z1111111111ABCDEFGHIJ",
+        "ZoneTld": "lambda-my-aws.io",
+    }
+    assert (
+        lookup_route53_namespace(Zone("lambda-my-aws.io"), session, True)["ZoneId"]
+        == "Z2222222222ABCDEFGHIJ"
+    )
+    with pytest.raises(LookupError):
+        lookup_route53_namespace(Zone("lambda-my-aws.internal"), session, True)
+
+
+def test_meshes_lookup(session):
+    assert lookup_mesh_by_name(session, "shared") == {
+        MESH_NAME.title: "shared",
+        MESH_OWNER_ID.title: "111111111111",
+    }
+    assert (
+        lookup_mesh_by_name(session, "root", "000000000000")[MESH_NAME.title] == "root"
+    )
+    assert not lookup_mesh_by_name(session, "root", "111111111111")
+    assert not lookup_mesh_by_name(session, "none")
@@ -0,0 +1,60 @@
+#  -*- coding: utf-8 -*-
+#   ECS ComposeX <https://github.com/lambda-my-aws/ecs_composex>
+#   Copyright (C) 2020-2021  John Mille <john@lambda-my-aws.io>
+#  #
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#  #
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#  #
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module to test the Fargate CPU/RAM configuration selection.
+"""
+
+import pytest
+
+from ecs_composex.ecs.docker_tools import (
+    define_fargate_sizing,
+    find_cheapest_fargate_configuration,
+    find_closest_fargate_configuration,
+)
+
+
+@pytest.mark.parametrize(
+    "cpu, ram, expected",
+    [
+        (0, 0, (256, 512)),
+        (0, 600, (256, 1024)),
+        (256, 2048, (256, 2048)),
+        (300, 512, (512, 1024)),
+        (256, 3000, (512, 3072)),
+        (1024, 9000, (2048, 9216)),
+        (4096, 30720, (4096, 30720)),
+    ],
+)
+def test_cheapest_configuration(cpu, ram, expected):
+    assert find_cheapest_fargate_configuration(cpu, ram) == expected
+    assert find_closest_fargate_configuration(cpu, ram) == expected
+
+
+def test_oversized_configuration():
+    assert find_cheapest_fargate_configuration(8192, 512) is None
+    assert find_closest_fargate_configuration(8192, 65536, True) == "4096!32768"
+    assert find_closest_fargate_configuration(256, 65536, True) == "4096!32768"
+    assert find_closest_fargate_configuration(8192, 512) == (4096, 8192)
+
+
+def test_sizing_report():
+    sizing = define_fargate_sizing(768, 1536)
+    assert sizing["Cpu"] == 1024
+    assert sizing["Memory"] == 2048
+    assert sizing["UnusedVCpu"] == 0.25
+    assert sizing["UnusedGB"] == 0.5
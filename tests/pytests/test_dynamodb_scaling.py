@@ -0,0 +1,113 @@
+#  -*- coding: utf-8 -*-
+#   ECS ComposeX <https://github.com/lambda-my-aws/ecs_composex>
+#   Copyright (C) 2020-2021  John Mille <john@lambda-my-aws.io>
+#  #
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#  #
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#  #
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module to test the DynamoDB tables capacity autoscaling and billing mode.
+"""
+
+from os import path
+
+import boto3
+import pytest
+
+from ecs_composex.common.settings import ComposeXSettings
+from ecs_composex.dynamodb.dynamodb_params import RES_KEY
+from ecs_composex.dynamodb.dynamodb_scaling import set_billing_mode
+from ecs_composex.dynamodb.dynamodb_stack import XStack
+
+HERE = path.abspath(path.dirname(__file__))
+
+
+def test_tables_autoscaling():
+    settings = ComposeXSettings(
+        session=boto3.session.Session(),
+        **{
+            ComposeXSettings.name_arg: "test",
+            ComposeXSettings.command_arg: ComposeXSettings.render_arg,
+            ComposeXSettings.input_file_arg: [
+                path.abspath(f"{HERE}/../../use-cases/blog.yml"),
+                path.abspath(f"{HERE}/../../use-cases/dynamodb/autoscaling.yml"),
+            ],
+            ComposeXSettings.format_arg: "yaml",
+        },
+    )
+    stack = XStack("dynamodb", settings)
+    resources = stack.stack_template.resources
+    assert resources["tableA"].BillingMode == "PROVISIONED"
+    assert resources["tableA"].ProvisionedThroughput.ReadCapacityUnits == 5
+    assert resources["tableAReadScalableTarget"].MaxCapacity == 100
+    index_target = resources["tableAmyGSI2ReadScalableTarget"]
+    assert index_target.MinCapacity == 2
+    assert index_target.ScalableDimension == "dynamodb:index:ReadCapacityUnits"
+    assert "tableAmyGSIWriteTrackingPolicy" in resources
+    assert resources["tableB"].BillingMode == "PAY_PER_REQUEST"
+    assert not hasattr(resources["tableB"], "ProvisionedThroughput")
+    assert not [name for name in resources if name.startswith("tableBRead")]
+    assert settings.compose_content[RES_KEY]["tableB"].attributes_outputs
+
+
+def test_billing_mode_validation():
+    class Table(object):
+        name = "table"
+        properties = {"GlobalSecondaryIndexes": [{"IndexName": "gsi"}]}
+        parameters = {"BillingMode": "ON_DEMAND"}
+
+    with pytest.raises(ValueError):
+        set_billing_mode(Table)
+    Table.parameters = {
+        "BillingMode": "PAY_PER_REQUEST",
+        "AutoScaling": {"ReadCapacity": {"Min": 1, "Max": 10}},
+    }
+    with pytest.raises(ValueError):
+        set_billing_mode(Table)
+    Table.parameters = {"AutoScaling": {"ReadCapacity": {"Min": 1, "Max": 10}}}
+    with pytest.raises(ValueError):
+        set_billing_mode(Table)
+    Table.parameters = {
+        "AutoScaling": {
+            "ReadCapacity": {"Min": 1, "Max": 10},
+            "WriteCapacity": {"Min": 10, "Max": 1},
+        }
+    }
+    with pytest.raises(ValueError):
+        set_billing_mode(Table)
+    Table.parameters = {
+        "AutoScaling": {
+            "ReadCapacity": {"Min": 1, "Max": 10, "TargetUtilization": 95},
+            "WriteCapacity": {"Min": 1, "Max": 10},
+        }
+    }
+    with pytest.raises(ValueError):
+        set_billing_mode(Table)
+    Table.parameters = {
+        "AutoScaling": {
+            "ReadCapacity": {"Min": 1, "Max": 10},
+            "WriteCapacity": {"Min": 1, "Max": 10},
+            "Indexes": {"nope": {}},
+        }
+    }
+    with pytest.raises(KeyError):
+        set_billing_mode(Table)
+    Table.parameters["AutoScaling"]["Indexes"] = {
+        "gsi": {"WriteCapacity": {"Min": 2, "Max": 4}}
+    }
+    properties = set_billing_mode(Table)
+    assert properties["GlobalSecondaryIndexes"][0]["ProvisionedThroughput"] == {
+        "ReadCapacityUnits": 1,
+        "WriteCapacityUnits": 2,
+    }
+    assert "ProvisionedThroughput" not in Table.properties
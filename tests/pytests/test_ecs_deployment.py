@@ -0,0 +1,102 @@
+﻿#  -*- coding: utf-8 -*-
+#   ECS ComposeX <https://github.com/lambda-my-aws/ecs_composex>
+#   Copyright (C) 2020-2021  John Mille <john@lambda-my-aws.io>
+#  #
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#  #
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#  #
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Module to test the ECS Service deployment configuration settings.
+"""
+
+from pytest import raises
+
+from ecs_composex.common.compose_services import ComposeService
+from ecs_composex.ecs.ecs_deployment import ServiceDeployment, import_update_config
+
+
+def test_update_config():
+    """
+    Function to test the import of the compose deploy.update_config
+    """
+    assert import_update_config(
+        {"parallelism": 2, "order": "start-first", "failure_action": "rollback"}, 4
+    ) == {
+        "MinimumHealthyPercent": 100,
+        "MaximumPercent": 150,
+        "DeploymentCircuitBreaker": {"Enable": True, "Rollback": True},
+    }
+    assert import_update_config({"parallelism": 1, "failure_action": "pause"}, 3) == {
+        "MinimumHealthyPercent": 66,
+        "MaximumPercent": 100,
+        "DeploymentCircuitBreaker": {"Enable": True, "Rollback": False},
+    }
+    with raises(ValueError):
+        import_update_config({"order": "random"}, 1)
+
+
+def test_family_deployment():
+    """
+    Function to test the merge of the deployment settings of the family services
+    """
+    services = [
+        ComposeService(
+            "api",
+            {
+                "image": "api",
+                "deploy": {"update_config": {"failure_action": "rollback"}},
+                "x-ecs": {
+                    "DeploymentConfiguration": {"MinimumHealthyPercent": 50},
+                    "HealthCheckGracePeriodSeconds": 30,
+                },
+            },
+        ),
+        ComposeService(
+            "sidecar",
+            {
+                "image": "sidecar",
+                "x-ecs": {
+                    "DeploymentConfiguration": {
+                        "MinimumHealthyPercent": 75,
+                        "MaximumPercent": 150,
+                    },
+                    "HealthCheckGracePeriodSeconds": 60,
+                },
+            },
+        ),
+    ]
+    deployment = ServiceDeployment(services)
+    assert deployment.grace_period == 60
+    assert deployment.configuration == {
+        "MinimumHealthyPercent": 50,
+        "MaximumPercent": 150,
+        "DeploymentCircuitBreaker": {"Enable": True, "Rollback": True},
+    }
+    with raises(ValueError):
+        ServiceDeployment(
+            [
+                ComposeService(
+                    "api",
+                    {
+                        "image": "api",
+                        "x-ecs": {
+                            "DeploymentConfiguration": {
+                                "MinimumHealthyPercent": 100,
+                                "MaximumPercent": 100,
+                            }
+                        },
+                    },
+                )
+            ]
+        )
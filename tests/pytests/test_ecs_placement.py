@@ -0,0 +1,157 @@
+﻿#  -*- coding: utf-8 -*-
+#   ECS ComposeX <https://github.com/lambda-my-aws/ecs_composex>
+#   Copyright (C) 2020-2021  John Mille <john@lambda-my-aws.io>
+#  #
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#  #
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#  #
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Module to test the ECS Service placement and capacity provider strategy settings.
+"""
+
+from pytest import raises
+
+from ecs_composex.common.compose_services import ComposeService
+from ecs_composex.ecs.ecs_cluster import DEFAULT_PROVIDERS
+from ecs_composex.ecs.ecs_placement import (
+    ServicePlacement,
+    import_deploy_placement,
+    validate_capacity_provider_strategy,
+)
+
+
+def test_family_placement():
+    """
+    Function to test the merge of deploy.placement and x-ecs settings of the family services
+    """
+    services = [
+        ComposeService(
+            "worker",
+            {
+                "image": "worker",
+                "deploy": {
+                    "placement": {
+                        "constraints": ["attribute:ecs.instance-type =~ m5.*"],
+                        "preferences": [{"binpack": "memory"}],
+                    }
+                },
+            },
+        ),
+        ComposeService(
+            "sidecar",
+            {
+                "image": "sidecar",
+                "x-ecs": {
+                    "PlacementConstraints": [{"Type": "distinctInstance"}],
+                    "PlacementStrategies": [{"Type": "random"}],
+                },
+            },
+        ),
+    ]
+    placement = ServicePlacement(services, DEFAULT_PROVIDERS)
+    assert placement.strategies == [{"Type": "binpack", "Field": "memory"}]
+    assert [
+        constraint.Type for constraint in placement.define_placement_constraints()
+    ] == [
+        "memberOf",
+        "distinctInstance",
+    ]
+    assert placement.define_capacity_provider_strategy().data == {"Ref": "AWS::NoValue"}
+
+
+def test_capacity_provider_strategy():
+    """
+    Function to test the validation of the capacity provider strategy
+    """
+    strategy = [
+        {"CapacityProvider": "FARGATE_SPOT", "Weight": 3},
+        {"CapacityProvider": "FARGATE", "Weight": 1, "Base": 2},
+    ]
+    validate_capacity_provider_strategy(strategy, DEFAULT_PROVIDERS)
+    validate_capacity_provider_strategy(strategy, None)
+    with raises(ValueError):
+        validate_capacity_provider_strategy(strategy, ["FARGATE"])
+    with raises(ValueError):
+        validate_capacity_provider_strategy(
+            [
+                {"CapacityProvider": "FARGATE", "Weight": 1},
+                {"CapacityProvider": "my-asg-provider", "Weight": 1},
+            ],
+            None,
+        )
+    with raises(ValueError):
+        validate_capacity_provider_strategy(
+            [
+                {"CapacityProvider": "FARGATE_SPOT", "Base": 1},
+                {"CapacityProvider": "FARGATE", "Base": 1},
+            ],
+            DEFAULT_PROVIDERS,
+        )
+    with raises(ValueError):
+        ServicePlacement(
+            [
+                ComposeService(
+                    "batch",
+                    {
+                        "image": "batch",
+                        "x-ecs": {"PlacementStrategies": [{"Type": "binpack"}]},
+                    },
+                )
+            ]
+        )
+
+
+def test_swarm_placement():
+    """
+    Function to test the translation of the Swarm deploy.placement constraints and preferences
+    """
+    config = import_deploy_placement(
+        {
+            "constraints": [
+                "node.labels.zone == eu-west-1a",
+                "node.role==manager",
+                "node.platform.arch!=aarch64",
+                "node.hostname == node-1",
+                "attribute:ecs.instance-type =~ m5.*",
+            ],
+            "preferences": [
+                {"spread": "node.labels.zone"},
+                {"spread": "node.id"},
+                {"binpack": "memory"},
+            ],
+        }
+    )
+    assert config == {
+        "PlacementConstraints": [
+            {"Type": "memberOf", "Expression": "attribute:zone == eu-west-1a"},
+            {
+                "Type": "memberOf",
+                "Expression": "attribute:ecs.cpu-architecture != arm64",
+            },
+            {"Type": "memberOf", "Expression": "attribute:ecs.instance-type =~ m5.*"},
+        ],
+        "PlacementStrategies": [
+            {"Type": "spread", "Field": "attribute:zone"},
+            {"Type": "binpack", "Field": "memory"},
+        ],
+    }
+    assert (
+        import_deploy_placement(
+            {
+                "constraints": ["node.role == manager"],
+                "preferences": [{"spread": "node.id"}],
+            }
+        )
+        == {}
+    )
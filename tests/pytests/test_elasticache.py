@@ -0,0 +1,100 @@
+#  -*- coding: utf-8 -*-
+#   ECS ComposeX <https://github.com/lambda-my-aws/ecs_composex>
+#   Copyright (C) 2020-2021  John Mille <john@lambda-my-aws.io>
+#  #
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#  #
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#  #
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module to test the ElastiCache Redis cluster mode and replication groups endpoints.
+"""
+
+from os import path
+
+import boto3
+import pytest
+
+from ecs_composex.common.settings import ComposeXSettings
+from ecs_composex.elasticache.elasticache_params import (
+    RES_KEY,
+    REPLICA_CONFIG_PORT,
+    REPLICA_PRIMARY_ADDRESS,
+    REPLICA_READER_ADDRESS,
+)
+from ecs_composex.elasticache.elasticache_stack import XStack
+from ecs_composex.elasticache.elasticache_template import define_cluster_mode_props
+
+HERE = path.abspath(path.dirname(__file__))
+
+
+def get_settings(*files):
+    return ComposeXSettings(
+        session=boto3.session.Session(),
+        **{
+            ComposeXSettings.name_arg: "test",
+            ComposeXSettings.command_arg: ComposeXSettings.render_arg,
+            ComposeXSettings.input_file_arg: [
+                path.abspath(f"{HERE}/../../use-cases/{file_name}")
+                for file_name in files
+            ],
+            ComposeXSettings.format_arg: "yaml",
+        },
+    )
+
+
+def test_cluster_mode():
+    settings = get_settings("blog.yml", "elasticache/cluster_mode.yml")
+    stack = XStack("elasticache", settings)
+    sessions = settings.compose_content[RES_KEY]["sessions"]
+    props = sessions.cfn_resource.to_dict()["Properties"]
+    assert props["NumNodeGroups"] == 3
+    assert props["ReplicasPerNodeGroup"] == 2
+    assert props["AutomaticFailoverEnabled"] is True
+    assert props["CacheParameterGroupName"] == "default.redis6.x.cluster.on"
+    assert sessions.port_attr is REPLICA_CONFIG_PORT
+    assert "sessionsConfigurationEndPointAddress" in stack.stack_template.outputs
+    cache = settings.compose_content[RES_KEY]["cache03"]
+    assert REPLICA_READER_ADDRESS in cache.env_vars_parameters
+    cache.generate_resource_envvars()
+    assert [env.Name for env in cache.env_vars] == [
+        "cache03_PrimaryEndPointAddress",
+        "cache03_PrimaryEndPointPort",
+        "cache03_ReaderEndPointAddress",
+        "cache03_ReaderEndPointPort",
+        "cache03",
+    ]
+
+
+def test_single_node_group():
+    settings = get_settings("blog.yml", "elasticache/cluster_mode.yml")
+    stack = XStack("elasticache", settings)
+    disabled = settings.compose_content[RES_KEY]["cache04"]
+    assert REPLICA_PRIMARY_ADDRESS in disabled.env_vars_parameters
+    assert REPLICA_READER_ADDRESS in disabled.env_vars_parameters
+    assert "cache04ConfigurationEndPointAddress" not in stack.stack_template.outputs
+    enabled = settings.compose_content[RES_KEY]["cache05"]
+    assert enabled.port_attr is REPLICA_CONFIG_PORT
+    assert "cache05ConfigurationEndPointAddress" in stack.stack_template.outputs
+
+
+def test_cluster_mode_validation():
+    assert (
+        define_cluster_mode_props({"ReplicasPerNodeGroup": 0}, {})["MultiAZEnabled"]
+        is False
+    )
+    with pytest.raises(ValueError):
+        define_cluster_mode_props({"DataTiering": True}, {})
+    with pytest.raises(ValueError):
+        define_cluster_mode_props({"ReplicasPerNodeGroup": 0, "MultiAZ": True}, {})
+    with pytest.raises(ValueError):
+        define_cluster_mode_props({"NumNodeGroups": 0}, {})
@@ -0,0 +1,134 @@
+#  -*- coding: utf-8 -*-
+#   ECS ComposeX <https://github.com/lambda-my-aws/ecs_composex>
+#   Copyright (C) 2020-2021  John Mille <john@lambda-my-aws.io>
+#  #
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#  #
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#  #
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module to test the listener rules compiler.
+"""
+
+import pytest
+from troposphere.elasticloadbalancingv2 import Action, FixedResponseConfig, Listener
+
+from ecs_composex.elbv2.elbv2_rules import (
+    ALB_MAX_CONDITION_VALUES,
+    ALB_MAX_RULE_VALUES,
+    compile_listener_rules,
+    patterns_intersect,
+    remove_covered_values,
+)
+
+
+def fixed_response(listener, target_def):
+    return [
+        Action(
+            Type="fixed-response",
+            FixedResponseConfig=FixedResponseConfig(StatusCode="200"),
+        )
+    ]
+
+
+@pytest.fixture
+def listener():
+    return Listener("lbA80", Port=80, Protocol="HTTP", LoadBalancerArn="arn")
+
+
+def rules_conditions(rules):
+    return [
+        (
+            rule.title,
+            rule.Priority,
+            [
+                condition.to_dict()[
+                    "HostHeaderConfig"
+                    if condition.Field == "host-header"
+                    else "PathPatternConfig"
+                ]["Values"]
+                for condition in rule.Conditions
+            ],
+        )
+        for rule in rules
+    ]
+
+
+def test_merge_paths_and_hosts(listener):
+    targets = [
+        {
+            "name": "app01:app01",
+            "access": [f"api.example.com/path{count}" for count in range(12)],
+        },
+        {"name": "app02:app02", "access": "a.example.com"},
+        {"name": "app02:app02", "access": ["b.example.com", "c.example.com/abcd"]},
+        {"name": "app02:app02", "access": "c.example.com/efgh"},
+    ]
+    rules = compile_listener_rules(listener, targets, fixed_response)
+    assert len(rules) == 6
+    assert rules_conditions(rules)[0][2] == [
+        ["api.example.com"],
+        ["/path0", "/path1", "/path2"],
+    ]
+    assert rules_conditions(rules)[4] == (
+        "lbA80app02app02Rule",
+        5,
+        [["a.example.com", "b.example.com"]],
+    )
+    assert rules_conditions(rules)[5][2] == [["c.example.com"], ["/abcd", "/efgh"]]
+
+
+def test_conditions_values_limits(listener):
+    hosts = [f"host{count}.example.com" for count in range(7)]
+    paths = [f"/v{count}" for count in range(5)]
+    targets = [
+        {"name": "app01:app01", "access": hosts},
+        {"name": "app02:app02", "access": [f"api.example.com{path}" for path in paths]},
+    ]
+    rules = rules_conditions(compile_listener_rules(listener, targets, fixed_response))
+    paths_targets = [{"name": "app03:app03", "access": paths + ["/health"]}]
+    rules += rules_conditions(
+        compile_listener_rules(listener, paths_targets, fixed_response)
+    )
+    assert len(rules) == 7
+    for title, priority, conditions in rules:
+        assert all(len(values) <= ALB_MAX_CONDITION_VALUES for values in conditions)
+        assert sum(len(values) for values in conditions) <= ALB_MAX_RULE_VALUES
+    assert sorted(
+        value for _, _, conditions in rules for values in conditions for value in values
+    ) == sorted(hosts + ["api.example.com"] * 2 + paths * 2 + ["/health"])
+
+
+def test_weights_and_conflicts(listener):
+    targets = [
+        {"name": "app01:app01", "access": ["/api/*", "/health"]},
+        {"name": "app02:app02", "access": "/api/v1/users"},
+        {"name": "app03:app03", "access": ["/static/*", "/images/*"], "weight": 10},
+        {"name": "app02:app02", "access": "/api/*/private", "weight": 20},
+    ]
+    rules = rules_conditions(compile_listener_rules(listener, targets, fixed_response))
+    assert rules == [
+        ("lbA80app03app03Rule", 1, [["/static/*", "/images/*"]]),
+        ("lbA80app01app01Rule", 2, [["/api/*"]]),
+        ("lbA80app01app01Rule2", 3, [["/health"]]),
+    ]
+
+
+def test_patterns():
+    assert patterns_intersect("/api/*", "/*/users")
+    assert not patterns_intersect("/api/*", "/static/*")
+    assert not patterns_intersect("/api/*.json", "/api/*.html")
+    assert not patterns_intersect("/a?", "/abc")
+    assert remove_covered_values(["/api/v1/*", "/api/*", "/health", "/api/*"]) == [
+        "/api/*",
+        "/health",
+    ]
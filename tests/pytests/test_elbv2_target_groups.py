@@ -0,0 +1,99 @@
+﻿#  -*- coding: utf-8 -*-
+#   ECS ComposeX <https://github.com/lambda-my-aws/ecs_composex>
+#   Copyright (C) 2020-2021  John Mille <john@lambda-my-aws.io>
+#  #
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#  #
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#  #
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Module to test the target groups attributes of the x-elbv2 services.
+"""
+
+from pytest import raises
+
+from ecs_composex.elbv2.elbv2_ecs import define_target_group_attributes
+
+
+class LoadBalancer(object):
+    """
+    Class with the LB type methods of ecs_composex.elbv2.elbv2_stack.Elbv2
+    """
+
+    def __init__(self, lb_type):
+        self.lb_type = lb_type
+
+    def is_alb(self):
+        return self.lb_type == "application"
+
+    def is_nlb(self):
+        return self.lb_type == "network"
+
+
+def attributes(lb_type, tgt_attributes):
+    return {
+        attribute.Key: attribute.Value
+        for attribute in define_target_group_attributes(
+            LoadBalancer(lb_type),
+            {"name": "app01:app01", "TargetGroupAttributes": tgt_attributes},
+        )
+    }
+
+
+def test_alb_attributes():
+    assert attributes(
+        "application",
+        {
+            "slow_start.duration_seconds": 60,
+            "stickiness.enabled": True,
+            "stickiness.type": "lb_cookie",
+        },
+    ) == {
+        "deregistration_delay.timeout_seconds": "60",
+        "slow_start.duration_seconds": "60",
+        "stickiness.enabled": "true",
+        "stickiness.type": "lb_cookie",
+    }
+    with raises(ValueError):
+        attributes("application", {"proxy_protocol_v2.enabled": True})
+    with raises(ValueError):
+        attributes(
+            "application",
+            {
+                "slow_start.duration_seconds": 60,
+                "load_balancing.algorithm.type": "least_outstanding_requests",
+            },
+        )
+    with raises(ValueError):
+        attributes("application", {"slow_start.duration_seconds": 10})
+    with raises(KeyError):
+        attributes("application", {"slow_start": 60})
+
+
+def test_nlb_attributes():
+    assert attributes(
+        "network",
+        {
+            "deregistration_delay.timeout_seconds": 10,
+            "preserve_client_ip.enabled": False,
+            "stickiness.type": "source_ip",
+        },
+    ) == {
+        "deregistration_delay.timeout_seconds": "10",
+        "preserve_client_ip.enabled": "false",
+        "stickiness.type": "source_ip",
+    }
+    with raises(ValueError):
+        attributes("network", {"load_balancing.algorithm.type": "round_robin"})
+    with raises(ValueError):
+        attributes("network", {"stickiness.type": "lb_cookie"})
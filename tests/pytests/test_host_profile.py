@@ -0,0 +1,109 @@
+#  -*- coding: utf-8 -*-
+#   ECS ComposeX <https://github.com/lambda-my-aws/ecs_composex>
+#   Copyright (C) 2020-2021  John Mille <john@lambda-my-aws.io>
+#  #
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#  #
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#  #
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module to test the EC2 hosts profile (ECS Agent, docker and packages settings).
+"""
+
+from os import path
+
+import boto3
+import pytest
+
+from ecs_composex.common.config import HostProfileConfig
+from ecs_composex.common.settings import ComposeXSettings
+from ecs_composex.compute.compute_params import HOST_ROLE_T
+from ecs_composex.compute.compute_template import generate_compute_template
+
+HERE = path.abspath(path.dirname(__file__))
+
+
+def get_settings(*files):
+    return ComposeXSettings(
+        session=boto3.session.Session(),
+        **{
+            ComposeXSettings.name_arg: "test",
+            ComposeXSettings.command_arg: ComposeXSettings.render_arg,
+            ComposeXSettings.input_file_arg: [
+                path.abspath(f"{HERE}/../../use-cases/{file_name}")
+                for file_name in files
+            ],
+            ComposeXSettings.format_arg: "yaml",
+        },
+    )
+
+
+def get_init_configs(template):
+    init = template.resources["LaunchTemplate"].Metadata.to_dict()[
+        "AWS::CloudFormation::Init"
+    ]
+    return init["configSets"]["default"], init
+
+
+def test_default_profile():
+    settings = get_settings("blog.yml")
+    template = generate_compute_template(settings)
+    config_sets, init = get_init_configs(template)
+    assert config_sets == ["awspackages", "dockerconfig", "ecsconfig", "awsservices"]
+    ecs_config = init["ecsconfig"]["files"]["/etc/ecs/ecs.config"]["content"]
+    assert "ECS_IMAGE_PULL_BEHAVIOR=prefer-cached" in ecs_config["Fn::Join"][1]
+    docker_config = init["dockerconfig"]["files"]["/etc/sysconfig/docker"]["content"]
+    assert (
+        "OPTIONS=--default-ulimit nofile=65536:65536 --max-concurrent-downloads 10"
+        in docker_config["Fn::Join"][1]
+    )
+    assert init["awspackages"]["commands"]["100-install-amazon-ssm-agent"] == {
+        "command": "yum install -y amazon-ssm-agent",
+        "test": "! rpm -q amazon-ssm-agent",
+    }
+    commands = sorted(init["awspackages"]["commands"])
+    assert commands[-2:] == ["901-check-packages", "902-check-packages"]
+    assert all("-install-" in name for name in commands[:-2])
+
+
+def test_host_profile():
+    settings = get_settings("blog.yml", "ec2compute/host_profile.yml")
+    host_profile = HostProfileConfig(settings)
+    assert host_profile.ulimits == ["nofile=32768:65536", "nproc=16384:16384"]
+    assert "nginx" in host_profile.images
+    assert host_profile.ecr_registries == {
+        "123456789012.dkr.ecr.eu-west-1.amazonaws.com": "eu-west-1"
+    }
+    template = generate_compute_template(settings)
+    config_sets, init = get_init_configs(template)
+    assert config_sets[-1] == "imagesprepull"
+    commands = init["imagesprepull"]["commands"]
+    assert commands["001-ecr-login"]["command"].startswith(
+        "aws ecr get-login-password --region eu-west-1"
+    )
+    assert len([name for name in commands if name.endswith("-pull")]) == 2
+    assert "awslogs" not in str(init["awspackages"])
+    assert len(template.resources[HOST_ROLE_T].ManagedPolicyArns) == 2
+
+
+def test_invalid_profile():
+    settings = get_settings("blog.yml")
+    settings.compose_content["x-configs"] = {
+        "composex": {"host_profile": {"ContainerStopTimeout": "30"}}
+    }
+    with pytest.raises(ValueError):
+        HostProfileConfig(settings)
+    settings.compose_content["x-configs"]["composex"]["host_profile"] = {
+        "ImagePullBehaviour": "once"
+    }
+    with pytest.raises(KeyError):
+        HostProfileConfig(settings)
@@ -0,0 +1,105 @@
+﻿#  -*- coding: utf-8 -*-
+#   ECS ComposeX <https://github.com/lambda-my-aws/ecs_composex>
+#   Copyright (C) 2020-2021  John Mille <john@lambda-my-aws.io>
+#  #
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#  #
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#  #
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Module to test the services logging modes and the FireLens log router.
+"""
+
+from pytest import raises
+
+from ecs_composex.common.compose_services import ComposeFamily, ComposeService
+from ecs_composex.ecs.ecs_params import LOG_ROUTER_NAME
+
+
+def test_non_blocking_mode():
+    """
+    Function to test the non-blocking logging options, from x-logging and from the compose logging options
+    """
+    service = ComposeService(
+        "api",
+        {"image": "api", "x-logging": {"Mode": "non-blocking", "MaxBufferSize": "25m"}},
+    )
+    options = service.container_definition.LogConfiguration.Options
+    assert options["mode"] == "non-blocking"
+    assert options["max-buffer-size"] == "25m"
+    service = ComposeService(
+        "api",
+        {"image": "api", "logging": {"options": {"mode": "non-blocking"}}},
+    )
+    assert service.logging_options == {"mode": "non-blocking", "max-buffer-size": "1m"}
+    with raises(ValueError):
+        ComposeService("api", {"image": "api", "x-logging": {"MaxBufferSize": "25m"}})
+    with raises(ValueError):
+        ComposeService(
+            "api",
+            {
+                "image": "api",
+                "x-logging": {"Mode": "non-blocking", "MaxBufferSize": "25"},
+            },
+        )
+
+
+def test_firelens_log_router():
+    """
+    Function to test the FireLens log router is added to the family and the services logs routed to it
+    """
+    service = ComposeService(
+        "api",
+        {
+            "image": "api",
+            "x-logging": {
+                "RetentionInDays": 30,
+                "Mode": "non-blocking",
+                "MaxBufferSize": "2m",
+                "FireLens": {"Options": {"log_format": "json/emf"}},
+            },
+        },
+    )
+    family = ComposeFamily([service], "api")
+    assert family.use_firelens
+    assert [service.name for service in family.ordered_services] == [
+        LOG_ROUTER_NAME,
+        "api",
+    ]
+    log_config = service.container_definition.LogConfiguration
+    assert log_config.LogDriver == "awsfirelens"
+    assert log_config.Options["log-driver-buffer-limit"] == str(2 * pow(2, 20))
+    assert log_config.Options["log_format"] == "json/emf"
+    router = family.ordered_services[0].container_definition
+    assert router.FirelensConfiguration.Type == "fluentbit"
+    assert router.LogConfiguration.LogDriver == "awslogs"
+    assert log_config.Options["auto_create_group"].to_dict() == {
+        "Fn::If": [
+            "CreateNewLogGroupCondition",
+            "false",
+            {"Fn::If": ["GenerateLogGroupName", "true", "false"]},
+        ]
+    }
+    family.refresh()
+    assert [service.name for service in family.ignored_services] == [LOG_ROUTER_NAME]
+
+
+def test_firelens_without_refresh(monkeypatch):
+    """
+    Function to test the services logs are routed to FireLens without relying on the family refresh
+    """
+    service = ComposeService("api", {"image": "api", "x-logging": {"FireLens": True}})
+    monkeypatch.setattr(ComposeFamily, "refresh", lambda family: None)
+    family = ComposeFamily([service], "api")
+    assert LOG_ROUTER_NAME in [service.name for service in family.services]
+    assert service.container_definition.LogConfiguration.LogDriver == "awsfirelens"
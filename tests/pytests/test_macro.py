@@ -0,0 +1,205 @@
+#  -*- coding: utf-8 -*-
+#   ECS ComposeX <https://github.com/lambda-my-aws/ecs_composex>
+#   Copyright (C) 2020-2021  John Mille <john@lambda-my-aws.io>
+#  #
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#  #
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#  #
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module to test the download of the remote compose files of the macro.
+"""
+
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from os import listdir
+
+import boto3
+import pytest
+from botocore.exceptions import ClientError
+
+from ecs_composex import macro
+from ecs_composex.common.settings import ComposeXSettings
+
+
+class HttpResponse(object):
+    def __init__(self, status_code, chunks=None, etag=None):
+        self.status_code = status_code
+        self.chunks = chunks or []
+        self.headers = {"ETag": etag} if etag else {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def iter_content(self, chunk_size):
+        for chunk in self.chunks:
+            if isinstance(chunk, Exception):
+                raise chunk
+            yield chunk
+
+
+class HttpSession(object):
+    def __init__(self, responses):
+        self.responses = responses
+        self.requests = []
+
+    def get(self, url, headers=None, stream=False):
+        self.requests.append(headers)
+        return self.responses.pop(0)
+
+
+class S3Client(object):
+    class exceptions(object):
+        class NoSuchKey(Exception):
+            pass
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.requests = []
+
+    def get_object(self, **kwargs):
+        self.requests.append(kwargs)
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+@pytest.fixture
+def cache_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr(macro, "REMOTE_FILES_CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def test_remote_files_order(monkeypatch, cache_dir):
+    files = [f"https://example.com/docker-compose-{count}.yml" for count in range(5)]
+
+    def fetch(file, client, http_session):
+        time.sleep(0.01 * (len(files) - files.index(file)))
+        return None if file.endswith("3.yml") else f"/local/{file[-5]}"
+
+    monkeypatch.setattr(macro, "fetch_remote_file", fetch)
+    params = {ComposeXSettings.input_file_arg: ["/local/src.yml"]}
+    macro.set_settings_from_remote_files(
+        files,
+        params,
+        tempfile.TemporaryDirectory(),
+        boto3.session.Session(region_name="eu-west-1"),
+    )
+    assert params[ComposeXSettings.input_file_arg] == [
+        "/local/src.yml",
+        "/local/0",
+        "/local/1",
+        "/local/2",
+        "/local/4",
+    ]
+
+
+def test_https_not_modified(cache_dir):
+    url = "https://example.com/docker-compose.yml"
+    http_session = HttpSession(
+        [HttpResponse(200, [b"services:", b" {}"], etag='"abc"'), HttpResponse(304)]
+    )
+    file_path = macro.fetch_https_file(url, http_session)
+    assert macro.fetch_https_file(url, http_session) == file_path
+    assert http_session.requests == [{}, {"If-None-Match": '"abc"'}]
+    with open(file_path, "rb") as file_fd:
+        assert file_fd.read() == b"services: {}"
+
+
+def test_s3_not_modified(cache_dir):
+    url = "s3://bucket/path/docker-compose.yml"
+
+    class Body(object):
+        def iter_chunks(self, chunk_size):
+            yield b"services: {}"
+
+    client = S3Client(
+        [
+            {"Body": Body(), "ETag": '"abc"'},
+            ClientError({"Error": {"Code": "304"}}, "GetObject"),
+        ]
+    )
+    file_path = macro.fetch_s3_file(url, client)
+    assert macro.fetch_s3_file(url, client) == file_path
+    assert client.requests[1] == {
+        "Bucket": "bucket",
+        "Key": "path/docker-compose.yml",
+        "IfNoneMatch": '"abc"',
+    }
+
+
+def test_download_failures(cache_dir):
+    url = "https://example.com/docker-compose.yml"
+    http_session = HttpSession(
+        [
+            HttpResponse(200, [b"services: {}"], etag='"abc"'),
+            HttpResponse(200, [b"partial", IOError("Connection reset")]),
+            HttpResponse(404),
+        ]
+    )
+    file_path = macro.fetch_https_file(url, http_session)
+    with pytest.raises(IOError):
+        macro.fetch_https_file(url, http_session)
+    with pytest.raises(FileNotFoundError):
+        macro.fetch_https_file(url, http_session)
+    with open(file_path, "rb") as file_fd:
+        assert file_fd.read() == b"services: {}"
+    assert not [name for name in listdir(cache_dir) if name.endswith(".tmp")]
+    client = S3Client([ClientError({"Error": {"Code": "AccessDenied"}}, "GetObject")])
+    with pytest.raises(ClientError):
+        macro.fetch_s3_file("s3://bucket/docker-compose.yml", client)
+    assert macro.fetch_remote_file("http://example.com/file.yml", None, None) is None
+
+
+def test_concurrent_writes(cache_dir):
+    file_path, etag_path = macro.get_cached_file_paths("https://example.com/file.yml")
+    contents = [bytes([65 + count]) * 1024 for count in range(8)]
+
+    def write(content):
+        macro.write_cached_file(
+            (content[index : index + 64] for index in range(0, len(content), 64)),
+            file_path,
+            etag_path,
+            None,
+        )
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(write, contents))
+    with open(file_path, "rb") as file_fd:
+        assert file_fd.read() in contents
+    assert not [name for name in listdir(cache_dir) if name.endswith(".tmp")]
+
+
+def test_account_id_from_role(monkeypatch):
+    monkeypatch.setattr(macro, "get_account_id", lambda session: "210987654321")
+    settings = ComposeXSettings(
+        **{
+            ComposeXSettings.name_arg: "test",
+            ComposeXSettings.command_arg: ComposeXSettings.render_arg,
+            ComposeXSettings.format_arg: "yaml",
+        },
+        content={"services": {}},
+        session=boto3.session.Session(),
+    )
+    macro.set_settings_account_id(settings, {}, "123456789012")
+    assert settings.account_id == "123456789012"
+    macro.set_settings_account_id(
+        settings,
+        {ComposeXSettings.arn_arg: "arn:aws:iam::210987654321:role/composex"},
+        "123456789012",
+    )
+    assert settings.account_id == "210987654321"
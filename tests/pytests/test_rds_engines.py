@@ -0,0 +1,111 @@
+#  -*- coding: utf-8 -*-
+#   ECS ComposeX <https://github.com/lambda-my-aws/ecs_composex>
+#   Copyright (C) 2020-2021  John Mille <john@lambda-my-aws.io>
+#  #
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#  #
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#  #
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module to test the RDS engines catalog and its refresh from the API.
+"""
+
+from os import path
+
+import boto3
+import placebo
+import pytest
+
+from ecs_composex.rds.rds_parameter_groups_helper import (
+    ENGINES_CACHE_DIR_ENV,
+    get_db_cluster_engine_parameter_group_defaults,
+    get_family_from_engine_version,
+    get_family_settings,
+    read_cache_file,
+)
+
+
+class OfflineSession(object):
+    """
+    Session which fails the test if any client is requested
+    """
+
+    region_name = "eu-west-1"
+
+    def client(self, service_name):
+        raise AssertionError(f"No {service_name} client should be created")
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv(ENGINES_CACHE_DIR_ENV, str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def session():
+    here = path.abspath(path.dirname(__file__))
+    session = boto3.session.Session()
+    pill = placebo.attach(session, data_path=f"{here}/x_rds_engines")
+    pill.playback()
+    return session
+
+
+def test_catalog_families():
+    session = OfflineSession()
+    assert (
+        get_family_from_engine_version("aurora-postgresql", "11.7", session)
+        == "aurora-postgresql11"
+    )
+    assert (
+        get_family_from_engine_version("aurora-postgresql", 9.6, session)
+        == "aurora-postgresql9.6"
+    )
+    assert (
+        get_family_from_engine_version(
+            "aurora-mysql", "5.7.mysql_aurora.2.09.2", session
+        )
+        == "aurora-mysql5.7"
+    )
+    assert get_family_from_engine_version("mysql", "8.0.21", session) == "mysql8.0"
+
+
+def test_catalog_defaults():
+    session = OfflineSession()
+    assert get_family_settings("aurora-mysql5.7", session) == {"binlog_format": "MIXED"}
+    assert "rds.force_ssl" in get_family_settings("aurora-postgresql11", session)
+    assert get_family_settings("mysql8.0", session) is None
+
+
+def test_refresh_defaults(session, cache_dir):
+    defaults = get_db_cluster_engine_parameter_group_defaults(
+        "aurora-mysql5.7", session, refresh=True
+    )
+    assert defaults == {"aurora_parallel_query": "OFF", "binlog_format": "MIXED"}
+    assert read_cache_file("aurora-mysql5.7.json")["Parameters"] == defaults
+    assert (
+        get_db_cluster_engine_parameter_group_defaults(
+            "aurora-mysql5.7", OfflineSession()
+        )
+        == defaults
+    )
+
+
+def test_family_from_api(session):
+    assert (
+        get_family_from_engine_version("aurora-postgresql", "14.3", session)
+        == "aurora-postgresql14"
+    )
+    assert (
+        get_family_from_engine_version("aurora-postgresql", "14.3", OfflineSession())
+        == "aurora-postgresql14"
+    )
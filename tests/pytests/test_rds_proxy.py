@@ -0,0 +1,135 @@
+#  -*- coding: utf-8 -*-
+#   ECS ComposeX <https://github.com/lambda-my-aws/ecs_composex>
+#   Copyright (C) 2020-2021  John Mille <john@lambda-my-aws.io>
+#  #
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#  #
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#  #
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module to test the RDS Proxy for new and looked up DBs.
+"""
+
+from os import path
+
+import boto3
+import placebo
+import pytest
+
+from ecs_composex.common.settings import ComposeXSettings
+from ecs_composex.ecs.ecs_params import TASK_T
+from ecs_composex.ecs_composex import generate_full_template
+from ecs_composex.rds.rds_params import DB_PROXY_ENDPOINT, RES_KEY
+from ecs_composex.rds.rds_proxy import get_proxy_engine_family, get_proxy_settings
+from ecs_composex.rds.rds_stack import XStack
+
+HERE = path.abspath(path.dirname(__file__))
+
+
+def get_settings(session, *files):
+    return ComposeXSettings(
+        session=session,
+        **{
+            ComposeXSettings.name_arg: "test",
+            ComposeXSettings.command_arg: ComposeXSettings.render_arg,
+            ComposeXSettings.input_file_arg: [
+                path.abspath(f"{HERE}/../../use-cases/{file_name}")
+                for file_name in files
+            ],
+            ComposeXSettings.format_arg: "yaml",
+        },
+    )
+
+
+def test_new_db_proxy():
+    settings = get_settings(boto3.session.Session(), "blog.yml", "rds/rds_proxy.yml")
+    stack = XStack("rds", settings)
+    db_a = settings.compose_content[RES_KEY]["dbA"]
+    db_template = stack.stack_template.resources["dbA"].stack_template
+    target_group = db_template.resources["dbAProxyTargetGroup"].to_dict()
+    assert target_group["Properties"]["ConnectionPoolConfigurationInfo"] == {
+        "MaxConnectionsPercent": 80,
+        "MaxIdleConnectionsPercent": 20,
+        "ConnectionBorrowTimeout": 120,
+    }
+    assert db_a.proxy.EngineFamily == "POSTGRESQL"
+    assert DB_PROXY_ENDPOINT in db_a.attributes_outputs
+    assert "dbAProxyEndpoint" in stack.stack_template.outputs
+    assert settings.compose_content[RES_KEY]["dbB"].proxy.EngineFamily == "MYSQL"
+
+
+def get_family_access(root_stack, family_name):
+    family = root_stack.stack_template.resources[family_name].stack_template
+    ingress = {
+        name: resource.GroupId.to_dict()["Ref"]
+        for name, resource in family.resources.items()
+        if resource.resource_type == "AWS::EC2::SecurityGroupIngress"
+    }
+    container = [
+        container
+        for container in family.resources[TASK_T].ContainerDefinitions
+        if container.Name == family_name
+    ][0]
+    return (
+        ingress,
+        [secret.Name for secret in container.Secrets],
+        {env.Name: env.Value for env in container.Environment},
+    )
+
+
+def test_proxy_services_access():
+    settings = get_settings(boto3.session.Session(), "blog.yml", "rds/rds_proxy.yml")
+    root_stack = generate_full_template(settings)
+    ingress, secrets, env_vars = get_family_access(root_stack, "app01")
+    assert ingress == {"AllowFromapp01todbA": "dbARdsProxySg"}
+    assert "DB_HOST" not in secrets
+    assert env_vars["DB_HOST"].to_dict() == {"Ref": "dbAProxyEndpoint"}
+    ingress, secrets, env_vars = get_family_access(root_stack, "app02")
+    assert ingress == {
+        "AllowFromapp02todbB": "dbBRdsProxySg",
+        "AllowFromapp02todbBDb": "dbBRdsSg",
+    }
+    assert secrets == ["dbB"]
+
+
+def test_lookup_db_proxy():
+    session = boto3.session.Session()
+    pill = placebo.attach(session, data_path=f"{HERE}/x_rds_lookup")
+    pill.playback()
+    settings = get_settings(session, "blog.yml", "rds/rds_proxy_lookup.yml")
+    stack = XStack("rds", settings)
+    db_c = settings.compose_content[RES_KEY]["dbC"]
+    resources = stack.stack_template.resources
+    assert resources["dbCProxyTargetGroup"].DBClusterIdentifiers == ["database-1"]
+    assert resources["dbCProxyToDb"].GroupId == "sg-07726e3f84c493d8d"
+    assert resources["dbCProxyToDb"].FromPort == 3306
+    assert db_c.proxy.EngineFamily == "MYSQL"
+    assert "dbCProxyEndpoint" in stack.stack_template.outputs
+    assert db_c.attributes_outputs[DB_PROXY_ENDPOINT]["ImportValue"].to_dict() == {
+        "Fn::GetAtt": ["rds", "Outputs.dbCProxyEndpoint"]
+    }
+
+
+def test_proxy_settings_validation():
+    class Db(object):
+        name = "db"
+        parameters = {"Proxy": {"MaxConnectionsPercent": 20}}
+
+    with pytest.raises(ValueError):
+        get_proxy_settings(Db)
+    Db.parameters = {"Proxy": {"MaxPoolSize": 20}}
+    with pytest.raises(KeyError):
+        get_proxy_settings(Db)
+    Db.parameters = {"Proxy": True}
+    assert get_proxy_settings(Db)["MaxConnectionsPercent"] == 90
+    with pytest.raises(ValueError):
+        get_proxy_engine_family("sqlserver-ex")
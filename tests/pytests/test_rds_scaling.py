@@ -0,0 +1,104 @@
+#  -*- coding: utf-8 -*-
+#   ECS ComposeX <https://github.com/lambda-my-aws/ecs_composex>
+#   Copyright (C) 2020-2021  John Mille <john@lambda-my-aws.io>
+#  #
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#  #
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#  #
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module to test the Aurora replicas scaling and the reader endpoint of the clusters.
+"""
+
+from os import path
+
+import boto3
+import placebo
+import pytest
+
+from ecs_composex.common.settings import ComposeXSettings
+from ecs_composex.rds.rds_aws import lookup_rds_resource
+from ecs_composex.rds.rds_ecs import create_rds_db_config_mapping
+from ecs_composex.rds.rds_params import (
+    DB_READER_ENDPOINT_T,
+    DB_RO_ENDPOINT_ADDRESS,
+    RES_KEY,
+)
+from ecs_composex.rds.rds_scaling import get_replicas_scaling_settings
+from ecs_composex.rds.rds_stack import XStack
+
+HERE = path.abspath(path.dirname(__file__))
+
+
+def test_replicas_scaling():
+    settings = ComposeXSettings(
+        session=boto3.session.Session(),
+        **{
+            ComposeXSettings.name_arg: "test",
+            ComposeXSettings.command_arg: ComposeXSettings.render_arg,
+            ComposeXSettings.input_file_arg: [
+                path.abspath(f"{HERE}/../../use-cases/blog.yml"),
+                path.abspath(f"{HERE}/../../use-cases/rds/replicas_scaling.yml"),
+            ],
+            ComposeXSettings.format_arg: "yaml",
+        },
+    )
+    stack = XStack("rds", settings)
+    db = settings.compose_content[RES_KEY]["dbA"]
+    resources = stack.stack_template.resources["dbA"].stack_template.resources
+    target = resources["dbAReplicasScalableTarget"]
+    assert target.MaxCapacity == 4
+    assert target.DependsOn == ["InstancedbA"]
+    assert (
+        resources[
+            "dbAReplicasCpuTrackingPolicy"
+        ].TargetTrackingScalingPolicyConfiguration.PredefinedMetricSpecification.PredefinedMetricType
+        == "RDSReaderAverageCPUUtilization"
+    )
+    assert "dbAReplicasConnectionsTrackingPolicy" in resources
+    assert DB_RO_ENDPOINT_ADDRESS in db.attributes_outputs
+
+
+def test_replicas_scaling_validation():
+    class Db(object):
+        name = "db"
+        parameters = {"ReplicasScaling": {"MaxCapacity": 2}}
+
+    with pytest.raises(KeyError):
+        get_replicas_scaling_settings(Db)
+    Db.parameters = {"ReplicasScaling": {"MaxCapacity": 16, "CpuTarget": 50}}
+    with pytest.raises(ValueError):
+        get_replicas_scaling_settings(Db)
+    Db.parameters = {
+        "ReplicasScaling": {"MinCapacity": 3, "MaxCapacity": 2, "CpuTarget": 50}
+    }
+    with pytest.raises(ValueError):
+        get_replicas_scaling_settings(Db)
+
+
+def test_lookup_reader_endpoint():
+    session = boto3.session.Session()
+    pill = placebo.attach(session, data_path=f"{HERE}/x_rds_lookup")
+    pill.playback()
+    db_config = lookup_rds_resource(
+        {"cluster": {"Name": "database-1", "Tags": [{"dbname": "test-1"}]}},
+        session,
+    )
+
+    class Db(object):
+        logical_name = "dbC"
+
+    mapping = create_rds_db_config_mapping(Db, db_config)
+    assert (
+        mapping["dbC"][DB_READER_ENDPOINT_T]
+        == "database-1.cluster-ro-cvjpaxz5wqkd.eu-west-1.rds.amazonaws.com"
+    )
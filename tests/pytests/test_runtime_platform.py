@@ -0,0 +1,79 @@
+﻿#  -*- coding: utf-8 -*-
+#   ECS ComposeX <https://github.com/lambda-my-aws/ecs_composex>
+#   Copyright (C) 2020-2021  John Mille <john@lambda-my-aws.io>
+#  #
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#  #
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#  #
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Module to test the families runtime platform and ephemeral storage settings.
+"""
+
+from pytest import raises
+
+from ecs_composex.common.compose_services import ComposeFamily, ComposeService
+
+
+def test_runtime_platform():
+    """
+    Function to test the runtime platform from the compose platform and x-ecs, and the family merge.
+    """
+    api = ComposeService(
+        "api",
+        {"image": "api", "platform": "linux/arm64", "x-ecs": {"EphemeralStorage": 30}},
+    )
+    worker = ComposeService(
+        "worker",
+        {
+            "image": "worker",
+            "x-ecs": {
+                "RuntimePlatform": {"CpuArchitecture": "ARM64"},
+                "EphemeralStorage": 50,
+            },
+        },
+    )
+    family = ComposeFamily([api, worker], "api")
+    assert family.get_task_runtime_settings() == (
+        {"CpuArchitecture": "ARM64", "OperatingSystemFamily": "LINUX"},
+        50,
+    )
+    family.add_service(ComposeService("sidecar", {"image": "sidecar"}))
+    assert family.get_task_runtime_settings()[0]["CpuArchitecture"] == "ARM64"
+    family.add_service(
+        ComposeService("x86", {"image": "x86", "platform": "linux/amd64"})
+    )
+    with raises(ValueError):
+        family.get_task_runtime_settings()
+
+
+def test_invalid_runtime_settings():
+    with raises(ValueError):
+        ComposeService("api", {"image": "api", "platform": "windows/amd64"})
+    with raises(ValueError):
+        ComposeService("api", {"image": "api", "platform": "linux/s390x"})
+    with raises(ValueError):
+        ComposeService("api", {"image": "api", "x-ecs": {"EphemeralStorage": 10}})
+    with raises(ValueError):
+        ComposeService(
+            "api",
+            {
+                "image": "api",
+                "x-ecs": {
+                    "RuntimePlatform": {
+                        "CpuArchitecture": "ARM64",
+                        "OperatingSystemFamily": "WINDOWS_SERVER_2019_CORE",
+                    }
+                },
+            },
+        )
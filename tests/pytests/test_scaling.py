@@ -17,7 +17,18 @@
 
 from pytest import raises
 
-from ecs_composex.ecs.ecs_scaling import generate_scaling_out_steps
+from ecs_composex.ecs.ecs_scaling import (
+    PRE_WARM_KEY,
+    QUEUE_SCALING_KEY,
+    SCHEDULED_ACTIONS_KEY,
+    define_backlog_per_task_target,
+    define_scheduled_actions,
+    expand_week_days,
+    generate_scaling_out_steps,
+    handle_pre_warm,
+    handle_queue_scaling,
+    handle_scheduled_actions,
+)
 
 
 def test_steps_definition():
@@ -49,3 +60,99 @@ def test_steps_definition():
             ],
             target=None,
         )
+
+
+def test_queue_scaling():
+    """
+    Function to test the merge of QueueScaling and the backlog per task target
+    """
+    config = {QUEUE_SCALING_KEY: None}
+    handle_queue_scaling(
+        config,
+        QUEUE_SCALING_KEY,
+        {"AcceptableLatency": 300, "MessageProcessingTime": 2, "ScaleInCooldown": 120},
+    )
+    handle_queue_scaling(
+        config,
+        QUEUE_SCALING_KEY,
+        {"AcceptableLatency": 600, "MessageProcessingTime": 4, "ScaleInCooldown": 300},
+    )
+    assert config[QUEUE_SCALING_KEY] == {
+        "AcceptableLatency": 300,
+        "MessageProcessingTime": 4,
+        "ScaleInCooldown": 300,
+    }
+    assert define_backlog_per_task_target(config[QUEUE_SCALING_KEY]) == 75.0
+    assert (
+        define_backlog_per_task_target(
+            {"AcceptableLatency": 1, "MessageProcessingTime": 4}
+        )
+        == 1.0
+    )
+    with raises(ValueError):
+        handle_queue_scaling(config, QUEUE_SCALING_KEY, {"AcceptableLatency": 60})
+    with raises(KeyError):
+        handle_queue_scaling(
+            config,
+            QUEUE_SCALING_KEY,
+            {"AcceptableLatency": 60, "MessageProcessingTime": 1, "Latency": 1},
+        )
+
+
+def test_scheduled_actions():
+    """
+    Function to test the merge of the scheduled actions and pre-warm periods into the ScalableTarget actions
+    """
+    config = {SCHEDULED_ACTIONS_KEY: None, PRE_WARM_KEY: None}
+    handle_scheduled_actions(
+        config,
+        SCHEDULED_ACTIONS_KEY,
+        [{"Schedule": "cron(0 22 * * ? *)", "MaxCapacity": 2}],
+    )
+    handle_scheduled_actions(
+        config,
+        SCHEDULED_ACTIONS_KEY,
+        [{"Schedule": "cron(0 22 * * ? *)", "MaxCapacity": 4, "MinCapacity": 1}],
+    )
+    assert config[SCHEDULED_ACTIONS_KEY] == [
+        {"Schedule": "cron(0 22 * * ? *)", "MaxCapacity": 4, "MinCapacity": 1}
+    ]
+    for pre_warm in [
+        {"Start": "08:00", "End": "18:00", "Days": "MON-FRI", "MinCapacity": 4},
+        {
+            "Start": "08:00",
+            "End": "18:00",
+            "Days": "MON-FRI",
+            "MinCapacity": 6,
+            "LeadTime": 10,
+        },
+        {"Start": "00:10", "End": "02:00", "Days": "SUN,SAT", "MinCapacity": 2},
+    ]:
+        handle_pre_warm(config, PRE_WARM_KEY, [pre_warm])
+    assert len(config[PRE_WARM_KEY]) == 2
+    actions = define_scheduled_actions(
+        config[SCHEDULED_ACTIONS_KEY], config[PRE_WARM_KEY], {"min": 1, "max": 10}
+    )
+    assert [
+        (action.ScheduledActionName, action.Schedule) for action in actions[1:]
+    ] == [
+        ("PreWarm0Start", "cron(45 7 ? * MON,TUE,WED,THU,FRI *)"),
+        ("PreWarm0End", "cron(0 18 ? * MON,TUE,WED,THU,FRI *)"),
+        ("PreWarm1Start", "cron(55 23 ? * FRI,SAT *)"),
+        ("PreWarm1End", "cron(0 2 ? * SUN,SAT *)"),
+    ]
+    assert actions[1].ScalableTargetAction.MinCapacity == 6
+    assert actions[2].ScalableTargetAction.MinCapacity == 1
+    with raises(ValueError):
+        define_scheduled_actions(
+            [{"Schedule": "rate(1 hour)", "MinCapacity": 12}],
+            None,
+            {"min": 1, "max": 10},
+        )
+    with raises(ValueError):
+        handle_scheduled_actions(
+            config, SCHEDULED_ACTIONS_KEY, [{"Schedule": "daily", "MinCapacity": 1}]
+        )
+    assert expand_week_days("FRI-MON") == ["SUN", "MON", "FRI", "SAT"]
+    with raises(ValueError):
+        expand_week_days("MON-FUN")
@@ -15,7 +15,18 @@
 #   You should have received a copy of the GNU General Public License
 #   along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from os import path
+
+import boto3
+import placebo
+from pytest import raises
+
 from ecs_composex.secrets.compose_secrets import define_env_var_name
+from ecs_composex.secrets.secrets_aws import (
+    build_secrets_indexes,
+    define_secrets_filters,
+    lookup_secret_config,
+)
 
 
 def test_normal_secrets():
@@ -43,3 +54,40 @@ def test_normal_secrets():
             "Transform": "java_properties",
         }
     )
+
+
+def test_secrets_filters():
+    """
+    Function to test the list_secrets filters for the lookups
+    """
+    assert define_secrets_filters(
+        [{"Name": "b", "Tags": [{"costcentre": "lambda"}]}, {"Name": "a"}]
+    ) == [{"Key": "name", "Values": ["a", "b"]}]
+    assert define_secrets_filters(
+        [{"Tags": [{"costcentre": "lambda"}]}, {"Name": "a", "Tags": [{"app": "a"}]}]
+    ) == [{"Key": "tag-key", "Values": ["app", "costcentre"]}]
+    assert define_secrets_filters([{"Tags": [{"costcentre": "lambda"}]}, {}]) == []
+
+
+def test_secrets_index_lookup():
+    """
+    Function to test the secrets lookup from the index of all secrets listed
+    """
+    here = path.abspath(path.dirname(__file__))
+    session = boto3.session.Session()
+    pill = placebo.attach(session, data_path=f"{here}/x_secrets")
+    pill.playback()
+    lookup = {"Name": "secret/with/kmskey", "Tags": [{"costcentre": "lambda"}]}
+    indexes = build_secrets_indexes([lookup], session)
+    assert len(indexes) == 1
+    assert len(list(indexes.values())[0].secrets) == 3
+    config = lookup_secret_config("zyx", lookup, session, indexes)
+    assert config["zyx"].endswith(":secret:secret/with/kmskey-3MmbWA")
+    assert config["Name"] == "secret/with/kmskey"
+    assert config["KmsKeyId"].startswith("arn:aws:kms:")
+    with raises(LookupError):
+        lookup_secret_config(
+            "dup", {"Tags": [{"composexdev": "yes"}]}, session, indexes
+        )
+    with raises(LookupError):
+        lookup_secret_config("none", {"Name": "secret/none"}, session, indexes)
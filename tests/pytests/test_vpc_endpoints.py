@@ -0,0 +1,90 @@
+#  -*- coding: utf-8 -*-
+#   ECS ComposeX <https://github.com/lambda-my-aws/ecs_composex>
+#   Copyright (C) 2020-2021  John Mille <john@lambda-my-aws.io>
+#  #
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#  #
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#  #
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module to test the VPC endpoints planner.
+"""
+
+from os import path
+
+import boto3
+
+from ecs_composex.common.settings import ComposeXSettings
+from ecs_composex.vpc.vpc_endpoints import plan_vpc_endpoints, report_nat_savings
+from ecs_composex.vpc.vpc_stack import RES_KEY, VpcStack, define_create_settings
+
+HERE = path.abspath(path.dirname(__file__))
+
+
+def get_settings(*files):
+    return ComposeXSettings(
+        session=boto3.session.Session(),
+        **{
+            ComposeXSettings.name_arg: "test",
+            ComposeXSettings.command_arg: ComposeXSettings.render_arg,
+            ComposeXSettings.input_file_arg: [
+                path.abspath(f"{HERE}/../../use-cases/{file_name}")
+                for file_name in files
+            ],
+            ComposeXSettings.format_arg: "yaml",
+        },
+    )
+
+
+def test_detected_endpoints():
+    settings = get_settings(
+        "blog.yml",
+        "s3/simple_s3_bucket.yml",
+        "sqs/simple_queue.yml",
+        "vpc/auto_endpoints.yml",
+    )
+    create_settings = define_create_settings(
+        settings.compose_content["x-vpc"]["Create"]
+    )
+    endpoints = plan_vpc_endpoints(settings, create_settings["Endpoints"])
+    assert [service["service"] for service in endpoints["AwsServices"]] == [
+        "ecr.api",
+        "s3",
+        "sqs",
+        "logs",
+    ]
+    vpc_stack = VpcStack(RES_KEY, settings, create_settings)
+    resources = vpc_stack.stack_template.resources
+    assert resources["s3Endpoint"].VpcEndpointType == "Gateway"
+    assert resources["sqsEndpoint"].VpcEndpointType == "Interface"
+
+
+def test_no_auto_detect():
+    settings = get_settings("blog.yml", "s3/simple_s3_bucket.yml")
+    endpoints = plan_vpc_endpoints(
+        settings, {"AutoDetect": False, "AwsServices": [{"service": "ecr.dkr"}]}
+    )
+    assert endpoints["AwsServices"] == [{"service": "ecr.dkr"}]
+
+
+def test_auto_detect_opt_in():
+    settings = get_settings("blog.yml", "s3/simple_s3_bucket.yml")
+    endpoints = plan_vpc_endpoints(settings, {"AwsServices": [{"service": "ecr.dkr"}]})
+    assert endpoints["AwsServices"] == [{"service": "ecr.dkr"}]
+
+
+def test_nat_savings():
+    plan = {"s3": ["x-s3"], "dynamodb": ["x-dynamodb"], "sqs": ["x-sqs"]}
+    savings = report_nat_savings(plan, {"s3": 100, "sqs": 100}, 3)
+    assert round(savings, 2) == round(4.5 + 3.5 - 0.01 * 730 * 3, 2)
+    assert report_nat_savings(plan, {"s3": 100, "sqs": 5000}, 2) > 0
+    assert round(report_nat_savings({"logs": ["awslogs"]}, {}, 2), 2) == -14.6
@@ -0,0 +1,100 @@
+#  -*- coding: utf-8 -*-
+#   ECS ComposeX <https://github.com/lambda-my-aws/ecs_composex>
+#   Copyright (C) 2020-2021  John Mille <john@lambda-my-aws.io>
+#  #
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#  #
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#  #
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module to test the VPC subnets planning.
+"""
+
+import ipaddress
+from itertools import combinations
+
+import pytest
+
+from ecs_composex.vpc.vpc_maths import get_subnet_layers, plan_vpcs, nxtpow2
+from ecs_composex.vpc.vpc_stack import define_layers_weights
+
+
+def assert_no_overlaps(cidrs, parent):
+    networks = [ipaddress.IPv4Network(cidr) for cidr in cidrs]
+    for network in networks:
+        assert network.subnet_of(ipaddress.IPv4Network(parent))
+    for left, right in combinations(networks, 2):
+        assert not left.overlaps(right)
+
+
+def test_default_layers():
+    layers = get_subnet_layers("100.64.72.0/24", 3)
+    assert layers == {
+        "app": ["100.64.72.0/27", "100.64.72.64/27", "100.64.72.128/27"],
+        "pub": ["100.64.72.32/28", "100.64.72.96/28", "100.64.72.160/28"],
+        "stor": ["100.64.72.48/28", "100.64.72.112/28", "100.64.72.176/28"],
+    }
+    layers = get_subnet_layers("10.0.0.0/16", 1)
+    assert layers == {
+        "app": ["10.0.0.0/18"],
+        "pub": ["10.0.64.0/19"],
+        "stor": ["10.0.96.0/19"],
+    }
+    layers = get_subnet_layers("10.0.0.0/16", 5)
+    assert layers["app"] == [f"10.0.{block * 32}.0/20" for block in range(5)]
+    assert layers["pub"][-1] == "10.0.144.0/21"
+    assert layers["stor"][-1] == "10.0.152.0/21"
+
+
+@pytest.mark.parametrize("azs", [1, 2, 3, 5, 6, 7])
+def test_any_azs_count(azs):
+    layers = get_subnet_layers("10.10.0.0/20", azs, {"app": 4, "pub": 1, "stor": 1})
+    cidrs = [cidr for subnets in layers.values() for cidr in subnets]
+    assert len(cidrs) == azs * 3
+    assert_no_overlaps(cidrs, "10.10.0.0/20")
+    assert ipaddress.IPv4Network(layers["app"][0]).num_addresses >= (
+        ipaddress.IPv4Network(layers["pub"][0]).num_addresses * 2
+    )
+
+
+def test_too_small_vpc():
+    with pytest.raises(ValueError):
+        get_subnet_layers("100.64.72.0/24", 6)
+    with pytest.raises(ValueError):
+        get_subnet_layers("100.64.72.0/24", 2, {"app": 0, "pub": 1})
+
+
+def test_plan_vpcs():
+    plan = plan_vpcs("10.0.0.0/14", {"small": 20, "big": 16, "medium": 18}, 3)
+    assert plan["big"]["VpcCidr"] == "10.0.0.0/16"
+    assert_no_overlaps([vpc["VpcCidr"] for vpc in plan.values()], "10.0.0.0/14")
+    for vpc in plan.values():
+        assert_no_overlaps(
+            [cidr for subnets in vpc["Layers"].values() for cidr in subnets],
+            vpc["VpcCidr"],
+        )
+    with pytest.raises(ValueError):
+        plan_vpcs("10.0.0.0/16", {"one": 16, "two": 17}, 2)
+
+
+def test_layers_settings():
+    assert define_layers_weights({}) == {"app": 2, "pub": 1, "stor": 1}
+    assert define_layers_weights({"Layers": {"AppSubnets": 6}}) == {
+        "app": 6,
+        "pub": 1,
+        "stor": 1,
+    }
+    with pytest.raises(KeyError):
+        define_layers_weights({"Layers": {"Backend": 1}})
+    with pytest.raises(ValueError):
+        define_layers_weights({"Layers": {"PublicSubnets": 0.5}})
+    assert nxtpow2(3) == 4 and nxtpow2(4) == 4 and nxtpow2(1) == 1